@@ -6,64 +6,113 @@ e a composição de serviços foram centralizadas no pacote `evichain` para redu
 acoplamento e deixar a arquitetura mais profissional.
 """
 
-from flask import Flask, request, jsonify, send_from_directory
-import json
+from flask import Flask, Response, g, request, jsonify, send_file, send_from_directory
+import functools
+import hashlib
+import hmac
+import math
+import os
 import re
 import time
 import uuid
 from datetime import datetime
-from collections import deque
+from urllib.parse import urlencode
 from pathlib import Path
 from typing import Dict
 import traceback
 
 from blockchain_simulator import generate_complaint_id
 from evichain import Services, create_services, load_settings
-from evichain.threat_model import get_threat_catalogue, get_security_posture, get_threat_summary
+from evichain.static_responses import PrecomputedResponse, build_security_responses
+from evichain.audit_index import parse_timestamp
 from evichain.audit_log import AuditLog
+from evichain.anchor_scheduler import AnchorScheduler
 from evichain.external_anchor import ExternalAnchor
+from evichain.flask_json import FastJSONProvider
+from evichain.jobs import JobQueue, JobQueueFull
+from evichain.pdf_report import PdfRenderer, report_filename
+from evichain.metrics import CHAIN_HEIGHT, HTTP_REQUEST_SECONDS, HTTP_REQUESTS, REGISTRY
+from evichain.rate_limit import Budget, RateLimiter, create_bucket_store
+from evichain.serialization import loads as json_loads
+from evichain.tracing import tracer
+from evichain.compression import (
+    COMPRESSIBLE_MIMETYPES, ENCODING_PREFERENCE, CompressedBodyCache,
+    compress_body, compress_stream, encoded_etag, negotiate_encoding,
+)
 
 
 app = Flask(__name__)
-TRACE_BUFFER = deque(maxlen=120)
+app.json = FastJSONProvider(app)
 audit_log: AuditLog | None = None
 external_anchor: ExternalAnchor | None = None
+anchor_scheduler: AnchorScheduler | None = None
+STATIC_RESPONSES: Dict[str, PrecomputedResponse] = {}
+job_queue: JobQueue | None = None
+pdf_renderer: PdfRenderer | None = None
 
 
 SERVICES: Services | None = None
 
-# Compatibilidade com o código existente: as rotas seguem usando estes nomes
-assistente = None
-investigador = None
-consultor_registros = None
+# A chain é carregada no init; os demais serviços (IA, assistente, investigador,
+# consultor) são construídos sob demanda em SERVICES na primeira rota que os usa.
 evichain = None
-ia_engine = None
 
 
 def init_app() -> None:
     """Inicializa settings + services e injeta em variáveis globais (compat)."""
 
-    global SERVICES, assistente, investigador, consultor_registros, evichain, ia_engine
-    global audit_log, external_anchor
+    global SERVICES, evichain
+    global audit_log, external_anchor, anchor_scheduler, STATIC_RESPONSES, job_queue, pdf_renderer
 
     settings = load_settings(project_root=Path(__file__).resolve().parent)
     app.config["EVICHAIN_PROJECT_ROOT"] = str(settings.project_root)
     app.config["EVICHAIN_HOST"] = settings.host
     app.config["EVICHAIN_PORT"] = settings.port
     app.config["EVICHAIN_DEBUG"] = settings.debug
+    app.config["EVICHAIN_DEBUG_TRACES"] = settings.debug_traces
+    app.config["EVICHAIN_AUDIT_QUERY"] = settings.audit_query
+    app.config["EVICHAIN_ADMIN_TOKEN"] = settings.admin_token
 
     SERVICES = create_services(settings)
     app.extensions["evichain_services"] = SERVICES
 
-    assistente = SERVICES.assistente
-    investigador = SERVICES.investigador
-    consultor_registros = SERVICES.consultor_registros
     evichain = SERVICES.blockchain
-    ia_engine = SERVICES.ia_engine
+    # Com `gunicorn --preload`, construir tudo no master e compartilhar via copy-on-write
+    if os.getenv("EVICHAIN_PRELOAD_SERVICES", "").lower() in ("1", "true", "yes"):
+        SERVICES.warm()
 
     # Audit log and external anchoring
     audit_log = AuditLog()
     external_anchor = ExternalAnchor(evichain)
+    # Âncoras a cada N blocos / T minutos e sob demanda, fora da requisição
+    anchor_scheduler = AnchorScheduler(external_anchor, on_anchored=_log_anchor_created)
+
+    # Payloads estáticos de segurança: serializados uma vez por processo
+    STATIC_RESPONSES = build_security_responses()
+
+    # Relatórios PDF: pool de processos + cache em disco por hash do payload
+    pdf_renderer = PdfRenderer()
+
+    # Altura da chain lida no momento do scrape de /metrics
+    CHAIN_HEIGHT.set_function(lambda: len(evichain.chain))
+
+    # Fila de processamento assíncrono de denúncias (202 Accepted).
+    # O handler é resolvido em tempo de execução: as rotas são definidas depois.
+    job_queue = JobQueue(
+        handler=lambda job_id, payload: _run_complaint_job(job_id, payload),
+        pools={'lookup': int(os.getenv('EVICHAIN_LOOKUP_WORKERS', '4'))},
+    )
+    # Consultas externas (registros, investigação, redes sociais) também podem
+    # rodar na fila, liberando o worker HTTP durante a espera pela rede. Ficam
+    # num pool próprio para não ocupar os workers que selam denúncias.
+    job_queue.register('registry', lambda job_id, payload: _registry_lookup(payload), pool='lookup')
+    job_queue.register('investigation', lambda job_id, payload: _run_investigation(payload), pool='lookup')
+    job_queue.register('social', lambda job_id, payload: _social_lookup(payload), pool='lookup')
+
+
+def _log_anchor_created(receipt: dict) -> None:
+    if audit_log:
+        audit_log.log_anchor_created(receipt["type"], receipt["root_hash"])
 
 
 def get_project_root() -> Path:
@@ -74,8 +123,10 @@ def get_web_root() -> Path:
     return (get_project_root() / "web").resolve()
 
 def log_trace(trace_id, stage, detail=""):
+    """Marca um evento no log e no buffer de spans (o ``detail`` só vai para o log)."""
     timestamp = datetime.now().isoformat()
     print(f"[TRACE][{timestamp}][{trace_id}] {stage} - {detail}", flush=True)
+    tracer.event(stage, trace_id=trace_id)
 
 # (O resto das funções de parse de JSON permanece o mesmo, sem necessidade de alteração)
 def _split_loose_items(body: str) -> list[str]:
@@ -148,6 +199,34 @@ def _parse_loose_object(raw: str):
         except ValueError:
             return None
     return result
+# ── Metrics (latência e status por rota) ─────────────────────────
+# Registrados antes dos demais hooks: o before_request roda primeiro e o
+# after_request por último, medindo também rate limit e compressão.
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def _record_request_metrics(response):
+    started = g.pop('request_started', None)
+    # Template da rota (ex.: /api/jobs/<job_id>), nunca o caminho bruto
+    route = request.url_rule.rule if request.url_rule else '<unmatched>'
+    HTTP_REQUESTS.inc(method=request.method, route=route, status=str(response.status_code))
+    if started is not None:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=request.method, route=route)
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Métricas do processo no formato texto do Prometheus."""
+    response = Response(REGISTRY.render(), mimetype='text/plain')
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
 @app.after_request
 def after_request(response):
     # CORS headers
@@ -170,44 +249,155 @@ def after_request(response):
         "connect-src 'self'"
     )
 
+    return _compress_response(response)
+
+
+# ── Response compression (gzip/brotli) ───────────────────────────
+COMPRESSION_MIN_BYTES = int(os.getenv("EVICHAIN_COMPRESSION_MIN_BYTES", "1024"))
+_compressed_bodies = CompressedBodyCache()
+
+
+def _compress_response(response):
+    """Content-negotiated compression for JSON/text responses.
+
+    Buffered bodies below ``COMPRESSION_MIN_BYTES`` are left alone; bodies
+    with an ETag are served under the per-encoding ETag and compressed once,
+    cached in ``_compressed_bodies`` by a digest of the body itself (the
+    ETag follows the chain tip, but fields like ``server_time`` do not).
+    Generated streams are encoded on the fly; files sent from disk keep
+    their identity encoding, since their ETag and 304s come from the file.
+    """
+    if (response.status_code != 200 or request.method == 'HEAD'
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+    if encoding is None:
+        return response
+
+    if response.direct_passthrough:  # arquivos servidos do disco
+        return response
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    body = response.get_data()
+    if len(body) < COMPRESSION_MIN_BYTES:
+        return response
+
+    etag, _weak = response.get_etag()
+    digest = hashlib.sha256(body).hexdigest() if etag else None
+    compressed = _compressed_bodies.get(digest, encoding) if digest else None
+    if compressed is None:
+        compressed = compress_body(body, encoding)
+        if digest:
+            _compressed_bodies.put(digest, encoding, compressed)
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    if etag:
+        response.set_etag(encoded_etag(etag, encoding))
     return response
 
 
-# ── Rate Limiter (in-memory, per-IP) ─────────────────────────────
+# ── Rate Limiter (token bucket, per-IP and per-route) ─────────────
 # Addresses STRIDE threat T-08 (Denial of Service)
-_rate_limit_store: Dict[str, list] = {}
 RATE_LIMIT_WINDOW = 60     # seconds
 RATE_LIMIT_MAX_REQUESTS = 30  # max requests per window per IP
+RATE_LIMIT_ROUTE_BUDGETS = {
+    '/api/submit-complaint': Budget(10, RATE_LIMIT_WINDOW),  # pipeline de IA + mineração
+    '/api/security/anchor': Budget(5, RATE_LIMIT_WINDOW),   # chamada externa à TSA
+    '/api/sync/': Budget(60, RATE_LIMIT_WINDOW),
+    '/api/jobs/': Budget(120, RATE_LIMIT_WINDOW),           # polling de status
+    '/metrics': Budget(120, RATE_LIMIT_WINDOW),             # scraper de métricas
+    '/api/generate_pdf': Budget(20, RATE_LIMIT_WINDOW),     # renderização de PDF (CPU)
+    '/api/generate_pdf/batch': Budget(5, RATE_LIMIT_WINDOW),  # lote de PDFs em .zip
+}
+_rate_limit_store = create_bucket_store()
+rate_limiter = RateLimiter(
+    _rate_limit_store,
+    default=Budget(RATE_LIMIT_MAX_REQUESTS, RATE_LIMIT_WINDOW),
+    routes=RATE_LIMIT_ROUTE_BUDGETS,
+)
+
+
+@app.before_request
+def _start_anchor_scheduler():
+    """Retoma a fila de âncoras na primeira requisição de cada worker.
+
+    Nunca no master do ``gunicorn --preload``, cuja cópia da cadeia não
+    acompanha os blocos minerados; entre os workers, só quem obtém o lock
+    da fila a consome.
+    """
+    anchor_scheduler.start()
 
 
 @app.before_request
 def rate_limit():
-    """Simple sliding-window rate limiter — no external dependency."""
+    """Token-bucket rate limiter — O(1) state per client and route."""
     # Skip rate limiting for static files
     if request.path.startswith('/web/') or request.path in ('/', '/landing.css', '/landing.js', '/icon.svg'):
         return None
 
     client_ip = request.remote_addr or '0.0.0.0'
-    now = time.time()
-    window_start = now - RATE_LIMIT_WINDOW
-
-    # Clean up old entries
-    if client_ip in _rate_limit_store:
-        _rate_limit_store[client_ip] = [
-            ts for ts in _rate_limit_store[client_ip] if ts > window_start
-        ]
-    else:
-        _rate_limit_store[client_ip] = []
-
-    if len(_rate_limit_store[client_ip]) >= RATE_LIMIT_MAX_REQUESTS:
-        return jsonify({
+    allowed, retry_after = rate_limiter.hit(client_ip, request.path)
+    if not allowed:
+        response = jsonify({
             "success": False,
             "error": "Rate limit exceeded. Try again later."
-        }), 429
+        })
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return response, 429
+    return None
+
+# ── Conditional GET (ETag keyed on chain tip) ────────────────────
+# Read endpoints only change when a block is appended, so the tip hash plus
+# path and query string identify the representation without recomputing it.
+ETAG_VERSION = "v1"  # altere quando o formato das respostas mudar
+CHAIN_READ_CACHE_CONTROL = "private, no-cache"
 
-    _rate_limit_store[client_ip].append(now)
+
+def _chain_etag() -> str:
+    tip = evichain.last_block
+    # Re-encoded, so a "&" or "=" inside a value cannot pass for a separator
+    query = urlencode(sorted(request.args.items(multi=True)))
+    raw = f"{ETAG_VERSION}|{tip.index}|{tip.hash}|{request.path}|{query}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:40]
+
+
+def _matching_etag(etag: str) -> str | None:
+    """Return the representation ETag (plain or per-encoding) the client already has."""
+    for candidate in (etag, *(encoded_etag(etag, e) for e in ENCODING_PREFERENCE)):
+        if request.if_none_match.contains(candidate):
+            return candidate
     return None
 
+
+def chain_conditional(view):
+    """Adds a strong ETag and answers ``If-None-Match`` with 304 before running the view."""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = _chain_etag()
+        matched = _matching_etag(etag)
+        if matched:
+            response = app.response_class(status=304)
+            response.set_etag(matched)
+        else:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            response.set_etag(etag)
+        response.headers['Cache-Control'] = CHAIN_READ_CACHE_CONTROL
+        return response
+
+    return wrapper
+
+
 @app.route("/")
 def serve_landing():
     """Serve a landing page (index.html da raiz do projeto)"""
@@ -265,14 +455,141 @@ def healthcheck():
     return jsonify({"success": True, "status": "ok", "total_blocks": total_blocks})
 
 
-# Inicializa settings/services no import para manter compatibilidade com `python api_server.py`
-init_app()
+# Inicializa settings/services no import para manter compatibilidade com `python api_server.py`.
+# Não nos processos dos pools (PDF, verificação do audit log): com
+# `python api_server.py` eles reimportam este script como __mp_main__.
+if __name__ != "__mp_main__":
+    init_app()
+
+def _complaint_transaction_data(data: dict):
+    """Valida o corpo de /api/submit-complaint.
+
+    Retorna ``(transaction_data, None)`` ou ``(None, mensagem_de_erro)``.
+    """
+    # ===== CORREÇÃO FINAL =====
+    title = data.get('titulo', 'Denúncia sem Título')
+    nome_denunciado = data.get('nomeDenunciado', '').strip()
+    description = data.get('descricao', '')
+    # ==========================
+
+    if not description:
+        return None, "O campo 'descricao' é obrigatório."
+
+    if not nome_denunciado:
+        return None, "O campo 'nomeDenunciado' é obrigatório."
+
+    # Validação dos novos campos obrigatórios
+    assunto = data.get('assunto', '').strip()
+    finalidade = data.get('finalidade', '').strip()
+
+    if not assunto:
+        return None, "O campo 'assunto' é obrigatório."
+
+    if not finalidade:
+        return None, "O campo 'finalidade' é obrigatório."
+
+    return {
+        'titulo': title,
+        'nomeDenunciado': nome_denunciado,
+        'descricao': description,
+        'conselho': data.get('conselho', 'N/A'),
+        'categoria': data.get('categoria', 'N/A'),
+        'anonymous': data.get('anonymous', True),
+        'ouvidoriaAnonima': data.get('ouvidoriaAnonima', False),
+        'assunto': data.get('assunto', ''),
+        'prioridade': data.get('prioridade', ''),
+        'finalidade': data.get('finalidade', ''),
+        'codigosAnteriores': data.get('codigosAnteriores', ''),
+        'file_hashes': []
+    }, None
+
+
+def _process_complaint(transaction_data: dict, trace_id: str) -> dict:
+    """Pipeline completo: análise de IA, inclusão, mineração e auditoria."""
+    with tracer.span('ia_analysis', trace_id=trace_id):
+        ia_analysis_result = SERVICES.ia_engine.analisar_denuncia_completa(transaction_data, trace_id=trace_id)
+    transaction_data["ia_analysis"] = ia_analysis_result or {}
+
+    # Inclusão + mineração atômicas: outra thread não pode minerar nossa transação
+    with evichain.lock:
+        with tracer.span('blockchain_add', trace_id=trace_id):
+            complaint_id = evichain.add_evidence_transaction(transaction_data)
+
+        t_mine_start = time.monotonic()
+        with tracer.span('mining', trace_id=trace_id) as span_attrs:
+            new_block = evichain.mine_pending_transactions()
+            span_attrs['block_index'] = new_block.index if new_block else None
+        mining_ms = (time.monotonic() - t_mine_start) * 1000
+
+    if audit_log:
+        with tracer.span('audit', trace_id=trace_id):
+            audit_log.log_complaint_submitted(complaint_id, actor=trace_id)
+            if new_block:
+                audit_log.log_block_mined(
+                    new_block.index, new_block.hash,
+                    complaint_ids=evichain.block_header(new_block)["transaction_ids"])
+
+    return {
+        'complaint_id': complaint_id,
+        'block_index': new_block.index if new_block else None,
+        'mining_time_ms': round(mining_ms, 2),
+    }
+
+
+def _run_complaint_job(job_id: str, transaction_data: dict) -> dict:
+    """Handler da fila de jobs: idempotente pelo ``origin_id`` = id do job."""
+    existing = evichain.find_complaint(job_id)
+    if existing:
+        return {'complaint_id': existing[1], 'block_index': existing[0], 'mining_time_ms': None}
+    trace_id = f"JOB-{job_id[:6]}"
+    log_trace(trace_id, 'job_start')
+    transaction_data['origin_id'] = job_id
+    with tracer.span('complaint_job', trace_id=trace_id):
+        return _process_complaint(transaction_data, trace_id)
+
+
+def _wants_async() -> bool:
+    """Modo assíncrono: ``?async=1`` ou cabeçalho ``Prefer: respond-async``."""
+    if request.args.get('async', '').strip().lower() in {'1', 'true', 'yes'}:
+        return True
+    return 'respond-async' in request.headers.get('Prefer', '').lower()
+
+
+def _accept_job(kind: str, payload: dict, trace_id: str | None = None):
+    """Enfileira um job e responde 202 com a URL de acompanhamento (503 se a fila estiver cheia)."""
+    try:
+        job = job_queue.submit(payload, kind=kind)
+    except JobQueueFull:
+        response = jsonify({"success": False, "error": "Fila de processamento cheia. Tente novamente."})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    if trace_id:
+        log_trace(trace_id, 'job_queued', job['id'])
+    status_url = f"/api/jobs/{job['id']}"
+    response = jsonify({
+        'success': True,
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': status_url,
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
 
 @app.route('/api/submit-complaint', methods=['POST'])
 def submit_complaint():
     trace_id = f"REQ-{uuid.uuid4().hex[:6]}"
     log_trace(trace_id, 'request_start')
-    
+
+    # Span do request inteiro; as etapas (ia_analysis, mining, ...) ficam aninhadas.
+    # Os erros viram respostas 500 aqui dentro: o status do span vem do código.
+    with tracer.span('submit_complaint', trace_id=trace_id) as span_attrs:
+        response = app.make_response(_submit_complaint(trace_id))
+        span_attrs['status_code'] = response.status_code
+    return response
+
+
+def _submit_complaint(trace_id: str):
     try:
         data = request.get_json(silent=True)
         if data is None:
@@ -280,68 +597,15 @@ def submit_complaint():
             data = _parse_loose_object(raw_body)
             if data is None: return jsonify({"success": False, "error": "Formato JSON inválido."}), 400
 
-        # ===== CORREÇÃO FINAL =====
-        title = data.get('titulo', 'Denúncia sem Título')
-        nome_denunciado = data.get('nomeDenunciado', '').strip()
-        description = data.get('descricao', '')
-        # ==========================
-        
-        if not description:
-            return jsonify({"success": False, "error": "O campo 'descricao' é obrigatório."}), 400
-            
-        if not nome_denunciado:
-            return jsonify({"success": False, "error": "O campo 'nomeDenunciado' é obrigatório."}), 400
-        
-        # Validação dos novos campos obrigatórios
-        assunto = data.get('assunto', '').strip()
-        finalidade = data.get('finalidade', '').strip()
-        
-        if not assunto:
-            return jsonify({"success": False, "error": "O campo 'assunto' é obrigatório."}), 400
-            
-        if not finalidade:
-            return jsonify({"success": False, "error": "O campo 'finalidade' é obrigatório."}), 400
-
-        transaction_data = {
-            'titulo': title,
-            'nomeDenunciado': nome_denunciado,
-            'descricao': description,
-            'conselho': data.get('conselho', 'N/A'),
-            'categoria': data.get('categoria', 'N/A'),
-            'anonymous': data.get('anonymous', True),
-            'ouvidoriaAnonima': data.get('ouvidoriaAnonima', False),
-            'assunto': data.get('assunto', ''),
-            'prioridade': data.get('prioridade', ''),
-            'finalidade': data.get('finalidade', ''),
-            'codigosAnteriores': data.get('codigosAnteriores', ''),
-            'file_hashes': []
-        }
-
-        log_trace(trace_id, 'ia_analysis_start')
-        ia_analysis_result = ia_engine.analisar_denuncia_completa(transaction_data, trace_id=trace_id)
-        transaction_data["ia_analysis"] = ia_analysis_result or {}
-
-        log_trace(trace_id, 'blockchain_add_start')
-        complaint_id = evichain.add_evidence_transaction(transaction_data)
-        
-        log_trace(trace_id, 'mining_start')
-        t_mine_start = time.monotonic()
-        new_block = evichain.mine_pending_transactions()
-        mining_ms = (time.monotonic() - t_mine_start) * 1000
+        transaction_data, error = _complaint_transaction_data(data)
+        if error:
+            return jsonify({"success": False, "error": error}), 400
 
-        # Audit log + cycle timing
-        cycle_ms = (time.monotonic() - t_mine_start) * 1000 + mining_ms
-        if audit_log:
-            audit_log.log_complaint_submitted(complaint_id, actor=trace_id)
-            if new_block:
-                audit_log.log_block_mined(new_block.index, new_block.hash)
+        if _wants_async():
+            return _accept_job('complaint', transaction_data, trace_id)
 
-        response = {
-            'success': True,
-            'complaint_id': complaint_id,
-            'block_index': new_block.index if new_block else None,
-            'mining_time_ms': round(mining_ms, 2),
-        }
+        response = {'success': True}
+        response.update(_process_complaint(transaction_data, trace_id))
         return jsonify(response), 200
 
     except Exception as e:
@@ -349,7 +613,50 @@ def submit_complaint():
         traceback.print_exc()
         return jsonify({"success": False, "error": f"Erro interno no servidor: {e}"}), 500
 
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Consulta o estado de um job criado pelo modo assíncrono."""
+    job = job_queue.get(job_id) if job_queue else None
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job não encontrado'}), 404
+    return jsonify({'success': True, 'job': job})
+
+
+@app.route('/api/debug/traces', methods=['GET'])
+def get_debug_traces():
+    """Spans recentes e latência por etapa (p50/p95/p99).
+
+    Filtros opcionais: ``trace_id``, ``stage`` e ``limit`` (padrão 100).
+    Os spans não contêm dados pessoais, apenas etapas, tempos e contagens,
+    mas revelam rotas e trace ids: a rota só existe com ``FLASK_DEBUG`` ou
+    ``EVICHAIN_DEBUG_TRACES`` habilitado.
+    """
+    if not app.config.get("EVICHAIN_DEBUG_TRACES", False):
+        return jsonify({'success': False, 'error': 'Não encontrado'}), 404
+    try:
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit deve ser inteiro'}), 400
+    limit = max(0, min(limit, tracer.capacity))
+
+    spans = tracer.spans(
+        trace_id=request.args.get('trace_id') or None,
+        stage=request.args.get('stage') or None,
+        limit=limit,
+    )
+    response = jsonify({
+        'success': True,
+        'capacity': tracer.capacity,
+        'buffered': len(tracer),
+        'stages': tracer.stage_stats(),
+        'spans': [span.to_dict() for span in spans],
+    })
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
 @app.route('/api/complaints', methods=['GET'])
+@chain_conditional
 def get_complaints():
     try:
         complaints = evichain.get_all_complaints()
@@ -358,7 +665,54 @@ def get_complaints():
         print(f"[ERROR] Erro ao obter denúncias: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/api/complaints/<complaint_id>/resolve', methods=['POST'])
+def resolve_complaint(complaint_id):
+    """Registra na chain que uma denúncia foi resolvida.
+
+    Grava uma transação ``status_update`` num bloco novo; é ela que alimenta
+    ``resolvedComplaints`` e ``averageResolutionTime`` em ``/api/analytics``.
+    Exige ``Authorization: Bearer <EVICHAIN_ADMIN_TOKEN>``; sem o token
+    configurado a rota não existe.
+    """
+    token = app.config.get("EVICHAIN_ADMIN_TOKEN")
+    if not token:
+        return jsonify({'success': False, 'error': 'Não encontrado'}), 404
+    supplied = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+        return jsonify({'success': False, 'error': 'Não autorizado'}), 401
+
+    try:
+        with evichain.lock:
+            location = evichain.find_complaint(complaint_id)
+            if location is None:
+                return jsonify({'success': False, 'error': 'Denúncia não encontrada'}), 404
+            if not evichain.aggregates.is_open(location[1]):
+                return jsonify({'success': False, 'error': 'Denúncia já resolvida'}), 409
+            update = evichain.add_status_update(location[1])
+            new_block = evichain.mine_pending_transactions()
+
+        if audit_log:
+            audit_log.log_event(
+                "COMPLAINT_RESOLVED", actor='admin',
+                detail={'complaint_id': update['complaint_id']})
+            if new_block:
+                audit_log.log_block_mined(
+                    new_block.index, new_block.hash,
+                    complaint_ids=evichain.block_header(new_block)["transaction_ids"])
+
+        return jsonify({
+            'success': True,
+            'complaint_id': update['complaint_id'],
+            'status': update['status'],
+            'block_index': new_block.index if new_block else None
+        })
+    except Exception as e:
+        print(f"[ERROR] Erro ao resolver denúncia: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/blockchain-info', methods=['GET'])
+@chain_conditional
 def get_blockchain_info():
     try:
         info = evichain.get_chain_info()
@@ -384,10 +738,10 @@ def analisar_com_assistente():
         print(f"[INFO] Analisando texto com assistente: {len(texto)} caracteres")
         
         # Analisar com assistente (usa OpenAI se disponível, senão local)
-        analise = assistente.analisar_denuncia(texto, conselho, categoria)
+        analise = SERVICES.assistente.analisar_denuncia(texto, conselho, categoria)
         
         # Gerar relatório HTML
-        relatorio_html = assistente.gerar_relatorio_html(analise)
+        relatorio_html = SERVICES.assistente.gerar_relatorio_html(analise)
         
         print(f"[INFO] Análise concluída - Fonte: {analise.get('fonte')}, Pontuação: {analise['pontuacao_qualidade']}/100")
         
@@ -405,49 +759,63 @@ def analisar_com_assistente():
             'error': str(e)
         }), 500
 
+def _registry_lookup(params: dict) -> dict:
+    """Consulta detalhada de registro profissional (síncrona ou via fila de jobs)."""
+    nome, registro, conselho = params['nome'], params.get('registro', ''), params.get('conselho', '')
+    print(f"[INFO] Consultando registro profissional: {nome} - {conselho} - {registro}")
+    
+    # Realizar consulta detalhada
+    resultado_consulta = SERVICES.consultor_registros.consultar_registro_completo(
+        nome=nome,
+        registro=registro,
+        conselho=conselho
+    )
+    
+    # Se encontrou registro, extrair formação
+    if resultado_consulta.get("registro_encontrado") and resultado_consulta.get("dados_profissional"):
+        formacao_info = SERVICES.consultor_registros.extrair_formacao_e_especialidades(
+            resultado_consulta["dados_profissional"],
+            conselho or "GENERICO"
+        )
+        resultado_consulta["formacao_detalhada"] = formacao_info
+    
+    # Gerar relatório
+    relatorio = SERVICES.consultor_registros.gerar_relatorio_registro(resultado_consulta)
+    
+    print(f"[SUCCESS] Consulta concluída - Registro encontrado: {resultado_consulta.get('registro_encontrado', False)}")
+    
+    return {
+        'consulta': resultado_consulta,
+        'relatorio': relatorio,
+        'encontrado': resultado_consulta.get('registro_encontrado', False)
+    }
+
+
 @app.route('/api/registros/consultar', methods=['POST'])
 def consultar_registro_profissional():
-    """Endpoint específico para consulta detalhada de registros profissionais"""
+    """Endpoint específico para consulta detalhada de registros profissionais.
+
+    Com ``?async=1`` (ou ``Prefer: respond-async``) a consulta vai para a fila
+    de jobs e a resposta é 202 com ``status_url``.
+    """
     try:
         data = request.json
-        nome = data.get('nome', '').strip()
-        registro = data.get('registro', '').strip()
-        conselho = data.get('conselho', '').strip()
+        params = {
+            'nome': data.get('nome', '').strip(),
+            'registro': data.get('registro', '').strip(),
+            'conselho': data.get('conselho', '').strip(),
+        }
         
-        if not nome:
+        if not params['nome']:
             return jsonify({
                 'success': False,
                 'error': 'Nome do profissional é obrigatório'
             }), 400
         
-        print(f"[INFO] Consultando registro profissional: {nome} - {conselho} - {registro}")
-        
-        # Realizar consulta detalhada
-        resultado_consulta = consultor_registros.consultar_registro_completo(
-            nome=nome,
-            registro=registro,
-            conselho=conselho
-        )
-        
-        # Se encontrou registro, extrair formação
-        if resultado_consulta.get("registro_encontrado") and resultado_consulta.get("dados_profissional"):
-            formacao_info = consultor_registros.extrair_formacao_e_especialidades(
-                resultado_consulta["dados_profissional"],
-                conselho or "GENERICO"
-            )
-            resultado_consulta["formacao_detalhada"] = formacao_info
-        
-        # Gerar relatório
-        relatorio = consultor_registros.gerar_relatorio_registro(resultado_consulta)
+        if _wants_async():
+            return _accept_job('registry', params)
         
-        print(f"[SUCCESS] Consulta concluída - Registro encontrado: {resultado_consulta.get('registro_encontrado', False)}")
-        
-        return jsonify({
-            'success': True,
-            'consulta': resultado_consulta,
-            'relatorio': relatorio,
-            'encontrado': resultado_consulta.get('registro_encontrado', False)
-        })
+        return jsonify({'success': True, **_registry_lookup(params)})
     
     except Exception as e:
         print(f"[ERROR] Erro na consulta de registro: {e}")
@@ -457,38 +825,48 @@ def consultar_registro_profissional():
             'error': str(e)
         }), 500
 
+def _run_investigation(params: dict) -> dict:
+    """Investigação digital completa (síncrona ou via fila de jobs)."""
+    nome = params['nome']
+    print(f"[INFO] Iniciando investigação digital para: {nome}")
+    
+    # Realizar investigação completa
+    resultado_investigacao = SERVICES.investigador.investigar_completo(
+        nome=nome,
+        registro_profissional=params.get('registro', ''),
+        conselho=params.get('conselho', ''),
+        informacoes_adicionais=params.get('informacoes_adicionais', {})
+    )
+    
+    print(f"[SUCCESS] Investigação concluída para {nome}")
+    return {'investigacao': resultado_investigacao}
+
+
 @app.route('/api/investigacao/iniciar', methods=['POST'])
 def iniciar_investigacao():
-    """Endpoint para iniciar investigação digital de um profissional"""
+    """Endpoint para iniciar investigação digital de um profissional.
+
+    Aceita ``?async=1`` / ``Prefer: respond-async`` (202 + ``status_url``).
+    """
     try:
         data = request.json
-        nome = data.get('nome', '').strip()
-        registro = data.get('registro', '').strip()
-        conselho = data.get('conselho', '').strip()
-        informacoes_adicionais = data.get('informacoes_adicionais', {})
+        params = {
+            'nome': data.get('nome', '').strip(),
+            'registro': data.get('registro', '').strip(),
+            'conselho': data.get('conselho', '').strip(),
+            'informacoes_adicionais': data.get('informacoes_adicionais', {}),
+        }
         
-        if not nome:
+        if not params['nome']:
             return jsonify({
                 'success': False,
                 'error': 'Nome do profissional é obrigatório'
             }), 400
         
-        print(f"[INFO] Iniciando investigação digital para: {nome}")
-        
-        # Realizar investigação completa
-        resultado_investigacao = investigador.investigar_completo(
-            nome=nome,
-            registro_profissional=registro,
-            conselho=conselho,
-            informacoes_adicionais=informacoes_adicionais
-        )
-        
-        print(f"[SUCCESS] Investigação concluída para {nome}")
+        if _wants_async():
+            return _accept_job('investigation', params)
         
-        return jsonify({
-            'success': True,
-            'investigacao': resultado_investigacao
-        })
+        return jsonify({'success': True, **_run_investigation(params)})
     
     except Exception as e:
         print(f"[ERROR] Erro durante investigação: {e}")
@@ -517,12 +895,12 @@ def gerar_relatorio_investigacao(formato):
                 'error': 'Formato deve ser: json, html ou txt'
             }), 400
         
-        relatorio = investigador.gerar_relatorio_investigacao(dados_investigacao, formato)
+        relatorio = SERVICES.investigador.gerar_relatorio_investigacao(dados_investigacao, formato)
         
         if formato == 'json':
             return jsonify({
                 'success': True,
-                'relatorio': json.loads(relatorio),
+                'relatorio': json_loads(relatorio),
                 'formato': 'json'
             })
         else:
@@ -540,28 +918,29 @@ def gerar_relatorio_investigacao(formato):
             'error': str(e)
         }), 500
 
+def _social_lookup(params: dict) -> dict:
+    """Busca apenas em redes sociais (síncrona ou via fila de jobs)."""
+    print(f"[INFO] Buscando redes sociais para: {params['nome']}")
+    return {'redes_sociais': SERVICES.investigador._investigar_redes_sociais(params['nome'])}
+
+
 @app.route('/api/investigacao/buscar-redes-sociais', methods=['POST'])
 def buscar_redes_sociais():
-    """Endpoint específico para busca em redes sociais"""
+    """Endpoint específico para busca em redes sociais (aceita ``?async=1``)."""
     try:
         data = request.json
-        nome = data.get('nome', '').strip()
+        params = {'nome': data.get('nome', '').strip()}
         
-        if not nome:
+        if not params['nome']:
             return jsonify({
                 'success': False,
                 'error': 'Nome é obrigatório'
             }), 400
         
-        print(f"[INFO] Buscando redes sociais para: {nome}")
-        
-        # Buscar apenas redes sociais
-        redes_sociais = investigador._investigar_redes_sociais(nome)
+        if _wants_async():
+            return _accept_job('social', params)
         
-        return jsonify({
-            'success': True,
-            'redes_sociais': redes_sociais
-        })
+        return jsonify({'success': True, **_social_lookup(params)})
     
     except Exception as e:
         print(f"[ERROR] Erro na busca de redes sociais: {e}")
@@ -572,6 +951,7 @@ def buscar_redes_sociais():
         }), 500
 
 @app.route('/api/search', methods=['GET'])
+@chain_conditional
 def search_complaints():
     """Busca denúncias na blockchain por termo de pesquisa"""
     try:
@@ -656,6 +1036,7 @@ def search_complaints():
         }), 500
 
 @app.route('/api/search-by-professional', methods=['GET'])
+@chain_conditional
 def search_by_professional():
     """Busca específica por nome de profissional"""
     try:
@@ -711,6 +1092,7 @@ def search_by_professional():
         }), 500
 
 @app.route('/api/search-by-council', methods=['GET'])
+@chain_conditional
 def search_by_council():
     """Busca específica por conselho profissional"""
     try:
@@ -751,31 +1133,20 @@ def search_by_council():
         }), 500
 
 @app.route('/api/stats', methods=['GET'])
+@chain_conditional
 def get_stats():
     """Retorna estatísticas básicas do sistema"""
     try:
-        complaints = evichain.get_all_complaints()
-        
-        total_complaints = len(complaints)
-        total_blocks = len(evichain.chain)
-        
-        # Contar por conselho
-        councils = {}
-        categories = {}
-        
-        for complaint in complaints:
-            conselho = complaint.get('conselho', 'N/A')
-            categoria = complaint.get('categoria', 'N/A')
-            
-            councils[conselho] = councils.get(conselho, 0) + 1
-            categories[categoria] = categories.get(categoria, 0) + 1
+        # Contadores mantidos a cada bloco anexado (evichain.aggregates): O(1) por requisição
+        stats = evichain.aggregates.stats()
         
         return jsonify({
             'success': True,
-            'total_complaints': total_complaints,
-            'total_blocks': total_blocks,
-            'councils': councils,
-            'categories': categories
+            'total_complaints': stats['total_complaints'],
+            'total_blocks': len(evichain.chain),
+            'councils': stats['councils'],
+            'categories': stats['categories'],
+            'risk_levels': stats['risk_levels']
         })
         
     except Exception as e:
@@ -789,36 +1160,40 @@ def get_stats():
 # Provides transparency about system security posture (for the article
 # and for auditors).  Addresses reviewer criticism about lack of threat model.
 
+SECURITY_RESPONSES_CACHE_CONTROL = "public, max-age=300"
+
+
+def _serve_precomputed(name: str):
+    """Serve a payload serialized at startup (see evichain.static_responses)."""
+    encoding, body, etag = STATIC_RESPONSES[name].select(request.headers.get('Accept-Encoding'))
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = SECURITY_RESPONSES_CACHE_CONTROL
+    return response
+
+
 @app.route('/api/security/threat-model', methods=['GET'])
 def api_threat_model():
     """Returns the full STRIDE threat catalogue."""
-    return jsonify({
-        'success': True,
-        'threats': get_threat_catalogue(),
-        'summary': get_threat_summary(),
-    })
+    return _serve_precomputed('threat_model')
 
 
 @app.route('/api/security/posture', methods=['GET'])
 def api_security_posture():
     """Returns explicit guarantees and non-guarantees."""
-    return jsonify({
-        'success': True,
-        'posture': get_security_posture(),
-    })
+    return _serve_precomputed('posture')
 
 
 @app.route('/api/security/summary', methods=['GET'])
 def api_security_summary():
     """Returns a high-level summary of the threat model."""
-    summary = get_threat_summary()
-    posture = get_security_posture()
-    return jsonify({
-        'success': True,
-        'summary': summary,
-        'guarantees_count': len(posture['guarantees']),
-        'non_guarantees_count': len(posture['non_guarantees']),
-    })
+    return _serve_precomputed('summary')
 
 
 # ------------------------------------------------------------------
@@ -827,48 +1202,143 @@ def api_security_summary():
 
 @app.route('/api/security/anchor', methods=['POST'])
 def api_anchor_chain():
-    """Anchor the current chain root hash via RFC 3161 timestamping."""
+    """Queue an RFC 3161 anchor of the current chain root (202 Accepted).
+
+    The background scheduler contacts the TSA and retries with backoff;
+    the receipt then shows up in ``/api/security/anchors``.
+    """
     try:
-        receipt = external_anchor.anchor_rfc3161()
-        if audit_log:
-            audit_log.log_anchor_created("rfc3161", receipt["root_hash"])
-        return jsonify({"success": True, "receipt": receipt})
-    except Exception as e:
+        anchor_request = anchor_scheduler.enqueue(reason="api")
+    except OSError as e:
         return jsonify({"success": False, "error": str(e)}), 500
+    anchor_scheduler.start()
+    status_url = '/api/security/anchor/queue'
+    response = jsonify({"success": True, "request": anchor_request, "status_url": status_url})
+    response.headers['Location'] = status_url
+    return response, 202
+
+
+@app.route('/api/security/anchor/queue', methods=['GET'])
+def api_anchor_queue():
+    """Anchoring requests still queued (or given up on), oldest first."""
+    response = jsonify({"success": True, **anchor_scheduler.status()})
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 
 @app.route('/api/security/anchors', methods=['GET'])
 def api_list_anchors():
-    """List all stored anchor receipts."""
-    return jsonify({"success": True, "anchors": external_anchor.list_anchors()})
+    """List anchor receipts from the manifest, newest first.
+
+    Pagination: ``limit`` (default 50, max 500) and ``cursor`` – the
+    ``next_cursor`` of the previous page.
+    """
+    page_args = {}
+    try:
+        for name, param in (("limit", "limit"), ("before_seq", "cursor")):
+            value = request.args.get(param, '').strip()
+            if value:
+                page_args[name] = int(value)
+    except ValueError:
+        return jsonify({"success": False, "error": "limit e cursor devem ser inteiros"}), 400
+    return jsonify({"success": True, **external_anchor.list_anchors(**page_args)})
+
+
+@app.route('/api/security/anchors/verify', methods=['GET'])
+def api_verify_anchors():
+    """Check every anchor receipt against the current chain in one pass."""
+    response = jsonify({"success": True, **external_anchor.verify_all_anchors()})
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+@app.route('/api/security/anchors/consistency', methods=['GET'])
+def api_anchor_consistency():
+    """Consistency proof between two chain lengths.
+
+    ``first`` is the ``chain_length`` of an anchor receipt; ``second``
+    defaults to the current length.  The proof shows that the root
+    anchored at ``first`` is a prefix of the root at ``second``.
+    """
+    try:
+        first = int(request.args.get('first', ''))
+        second = request.args.get('second', '').strip()
+        proof = external_anchor.consistency_proof(first, int(second) if second else None)
+    except ValueError as e:
+        return jsonify({"success": False, "error": f"first/second inválidos: {e}"}), 400
+    return jsonify({"success": True, **proof})
 
 
 @app.route('/api/security/audit-log/verify', methods=['GET'])
 def api_verify_audit_log():
-    """Verify the HMAC-chained integrity of the audit log."""
-    result = audit_log.verify_integrity() if audit_log else {"valid": True, "entries": 0, "errors": []}
+    """Verify the HMAC-chained integrity of the audit log.
+
+    Checks entries appended since the last signed checkpoint; ``?full=true``
+    re-verifies the whole log.
+    """
+    full = request.args.get('full', '').strip().lower() in {'1', 'true', 'yes'}
+    result = (audit_log.verify_integrity(full=full) if audit_log
+              else {"valid": True, "entries": 0, "errors": [], "verified_from": 0})
     return jsonify({"success": True, "audit_log": result})
 
 
+@app.route('/api/security/audit-log/query', methods=['GET'])
+def api_query_audit_log():
+    """Search the audit log through its index, newest entries first.
+
+    Filters (all optional, combined with AND): ``event``, ``actor``,
+    ``complaint_id``, ``block_index``, ``since`` and ``until`` (ISO 8601
+    or epoch seconds).  Pagination: ``limit`` (default 50, max 500) and
+    ``cursor`` – the ``next_cursor`` of the previous page.
+
+    Entries carry actors, complaint ids and details, so the route only
+    exists with ``FLASK_DEBUG`` or ``EVICHAIN_AUDIT_QUERY`` enabled.
+    """
+    if not app.config.get("EVICHAIN_AUDIT_QUERY", False):
+        return jsonify({'success': False, 'error': 'Não encontrado'}), 404
+    if not audit_log or audit_log.index is None:
+        return jsonify({"success": False, "error": "Audit index is not enabled"}), 503
+
+    filters = {}
+    for name in ("event", "actor", "complaint_id"):
+        value = request.args.get(name, '').strip()
+        if value:
+            filters[name] = value
+    try:
+        for name, param in (("block_index", "block_index"), ("before_seq", "cursor"),
+                            ("limit", "limit")):
+            value = request.args.get(param, '').strip()
+            if value:
+                filters[name] = int(value)
+        for name in ("since", "until"):
+            value = request.args.get(name, '').strip()
+            if value:
+                filters[name] = parse_timestamp(value)
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "block_index, cursor e limit devem ser inteiros; since/until em ISO 8601 ou epoch",
+        }), 400
+
+    page = audit_log.query(**filters)
+    response = jsonify({"success": True, **page})
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
 @app.route('/api/analytics', methods=['GET'])
+@chain_conditional
 def get_analytics():
-    """Retorna estatísticas analíticas das denúncias"""
+    """Retorna estatísticas analíticas das denúncias.
+
+    ``?days=N`` limita a série diária (``timeseries``) aos N dias mais
+    recentes com movimento (padrão 30; 0 = todos).
+    """
     try:
-        complaints = evichain.get_all_complaints()
-        
-        total_complaints = len(complaints)
-        pending_complaints = len([c for c in complaints if c.get('status', 'pending') == 'pending'])
-        resolved_complaints = total_complaints - pending_complaints
-        
-        # Cálculo simples do tempo médio de resolução (em horas)
-        average_resolution_time = 24  # Valor padrão para demonstração
-        
-        return jsonify({
-            'totalComplaints': total_complaints,
-            'pendingComplaints': pending_complaints,
-            'resolvedComplaints': resolved_complaints,
-            'averageResolutionTime': f'{average_resolution_time}h'
-        })
+        days = request.args.get('days', 30, type=int)
+        analytics = evichain.aggregates.analytics()
+        analytics['timeseries'] = evichain.aggregates.timeseries(days)
+        return jsonify(analytics)
     
     except Exception as e:
         print(f"[ERROR] Erro ao obter analytics: {e}")
@@ -885,14 +1355,48 @@ def get_analytics():
 # =====================================================================
 
 @app.route('/api/sync/pull', methods=['GET'])
+@chain_conditional
 def sync_pull():
-    """Retorna todas as denúncias para o desktop sincronizar."""
+    """Retorna denúncias para o desktop sincronizar.
+
+    Sem parâmetros devolve o conjunto completo. Com ``since_height`` e/ou
+    ``since_hash`` (ponta conhecida pelo cliente) devolve apenas os blocos e
+    denúncias posteriores. Se a ponta do cliente não pertence mais à chain,
+    a resposta vem com ``diverged=True`` e o conjunto completo.
+    """
     try:
-        complaints = evichain.get_all_complaints()
+        since_height_raw = request.args.get('since_height', '').strip()
+        since_hash = request.args.get('since_hash', '').strip() or None
+
+        since_height = None
+        if since_height_raw:
+            try:
+                since_height = int(since_height_raw)
+            except ValueError:
+                return jsonify({'success': False, 'error': 'since_height deve ser um inteiro'}), 400
+
+        delta_requested = since_height is not None or since_hash is not None
+        known_height = evichain.resolve_sync_tip(since_height, since_hash) if delta_requested else None
+        diverged = delta_requested and known_height is None
+
+        if known_height is None:
+            blocks = evichain.chain
+            complaints = evichain.get_all_complaints()
+        else:
+            blocks = evichain.get_blocks_since(known_height)
+            complaints = evichain.get_complaints_since(known_height)
+
+        tip = evichain.last_block
         return jsonify({
             'success': True,
             'complaints': complaints,
+            'blocks': [evichain.block_header(b) for b in blocks],
             'total': len(complaints),
+            'full': known_height is None,
+            'since_height': known_height,
+            'diverged': diverged,
+            'tip_height': tip.index,
+            'tip_hash': tip.hash,
             'server_time': time.time()
         })
     except Exception as e:
@@ -900,6 +1404,30 @@ def sync_pull():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+SYNC_PUSH_BATCH_MAX = 500  # máximo de denúncias por requisição de push-batch
+
+
+def _sync_transaction_data(data: dict) -> dict:
+    """Converte uma denúncia vinda do desktop nos dados da transação."""
+    return {
+        'titulo': data.get('titulo', 'Denúncia sem Título'),
+        'nomeDenunciado': data.get('nomeDenunciado', ''),
+        'descricao': data.get('descricao', ''),
+        'conselho': data.get('conselho', 'N/A'),
+        'categoria': data.get('categoria', 'N/A'),
+        'anonymous': data.get('anonymous', True),
+        'ouvidoriaAnonima': data.get('ouvidoriaAnonima', False),
+        'assunto': data.get('assunto', ''),
+        'prioridade': data.get('prioridade', ''),
+        'finalidade': data.get('finalidade', ''),
+        'codigosAnteriores': data.get('codigosAnteriores', ''),
+        'file_hashes': [],
+        'ia_analysis': data.get('ia_analysis') or {},
+        'source': data.get('source', 'desktop'),
+        'origin_id': data.get('id') or None,
+    }
+
+
 @app.route('/api/sync/push', methods=['POST'])
 def sync_push():
     """Recebe uma denúncia do desktop e registra no servidor."""
@@ -910,38 +1438,27 @@ def sync_push():
 
         complaint_id = data.get('id', '')
 
-        # Verificar se já existe no servidor
-        existing = evichain.get_all_complaints()
-        existing_ids = {c.get('id') for c in existing}
-
-        if complaint_id in existing_ids:
-            return jsonify({
-                'success': True,
-                'status': 'already_exists',
-                'complaint_id': complaint_id
-            }), 200
-
-        # Registrar nova denúncia vinda do desktop
-        transaction_data = {
-            'titulo': data.get('titulo', 'Denúncia sem Título'),
-            'nomeDenunciado': data.get('nomeDenunciado', ''),
-            'descricao': data.get('descricao', ''),
-            'conselho': data.get('conselho', 'N/A'),
-            'categoria': data.get('categoria', 'N/A'),
-            'anonymous': data.get('anonymous', True),
-            'ouvidoriaAnonima': data.get('ouvidoriaAnonima', False),
-            'assunto': data.get('assunto', ''),
-            'prioridade': data.get('prioridade', ''),
-            'finalidade': data.get('finalidade', ''),
-            'codigosAnteriores': data.get('codigosAnteriores', ''),
-            'file_hashes': [],
-            'ia_analysis': data.get('ia_analysis') or {},
-            'source': data.get('source', 'desktop')
-        }
+        with evichain.lock:
+            # Verificar se já existe no servidor (id do servidor ou id de origem)
+            existing = evichain.find_complaint(complaint_id)
+            if existing:
+                return jsonify({
+                    'success': True,
+                    'status': 'already_exists',
+                    'complaint_id': existing[1],
+                    'block_index': existing[0]
+                }), 200
+
+            # Registrar nova denúncia vinda do desktop, guardando o id original
+            new_id = evichain.add_evidence_transaction(_sync_transaction_data(data))
+            new_block = evichain.mine_pending_transactions()
 
-        # Usar o ID original do desktop se possível
-        new_id = evichain.add_evidence_transaction(transaction_data)
-        new_block = evichain.mine_pending_transactions()
+        if audit_log:
+            audit_log.log_complaint_submitted(new_id, actor='desktop-sync')
+            if new_block:
+                audit_log.log_block_mined(
+                    new_block.index, new_block.hash,
+                    complaint_ids=evichain.block_header(new_block)["transaction_ids"])
 
         print(f"[SYNC] Denúncia recebida do desktop: {complaint_id} → registrada como {new_id}")
 
@@ -958,562 +1475,172 @@ def sync_push():
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+
+@app.route('/api/sync/push-batch', methods=['POST'])
+def sync_push_batch():
+    """Recebe várias denúncias do desktop e sela as novas em um único bloco.
+
+    Aceita uma lista JSON ou ``{"complaints": [...]}``. Cada item recebe um
+    status próprio: ``created``, ``already_exists``, ``duplicate`` (repetido
+    no mesmo lote) ou ``invalid``.
+    """
+    try:
+        data = request.get_json(silent=True)
+        items = data.get('complaints') if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return jsonify({'success': False, 'error': 'Envie uma lista de denúncias'}), 400
+        if len(items) > SYNC_PUSH_BATCH_MAX:
+            return jsonify({
+                'success': False,
+                'error': f'Lote excede o máximo de {SYNC_PUSH_BATCH_MAX} denúncias'
+            }), 413
+
+        # Deduplicação, inclusão e mineração atômicas em relação a outras threads
+        with evichain.lock:
+            results = []
+            created = []
+            seen_in_batch = set()
+
+            for position, item in enumerate(items):
+                if not isinstance(item, dict):
+                    results.append({'index': position, 'status': 'invalid', 'error': 'Item deve ser um objeto'})
+                    continue
+
+                original_id = item.get('id', '')
+                existing = evichain.find_complaint(original_id)
+                if existing:
+                    results.append({
+                        'index': position,
+                        'original_id': original_id,
+                        'status': 'already_exists',
+                        'complaint_id': existing[1],
+                        'block_index': existing[0]
+                    })
+                    continue
+                if original_id and original_id in seen_in_batch:
+                    results.append({'index': position, 'original_id': original_id, 'status': 'duplicate'})
+                    continue
+                if original_id:
+                    seen_in_batch.add(original_id)
+
+                new_id = evichain.add_evidence_transaction(_sync_transaction_data(item))
+                result = {
+                    'index': position,
+                    'original_id': original_id,
+                    'status': 'created',
+                    'complaint_id': new_id,
+                    'block_index': None
+                }
+                results.append(result)
+                created.append(result)
+
+            new_block = evichain.mine_pending_transactions() if created else None
+        if new_block:
+            for result in created:
+                result['block_index'] = new_block.index
+            if audit_log:
+                for result in created:
+                    audit_log.log_complaint_submitted(result['complaint_id'], actor='desktop-sync')
+                audit_log.log_block_mined(
+                    new_block.index, new_block.hash,
+                    complaint_ids=evichain.block_header(new_block)["transaction_ids"])
+
+        print(f"[SYNC] Lote recebido do desktop: {len(items)} itens, {len(created)} novos")
+
+        return jsonify({
+            'success': True,
+            'results': results,
+            'total': len(items),
+            'created': len(created),
+            'block_index': new_block.index if new_block else None
+        }), 201 if created else 200
+
+    except Exception as e:
+        print(f"[SYNC] Erro no push em lote: {e}")
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+PDF_BATCH_MAX = int(os.getenv("EVICHAIN_PDF_BATCH_MAX", "50"))
+PDF_REPORTLAB_MISSING = 'Biblioteca reportlab não está instalada. Use: pip install reportlab'
+
+
+def _send_report(path: Path, mimetype: str, download_name: str):
+    """Envia um relatório do cache em disco (streaming; ETag = digest do conteúdo)."""
+    response = send_file(path, mimetype=mimetype, as_attachment=True,
+                         download_name=download_name, etag=path.stem)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 @app.route('/api/generate_pdf', methods=['POST'])
 def generate_pdf():
-    """Gera PDF com dados da denúncia"""
+    """Gera PDF com dados da denúncia.
+
+    A renderização roda no pool de processos de ``evichain.pdf_report`` e o
+    resultado fica em cache em disco, indexado pelo hash do payload: pedir
+    de novo o mesmo relatório não renderiza outra vez.
+    """
     try:
         data = request.json
         if not data:
             return jsonify({'success': False, 'error': 'Dados não fornecidos'}), 400
-        
-        # Extrair todos os dados da denúncia
-        complaint_id = data.get('complaint_id', 'N/A')
-        titulo = data.get('titulo', 'N/A')
-        nome_denunciado = data.get('nomeDenunciado', 'N/A')
-        assunto = data.get('assunto', 'N/A')
-        prioridade = data.get('prioridade', 'N/A')
-        finalidade = data.get('finalidade', 'N/A')
-        conselho = data.get('conselho', 'N/A')
-        categoria = data.get('categoria', 'N/A')
-        timestamp = data.get('timestamp', datetime.now().isoformat())
-        codigosAnteriores = data.get('codigosAnteriores')
-        ouvidoriaAnonima = data.get('ouvidoriaAnonima', False)
-        anonymous = data.get('anonymous', False)
-        descricao = data.get('descricao', 'Não disponível')
-        ia_analysis = data.get('ia_analysis', {})
-        metadata = data.get('metadata', {})
-        
-        from reportlab.lib.pagesizes import letter, A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch, cm
-        from reportlab.lib import colors
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
-        from io import BytesIO
-        
-        # Criar documento PDF em memória com margens profissionais
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, 
-                              rightMargin=2*cm, leftMargin=2*cm,
-                              topMargin=3*cm, bottomMargin=2*cm)
-        
-        # Estilos profissionais para relatório
-        styles = getSampleStyleSheet()
-        
-        # Estilo do cabeçalho principal
-        header_style = ParagraphStyle(
-            'ReportHeader',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=10,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold',
-            textColor=colors.HexColor('#1a365d')
-        )
-        
-        # Estilo do subtítulo
-        subtitle_style = ParagraphStyle(
-            'ReportSubtitle',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            fontName='Helvetica',
-            textColor=colors.HexColor('#2d3748')
-        )
-        
-        # Estilo para seções principais
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            spaceBefore=20,
-            alignment=TA_LEFT,
-            fontName='Helvetica-Bold',
-            textColor=colors.HexColor('#2c5282'),
-            borderWidth=1,
-            borderColor=colors.HexColor('#e2e8f0'),
-            borderPadding=8,
-            backColor=colors.HexColor('#f7fafc')
-        )
-        
-        # Estilo para subseções
-        subsection_style = ParagraphStyle(
-            'SubsectionHeader',
-            parent=styles['Heading3'],
-            fontSize=12,
-            spaceAfter=8,
-            spaceBefore=12,
-            alignment=TA_LEFT,
-            fontName='Helvetica-Bold',
-            textColor=colors.HexColor('#4a5568')
-        )
-        
-        # Estilo para texto normal com melhor formatação
-        normal_style = ParagraphStyle(
-            'ReportNormal',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=6,
-            alignment=TA_JUSTIFY,
-            fontName='Helvetica',
-            leading=14
-        )
-        
-        # Estilo para dados importantes
-        important_style = ParagraphStyle(
-            'ImportantData',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=4,
-            alignment=TA_LEFT,
-            fontName='Helvetica',
-            textColor=colors.HexColor('#2d3748'),
-            leftIndent=20
-        )
-        
-        # Conteúdo do relatório
-        story = []
-        
-        # Formatar data primeiro
-        try:
-            if timestamp:
-                data_formatada = datetime.fromisoformat(timestamp.replace('Z', '+00:00')).strftime('%d/%m/%Y %H:%M')
-            else:
-                data_formatada = datetime.now().strftime('%d/%m/%Y %H:%M')
-        except:
-            data_formatada = timestamp or datetime.now().strftime('%d/%m/%Y %H:%M')
-        
-        # === CABEÇALHO FORMAL DO RELATÓRIO ===
-        
-        # Logo/Título institucional
-        story.append(Paragraph("EVICHAIN", header_style))
-        story.append(Paragraph("Sistema Blockchain para Evidências Digitais", subtitle_style))
-        
-        # Linha divisória
-        story.append(Spacer(1, 10))
-        divider_table = Table([['_' * 80]], colWidths=[15*cm])
-        divider_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#a0aec0'))
-        ]))
-        story.append(divider_table)
-        story.append(Spacer(1, 20))
-        
-        # Título do relatório
-        story.append(Paragraph("RELATÓRIO DE ANÁLISE DE DENÚNCIA", header_style))
-        story.append(Spacer(1, 10))
-        
-        # Informações do documento
-        doc_info_data = [
-            ['ID da Denúncia:', complaint_id],
-            ['Data de Geração:', data_formatada],
-            ['Documento:', f'EviChain_Relatorio_{complaint_id}_{datetime.now().strftime("%Y-%m-%d")}.pdf'],
-            ['Status:', 'CONFIDENCIAL - USO RESTRITO']
-        ]
-        
-        doc_info_table = Table(doc_info_data, colWidths=[4*cm, 10*cm])
-        doc_info_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f7fafc')),
-            ('PADDING', (0, 0), (-1, -1), 6),
-        ]))
-        story.append(doc_info_table)
-        story.append(Spacer(1, 30))
-        
-        # === SEÇÃO 1: INFORMAÇÕES BÁSICAS DA DENÚNCIA ===
-        story.append(Paragraph("1. INFORMAÇÕES BÁSICAS DA DENÚNCIA", section_style))
-        
-        # Criar tabela para informações básicas
-        basic_info_data = [
-            ['Título:', titulo],
-            ['Nome do Profissional Denunciado:', nome_denunciado],
-            ['Assunto:', assunto],
-            ['Prioridade:', prioridade],
-            ['Finalidade:', finalidade],
-            ['Conselho:', conselho],
-            ['Categoria:', categoria],
-            ['Data de Registro:', data_formatada],
-            ['Status:', 'Registrada e Analisada']
-        ]
-        
-        if codigosAnteriores:
-            basic_info_data.append(['Códigos Anteriores:', codigosAnteriores])
-        
-        basic_info_table = Table(basic_info_data, colWidths=[4*cm, 11*cm])
-        basic_info_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8fafc')),
-            ('PADDING', (0, 0), (-1, -1), 8),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-        story.append(basic_info_table)
-        story.append(Spacer(1, 20))
-        
-        # === SEÇÃO 2: CONFIGURAÇÕES DE PRIVACIDADE ===
-        story.append(Paragraph("2. CONFIGURAÇÕES DE PRIVACIDADE", section_style))
-        
-        privacy_data = [
-            ['Ouvidoria Anônima:', 'Sim' if ouvidoriaAnonima else 'Não'],
-            ['Manter Anonimato:', 'Sim' if anonymous else 'Não']
-        ]
-        
-        privacy_table = Table(privacy_data, colWidths=[4*cm, 11*cm])
-        privacy_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8fafc')),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(privacy_table)
-        story.append(Spacer(1, 20))
-        
-        # === SEÇÃO 3: DESCRIÇÃO DA DENÚNCIA ===
-        story.append(Paragraph("3. DESCRIÇÃO DA DENÚNCIA", section_style))
-        story.append(Paragraph(descricao, normal_style))
-        story.append(Spacer(1, 25))
-        
-        # === SEÇÃO 4: ANÁLISE DA INTELIGÊNCIA ARTIFICIAL ===
-        if ia_analysis:
-            story.append(Paragraph("4. ANÁLISE DA INTELIGÊNCIA ARTIFICIAL", section_style))
-            story.append(Spacer(1, 10))
-            
-            # Informações básicas da análise
-            analise_juridica = ia_analysis.get('analise_juridica', {})
-            classificacao_risco = ia_analysis.get('classificacao_risco', {})
-            analise_basica = ia_analysis.get('analise_basica', {})
-            
-            # Criar tabela de análise principal
-            analise_data = []
-            
-            if analise_juridica.get('gravidade'):
-                analise_data.append(['Gravidade:', analise_juridica['gravidade'].title()])
-            
-            if analise_juridica.get('tipificacao'):
-                analise_data.append(['Tipificação:', analise_juridica['tipificacao']])
-            
-            if classificacao_risco.get('nivel') and classificacao_risco.get('pontuacao'):
-                nivel = classificacao_risco['nivel']
-                pontuacao = classificacao_risco['pontuacao']
-                analise_data.append(['Nível de Risco:', f"{nivel} ({pontuacao}/100)"])
-            
-            if classificacao_risco.get('acao_recomendada'):
-                analise_data.append(['Ação Recomendada:', classificacao_risco['acao_recomendada']])
-            
-            if analise_data:
-                analise_table = Table(analise_data, colWidths=[4*cm, 11*cm])
-                analise_table.setStyle(TableStyle([
-                    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-                    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8fafc')),
-                    ('PADDING', (0, 0), (-1, -1), 8),
-                ]))
-                story.append(analise_table)
-                story.append(Spacer(1, 15))
-            
-            # Resumo da análise
-            if analise_basica.get('resumo'):
-                story.append(Paragraph("4.1 Resumo da Análise", subsection_style))
-                story.append(Paragraph(analise_basica['resumo'], normal_style))
-                story.append(Spacer(1, 12))
-            
-            if analise_juridica.get('fundamentacao'):
-                story.append(Paragraph("4.2 Análise Detalhada", subsection_style))
-                story.append(Paragraph(analise_juridica['fundamentacao'], normal_style))
-                story.append(Spacer(1, 12))
-            
-            # === SUBSEÇÃO: LEGISLAÇÃO RECOMENDADA ===
-            legislacao_especifica = analise_juridica.get('legislacao_especifica', {})
-            if legislacao_especifica:
-                story.append(Paragraph("4.3 Legislação Recomendada pela IA", subsection_style))
-                
-                leg_data = []
-                if legislacao_especifica.get('legislacao_sugerida'):
-                    leg_data.append(['Legislação Sugerida:', legislacao_especifica['legislacao_sugerida']])
-                
-                if legislacao_especifica.get('conselho'):
-                    leg_data.append(['Conselho:', legislacao_especifica['conselho']])
-                
-                if legislacao_especifica.get('tipo'):
-                    leg_data.append(['Tipo de Infração:', legislacao_especifica['tipo']])
-                
-                if legislacao_especifica.get('descricao'):
-                    leg_data.append(['Descrição:', legislacao_especifica['descricao']])
-                
-                if legislacao_especifica.get('artigos'):
-                    artigos = legislacao_especifica['artigos']
-                    if isinstance(artigos, list):
-                        artigos = ' '.join(artigos)
-                    leg_data.append(['Artigos:', artigos])
-                
-                if legislacao_especifica.get('penalidades'):
-                    penalidades = legislacao_especifica['penalidades']
-                    if isinstance(penalidades, list):
-                        penalidades = ', '.join(penalidades)
-                    leg_data.append(['Penalidades:', penalidades])
-                
-                if leg_data:
-                    leg_table = Table(leg_data, colWidths=[4*cm, 11*cm])
-                    leg_table.setStyle(TableStyle([
-                        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                        ('FONTSIZE', (0, 0), (-1, -1), 10),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-                        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#fff8dc')),
-                        ('PADDING', (0, 0), (-1, -1), 8),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ]))
-                    story.append(leg_table)
-                    story.append(Spacer(1, 12))
-            
-            # === SUBSEÇÃO: PALAVRAS-CHAVE ===
-            palavras_chave = analise_basica.get('palavras_chave', [])
-            if palavras_chave:
-                story.append(Paragraph("4.4 Palavras-Chave Identificadas", subsection_style))
-                if isinstance(palavras_chave, list):
-                    for palavra in palavras_chave:
-                        story.append(Paragraph(f"• {palavra}", important_style))
-                else:
-                    story.append(Paragraph(palavras_chave, normal_style))
-                story.append(Spacer(1, 12))
-            
-            # === SUBSEÇÃO: RECOMENDAÇÕES ===
-            recomendacoes = ia_analysis.get('recomendacoes', [])
-            if recomendacoes:
-                story.append(Paragraph("4.5 Recomendações", subsection_style))
-                if isinstance(recomendacoes, list):
-                    for rec in recomendacoes:
-                        story.append(Paragraph(f"• {rec}", important_style))
-                else:
-                    story.append(Paragraph(recomendacoes, normal_style))
-                story.append(Spacer(1, 12))
-            
-            # Fatores de risco
-            fatores_risco = classificacao_risco.get('fatores_risco', [])
-            if fatores_risco and isinstance(fatores_risco, list):
-                story.append(Paragraph("4.6 Fatores de Risco", subsection_style))
-                for fator in fatores_risco:
-                    story.append(Paragraph(f"• {fator}", important_style))
-                story.append(Spacer(1, 15))
-            
-            story.append(Spacer(1, 20))
-        
-        # === SEÇÃO 5: INVESTIGAÇÃO AUTOMÁTICA ===
-        investigacao = ia_analysis.get('investigacao_automatica', {}) if ia_analysis else {}
-        if investigacao:
-            story.append(Paragraph("5. INVESTIGAÇÃO AUTOMÁTICA REALIZADA", section_style))
-            story.append(Spacer(1, 10))
-            
-            # Relatório de detecção formatado
-            if 'relatorio_deteccao' in investigacao:
-                story.append(Paragraph("5.1 Relatório de Detecção de Profissionais", subsection_style))
-                
-                deteccao = investigacao.get('deteccao_nomes', {})
-                
-                # Estatísticas gerais em tabela
-                stats_data = []
-                if deteccao.get('confiabilidade_deteccao') is not None:
-                    stats_data.append(['Confiabilidade Geral:', f"{deteccao.get('confiabilidade_deteccao', 0)}%"])
-                
-                if deteccao.get('contexto_profissional') is not None:
-                    contexto = "SIM" if deteccao.get('contexto_profissional') else "NÃO"
-                    stats_data.append(['Contexto Profissional Detectado:', contexto])
-                
-                if deteccao.get('recomendacao_investigacao') is not None:
-                    recomenda = "SIM" if deteccao.get('recomendacao_investigacao') else "NÃO"
-                    stats_data.append(['Recomenda Investigação:', recomenda])
-                
-                if stats_data:
-                    stats_table = Table(stats_data, colWidths=[6*cm, 9*cm])
-                    stats_table.setStyle(TableStyle([
-                        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                        ('FONTSIZE', (0, 0), (-1, -1), 10),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-                        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f8ff')),
-                        ('PADDING', (0, 0), (-1, -1), 8),
-                    ]))
-                    story.append(stats_table)
-                    story.append(Spacer(1, 15))
-            
-            # Profissionais identificados de forma organizada
-            deteccao = investigacao.get('deteccao_nomes', {})
-            if deteccao.get('nomes_detectados'):
-                story.append(Paragraph("5.2 Profissionais Identificados", subsection_style))
-                
-                # Criar tabela para profissionais detectados
-                prof_data = [['#', 'Nome Detectado', 'Confiabilidade', 'Contexto']]
-                
-                for i, nome in enumerate(deteccao['nomes_detectados'], 1):
-                    nome_profissional = nome.get('nome_detectado', f'Profissional {i}')
-                    confiabilidade = f"{nome.get('confiabilidade', 0)}%"
-                    contexto = nome.get('contexto_encontrado', 'N/A')
-                    
-                    prof_data.append([str(i), nome_profissional, confiabilidade, contexto])
-                
-                prof_table = Table(prof_data, colWidths=[1*cm, 5*cm, 2.5*cm, 6.5*cm])
-                prof_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a5568')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8f9fa')),
-                    ('PADDING', (0, 0), (-1, -1), 6),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ]))
-                story.append(prof_table)
-                story.append(Spacer(1, 15))
-            
-            # Resultados das investigações de forma organizada
-            investigacoes = investigacao.get('investigacoes_realizadas', [])
-            if investigacoes:
-                story.append(Paragraph("5.3 Resultados das Investigações Detalhadas", subsection_style))
-                
-                for i, inv in enumerate(investigacoes, 1):
-                    nome_investigado = inv.get('nome_investigado', f'Investigação {i}')
-                    story.append(Paragraph(f"5.3.{i} Investigação: {nome_investigado}", subsection_style))
-                    
-                    resultado = inv.get('resultado_investigacao', {})
-                    registros = resultado.get('registros_oficiais', {})
-                    
-                    inv_data = []
-                    
-                    if registros.get('registro_encontrado'):
-                        inv_data.append(['Status:', 'REGISTRO ENCONTRADO ✓'])
-                        
-                        dados_prof = registros.get('dados_profissional', {})
-                        if dados_prof.get('nome_completo_oficial'):
-                            inv_data.append(['Nome Oficial:', dados_prof['nome_completo_oficial']])
-                        
-                        if dados_prof.get('registro_crm_completo') or dados_prof.get('registro_completo'):
-                            registro = dados_prof.get('registro_crm_completo') or dados_prof.get('registro_completo')
-                            inv_data.append(['Registro:', registro])
-                        
-                        if dados_prof.get('situacao_registro'):
-                            inv_data.append(['Situação:', dados_prof['situacao_registro']])
-                        
-                        if dados_prof.get('especialidades'):
-                            especialidades = ', '.join(dados_prof['especialidades'])
-                            inv_data.append(['Especialidades:', especialidades])
-                            
-                    else:
-                        inv_data.append(['Status:', 'REGISTRO NÃO ENCONTRADO ✗'])
-                        if resultado.get('motivo_nao_encontrado'):
-                            inv_data.append(['Motivo:', resultado['motivo_nao_encontrado']])
-                    
-                    if inv_data:
-                        inv_table = Table(inv_data, colWidths=[3*cm, 12*cm])
-                        inv_table.setStyle(TableStyle([
-                            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                            ('FONTSIZE', (0, 0), (-1, -1), 9),
-                            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-                            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0fff0')),
-                            ('PADDING', (0, 0), (-1, -1), 6),
-                            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ]))
-                        story.append(inv_table)
-                        story.append(Spacer(1, 12))
-                
-                story.append(Spacer(1, 15))
-        
-        # === RODAPÉ FORMAL DO RELATÓRIO ===
-        story.append(Spacer(1, 30))
-        
-        # Assinatura digital
-        footer_data = [
-            ['', ''],
-            ['Documento gerado automaticamente pelo', ''],
-            ['Sistema EviChain v2.1', ''],
-            ['Blockchain para Evidências Digitais', ''],
-            ['', ''],
-            [f'Data/Hora de Geração: {datetime.now().strftime("%d/%m/%Y às %H:%M:%S")}', ''],
-            ['Este documento foi gerado automaticamente e não possui', ''],
-            ['assinatura digital. Consulte o sistema EviChain para verificação.', '']
-        ]
-        
-        footer_table = Table(footer_data, colWidths=[15*cm, 0*cm])
-        footer_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#6b7280')),
-            ('FONTNAME', (0, 2), (0, 2), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 2), (0, 2), 10),
-            ('TEXTCOLOR', (0, 2), (0, 2), colors.HexColor('#1f2937')),
-        ]))
-        story.append(footer_table)
-        
-        # Linha final
-        story.append(Spacer(1, 10))
-        final_line = Table([['_' * 80]], colWidths=[15*cm])
-        final_line.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#a0aec0'))
-        ]))
-        story.append(final_line)
-        story.append(Paragraph("_" * 80, styles['Normal']))
-        story.append(Paragraph("Documento gerado automaticamente pelo sistema EviChain", styles['Italic']))
-        
-        # Construir PDF
-        doc.build(story)
-        pdf_content = buffer.getvalue()
-        buffer.close()
-        
-        # Retornar PDF como resposta
-        from flask import make_response
-        response = make_response(pdf_content)
-        response.headers['Content-Type'] = 'application/pdf'
-        response.headers['Content-Disposition'] = f'attachment; filename=denuncia_{complaint_id}.pdf'
-        
-        return response
-        
+
+        path = pdf_renderer.render(data)
+        return _send_report(path, 'application/pdf', report_filename(data))
+
     except ImportError:
         # Se reportlab não estiver disponível, retornar erro informativo
+        return jsonify({'success': False, 'error': PDF_REPORTLAB_MISSING}), 500
+
+    except TimeoutError:
+        return jsonify({'success': False, 'error': 'Tempo esgotado ao gerar o PDF'}), 503
+
+    except Exception as e:
+        print(f"[ERROR] Erro ao gerar PDF: {e}")
         return jsonify({
             'success': False,
-            'error': 'Biblioteca reportlab não está instalada. Use: pip install reportlab'
+            'error': str(e)
         }), 500
-    
+
+
+@app.route('/api/generate_pdf/batch', methods=['POST'])
+def generate_pdf_batch():
+    """Gera os PDFs de várias denúncias (em paralelo) e devolve um único .zip.
+
+    Body: lista de payloads de ``/api/generate_pdf`` ou ``{"complaints": [...]}``.
+    """
+    try:
+        data = request.get_json(silent=True)
+        items = data.get('complaints') if isinstance(data, dict) else data
+        if not isinstance(items, list) or not items:
+            return jsonify({'success': False, 'error': 'Envie uma lista de denúncias'}), 400
+        if len(items) > PDF_BATCH_MAX:
+            return jsonify({'success': False, 'error': f'Máximo de {PDF_BATCH_MAX} denúncias por lote'}), 400
+        if not all(isinstance(item, dict) and item for item in items):
+            return jsonify({'success': False, 'error': 'Cada item deve ser um objeto'}), 400
+
+        path = pdf_renderer.render_zip(items)
+        return _send_report(path, 'application/zip', f'denuncias_{len(items)}.zip')
+
+    except ImportError:
+        return jsonify({'success': False, 'error': PDF_REPORTLAB_MISSING}), 500
+
+    except TimeoutError:
+        return jsonify({'success': False, 'error': 'Tempo esgotado ao gerar os PDFs'}), 503
+
     except Exception as e:
-        print(f"[ERROR] Erro ao gerar PDF: {e}")
+        print(f"[ERROR] Erro ao gerar lote de PDFs: {e}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+# Reenfileira jobs interrompidos por um reinício (após todas as rotas definidas).
+# Não no filho do pool de PDFs: com `python api_server.py`, o start method
+# "spawn" reimporta este script como __mp_main__.
+if __name__ != "__mp_main__":
+    job_queue.recover()
+
 if __name__ == '__main__':
     print("\n================ EviChain API Server ==================")
     print(f"🔗 Acesso principal: http://localhost:5000")
@@ -10,13 +10,11 @@ import re
 import os
 import json
 
-# Importação corrigida - importar apenas o módulo openai
-try:
-    import openai
-    from openai import OpenAI, AuthenticationError
-    OPENAI_DISPONIVEL = True
-except ImportError:
-    OPENAI_DISPONIVEL = False
+from evichain.optional_imports import available, require
+
+# A biblioteca openai só é importada quando há uma API key configurada
+OPENAI_DISPONIVEL = available("openai")
+if not OPENAI_DISPONIVEL:
     print("[WARN] Biblioteca openai não instalada. Use: pip install openai>=1.0.0")
 
 
@@ -110,9 +108,10 @@ class AssistenteDenuncia:
         
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key and api_key != "sua_api_key_aqui":
+            openai = require("openai")
             try:
                 # Usar a sintaxe correta do OpenAI v1.x
-                self.client = OpenAI(
+                self.client = openai.OpenAI(
                     api_key=api_key,
                     timeout=30.0,
                     max_retries=1
@@ -128,7 +127,7 @@ class AssistenteDenuncia:
                 self.usar_openai = True
                 print("[INFO] Assistente configurado com OpenAI v1.x")
                 
-            except AuthenticationError:
+            except openai.AuthenticationError:
                 print("[WARN] Erro de autenticação OpenAI: API Key inválida")
                 self.usar_openai = False
             except Exception as e:
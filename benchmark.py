@@ -13,6 +13,11 @@ Usage:
     python benchmark.py                         # defaults to localhost:5000
     python benchmark.py --host http://server:5000 --requests 500
     python benchmark.py --output results.json
+    python benchmark.py --serialization-only    # JSON backends, in-process
+    python benchmark.py --audit-only            # audit log events/s per mode, verify speed
+    python benchmark.py --boot-only             # worker boot time and RSS
+    python benchmark.py --import-budget 400     # fail if `import api_server` > 400 ms
+    python benchmark.py --server-metrics        # also record the server's /metrics
 
 Outputs
 -------
@@ -44,6 +49,7 @@ from typing import Dict, List, Tuple
 DEFAULT_HOST = "http://localhost:5000"
 DEFAULT_TOTAL_REQUESTS = 200
 DEFAULT_CONCURRENCY = 10
+DEFAULT_IMPORT_BUDGET_MS = float(os.getenv("EVICHAIN_IMPORT_BUDGET_MS", "500"))
 
 
 # ── Data Structures ──────────────────────────────────────────────
@@ -459,6 +465,311 @@ def benchmark_chain_validation(chain_sizes: list = None,
     return results
 
 
+def benchmark_serialization(n_blocks: int = 200, n_samples: int = 50) -> Dict:
+    """Benchmark the JSON backends of ``evichain.serialization``.
+
+    Encodes/decodes a synthetic chain file and an API-sized payload with
+    every available fast backend, next to the canonical (hashing) encoder
+    which always uses the stdlib.  Runs in-process (no HTTP).
+    """
+    sys.path.insert(0, os.path.dirname(__file__))
+    from evichain import serialization
+
+    blocks = [
+        {
+            "index": i,
+            "timestamp": 1_700_000_000.0 + i,
+            "previous_hash": "0" * 64,
+            "nonce": i * 7,
+            "hash": "f" * 64,
+            "data": {
+                "transactions": [{
+                    "id": f"EVC-{i:06d}",
+                    "type": "complaint",
+                    "data": {
+                        "titulo": f"Denúncia {i}",
+                        "descricao": "Descrição de teste com acentuação. " * 8,
+                        "conselho": "CRM",
+                        "categoria": "Negligência",
+                        "ia_analysis": {"classificacao_risco": "Médio", "score": 0.42},
+                    },
+                }],
+            },
+        }
+        for i in range(n_blocks)
+    ]
+    document = {"blocks": blocks}
+    backends = ["stdlib"] + (["orjson"] if serialization.orjson is not None else [])
+
+    print(f"\n{'='*60}")
+    print(f"  JSON Serialization Benchmark")
+    print(f"  Blocks: {n_blocks}  Samples: {n_samples}  Backends: {backends}")
+    print(f"{'='*60}\n")
+
+    def measure(fn) -> Dict:
+        timings = []
+        for _ in range(n_samples):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return {
+            "mean_ms": round(statistics.mean(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "min_ms": round(min(timings), 3),
+        }
+
+    results = {"canonical": measure(lambda: [serialization.canonical_dumps(b) for b in blocks])}
+    print(f"  canonical (stdlib, hashing): mean={results['canonical']['mean_ms']:.2f}ms")
+
+    previous = serialization.get_backend()
+    try:
+        for backend in backends:
+            serialization.set_backend(backend)
+            encoded = serialization.dumps(document, sort_keys=True)
+            results[backend] = {
+                "dumps": measure(lambda: serialization.dumps(document, sort_keys=True)),
+                "dumps_indent": measure(lambda: serialization.dumps(document, indent=True)),
+                "loads": measure(lambda: serialization.loads(encoded)),
+                "size_bytes": len(encoded),
+            }
+            r = results[backend]
+            print(f"  {backend:<8} dumps={r['dumps']['mean_ms']:.2f}ms  "
+                  f"dumps(indent)={r['dumps_indent']['mean_ms']:.2f}ms  "
+                  f"loads={r['loads']['mean_ms']:.2f}ms")
+    finally:
+        serialization.set_backend(previous)
+
+    print(f"\n{'='*60}\n")
+    return results
+
+
+def benchmark_audit(n_events: int = 5000, thread_counts: tuple = (1, 8),
+                    n_verify: int = 100_000) -> Dict:
+    """Benchmark audit log appends (events/s) per durability mode.
+
+    Each run writes ``n_events`` entries, split across ``threads``
+    writers, into a fresh log in a temporary directory; the time
+    includes the final ``close()`` so buffered modes pay their fsync.
+    Then times a full verification of an ``n_verify``-entry log in one
+    process and on every core.  Runs in-process (no HTTP).
+    """
+    import tempfile
+
+    sys.path.insert(0, os.path.dirname(__file__))
+    from evichain.audit_log import DURABILITY_MODES, AuditLog
+
+    print(f"\n{'='*60}")
+    print(f"  Audit Log Append Benchmark")
+    print(f"  Events: {n_events}  Threads: {list(thread_counts)}")
+    print(f"{'='*60}\n")
+
+    results = {}
+    for mode in DURABILITY_MODES:
+        results[mode] = {}
+        for threads in thread_counts:
+            with tempfile.TemporaryDirectory() as tmp:
+                log = AuditLog(log_dir=tmp, hmac_key=b"b" * 32, durability=mode)
+                per_thread = n_events // threads
+
+                def writer(_: int) -> None:
+                    for i in range(per_thread):
+                        log.log_event("BENCHMARK", detail={"i": i})
+
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=threads) as pool:
+                    list(pool.map(writer, range(threads)))
+                log.close()
+                elapsed = time.perf_counter() - start
+                assert log.verify_integrity()["valid"]
+
+            rate = per_thread * threads / elapsed
+            results[mode][f"threads_{threads}"] = {
+                "events": per_thread * threads,
+                "seconds": round(elapsed, 3),
+                "events_per_second": round(rate, 1),
+            }
+            print(f"  {mode:<9} threads={threads:<2}  {rate:>10,.0f} events/s  ({elapsed:.2f}s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = AuditLog(log_dir=tmp, hmac_key=b"b" * 32, durability="interval")
+        for i in range(n_verify):
+            log.log_event("BENCHMARK", detail={"i": i})
+        log.close()
+        size_mb = log.log_file.stat().st_size / 1024 / 1024
+        results["verify"] = {"entries": n_verify, "size_mb": round(size_mb, 1)}
+        for workers in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            outcome = log.verify_integrity(full=True, workers=workers)
+            elapsed = time.perf_counter() - start
+            assert outcome["valid"] and outcome["entries"] == n_verify
+            results["verify"][f"workers_{workers}"] = {
+                "seconds": round(elapsed, 3),
+                "entries_per_second": round(n_verify / elapsed, 1),
+            }
+            print(f"  verify    workers={workers:<2}  {n_verify / elapsed:>10,.0f} entries/s  "
+                  f"({elapsed:.2f}s, {size_mb:.0f}MB)")
+
+    print(f"\n{'='*60}\n")
+    return results
+
+
+_BOOT_PROBE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+import api_server
+boot_ms = (time.perf_counter() - t0) * 1000
+boot_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+api_server.SERVICES.warm()
+warm_ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({
+    "boot_ms": boot_ms, "boot_rss_kb": boot_rss, "warm_ms": warm_ms,
+    "warm_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def benchmark_boot(n_samples: int = 5) -> Dict:
+    """Benchmark worker boot: ``import api_server`` in a fresh interpreter.
+
+    Each sample runs in its own subprocess (so module caches do not leak
+    between samples) and reports the import time and peak RSS, then the
+    extra time and RSS to build every lazy service (what the first
+    requests of a worker pay, or the master pays once under ``--preload``).
+    RSS is ``ru_maxrss`` and therefore Unix-only.
+    """
+    import subprocess
+
+    root = os.path.dirname(os.path.abspath(__file__))
+
+    print(f"\n{'='*60}")
+    print(f"  Worker Boot Benchmark")
+    print(f"  Samples: {n_samples}")
+    print(f"{'='*60}\n")
+
+    samples = []
+    for _ in range(n_samples):
+        proc = subprocess.run(
+            [sys.executable, "-c", _BOOT_PROBE], cwd=root,
+            capture_output=True, text=True, timeout=120,
+        )
+        if proc.returncode != 0:
+            print(f"  [WARN] Boot probe failed: {proc.stderr.strip()[-300:]}")
+            return {}
+        samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    results = {
+        key: round(statistics.median(s[key] for s in samples), 1)
+        for key in ("boot_ms", "boot_rss_kb", "warm_ms", "warm_rss_kb", "modules")
+    }
+    results["samples"] = n_samples
+    print(f"  import api_server:  {results['boot_ms']:.0f}ms  "
+          f"RSS={results['boot_rss_kb'] / 1024:.1f}MB  modules={results['modules']:.0f}")
+    print(f"  + build services:   {results['warm_ms']:.0f}ms  "
+          f"RSS={results['warm_rss_kb'] / 1024:.1f}MB")
+    print(f"\n{'='*60}\n")
+    return results
+
+
+def check_import_budget(budget_ms: float = DEFAULT_IMPORT_BUDGET_MS,
+                        module: str = "api_server", n_samples: int = 3) -> Dict:
+    """Check the cold import of ``module`` against a time budget.
+
+    Runs ``python -X importtime -c "import <module>"`` in fresh
+    interpreters and parses its report (self / cumulative microseconds
+    per module).  Fails if the median cumulative time exceeds
+    ``budget_ms`` or if any of ``evichain.optional_imports.HEAVY_MODULES``
+    was imported – those must load on first use, not at boot.
+    """
+    import subprocess
+
+    sys.path.insert(0, os.path.dirname(__file__))
+    from evichain.optional_imports import HEAVY_MODULES
+
+    root = os.path.dirname(os.path.abspath(__file__))
+
+    print(f"\n{'='*60}")
+    print(f"  Import Budget Check: import {module}")
+    print(f"  Budget: {budget_ms:.0f}ms  Samples: {n_samples}")
+    print(f"{'='*60}\n")
+
+    totals, last = [], {}
+    for _ in range(n_samples):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=root, capture_output=True, text=True, timeout=120,
+        )
+        if proc.returncode != 0:
+            print(f"  [WARN] Import failed: {proc.stderr.strip()[-300:]}")
+            return {}
+        last = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            last[name.strip()] = (int(self_us), int(cumulative_us))
+        totals.append(last[module][1] / 1000)
+
+    heavy_loaded = sorted(name for name in last if name in HEAVY_MODULES)
+    slowest = sorted(last.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    import_ms = round(statistics.median(totals), 1)
+    passed = import_ms <= budget_ms and not heavy_loaded
+
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {name:<40} self={self_us / 1000:7.1f}ms  cumulative={cumulative_us / 1000:7.1f}ms")
+    print(f"\n  import {module}: {import_ms:.0f}ms (budget {budget_ms:.0f}ms)")
+    if heavy_loaded:
+        print(f"  heavy modules imported at boot: {', '.join(heavy_loaded)}")
+    print(f"  {'PASS' if passed else 'FAIL'}")
+    print(f"\n{'='*60}\n")
+
+    return {
+        "module": module,
+        "import_ms": import_ms,
+        "budget_ms": budget_ms,
+        "heavy_modules_loaded": heavy_loaded,
+        "slowest_self_ms": {name: round(self_us / 1000, 2) for name, (self_us, _) in slowest},
+        "passed": passed,
+    }
+
+
+def scrape_server_metrics(host: str) -> Dict:
+    """Fetch ``/metrics`` from the server and summarise its histograms.
+
+    A stand-in for a Prometheus scraper: run after (or between) benchmark
+    runs to compare server-side latencies across versions.  Returns
+    ``{metric: {labels: {"count": n, "mean_ms": x}}}``; empty if the
+    server does not expose metrics.
+    """
+    sys.path.insert(0, os.path.dirname(__file__))
+    from evichain.metrics import parse_text
+
+    url = f"{host.rstrip('/')}/metrics"
+    try:
+        with urllib.request.urlopen(url, timeout=10) as resp:
+            samples = parse_text(resp.read().decode("utf-8"))
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"  [WARN] Could not scrape {url}: {e}")
+        return {}
+
+    summary: Dict[str, Dict] = {}
+    for (name, labels), value in samples.items():
+        if not name.endswith("_count"):
+            continue
+        base = name[: -len("_count")]
+        total = samples.get((f"{base}_sum", labels), 0.0)
+        label_key = ",".join(f"{k}={v}" for k, v in labels) or "-"
+        mean = total / value if value else 0.0
+        entry = {"count": int(value)}
+        if base.endswith("_seconds"):
+            entry["mean_ms"] = round(mean * 1000, 3)
+        else:
+            entry["mean"] = round(mean, 3)
+        summary.setdefault(base, {})[label_key] = entry
+    return summary
+
+
 # ── Main ──────────────────────────────────────────────────────────
 
 def main():
@@ -475,8 +786,20 @@ def main():
                         help="Run only the mining benchmark (no HTTP)")
     parser.add_argument("--validation-only", action="store_true",
                         help="Run only the chain validation benchmark")
+    parser.add_argument("--server-metrics", action="store_true",
+                        help="Also scrape the server's /metrics after the HTTP run")
+    parser.add_argument("--serialization-only", action="store_true",
+                        help="Run only the JSON serialization benchmark")
+    parser.add_argument("--audit-only", action="store_true",
+                        help="Run only the audit log append benchmark")
+    parser.add_argument("--boot-only", action="store_true",
+                        help="Run only the worker boot (import time / RSS) benchmark")
+    parser.add_argument("--import-budget", type=float, nargs="?", const=DEFAULT_IMPORT_BUDGET_MS,
+                        metavar="MS",
+                        help="Only check the cold `import api_server` time against a budget "
+                             f"(default: {DEFAULT_IMPORT_BUDGET_MS:.0f}ms); exits 1 on failure")
     parser.add_argument("--full", action="store_true",
-                        help="Run all benchmarks (HTTP + mining + validation)")
+                        help="Run all benchmarks (HTTP + mining + validation + serialization + audit + boot)")
 
     args = parser.parse_args()
     all_results = {"run_timestamp": datetime.now().isoformat()}
@@ -485,6 +808,14 @@ def main():
         all_results["mining"] = benchmark_mining()
     elif args.validation_only:
         all_results["chain_validation"] = benchmark_chain_validation()
+    elif args.serialization_only:
+        all_results["serialization"] = benchmark_serialization()
+    elif args.audit_only:
+        all_results["audit"] = benchmark_audit()
+    elif args.boot_only:
+        all_results["boot"] = benchmark_boot()
+    elif args.import_budget is not None:
+        all_results["import_budget"] = check_import_budget(args.import_budget)
     elif args.full:
         # HTTP benchmarks
         http_result = run_benchmark(args.host, args.requests, args.concurrency)
@@ -501,6 +832,13 @@ def main():
         all_results["mining"] = benchmark_mining()
         # Validation benchmark
         all_results["chain_validation"] = benchmark_chain_validation()
+        # Serialization benchmark
+        all_results["serialization"] = benchmark_serialization()
+        # Audit log benchmark
+        all_results["audit"] = benchmark_audit()
+        # Worker boot benchmark
+        all_results["boot"] = benchmark_boot()
+        all_results["import_budget"] = check_import_budget()
     else:
         # Default: HTTP benchmarks only
         http_result = run_benchmark(args.host, args.requests, args.concurrency)
@@ -514,12 +852,18 @@ def main():
             "system_info": http_result.system_info,
         }
 
+    if args.server_metrics and "http_benchmark" in all_results:
+        all_results["server_metrics"] = scrape_server_metrics(args.host)
+
     # Save results
     output_path = args.output
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(all_results, f, indent=2, ensure_ascii=False)
     print(f"Results saved to: {output_path}")
 
+    if args.import_budget is not None and not all_results["import_budget"].get("passed"):
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
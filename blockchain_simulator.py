@@ -8,8 +8,15 @@ import hashlib
 import json
 import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import os
+import threading
+
+from evichain.aggregates import STATUS_RESOLVED, TX_STATUS_UPDATE, ChainAggregates
+from evichain.serialization import canonical_dumps, dumps, loads
+from evichain.metrics import MINING_NONCES, MINING_SECONDS
+from evichain.mmr import MerkleMountainRange
+from evichain.tracing import tracer
 
 class Block:
     """Representa um bloco na blockchain"""
@@ -28,24 +35,36 @@ class Block:
         Esta é a correção crítica para evitar erros de validação.
         """
         # Garante que os dados internos (como transações) também sejam ordenados
-        block_data_string = json.dumps(self.data, sort_keys=True)
+        block_data_string = canonical_dumps(self.data)
 
-        block_string = json.dumps({
+        block_string = canonical_dumps({
             "index": self.index,
             "timestamp": self.timestamp,
             "data": block_data_string,  # Usa a string de dados já ordenada
             "previous_hash": self.previous_hash,
             "nonce": self.nonce
-        }, sort_keys=True)
+        })
         
         return hashlib.sha256(block_string.encode()).hexdigest()
-    
+
+    def _hash_template(self) -> Tuple[bytes, bytes]:
+        """Prefixo e sufixo da string canônica em torno do nonce.
+
+        As chaves ordenadas são data, index, nonce, previous_hash, timestamp;
+        só o nonce varia durante a mineração, então os dados não precisam ser
+        reserializados a cada tentativa.
+        """
+        head = canonical_dumps({"data": canonical_dumps(self.data), "index": self.index})
+        tail = canonical_dumps({"previous_hash": self.previous_hash, "timestamp": self.timestamp})
+        return (head[:-1] + ', "nonce": ').encode(), (", " + tail[1:]).encode()
+
     def mine_block(self, difficulty: int = 4):
         """Simula o processo de mineração (Proof of Work simplificado)"""
         target = "0" * difficulty
+        prefix, suffix = self._hash_template()
         while self.hash[:difficulty] != target:
             self.nonce += 1
-            self.hash = self.calculate_hash()
+            self.hash = hashlib.sha256(prefix + str(self.nonce).encode() + suffix).hexdigest()
 
 class EviChainBlockchain:
     """Simulador da blockchain EviChain"""
@@ -55,19 +74,31 @@ class EviChainBlockchain:
         self.chain: List[Block] = []
         self.pending_transactions: List[Dict] = []
         self.difficulty = 4
+        # Serializa inclusão/mineração entre requisições e workers em segundo plano.
+        # Quem precisa incluir e minerar de forma atômica usa ``with chain.lock:``.
+        self.lock = threading.RLock()
+        # Índice hash -> altura, usado pela sincronização incremental
+        self._hash_index: Dict[str, int] = {}
+        # Índice id da denúncia (ou id de origem do desktop) -> (altura, id no servidor)
+        self._complaint_index: Dict[str, Tuple[int, str]] = {}
+        # Contadores de /api/stats e /api/analytics, atualizados a cada bloco
+        self.aggregates = ChainAggregates()
+        # Merkle Mountain Range dos hashes dos blocos, raiz das âncoras externas
+        self.mmr = MerkleMountainRange()
         self.load_chain()
 
     def load_chain(self):
         """Carrega a blockchain de um arquivo JSON"""
         try:
             if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(self.data_file, 'rb') as f:
+                    data = loads(f.read())
                     self.chain = [self._create_block_from_dict(block_data) for block_data in data.get('blocks', [])]
                 if not self.chain or not self.is_chain_valid():
                     print("⚠️ Blockchain inválida ou corrompida. Criando uma nova.")
                     self._create_genesis_block()
                 else:
+                    self._rebuild_indexes(saved_aggregates=data.get('aggregates'))
                     print(f"✅ Blockchain carregada de {self.data_file} com {len(self.chain)} blocos.")
             else:
                 self._create_genesis_block()
@@ -82,7 +113,7 @@ class EviChainBlockchain:
         block = Block(
             index=data['index'],
             timestamp=data['timestamp'],
-            data=json.loads(data['data']) if isinstance(data['data'], str) else data['data'], # Lida com o dado como string
+            data=loads(data['data']) if isinstance(data['data'], str) else data['data'], # Lida com o dado como string
             previous_hash=data['previous_hash']
         )
         block.nonce = data['nonce']
@@ -106,7 +137,8 @@ class EviChainBlockchain:
         }
         genesis_block = Block(0, time.time(), genesis_data, "0")
         genesis_block.mine_block(self.difficulty)
-        self.chain.append(genesis_block)
+        self._rebuild_indexes()
+        self._append_block(genesis_block)
         self.save_chain()
 
     def save_chain(self):
@@ -115,12 +147,13 @@ class EviChainBlockchain:
         for block in self.chain:
             block_dict = vars(block).copy()
             # Converte o dicionário de dados para uma string JSON, como no cálculo do hash
-            block_dict['data'] = json.dumps(block_dict['data'], sort_keys=True)
+            block_dict['data'] = canonical_dumps(block_dict['data'])
             chain_data_to_save.append(block_dict)
 
+        document = {"blocks": chain_data_to_save, "aggregates": self.aggregates.to_dict()}
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump({"blocks": chain_data_to_save}, f, indent=2, ensure_ascii=False)
+            with open(self.data_file, 'wb') as f:
+                f.write(dumps(document, indent=True))
         except IOError as e:
             print(f"❌ Erro ao salvar a blockchain: {e}")
 
@@ -129,14 +162,70 @@ class EviChainBlockchain:
         """Retorna o último bloco da chain"""
         return self.chain[-1]
 
+    def _append_block(self, block: Block) -> None:
+        """Anexa um bloco já minerado e atualiza os índices em memória."""
+        self.chain.append(block)
+        self._index_block(block)
+        self.aggregates.apply_block(block)
+        self.mmr.append(block.hash.encode())
+
+    def _rebuild_indexes(self, saved_aggregates: Optional[Dict] = None) -> None:
+        """Reconstrói os índices em memória a partir da chain carregada.
+
+        Agregados salvos no arquivo são reaproveitados se o bloco em que
+        pararam ainda estiver na chain; caso contrário são recalculados.
+        """
+        self._hash_index = {}
+        self._complaint_index = {}
+        for block in self.chain:
+            self._index_block(block)
+        self.aggregates = ChainAggregates.from_dict(saved_aggregates).resume(self.chain)
+        self.mmr = MerkleMountainRange(block.hash.encode() for block in self.chain)
+
+    def _index_block(self, block: Block) -> None:
+        self._hash_index[block.hash] = block.index
+        for tx in block.data.get("transactions", []):
+            tx_id = tx.get("id")
+            if not tx_id or tx.get("type") == TX_STATUS_UPDATE:
+                continue
+            self._complaint_index[tx_id] = (block.index, tx_id)
+            origin_id = tx.get("origin_id")
+            if origin_id:
+                self._complaint_index.setdefault(origin_id, (block.index, tx_id))
+
+    def find_complaint(self, complaint_id: str) -> Optional[Tuple[int, str]]:
+        """Localiza uma denúncia pelo id do servidor ou pelo id de origem.
+
+        Retorna ``(altura_do_bloco, id_no_servidor)`` ou None. O índice é
+        reconstruído a partir da própria chain, portanto persiste entre
+        reinicializações sem arquivo adicional.
+        """
+        if not complaint_id:
+            return None
+        return self._complaint_index.get(complaint_id)
+
+    def _unique_transaction_id(self) -> str:
+        """Gera um id de denúncia que não colide com a chain nem com pendentes."""
+        base_id = generate_complaint_id()
+        pending_ids = {tx.get("id") for tx in self.pending_transactions}
+        candidate, suffix = base_id, 1
+        while candidate in self._complaint_index or candidate in pending_ids:
+            suffix += 1
+            candidate = f"{base_id}-{suffix}"
+        return candidate
+
    
     def add_evidence_transaction(self, evidence_data: Dict) -> str:
         """Adiciona uma nova transação de evidência, incluindo a análise da IA."""
+        with self.lock:
+            return self._add_evidence_transaction(evidence_data)
+
+    def _add_evidence_transaction(self, evidence_data: Dict) -> str:
         transaction = {
-            "id": generate_complaint_id(),
+            "id": self._unique_transaction_id(),
             "type": "evidence_transaction",
             "timestamp": time.time(),
-            "evidence_hash": hashlib.sha256(json.dumps(evidence_data.get("file_hashes", [])).encode()).hexdigest(),
+            "evidence_hash": hashlib.sha256(canonical_dumps(evidence_data.get("file_hashes", [])).encode()).hexdigest(),
             "metadata": {
                 "titulo": evidence_data.get("titulo"),
                 "descricao": evidence_data.get("descricao"),
@@ -153,9 +242,31 @@ class EviChainBlockchain:
             # Usar a análise de IA recebida em vez de um dicionário vazio.
             "ia_analysis": evidence_data.get("ia_analysis", {})
         }
+        # Id atribuído pelo cliente de origem (desktop), usado para deduplicação
+        if evidence_data.get("origin_id"):
+            transaction["origin_id"] = evidence_data["origin_id"]
         self.pending_transactions.append(transaction)
         return transaction['id']
 
+    def add_status_update(self, complaint_id: str, status: str = STATUS_RESOLVED) -> Dict:
+        """Registra uma mudança de status (ex.: ``resolved``) de uma denúncia já na chain.
+
+        A transação entra no próximo bloco minerado; é ela que alimenta o
+        tempo médio de resolução em ``aggregates``.
+        """
+        with self.lock:
+            location = self.find_complaint(complaint_id)
+            if location is None:
+                raise KeyError(f"Denúncia não encontrada: {complaint_id}")
+            transaction = {
+                "type": TX_STATUS_UPDATE,
+                "complaint_id": location[1],
+                "status": status,
+                "timestamp": time.time(),
+            }
+            self.pending_transactions.append(transaction)
+            return transaction
+
 
 
 
@@ -170,6 +281,10 @@ class EviChainBlockchain:
 
     def mine_pending_transactions(self) -> Optional[Block]:
         """Minera um novo bloco com todas as transações pendentes"""
+        with self.lock:
+            return self._mine_pending_transactions()
+
+    def _mine_pending_transactions(self) -> Optional[Block]:
         if not self.pending_transactions:
             return None
 
@@ -180,10 +295,15 @@ class EviChainBlockchain:
             previous_hash=self.last_block.hash
         )
         
-        new_block.mine_block(self.difficulty)
-        self.chain.append(new_block)
+        with tracer.span("chain.pow", difficulty=self.difficulty) as span_attrs:
+            with MINING_SECONDS.time():
+                new_block.mine_block(self.difficulty)
+            span_attrs["nonce"] = new_block.nonce
+        MINING_NONCES.observe(new_block.nonce)
+        self._append_block(new_block)
         self.pending_transactions = []
-        self.save_chain()
+        with tracer.span("chain.save", blocks=len(self.chain)):
+            self.save_chain()
         return new_block
 
     def is_chain_valid(self) -> bool:
@@ -215,28 +335,93 @@ class EviChainBlockchain:
         """Extrai todas as denúncias da blockchain, pulando o bloco gênesis."""
         all_complaints = []
         for block in self.chain[1:]:
-            transactions = block.data.get("transactions", [])
-            for tx in transactions:
-                metadata = tx.get("metadata", {})
-                details = {
-                    "id": tx.get("id"),
-                    "titulo": metadata.get("titulo"),
-                    "descricao": metadata.get("descricao"),
-                    "conselho": metadata.get("conselho"),
-                    "categoria": metadata.get("categoria"),
-                    "anonymous": metadata.get("anonymous", False),
-                    "ouvidoriaAnonima": metadata.get("ouvidoriaAnonima", False),
-                    "assunto": metadata.get("assunto"),
-                    "prioridade": metadata.get("prioridade"),
-                    "finalidade": metadata.get("finalidade"),
-                    "codigosAnteriores": metadata.get("codigosAnteriores"),
-                    "timestamp": tx.get("timestamp", 0),
-                    "data": datetime.fromtimestamp(tx.get("timestamp", 0)).isoformat(),
-                    "ia_analysis": tx.get("ia_analysis", {})
-                }
-                all_complaints.append(details)
+            all_complaints.extend(self._complaints_in_block(block))
         return all_complaints
 
+    # ------------------------------------------------------------------
+    # Sincronização incremental (desktop)
+    # ------------------------------------------------------------------
+
+    def get_block_height(self, block_hash: str) -> Optional[int]:
+        """Retorna a altura do bloco com o hash informado, ou None se não existir."""
+        return self._hash_index.get(block_hash)
+
+    def resolve_sync_tip(self, since_height: Optional[int] = None,
+                         since_hash: Optional[str] = None) -> Optional[int]:
+        """Valida a ponta conhecida pelo cliente e retorna sua altura.
+
+        Retorna None quando a ponta do cliente não faz parte desta chain
+        (divergência), por exemplo após a recriação do bloco gênesis ou
+        quando o cliente afirma conhecer mais blocos do que existem.
+        """
+        if since_hash:
+            height = self.get_block_height(since_hash)
+            if height is None:
+                return None
+            if since_height is not None and since_height != height:
+                return None
+            return height
+        if since_height is None:
+            return None
+        if since_height < 0 or since_height > self.last_block.index:
+            return None
+        return since_height
+
+    def get_blocks_since(self, height: int) -> List[Block]:
+        """Retorna os blocos com índice maior que ``height`` (O(novos blocos))."""
+        return self.chain[height + 1:]
+
+    def get_complaints_since(self, height: int) -> List[Dict]:
+        """Extrai apenas as denúncias registradas após a altura informada."""
+        complaints = []
+        for block in self.get_blocks_since(height):
+            if block.index == 0:
+                continue
+            complaints.extend(self._complaints_in_block(block))
+        return complaints
+
+    @staticmethod
+    def block_header(block: Block) -> Dict:
+        """Resumo do bloco usado pelos clientes para acompanhar a chain."""
+        return {
+            "index": block.index,
+            "hash": block.hash,
+            "previous_hash": block.previous_hash,
+            "timestamp": block.timestamp,
+            "nonce": block.nonce,
+            "transaction_ids": [
+                tx.get("id") for tx in block.data.get("transactions", [])
+                if tx.get("type") != TX_STATUS_UPDATE
+            ],
+        }
+
+    @staticmethod
+    def _complaints_in_block(block: Block) -> List[Dict]:
+        """Converte as transações de um bloco no formato de denúncia da API."""
+        complaints = []
+        for tx in block.data.get("transactions", []):
+            if tx.get("type") == TX_STATUS_UPDATE:
+                continue
+            metadata = tx.get("metadata", {})
+            complaints.append({
+                "id": tx.get("id"),
+                "titulo": metadata.get("titulo"),
+                "descricao": metadata.get("descricao"),
+                "conselho": metadata.get("conselho"),
+                "categoria": metadata.get("categoria"),
+                "anonymous": metadata.get("anonymous", False),
+                "ouvidoriaAnonima": metadata.get("ouvidoriaAnonima", False),
+                "assunto": metadata.get("assunto"),
+                "prioridade": metadata.get("prioridade"),
+                "finalidade": metadata.get("finalidade"),
+                "codigosAnteriores": metadata.get("codigosAnteriores"),
+                "timestamp": tx.get("timestamp", 0),
+                "data": datetime.fromtimestamp(tx.get("timestamp", 0)).isoformat(),
+                "ia_analysis": tx.get("ia_analysis", {}),
+                "block_index": block.index
+            })
+        return complaints
+
 # Funções Auxiliares
 def generate_complaint_id() -> str:
     """Gera um ID único para a denúncia (EVC-ANO-TIMESTAMP)"""
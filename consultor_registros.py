@@ -5,15 +5,18 @@ Sistema especializado para verificação de registros, nomes completos e formaç
 em sistemas oficiais dos conselhos profissionais
 """
 
-import requests
 import re
 import json
 import time
+from functools import cached_property
 from typing import Dict, List, Optional, Any
 from urllib.parse import quote, urlencode
-from bs4 import BeautifulSoup
 import warnings
 
+from evichain.metrics import REGISTRY_SCRAPE_SECONDS
+from evichain.optional_imports import require
+from evichain.outbound import create_session, fan_out
+
 # Suprimir warnings de SSL não verificado
 warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 
@@ -23,6 +26,8 @@ class ConsultorRegistrosProfissionais:
     Extrai nome completo, formação e dados específicos dos conselhos
     """
     
+    CONSELHOS_SUPORTADOS = ("CRM", "OAB", "CREA", "CRP", "CRO", "CREF")
+    
     def __init__(self):
         self.versao = "EviChain Consultor v1.0"
         self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -32,13 +37,15 @@ class ConsultorRegistrosProfissionais:
             'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
             'Connection': 'keep-alive'
         }
-        self.sessao = requests.Session()
-        self.sessao.headers.update(self.headers)
-        
         # Cache de dados conhecidos para casos onde web scraping falha
         self._inicializar_cache_confef()
         
         print(f"[INFO] {self.versao} inicializado para consulta de registros profissionais")
+
+    @cached_property
+    def sessao(self):
+        """Sessão HTTP compartilhada pelas consultas paralelas; criada na primeira consulta."""
+        return create_session(self.headers)
     
     def consultar_registro_completo(self, nome: str, registro: str = None, conselho: str = None) -> Dict[str, Any]:
         """
@@ -67,6 +74,7 @@ class ConsultorRegistrosProfissionais:
         
         if conselho:
             conselho_upper = conselho.upper()
+            inicio = time.perf_counter()
             
             if conselho_upper == "CRM":
                 resultado.update(self._consultar_crm(nome, registro))
@@ -82,6 +90,10 @@ class ConsultorRegistrosProfissionais:
                 resultado.update(self._consultar_cref(nome, registro))
             else:
                 resultado["observacoes"].append(f"Conselho {conselho} não implementado")
+            
+            # Só conselhos conhecidos viram label (cardinalidade limitada)
+            if conselho_upper in self.CONSELHOS_SUPORTADOS:
+                REGISTRY_SCRAPE_SECONDS.observe(time.perf_counter() - inicio, council=conselho_upper)
         else:
             # Buscar em todos os conselhos se não especificado
             resultado.update(self._buscar_todos_conselhos(nome, registro))
@@ -519,7 +531,7 @@ class ConsultorRegistrosProfissionais:
             response = self.sessao.get(url_base, params=params, timeout=15, verify=False)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = require('bs4').BeautifulSoup(response.text, 'html.parser')
                 
                 # Procurar por dados do profissional na página
                 # (A implementação específica dependeria da estrutura exata do site)
@@ -591,7 +603,7 @@ class ConsultorRegistrosProfissionais:
             response = self.sessao.post(url_formulario, data=dados_post, headers=headers_busca, timeout=15, verify=False)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = require('bs4').BeautifulSoup(response.text, 'html.parser')
                 texto_pagina = soup.get_text().lower()
                 
                 # Verificar se o nome aparece nos resultados
@@ -712,22 +724,30 @@ class ConsultorRegistrosProfissionais:
             "resultados_por_conselho": {}
         }
         
-        conselhos = ["CRM", "OAB", "CREA", "CRP", "CRO", "CREF"]
-        
-        for conselho in conselhos:
+        conselhos = list(self.CONSELHOS_SUPORTADOS)
+
+        def consultar(conselho: str):
             try:
-                resultado_conselho = self.consultar_registro_completo(nome, registro, conselho)
-                resultado["conselhos_consultados"].append(conselho)
-                resultado["resultados_por_conselho"][conselho] = resultado_conselho
-                
-                # Se encontrou registro em algum conselho
-                if resultado_conselho.get("registro_encontrado"):
-                    resultado["registro_encontrado"] = True
-                    resultado["conselho_encontrado"] = conselho
-                    resultado["dados_profissional"] = resultado_conselho.get("dados_profissional", {})
-                    
+                return self.consultar_registro_completo(nome, registro, conselho), None
             except Exception as e:
-                resultado["resultados_por_conselho"][conselho] = {"erro": str(e)}
+                return None, e
+
+        # Os portais dos conselhos são consultados em paralelo
+        respostas = fan_out({c: (lambda c=c: consultar(c)) for c in conselhos}, span="registry")
+        
+        for conselho in conselhos:
+            resultado_conselho, erro = respostas[conselho]
+            if erro is not None:
+                resultado["resultados_por_conselho"][conselho] = {"erro": str(erro)}
+                continue
+            resultado["conselhos_consultados"].append(conselho)
+            resultado["resultados_por_conselho"][conselho] = resultado_conselho
+            
+            # Se encontrou registro em algum conselho
+            if resultado_conselho.get("registro_encontrado"):
+                resultado["registro_encontrado"] = True
+                resultado["conselho_encontrado"] = conselho
+                resultado["dados_profissional"] = resultado_conselho.get("dados_profissional", {})
         
         return resultado
     
@@ -2,7 +2,28 @@
 
 Este pacote concentra configuração e composição (services) para manter os entrypoints
 (api_server.py, search_server.py) pequenos e mais fáceis de manter/testar.
+
+Os nomes reexportados são resolvidos sob demanda (PEP 562): ``evichain.services``
+importa ``blockchain_simulator``, que por sua vez usa ``evichain.serialization``;
+carregar ``services`` aqui criaria um import circular.
 """
 
-from .settings import Settings, load_settings
-from .services import Services, create_services
+from importlib import import_module
+
+_EXPORTS = {
+    "Settings": ".settings",
+    "load_settings": ".settings",
+    "Services": ".services",
+    "create_services": ".services",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
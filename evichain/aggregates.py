@@ -0,0 +1,223 @@
+"""
+EviChain – Incremental Chain Aggregates
+
+Keeps the counters behind ``/api/stats`` and ``/api/analytics`` up to
+date as blocks are appended, instead of recounting every complaint on
+every request:
+
+1. Totals and breakdowns per council, category and risk level
+   (``ia_analysis.classificacao_risco.nivel``).
+2. Daily rollups (UTC ``YYYY-MM-DD``) of complaints opened and resolved,
+   for the dashboard time series.
+3. Resolution tracking: a ``status_update`` transaction that moves a
+   complaint to ``resolved`` closes it, and the time between filing and
+   resolution feeds ``averageResolutionTime``.
+
+``apply_block()`` is O(transactions in the block).  The aggregates are
+saved in the chain file next to the blocks, stamped with the height and
+hash of the last block they include; on load they are trusted only if
+that block is still on the chain, and any newer blocks are applied on
+top.  Otherwise they are rebuilt from the chain.
+
+Usage::
+
+    from evichain.aggregates import ChainAggregates
+
+    aggregates = ChainAggregates.from_dict(saved).resume(chain)
+    aggregates.apply_block(new_block)
+    aggregates.stats()["councils"]
+    aggregates.analytics()["averageResolutionTime"]
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+FORMAT_VERSION = 1
+
+TX_STATUS_UPDATE = "status_update"
+
+STATUS_RESOLVED = "resolved"
+
+UNKNOWN = "N/A"
+
+
+def _day(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+
+def _risk_level(tx: dict) -> str:
+    risk = (tx.get("ia_analysis") or {}).get("classificacao_risco") or {}
+    return risk.get("nivel") or UNKNOWN
+
+
+def _format_hours(seconds: float) -> str:
+    return f"{round(seconds / 3600, 1):g}h"
+
+
+class ChainAggregates:
+    """Counters and daily rollups over the complaints of one chain."""
+
+    def __init__(self) -> None:
+        self.height = -1                 # last block applied
+        self.tip_hash: Optional[str] = None
+        self.total_complaints = 0
+        self.councils: dict[str, int] = {}
+        self.categories: dict[str, int] = {}
+        self.risk_levels: dict[str, int] = {}
+        # day -> {"complaints": n, "resolved": n}
+        self.daily: dict[str, dict[str, int]] = {}
+        # complaint id -> filing timestamp, for complaints not yet resolved
+        self.open: dict[str, float] = {}
+        self.resolved = 0
+        self.resolution_seconds = 0.0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Updating
+    # ------------------------------------------------------------------
+
+    def apply_block(self, block: Any) -> None:
+        """Fold one block into the aggregates (blocks must arrive in order)."""
+        if block.index <= self.height:
+            return
+        with self._lock:
+            for tx in block.data.get("transactions", []):
+                if tx.get("type") == TX_STATUS_UPDATE:
+                    self._apply_status_update(tx)
+                else:
+                    self._apply_complaint(tx)
+            self.height = block.index
+            self.tip_hash = block.hash
+
+    def _apply_complaint(self, tx: dict) -> None:
+        metadata = tx.get("metadata") or {}
+        timestamp = tx.get("timestamp", 0)
+        self.total_complaints += 1
+        for counts, key in (
+            (self.councils, metadata.get("conselho") or UNKNOWN),
+            (self.categories, metadata.get("categoria") or UNKNOWN),
+            (self.risk_levels, _risk_level(tx)),
+        ):
+            counts[key] = counts.get(key, 0) + 1
+        self._bump_day(timestamp, "complaints")
+        if tx.get("id"):
+            self.open[tx["id"]] = timestamp
+
+    def _apply_status_update(self, tx: dict) -> None:
+        filed_at = self.open.get(tx.get("complaint_id"))
+        if tx.get("status") != STATUS_RESOLVED or filed_at is None:
+            return
+        del self.open[tx["complaint_id"]]
+        resolved_at = tx.get("timestamp", filed_at)
+        self.resolved += 1
+        self.resolution_seconds += max(0.0, resolved_at - filed_at)
+        self._bump_day(resolved_at, "resolved")
+
+    def _bump_day(self, timestamp: float, field: str) -> None:
+        bucket = self.daily.setdefault(_day(timestamp), {"complaints": 0, "resolved": 0})
+        bucket[field] += 1
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Breakdowns for ``/api/stats``."""
+        with self._lock:
+            return {
+                "total_complaints": self.total_complaints,
+                "councils": dict(self.councils),
+                "categories": dict(self.categories),
+                "risk_levels": dict(self.risk_levels),
+            }
+
+    def analytics(self) -> dict:
+        """Status counters for ``/api/analytics`` (dashboard field names)."""
+        with self._lock:
+            average = self.resolution_seconds / self.resolved if self.resolved else 0.0
+            return {
+                "totalComplaints": self.total_complaints,
+                "pendingComplaints": self.total_complaints - self.resolved,
+                "resolvedComplaints": self.resolved,
+                "averageResolutionTime": _format_hours(average),
+                "averageResolutionSeconds": round(average, 3),
+            }
+
+    def is_open(self, complaint_id: str) -> bool:
+        """Whether ``complaint_id`` is on the chain and not yet resolved."""
+        with self._lock:
+            return complaint_id in self.open
+
+    def timeseries(self, days: Optional[int] = None) -> list[dict]:
+        """Daily rollups, oldest first; ``days`` keeps only the most recent."""
+        with self._lock:
+            series = [{"day": day, **counts} for day, counts in sorted(self.daily.items())]
+        return series[-days:] if days and days > 0 else series
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "version": FORMAT_VERSION,
+                "height": self.height,
+                "tip_hash": self.tip_hash,
+                "total_complaints": self.total_complaints,
+                "councils": dict(self.councils),
+                "categories": dict(self.categories),
+                "risk_levels": dict(self.risk_levels),
+                "daily": {day: dict(counts) for day, counts in self.daily.items()},
+                "open": dict(self.open),
+                "resolved": self.resolved,
+                "resolution_seconds": self.resolution_seconds,
+            }
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "ChainAggregates":
+        """Restore saved aggregates; unknown or malformed input gives empty ones."""
+        aggregates = cls()
+        if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+            return aggregates
+        try:
+            aggregates.height = int(data["height"])
+            aggregates.tip_hash = data["tip_hash"]
+            aggregates.total_complaints = int(data["total_complaints"])
+            aggregates.councils = dict(data["councils"])
+            aggregates.categories = dict(data["categories"])
+            aggregates.risk_levels = dict(data["risk_levels"])
+            aggregates.daily = {day: dict(counts) for day, counts in data["daily"].items()}
+            aggregates.open = dict(data["open"])
+            aggregates.resolved = int(data["resolved"])
+            aggregates.resolution_seconds = float(data["resolution_seconds"])
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return cls()
+        return aggregates
+
+    def resume(self, chain: list) -> "ChainAggregates":
+        """Bring these aggregates up to the tip of ``chain``.
+
+        Saved aggregates are kept only if the block they were computed up
+        to is still on ``chain`` (same height and hash); otherwise they
+        are discarded and rebuilt.  Returns the aggregates to use.
+        """
+        aggregates = self
+        if not (0 <= self.height < len(chain) and chain[self.height].hash == self.tip_hash):
+            aggregates = ChainAggregates()
+        aggregates.extend(chain[aggregates.height + 1:])
+        return aggregates
+
+    def extend(self, blocks: Iterable[Any]) -> None:
+        for block in blocks:
+            self.apply_block(block)
+
+    @classmethod
+    def build(cls, chain: list) -> "ChainAggregates":
+        """Aggregate a whole chain from scratch."""
+        aggregates = cls()
+        aggregates.extend(chain)
+        return aggregates
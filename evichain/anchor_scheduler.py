@@ -0,0 +1,367 @@
+"""
+EviChain – Background Anchoring Scheduler
+
+Anchors the chain root on a background thread instead of inside the
+HTTP request, and keeps trying when the TSA is unreachable:
+
+1. Triggers – a request is queued once the chain has grown by
+   ``EVICHAIN_ANCHOR_EVERY_BLOCKS`` blocks (0 = off) or, if it grew at
+   all, once ``EVICHAIN_ANCHOR_EVERY_MINUTES`` minutes (default 60,
+   0 = off) have passed since the last request.  ``enqueue()`` queues
+   one on demand (``POST /api/security/anchor``).
+2. Durable queue – each request is a file in ``<anchors_dir>/queue/``
+   written atomically (temp file + ``os.replace``, as in
+   ``evichain.jobs``), holding the chain length and root it was queued
+   for.  A restart picks up where the previous process stopped; the
+   trigger baseline lives next to it in ``state.json``.
+3. Batching – once any request is due, every queued root (up to
+   ``EVICHAIN_ANCHOR_BATCH_MAX``, default 256) goes out in one
+   ``ExternalAnchor.anchor_batch()`` call: one TSA request, one receipt
+   per root.  ``enqueue_root()`` adds roots of other chains (another
+   council's node, say) to the same batches.
+4. Retries – a failed attempt is retried after
+   ``EVICHAIN_ANCHOR_RETRY_SECONDS`` (default 30), doubling up to an
+   hour.  After ``EVICHAIN_ANCHOR_MAX_ATTEMPTS`` (default 10) the request
+   stays in the queue as ``failed`` for an operator to look at; so does
+   a root of this chain that no longer matches it.
+
+The TSA calls go through ``ExternalAnchor``'s pooled session, to
+``EVICHAIN_TSA_URL``; tests point it at a local stand-in TSA.  Every
+gunicorn worker may run a scheduler, but only the one holding an
+exclusive ``flock`` on ``queue/scheduler.lock`` checks the triggers and
+drains the queue; the others retry the lock on each poll and take over
+when that process exits.  A queued root longer than this process's copy
+of the chain is left for later, not failed.
+
+Usage::
+
+    from evichain.anchor_scheduler import AnchorScheduler
+
+    scheduler = AnchorScheduler(anchor, on_anchored=lambda receipt: ...)
+    scheduler.start()
+    request = scheduler.enqueue(reason="api")   # returns immediately
+    scheduler.enqueue_root("crm-sp", 120, root_hash)
+    scheduler.status()["requests"]
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .mmr import ROOT_SCHEME
+from .serialization import dumps, loads
+
+try:
+    import fcntl
+except ImportError:  # Windows: one server process (waitress), nothing to elect
+    fcntl = None
+
+if TYPE_CHECKING:
+    from .external_anchor import ExternalAnchor
+
+STATUS_QUEUED = "queued"
+STATUS_FAILED = "failed"
+
+MAX_RETRY_SECONDS = 3600.0
+
+
+class AnchorScheduler:
+    """Queues anchoring requests and submits them to the TSA in the background."""
+
+    def __init__(
+        self,
+        anchor: "ExternalAnchor",
+        *,
+        queue_dir: str | Path | None = None,
+        every_blocks: int | None = None,
+        every_minutes: float | None = None,
+        retry_seconds: float | None = None,
+        max_attempts: int | None = None,
+        batch_max: int | None = None,
+        poll_seconds: float = 10.0,
+        on_anchored: Optional[Callable[[dict], None]] = None,
+    ) -> None:
+        self.anchor = anchor
+        self.queue_dir = Path(queue_dir or anchor.anchors_dir / "queue")
+        self.queue_dir.mkdir(parents=True, exist_ok=True)
+        self.every_blocks = (
+            every_blocks if every_blocks is not None
+            else int(os.getenv("EVICHAIN_ANCHOR_EVERY_BLOCKS", "0"))
+        )
+        self.every_minutes = (
+            every_minutes if every_minutes is not None
+            else float(os.getenv("EVICHAIN_ANCHOR_EVERY_MINUTES", "60"))
+        )
+        self.retry_seconds = retry_seconds or float(os.getenv("EVICHAIN_ANCHOR_RETRY_SECONDS", "30"))
+        self.max_attempts = max_attempts or int(os.getenv("EVICHAIN_ANCHOR_MAX_ATTEMPTS", "10"))
+        self.batch_max = batch_max or int(os.getenv("EVICHAIN_ANCHOR_BATCH_MAX", "256"))
+        self.poll_seconds = poll_seconds
+        self.on_anchored = on_anchored
+
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid: Optional[int] = None
+        # Open handle holding the queue lock, and the process that took it
+        self._lock_fh = None
+        self._lock_pid: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def enqueue(self, reason: str = "api") -> dict:
+        """Queue an anchor of the current root and wake the worker.
+
+        A request already queued for the same root is returned instead of
+        adding a duplicate.
+        """
+        chain_length, root_hash = self.anchor._snapshot()
+        request = self._add(self.anchor.source, chain_length, root_hash, ROOT_SCHEME, reason)
+        with self._lock:
+            self._save_state({"chain_length": chain_length, "queued_at": time.time()})
+        return request
+
+    def enqueue_root(
+        self,
+        source: str,
+        chain_length: int,
+        root_hash: str,
+        *,
+        root_scheme: str = ROOT_SCHEME,
+        reason: str = "external",
+    ) -> dict:
+        """Queue the root of another chain to share the next batch."""
+        if source == self.anchor.source:
+            raise ValueError("Use enqueue() for this chain's own root")
+        bytes.fromhex(root_hash)  # ValueError on anything but hex
+        return self._add(source, int(chain_length), root_hash.lower(), root_scheme, reason)
+
+    def check_triggers(self, now: Optional[float] = None) -> Optional[dict]:
+        """Queue a request if the block or time trigger is due."""
+        now = time.time() if now is None else now
+        length = len(self.anchor.blockchain.mmr)
+        state = self._load_state()
+        if state is None:
+            # First run: start counting from here rather than anchoring at once
+            self._save_state({"chain_length": length, "queued_at": now})
+            return None
+        grown = length - state["chain_length"]
+        if grown < 0:
+            # The chain was recreated: count from its new length
+            self._save_state({"chain_length": length, "queued_at": now})
+        if grown <= 0:
+            return None
+        if self.every_blocks and grown >= self.every_blocks:
+            return self.enqueue(reason="blocks")
+        if self.every_minutes and now - state["queued_at"] >= self.every_minutes * 60:
+            return self.enqueue(reason="interval")
+        return None
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Anchor every queued root in one batch if any of them is due.
+
+        Only the process holding the queue lock does anything.  Returns
+        the number of roots anchored.
+        """
+        if not self._claim_queue():
+            return 0
+        now = time.time() if now is None else now
+        queued = [r for r in self._requests() if r["status"] == STATUS_QUEUED]
+        if not any(r["next_attempt_at"] <= now for r in queued):
+            return 0
+
+        batch = []
+        for request in queued[: self.batch_max]:
+            local = request.get("source", self.anchor.source) == self.anchor.source
+            if local and request["chain_length"] > len(self.anchor.blockchain.mmr):
+                # Mined by another worker and not in this copy of the chain yet
+                request["next_attempt_at"] = now + self.poll_seconds
+                self._save(request)
+                continue
+            if local and not self.anchor._local_root_matches(self._root(request)):
+                request["status"] = STATUS_FAILED
+                request["last_error"] = (
+                    f"root of the first {request['chain_length']} blocks changed since it was queued"
+                )
+                print(f"[WARN] Anchor request {request['id']}: {request['last_error']}")
+                self._save(request)
+                continue
+            batch.append(request)
+        if not batch:
+            return 0
+
+        try:
+            receipts = self.anchor.anchor_batch([self._root(r) for r in batch])
+        except Exception as exc:
+            for request in batch:
+                self._retry_later(request, exc)
+            print(f"[WARN] Anchoring {len(batch)} root(s) failed: {exc}")
+            return 0
+
+        for request in batch:
+            self._path(request["id"]).unlink(missing_ok=True)
+        if self.on_anchored is not None:
+            for receipt in receipts:
+                self.on_anchored(receipt)
+        return len(receipts)
+
+    def status(self) -> dict:
+        """Queued and failed requests, oldest first, plus the trigger baseline."""
+        return {"requests": self._requests(), "last_queued": self._load_state()}
+
+    def start(self) -> None:
+        """Start the background thread (again, in a forked child)."""
+        if self._thread_pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="evichain-anchor-scheduler", daemon=True,
+            )
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stop.set()
+            self._wake.notify_all()
+        if thread is not None and self._thread_pid == os.getpid():
+            thread.join()
+        if self._lock_fh is not None and self._lock_pid == os.getpid():
+            self._lock_fh.close()  # releases the flock
+        self._lock_fh = self._lock_pid = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._claim_queue():
+                    self.check_triggers()
+                    self.run_pending()
+            except Exception as exc:  # keep the thread alive; the queue is on disk
+                print(f"[ERROR] Anchor scheduler: {exc}")
+            with self._lock:
+                if not self._stop.is_set():
+                    self._wake.wait(self._next_wait())
+
+    def _claim_queue(self) -> bool:
+        """Whether this process drains the queue (non-blocking ``flock``)."""
+        if fcntl is None:
+            return True
+        if self._lock_fh is not None and self._lock_pid == os.getpid():
+            return True
+        # A handle inherited through fork() shares the parent's lock: open our own
+        fh = open(self.queue_dir / "scheduler.lock", "ab")
+        try:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return False
+        self._lock_fh, self._lock_pid = fh, os.getpid()
+        return True
+
+    def _next_wait(self) -> float:
+        due = [r["next_attempt_at"] for r in self._requests() if r["status"] == STATUS_QUEUED]
+        if not due or self._lock_pid != os.getpid():
+            return self.poll_seconds
+        return max(0.0, min(self.poll_seconds, min(due) - time.time()))
+
+    def _add(self, source: str, chain_length: int, root_hash: str, root_scheme: str, reason: str) -> dict:
+        with self._lock:
+            for request in self._requests():
+                if (
+                    request["status"] == STATUS_QUEUED
+                    and request.get("source", self.anchor.source) == source
+                    and request["chain_length"] == chain_length
+                    and request["root_hash"] == root_hash
+                ):
+                    return request
+            now = time.time()
+            request = {
+                "id": uuid.uuid4().hex,
+                "status": STATUS_QUEUED,
+                "reason": reason,
+                "source": source,
+                "chain_length": chain_length,
+                "root_scheme": root_scheme,
+                "root_hash": root_hash,
+                "created_at": now,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "last_error": None,
+            }
+            self._save(request)
+            self._wake.notify()
+        return request
+
+    def _root(self, request: dict) -> dict:
+        return {
+            "source": request.get("source", self.anchor.source),
+            "chain_length": request["chain_length"],
+            "root_scheme": request.get("root_scheme", ROOT_SCHEME),
+            "root_hash": request["root_hash"],
+        }
+
+    def _retry_later(self, request: dict, exc: Exception) -> None:
+        request["attempts"] += 1
+        request["last_error"] = str(exc)
+        if request["attempts"] >= self.max_attempts:
+            request["status"] = STATUS_FAILED
+        else:
+            delay = min(self.retry_seconds * 2 ** (request["attempts"] - 1), MAX_RETRY_SECONDS)
+            request["next_attempt_at"] = time.time() + delay
+        self._save(request)
+
+    def _requests(self) -> list[dict]:
+        requests = []
+        for path in self.queue_dir.glob("*.json"):
+            if path.name == "state.json":
+                continue
+            try:
+                requests.append(loads(path.read_bytes()))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+        return sorted(requests, key=lambda r: r["created_at"])
+
+    def _path(self, request_id: str) -> Path:
+        return self.queue_dir / f"{request_id}.json"
+
+    def _save(self, request: dict) -> None:
+        self._write(self._path(request["id"]), request)
+
+    def _load_state(self) -> Optional[dict]:
+        try:
+            return loads((self.queue_dir / "state.json").read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _save_state(self, state: dict) -> None:
+        self._write(self.queue_dir / "state.json", state)
+
+    @staticmethod
+    def _write(path: Path, document: dict) -> None:
+        # Unique temp name: any worker may write state.json (enqueue) while
+        # the leader does (check_triggers)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(dumps(document))
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
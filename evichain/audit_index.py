@@ -0,0 +1,208 @@
+"""
+EviChain – Audit Log Index
+
+A SQLite sidecar (``audit.index.sqlite3`` next to the log) that answers
+forensic queries without reading the JSONL files:
+
+1. ``events`` – one row per entry: ``seq``, time, event type, actor,
+   severity, block index and the entry itself.
+2. ``event_complaints`` – the complaint ids an entry refers to
+   (``detail.complaint_id``, or ``detail.complaint_ids`` of a
+   ``BLOCK_MINED`` entry).
+3. ``state`` – segment number and byte offset just past the last
+   indexed entry, so a restart indexes only what was appended since.
+
+``AuditLog`` adds each group commit in one transaction.  The index is a
+convenience copy, not evidence: entries come back with their ``hmac``
+and ``prev_digest``, and ``AuditLog.verify_integrity()`` remains the
+integrity check.  Deleting the file just makes the next start rebuild it.
+
+Results are newest first with keyset pagination: pass the returned
+``next_cursor`` as ``before_seq`` to get the next page.
+
+Usage::
+
+    from evichain.audit_index import AuditIndex
+
+    index = AuditIndex("data/audit/audit.index.sqlite3")
+    page = index.query(complaint_id="EVC-2025-000001", limit=50)
+    index.query(event="BLOCK_MINED", before_seq=page["next_cursor"])
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .serialization import dumps_str, loads
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS events ("
+    " seq INTEGER PRIMARY KEY, ts REAL NOT NULL, event TEXT NOT NULL,"
+    " actor TEXT, severity TEXT, block_index INTEGER, entry TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS events_event ON events(event, seq)",
+    "CREATE INDEX IF NOT EXISTS events_actor ON events(actor, seq)",
+    "CREATE INDEX IF NOT EXISTS events_block ON events(block_index, seq)",
+    "CREATE INDEX IF NOT EXISTS events_ts ON events(ts)",
+    "CREATE TABLE IF NOT EXISTS event_complaints ("
+    " complaint_id TEXT NOT NULL, seq INTEGER NOT NULL, PRIMARY KEY (complaint_id, seq))",
+    "CREATE TABLE IF NOT EXISTS state ("
+    " id INTEGER PRIMARY KEY CHECK (id = 1), segment INTEGER NOT NULL, offset INTEGER NOT NULL)",
+)
+
+
+def parse_timestamp(value: str | float) -> float:
+    """Epoch seconds from a number or an ISO 8601 string (``Z`` allowed).
+
+    Naive times are taken as UTC.  Raises ``ValueError`` otherwise.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    moment = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _complaint_ids(entry: dict) -> set[str]:
+    detail = entry.get("detail") or {}
+    ids = set(detail.get("complaint_ids") or ())
+    if detail.get("complaint_id"):
+        ids.add(detail["complaint_id"])
+    return {str(complaint_id) for complaint_id in ids}
+
+
+class AuditIndex:
+    """Queryable copy of the audit log's entries."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread and process (see SQLiteBucketStore)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # ------------------------------------------------------------------
+    # Updating
+    # ------------------------------------------------------------------
+
+    def add(self, entries: Iterable[dict], segment: int, offset: int) -> None:
+        """Index ``entries`` and move the resume position, in one transaction."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for entry in entries:
+                seq = entry["seq"]
+                detail = entry.get("detail") or {}
+                try:
+                    ts = parse_timestamp(entry.get("timestamp_utc"))
+                except ValueError:
+                    ts = 0.0
+                conn.execute(
+                    "INSERT OR REPLACE INTO events"
+                    " (seq, ts, event, actor, severity, block_index, entry)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (seq, ts, entry.get("event", ""), entry.get("actor"),
+                     entry.get("severity"), detail.get("block_index"), dumps_str(entry)),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO event_complaints (complaint_id, seq) VALUES (?, ?)",
+                    [(complaint_id, seq) for complaint_id in _complaint_ids(entry)],
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO state (id, segment, offset) VALUES (1, ?, ?)",
+                (segment, offset),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        for table in ("events", "event_complaints", "state"):
+            conn.execute(f"DELETE FROM {table}")
+        conn.execute("COMMIT")
+
+    def position(self) -> tuple[int, int]:
+        """``(segment, offset)`` just past the last indexed entry."""
+        row = self._conn().execute("SELECT segment, offset FROM state WHERE id = 1").fetchone()
+        return (row[0], row[1]) if row else (1, 0)
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        *,
+        event: Optional[str] = None,
+        actor: Optional[str] = None,
+        complaint_id: Optional[str] = None,
+        block_index: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        before_seq: Optional[int] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> dict:
+        """Entries matching every given filter, newest first.
+
+        ``since``/``until`` are epoch seconds (inclusive).  Returns
+        ``{"entries": [...], "next_cursor": seq or None}``.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        clauses, params = [], []
+        for column, value in (("event", event), ("actor", actor), ("block_index", block_index)):
+            if value is not None:
+                clauses.append(f"e.{column} = ?")
+                params.append(value)
+        if complaint_id is not None:
+            clauses.append(
+                "e.seq IN (SELECT seq FROM event_complaints WHERE complaint_id = ?)"
+            )
+            params.append(complaint_id)
+        if since is not None:
+            clauses.append("e.ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("e.ts <= ?")
+            params.append(until)
+        if before_seq is not None:
+            clauses.append("e.seq < ?")
+            params.append(before_seq)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            f"SELECT e.seq, e.entry FROM events e {where} ORDER BY e.seq DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+        page = rows[:limit]
+        return {
+            "entries": [loads(entry) for _, entry in page],
+            "next_cursor": page[-1][0] if len(rows) > limit else None,
+        }
@@ -7,8 +7,10 @@ that deletion or reordering of entries is detectable.
 
 Deployment hardening (documented, not enforced by Python):
 
-    # Linux: make the log directory immutable after initial creation
-    sudo chattr +a /var/log/evichain/audit.jsonl
+    # Linux: sealed segments never change again – make them immutable
+    # (e.g. from a root cron job); the active audit.jsonl is renamed
+    # when it is sealed, so it cannot carry chattr +a itself
+    sudo chattr +i /var/log/evichain/segments/audit-*.jsonl
 
     # Run the application under a non-root service account
     sudo useradd --system --no-create-home evichain
@@ -21,28 +23,332 @@ Role-separation guidance:
       privileges.
     * The blockchain data file should be owned by ``evichain`` with
       mode 0640.
-    * The audit log directory should have the Linux append-only
-      attribute (``chattr +a``) so that even the service account
-      cannot delete or overwrite past entries.
+    * Sealed segments should carry the Linux immutable attribute
+      (``chattr +i``) so that even the service account cannot delete
+      or overwrite past entries.
     * A separate ``evichain-admin`` account (or root) is required to
-      rotate logs or change the append-only attribute.
+      archive segments or change the immutable attribute.
 
 This module addresses reviewer concern #2 (malicious administrator)
 by creating an independent, append-only evidence trail that is
 harder to tamper with than the blockchain file itself.
+
+Appends are O(1) in the size of the log: the next sequence number and
+the previous entry's digest are kept in memory, recovered at start-up
+(or when another writer has grown the file) by reading the last line
+backwards from EOF.
+
+Entries are queued, then chained and written through one open file
+handle in group commits.  ``EVICHAIN_AUDIT_DURABILITY`` picks when an
+entry is on disk:
+
+1. ``fsync`` – every ``log_event`` writes and fsyncs before returning.
+2. ``interval`` (default) – a background thread writes and fsyncs the
+   queued entries every ``EVICHAIN_AUDIT_FLUSH_MS`` (200 ms); a crash
+   can lose at most that window.
+3. ``batch`` – ``log_event`` waits until the background thread has
+   fsynced the batch holding its entry, so concurrent callers share
+   one fsync.
+
+``flush()`` forces queued entries to disk and ``close()`` flushes and
+stops the writer.
+
+Several processes (e.g. gunicorn workers) may append to one log in any
+mode: each commit takes an exclusive ``flock`` on ``audit.lock``, picks
+up a rotation or an append done by another process, and only then gives
+the queued entries their ``seq`` and ``prev_digest`` and writes them.
+The entry returned by ``log_event`` in ``interval`` mode gets those
+fields (and ``hmac``) when its batch is committed.
+
+Signed checkpoints: every ``EVICHAIN_AUDIT_CHECKPOINT_EVERY`` entries
+(1000) or ``EVICHAIN_AUDIT_CHECKPOINT_SECONDS`` (300 s), and after each
+successful verification, ``{seq, digest, offset}`` of the last durable
+entry is appended to ``audit.checkpoints.jsonl`` with its own HMAC.
+``verify_integrity()`` starts from the last checkpoint whose HMAC
+matches and whose entry is still at ``offset``, so routine checks only
+read what was appended since; ``verify_integrity(full=True)`` re-checks
+every entry from the first.
+
+Large ranges are verified in parallel: the file is split at line
+boundaries, each chunk is checked in a worker process over ``mmap``
+(every entry carries its own ``prev_digest`` and ``hmac``), and only the
+links across chunk seams are checked afterwards.  The worker pool is
+created once per process and reused; on POSIX its processes fork from a
+``forkserver`` that has only this module preloaded.
+
+Segments: once ``audit.jsonl`` reaches ``EVICHAIN_AUDIT_SEGMENT_MB``
+(64 MiB) or, if set, its first entry is ``EVICHAIN_AUDIT_SEGMENT_HOURS``
+old, the next commit seals it: a signed footer with the segment's seq
+range, first/last digests and SHA-256 is appended, the file moves to
+``segments/audit-NNNNNN.jsonl`` and the footer is recorded in
+``audit.manifest.jsonl``.  The chain carries on in a fresh
+``audit.jsonl``.  A sealed segment that verified once gets a signed
+``verified`` record in the manifest and is skipped by later routine
+checks as long as its size is unchanged; ``full=True`` re-reads all.
+
+Each group commit is also added to ``audit.index.sqlite3``
+(``evichain.audit_index``) so ``query()`` can filter by event type,
+actor, complaint id, block index and time without reading the files;
+set ``EVICHAIN_AUDIT_INDEX=0`` to disable it.
 """
 
 from __future__ import annotations
 
+import atexit
+import contextlib
 import hashlib
 import hmac
 import json
+import mmap
+import multiprocessing
 import os
+import sqlite3
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from .audit_index import AuditIndex
+from .metrics import AUDIT_APPEND_SECONDS
+from .serialization import canonical_dumps, dumps_str, loads
+
+try:
+    import fcntl
+except ImportError:  # Windows: one writer process, nothing to lock against
+    fcntl = None
+
+GENESIS_DIGEST = "0" * 64
+
+# Bytes read per step when scanning backwards for the last entry
+TAIL_CHUNK = 4096
+
+DURABILITY_MODES = ("fsync", "interval", "batch")
+DEFAULT_DURABILITY = "interval"
+DEFAULT_FLUSH_MS = 200.0
+
+DEFAULT_CHECKPOINT_EVERY = 1000
+DEFAULT_CHECKPOINT_SECONDS = 300.0
+
+DEFAULT_VERIFY_CHUNK_MB = 4.0
+
+DEFAULT_SEGMENT_MB = 64.0
+DEFAULT_SEGMENT_HOURS = 0.0
+
+
+def _segment_name(number: int) -> str:
+    return f"audit-{number:06d}.jsonl"
+
+
+def _parse_record(line: bytes) -> dict:
+    """Decode one JSONL record; ``{}`` if it is not a JSON object."""
+    try:
+        record = loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return {}
+    return record if isinstance(record, dict) else {}
+
+
+def _file_sha256(path: Path, end: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        remaining = end
+        while remaining > 0:
+            block = fh.read(min(remaining, 1024 * 1024))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest.hexdigest()
+
+
+def _fsync_dir(path: Path) -> None:
+    """Persist a rename (POSIX only; a no-op where directories can't be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _entry_hmac(key: bytes, entry: dict) -> str:
+    """HMAC-SHA256 over the canonical JSON of ``entry``."""
+    canonical = canonical_dumps(entry, ensure_ascii=False)
+    return hmac.new(key, canonical.encode(), hashlib.sha256).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Verification of byte ranges (runs in worker processes)
+# ----------------------------------------------------------------------
+
+def _chunk_ranges(path: Path, start: int, end: int, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Split ``[start, end)`` of ``path`` into ranges that begin on a line."""
+    bounds = [start]
+    if end - start > chunk_bytes > 0:
+        with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start + chunk_bytes
+            while pos < end:
+                nl = mm.find(b"\n", pos - 1, end)
+                if nl == -1 or nl + 1 >= end:
+                    break
+                bounds.append(nl + 1)
+                pos = nl + 1 + chunk_bytes
+    bounds.append(end)
+    return [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+
+
+def _verify_chunk(path: str, key: bytes, start: int, end: int) -> dict:
+    """Check the entries in ``[start, end)``, which begins on a line.
+
+    Line numbers are relative to the chunk.  The chain link of the first
+    entry cannot be checked here; it is returned in ``first`` as
+    ``(line, prev_digest, index in errors)`` for ``_stitch``.
+    """
+    errors: list[tuple[int, str]] = []
+    first = None
+    prev_digest = None
+    last_seq = None
+    count = lineno = 0
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            nl = mm.find(b"\n", pos, end)
+            stop = end if nl == -1 else nl + 1
+            line = mm[pos:stop].strip()
+            pos = stop
+            lineno += 1
+            if not line:
+                continue
+            try:
+                entry = loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                errors.append((lineno, "invalid JSON"))
+                continue
+
+            stored_hmac = entry.pop("hmac", "")
+
+            # Check chain link
+            if prev_digest is None:
+                first = (lineno, entry.get("prev_digest"), len(errors))
+            elif entry.get("prev_digest") != prev_digest:
+                errors.append((lineno, _chain_break(prev_digest)))
+
+            # Re-compute HMAC
+            if not hmac.compare_digest(stored_hmac, _entry_hmac(key, entry)):
+                errors.append((lineno, "HMAC mismatch"))
+
+            prev_digest = stored_hmac
+            last_seq = entry.get("seq")
+            count += 1
+    return {
+        "lines": lineno,
+        "entries": count,
+        "first": first,
+        "last_digest": prev_digest,
+        "last_seq": last_seq,
+        "errors": errors,
+    }
+
+
+# Verification pool: one per process, reused across verify_integrity() calls
+_verify_pool: Optional[ProcessPoolExecutor] = None
+_verify_pool_key: Optional[tuple[int, int]] = None  # (pid, max_workers)
+_verify_pool_lock = threading.Lock()
+
+
+def _verify_executor(workers: int) -> ProcessPoolExecutor:
+    """The process pool for chunk verification, created on first use.
+
+    Re-created after a fork (a pool inherited from the parent has no live
+    workers) or when a different ``workers`` count is asked for.
+    """
+    global _verify_pool, _verify_pool_key
+    with _verify_pool_lock:
+        if _verify_pool is None or _verify_pool_key != (os.getpid(), workers):
+            if _verify_pool is not None and _verify_pool_key[0] == os.getpid():
+                _verify_pool.shutdown(wait=False)
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload([__name__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            _verify_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _verify_pool_key = (os.getpid(), workers)
+        return _verify_pool
+
+
+def _chain_break(expected: str) -> str:
+    return f"chain break (expected prev_digest={expected[:16]}…)"
+
+
+def _stitch(
+    chunks: list[dict], prev_digest: str, lineno: int, errors: list[str]
+) -> tuple[int, str, Optional[int]]:
+    """Join chunk results in file order, checking the links at the seams.
+
+    Appends ``"Line N: ..."`` messages to ``errors``; returns
+    ``(entries, last_hmac, last_seq)``, ``last_seq`` being ``None`` if
+    there were no entries.
+    """
+    count = 0
+    last_seq = None
+    for chunk in chunks:
+        chunk_errors = list(chunk["errors"])
+        if chunk["first"] is not None:
+            line, first_prev, at = chunk["first"]
+            if first_prev != prev_digest:
+                chunk_errors.insert(at, (line, _chain_break(prev_digest)))
+            prev_digest = chunk["last_digest"]
+            last_seq = chunk["last_seq"]
+        errors.extend(f"Line {lineno + line}: {message}" for line, message in chunk_errors)
+        lineno += chunk["lines"]
+        count += chunk["entries"]
+    return count, prev_digest, last_seq
+
+
+def _last_line(path: Path, end: int | None = None) -> bytes:
+    """Last non-empty line of ``path`` before byte ``end`` (default EOF).
+
+    Reads backwards in ``TAIL_CHUNK`` steps, so the cost does not depend
+    on the file size.
+    """
+    try:
+        fh = open(path, "rb")
+    except FileNotFoundError:
+        return b""
+    with fh:
+        if end is None:
+            fh.seek(0, os.SEEK_END)
+            end = fh.tell()
+        tail = b""
+        while end > 0:
+            start = max(0, end - TAIL_CHUNK)
+            fh.seek(start)
+            tail = fh.read(end - start) + tail
+            end = start
+            stripped = tail.rstrip()
+            if stripped and (b"\n" in stripped or start == 0):
+                break
+    return tail.rstrip().rpartition(b"\n")[2].strip()
+
+
+def _first_line(path: Path) -> bytes:
+    """First non-empty line of ``path`` (``b""`` if none)."""
+    try:
+        with open(path, "rb") as fh:
+            for line in fh:
+                if line.strip():
+                    return line.strip()
+    except FileNotFoundError:
+        pass
+    return b""
+
 
 class AuditLog:
     """Append-only, HMAC-chained audit logger."""
@@ -51,6 +357,14 @@ class AuditLog:
         self,
         log_dir: str | Path | None = None,
         hmac_key: bytes | None = None,
+        *,
+        durability: str | None = None,
+        flush_interval: float | None = None,
+        checkpoint_every: int | None = None,
+        checkpoint_seconds: float | None = None,
+        segment_bytes: int | None = None,
+        segment_seconds: float | None = None,
+        index: bool | None = None,
     ) -> None:
         self.log_dir = Path(
             log_dir or os.getenv("EVICHAIN_AUDIT_DIR", "data/audit")
@@ -58,6 +372,14 @@ class AuditLog:
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
         self.log_file = self.log_dir / "audit.jsonl"
+        self.checkpoint_file = self.log_dir / "audit.checkpoints.jsonl"
+        self.manifest_file = self.log_dir / "audit.manifest.jsonl"
+        self.segments_dir = self.log_dir / "segments"
+        self.index_file = self.log_dir / "audit.index.sqlite3"
+        self.lock_file = self.log_dir / "audit.lock"
+        # Handle holding the inter-process flock, opened once per process
+        self._lock_fh = None
+        self._lock_pid: Optional[int] = None
 
         # HMAC key: from env (hex-encoded) or generate & persist
         raw_key = os.getenv("EVICHAIN_AUDIT_HMAC_KEY")
@@ -75,8 +397,78 @@ class AuditLog:
                 self._hmac_key = os.urandom(32)
                 key_path.write_text(self._hmac_key.hex(), encoding="utf-8")
 
-        # Chain digest: hash of previous entry's HMAC (or zeros for first)
-        self._prev_digest = self._recover_last_digest()
+        self.durability = (
+            durability or os.getenv("EVICHAIN_AUDIT_DURABILITY") or DEFAULT_DURABILITY
+        ).lower()
+        if self.durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"Unknown audit durability {self.durability!r}; use one of {DURABILITY_MODES}"
+            )
+        if flush_interval is None:
+            flush_interval = float(os.getenv("EVICHAIN_AUDIT_FLUSH_MS", DEFAULT_FLUSH_MS)) / 1000
+        self.flush_interval = flush_interval
+
+        # Checkpoint policy (0 disables a trigger)
+        if checkpoint_every is None:
+            checkpoint_every = int(
+                os.getenv("EVICHAIN_AUDIT_CHECKPOINT_EVERY", DEFAULT_CHECKPOINT_EVERY)
+            )
+        if checkpoint_seconds is None:
+            checkpoint_seconds = float(
+                os.getenv("EVICHAIN_AUDIT_CHECKPOINT_SECONDS", DEFAULT_CHECKPOINT_SECONDS)
+            )
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+
+        # Rotation policy (0 disables a trigger)
+        if segment_bytes is None:
+            segment_bytes = int(
+                float(os.getenv("EVICHAIN_AUDIT_SEGMENT_MB", DEFAULT_SEGMENT_MB)) * 1024 * 1024
+            )
+        if segment_seconds is None:
+            segment_seconds = (
+                float(os.getenv("EVICHAIN_AUDIT_SEGMENT_HOURS", DEFAULT_SEGMENT_HOURS)) * 3600
+            )
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+
+        # Sealed segments: finish a rotation interrupted by a crash, then
+        # number the active one.
+        # Chain state, kept in memory so appends never re-read the file:
+        # last sequence number and the HMAC of the last entry (the next
+        # entry's prev_digest; zeros for the first).  Only a commit, holding
+        # ``_io_lock`` and the file lock, reads or moves it.
+        self._lock = threading.Lock()
+        with self._file_lock():
+            self._finish_rotation()
+            self._segment_no = len(self._read_manifest()[0]) + 1
+            self._segment_opened = self._first_entry_time()
+            self._manifest_size = self._manifest_bytes()
+            self._seq, self._prev_digest, self._size = self._recover_tail()
+        # Entries not yet chained and written, guarded by ``_lock``
+        self._pending: list[dict] = []
+        self._queued = 0            # entries ever queued
+        self._committed = 0         # entries written and fsynced
+        self._has_pending = threading.Condition(self._lock)
+        self._flushed = threading.Condition(self._lock)
+
+        # Writer side: ``_io_lock`` serialises commits so batches hit the
+        # file in queue order.  Handle and thread are per process.
+        self._io_lock = threading.Lock()
+        self._fh = None
+        self._writer: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._pid = os.getpid()
+        self._checkpoint_seq = max(self._last_checkpoint_seq(), self._sealed_tip()[0])
+        self._checkpoint_time = time.monotonic()
+
+        # Query index (sidecar SQLite), brought up to date with the files
+        if index is None:
+            index = os.getenv("EVICHAIN_AUDIT_INDEX", "1").strip().lower() not in {"0", "false", "no"}
+        self.index: Optional[AuditIndex] = AuditIndex(self.index_file) if index else None
+        if self.index is not None:
+            self._catch_up_index()
+        atexit.register(self.close)
 
     # ------------------------------------------------------------------
     # Public API
@@ -90,76 +482,173 @@ class AuditLog:
         detail: Optional[dict] = None,
         severity: str = "INFO",
     ) -> dict:
-        """Append a single audit event.  Returns the entry dict."""
-        entry = {
-            "seq": self._next_seq(),
-            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-            "event": event_type,
-            "actor": actor,
-            "severity": severity,
-            "detail": detail or {},
-            "prev_digest": self._prev_digest,
-        }
-
-        # Compute HMAC over canonical JSON
-        canonical = json.dumps(entry, sort_keys=True, ensure_ascii=False)
-        entry_hmac = hmac.new(
-            self._hmac_key, canonical.encode(), hashlib.sha256
-        ).hexdigest()
-        entry["hmac"] = entry_hmac
+        """Append a single audit event.  Returns the entry dict.
 
-        # Append
-        with open(self.log_file, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        When the entry is on disk depends on ``durability`` (see module
+        docstring).
+        """
+        t0 = time.perf_counter()
+        self._check_pid()
+        if self.durability == "fsync":
+            with self._lock:
+                entry = self._queue_entry(event_type, actor, detail, severity)
+            self._commit()
+            AUDIT_APPEND_SECONDS.observe(time.perf_counter() - t0)
+            return entry
 
-        self._prev_digest = entry_hmac
+        with self._lock:
+            entry = self._queue_entry(event_type, actor, detail, severity)
+            ticket = self._queued
+            if self.durability == "batch":
+                self._ensure_writer()
+                self._has_pending.notify()
+                while self._committed < ticket:
+                    self._flushed.wait()
+            else:
+                self._ensure_writer()
+        AUDIT_APPEND_SECONDS.observe(time.perf_counter() - t0)
         return entry
 
-    def verify_integrity(self) -> dict:
-        """Verify the full audit log chain.
+    def flush(self) -> None:
+        """Write and fsync every queued entry."""
+        self._check_pid()
+        self._commit()
 
-        Returns ``{"valid": True/False, "entries": N, "errors": [...]}``.
-        """
-        if not self.log_file.exists():
-            return {"valid": True, "entries": 0, "errors": []}
+    def query(self, **filters) -> dict:
+        """Search the index (see ``AuditIndex.query``) after a flush."""
+        if self.index is None:
+            raise RuntimeError("Audit index is disabled (EVICHAIN_AUDIT_INDEX=0)")
+        self.flush()
+        return self.index.query(**filters)
 
-        errors: list[str] = []
-        prev_digest = "0" * 64
-        count = 0
+    def close(self) -> None:
+        """Flush, stop the background writer and close the file handle."""
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            writer, self._writer = self._writer, None
+            self._stop.set()
+            self._has_pending.notify_all()
+        if writer is not None:
+            writer.join()
+        self._stop.clear()
+        self._commit()
+        with self._io_lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
 
-        with open(self.log_file, "r", encoding="utf-8") as fh:
-            for lineno, line in enumerate(fh, 1):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                except json.JSONDecodeError:
-                    errors.append(f"Line {lineno}: invalid JSON")
-                    continue
+    def verify_integrity(
+        self,
+        full: bool = False,
+        *,
+        workers: int | None = None,
+        chunk_bytes: int | None = None,
+    ) -> dict:
+        """Verify the audit log chain.
 
-                stored_hmac = entry.pop("hmac", "")
+        Starts from the last trusted checkpoint unless ``full`` is set;
+        line numbers in errors are then counted from the checkpoint's
+        ``seq``.  A checkpoint that fails its HMAC or no longer matches
+        the log is reported as an error and the whole log is verified.
 
-                # Check chain link
-                if entry.get("prev_digest") != prev_digest:
-                    errors.append(
-                        f"Line {lineno}: chain break "
-                        f"(expected prev_digest={prev_digest[:16]}…)"
-                    )
+        The range to check is split at line boundaries into chunks of
+        about ``chunk_bytes`` (``EVICHAIN_AUDIT_VERIFY_CHUNK_MB``, 4 MiB);
+        when there is more than one, they are verified on up to
+        ``workers`` processes (``EVICHAIN_AUDIT_VERIFY_WORKERS``, default
+        CPU count) and the chain links are checked at the seams.  Errors
+        are the same as for a single pass.
+
+        Returns ``{"valid": True/False, "entries": N, "errors": [...],
+        "verified_from": seq}``.
+        """
+        self.flush()
+        if workers is None:
+            workers = int(os.getenv("EVICHAIN_AUDIT_VERIFY_WORKERS", 0)) or os.cpu_count() or 1
+        if chunk_bytes is None:
+            chunk_bytes = int(
+                float(os.getenv("EVICHAIN_AUDIT_VERIFY_CHUNK_MB", DEFAULT_VERIFY_CHUNK_MB))
+                * 1024 * 1024
+            )
 
-                # Re-compute HMAC
-                canonical = json.dumps(entry, sort_keys=True, ensure_ascii=False)
-                expected = hmac.new(
-                    self._hmac_key, canonical.encode(), hashlib.sha256
-                ).hexdigest()
+        segments, verified, errors = self._read_manifest()
 
-                if not hmac.compare_digest(stored_hmac, expected):
-                    errors.append(f"Line {lineno}: HMAC mismatch")
+        # Plan, in chain order: (segment record or None for the active
+        # file, chunk ranges or None if skipped, prev_digest, first line,
+        # errors found before reading entries)
+        plan: list[tuple[Optional[dict], Optional[list], str, int, list[str]]] = []
+        prev_digest, base_seq = GENESIS_DIGEST, 0
+        verified_from = None
+        for record in segments:
+            if full or not self._segment_trusted(record, verified.get(record["segment"])):
+                if verified_from is None:
+                    verified_from = base_seq
+                found: list[str] = []
+                ranges = self._check_segment(record, chunk_bytes, found)
+                plan.append((record, ranges, prev_digest, 0, found))
+            else:
+                plan.append((record, None, prev_digest, 0, []))
+            prev_digest, base_seq = record["last_digest"], record["last_seq"]
 
-                prev_digest = stored_hmac
-                count += 1
+        # Active file, from the last trusted checkpoint
+        found = []
+        checkpoint = None if full else self._trusted_checkpoint(found)
+        seq, prev_digest, offset = checkpoint or (base_seq, prev_digest, 0)
+        if verified_from is None:
+            verified_from = seq
+        active_end = self._current_size()
+        ranges = _chunk_ranges(self.log_file, offset, active_end, chunk_bytes)
+        plan.append((None, ranges, prev_digest, seq - base_seq, found))
 
-        return {"valid": len(errors) == 0, "entries": count, "errors": errors}
+        jobs = [
+            (str(self._segment_path(record) if record else self.log_file), self._hmac_key, lo, hi)
+            for record, ranges, _, _, _ in plan for lo, hi in ranges or ()
+        ]
+        if workers > 1 and len(jobs) > 1:
+            results = list(_verify_executor(workers).map(_verify_chunk, *zip(*jobs)))
+        else:
+            results = [_verify_chunk(*job) for job in jobs]
+
+        # Stitch file by file, checking the links at every seam
+        passed = []
+        for record, ranges, prev_digest, lineno, found in plan:
+            chunks, results = results[:len(ranges or ())], results[len(ranges or ()):]
+            if record is None:
+                errors.extend(found)
+                count, last_digest, last_seq = _stitch(chunks, prev_digest, lineno, errors)
+                continue
+            label = f"Segment {record['segment']}"
+            if ranges is None:
+                if record["first_prev_digest"] != prev_digest:
+                    errors.append(f"{label}: {_chain_break(prev_digest)}")
+                continue
+            segment_errors = list(found)
+            entries, last, _ = _stitch(chunks, prev_digest, 0, segment_errors)
+            if not segment_errors and (entries, last) != (record["entries"], record["last_digest"]):
+                segment_errors.append("entries do not match the segment footer")
+            errors.extend(f"{label}: {error}" for error in segment_errors)
+            if not segment_errors and not self._segment_trusted(
+                record, verified.get(record["segment"])
+            ):
+                passed.append(record)
+
+        # Remember what checked out so routine runs can skip it
+        with self._io_lock, self._file_lock():
+            for record in passed:
+                self._mark_verified(record)
+            if not errors and isinstance(last_seq, int) and last_seq > self._checkpoint_seq:
+                self._write_checkpoint(last_seq, last_digest, active_end)
+
+        return {
+            "valid": len(errors) == 0,
+            "entries": seq + count,
+            "errors": errors,
+            "verified_from": verified_from,
+            "segments": {
+                "sealed": len(segments),
+                "skipped": sum(1 for _, ranges, *_ in plan[:-1] if ranges is None),
+            },
+        }
 
     # ------------------------------------------------------------------
     # Convenience event loggers
@@ -171,11 +660,13 @@ class AuditLog:
             detail={"complaint_id": complaint_id},
         )
 
-    def log_block_mined(self, block_index: int, block_hash: str) -> dict:
-        return self.log_event(
-            "BLOCK_MINED",
-            detail={"block_index": block_index, "block_hash": block_hash},
-        )
+    def log_block_mined(
+        self, block_index: int, block_hash: str, complaint_ids: Optional[list[str]] = None
+    ) -> dict:
+        detail = {"block_index": block_index, "block_hash": block_hash}
+        if complaint_ids is not None:
+            detail["complaint_ids"] = list(complaint_ids)
+        return self.log_event("BLOCK_MINED", detail=detail)
 
     def log_chain_validated(self, is_valid: bool, block_count: int) -> dict:
         return self.log_event(
@@ -208,25 +699,493 @@ class AuditLog:
     # Internals
     # ------------------------------------------------------------------
 
-    def _next_seq(self) -> int:
-        """Return the next sequence number (1-based)."""
-        if not self.log_file.exists():
-            return 1
-        count = sum(1 for _ in open(self.log_file, "r", encoding="utf-8") if _.strip())
-        return count + 1
-
-    def _recover_last_digest(self) -> str:
-        """Read the HMAC of the last entry to continue the chain."""
-        if not self.log_file.exists():
-            return "0" * 64
-        last_line = ""
-        with open(self.log_file, "r", encoding="utf-8") as fh:
-            for line in fh:
-                if line.strip():
-                    last_line = line.strip()
+    def _queue_entry(
+        self, event_type: str, actor: str, detail: Optional[dict], severity: str
+    ) -> dict:
+        """Queue one entry (call with ``_lock`` held); it is chained on commit."""
+        entry = {
+            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+            "event": event_type,
+            "actor": actor,
+            "severity": severity,
+            "detail": detail or {},
+        }
+        self._pending.append(entry)
+        self._queued += 1
+        return entry
+
+    def _chain(self, batch: list[dict]) -> list[dict]:
+        """Give ``batch`` its ``seq``, ``prev_digest`` and ``hmac``, in order.
+
+        Returns new dicts; the chain state moves only once they are written.
+        """
+        seq, prev_digest = self._seq, self._prev_digest
+        chained = []
+        for queued in batch:
+            seq += 1
+            entry = {"seq": seq, **queued, "prev_digest": prev_digest}
+            # Compute HMAC over canonical JSON
+            entry["hmac"] = prev_digest = _entry_hmac(self._hmac_key, entry)
+            chained.append(entry)
+        return chained
+
+    def _commit(self) -> None:
+        """Group commit: write all queued lines at once, then one fsync."""
+        with self._io_lock, self._file_lock():
+            self._write_queued()
+
+    def _write_queued(self) -> None:
+        # Called with ``_io_lock`` and the file lock held
+        with self._lock:
+            batch, self._pending = self._pending, []
+            upto = self._queued
+        if batch:
+            # Another process (or AuditLog instance) rotated or appended
+            # since our last write: pick up its tail so the chain stays linked.
+            self._follow_rotation()
+            if self._current_size() != self._size:
+                self._seq, self._prev_digest, self._size = self._recover_tail()
+            chained = self._chain(batch)
+            try:
+                if self._fh is None:
+                    self._fh = open(self.log_file, "ab", buffering=0)
+                self._fh.write(b"".join((dumps_str(entry) + "\n").encode("utf-8") for entry in chained))
+                os.fsync(self._fh.fileno())
+            except OSError:
+                # Keep the entries queued, in order, for the next commit
+                with self._lock:
+                    self._pending[:0] = batch
+                self._size = -1  # part of the batch may have reached the file
+                raise
+            for queued, entry in zip(batch, chained):
+                queued.clear()
+                queued.update(entry)
+            last_seq, last_digest = chained[-1]["seq"], chained[-1]["hmac"]
+            self._seq, self._prev_digest = last_seq, last_digest
+            size = self._fh.tell()
+            if self._segment_opened is None:
+                self._segment_opened = time.time()
+            self._index_entries(chained, self._segment_no, size)
+            if self._rotation_due(size):
+                self._rotate(last_seq, last_digest, size)
+                size = 0
+            elif self._checkpoint_due(last_seq):
+                self._write_checkpoint(last_seq, last_digest, size)
+            self._size = size
+        with self._lock:
+            self._committed = max(self._committed, upto)
+            self._flushed.notify_all()
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Exclusive ``flock`` on ``audit.lock``, shared by every writer process."""
+        if fcntl is None:
+            yield
+            return
+        if self._lock_fh is None or self._lock_pid != os.getpid():
+            # A handle inherited through fork() shares the parent's lock
+            self._lock_fh = open(self.lock_file, "ab")
+            self._lock_pid = os.getpid()
+        fcntl.flock(self._lock_fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fh.fileno(), fcntl.LOCK_UN)
+
+    def _follow_rotation(self) -> None:
+        """Pick up segments sealed by another process (file lock held)."""
+        size = self._manifest_bytes()
+        if size == self._manifest_size:
+            return
+        self._manifest_size = size
+        if self._fh is not None:
+            self._fh.close()  # still points at the file that was moved
+            self._fh = None
+        self._segment_no = len(self._read_manifest()[0]) + 1
+        self._segment_opened = self._first_entry_time()
+        self._checkpoint_seq = max(self._last_checkpoint_seq(), self._sealed_tip()[0])
+        self._size = -1  # re-read the tail before the next append
+
+    def _ensure_writer(self) -> None:
+        # Called with ``_lock`` held
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(
+                target=self._run_writer, name="evichain-audit-writer", daemon=True,
+            )
+            self._writer.start()
+
+    def _run_writer(self) -> None:
+        while not self._stop.is_set():
+            if self.durability == "batch":
+                with self._lock:
+                    while not self._pending and not self._stop.is_set():
+                        self._has_pending.wait()
+            else:
+                self._stop.wait(self.flush_interval)
+            try:
+                self._commit()
+            except OSError as exc:
+                print(f"[ERROR] Audit log write failed: {exc}")
+                self._stop.wait(self.flush_interval)
+
+    def _check_pid(self) -> None:
+        """After ``fork()`` the child gets no writer thread and a shared handle.
+
+        Entries the parent had queued are the parent's to write; the child
+        drops them and re-reads the tail on its first append.
+        """
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._has_pending = threading.Condition(self._lock)
+        self._flushed = threading.Condition(self._lock)
+        self._io_lock = threading.Lock()
+        self._pending = []
+        self._committed = self._queued
+        self._size = -1
+        self._fh = None
+        self._writer = None
+        self._stop = threading.Event()
+
+    def _current_size(self) -> int:
+        try:
+            return self.log_file.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _recover_tail(self) -> tuple[int, str, int]:
+        """Return ``(last_seq, last_hmac, file_size)`` from the end of the log.
+
+        Only the last line is read (see ``_last_line``).  A final line
+        without its newline is a torn write: it is cut off, so the next
+        entry starts on a line of its own.  If the last complete line is
+        not a valid entry, the file is scanned for the last one that is.
+        """
+        size = self._current_size()
+        if size:
+            size = self._truncate_torn_tail(size)
+        last_line = _last_line(self.log_file)
         if not last_line:
-            return "0" * 64
+            # Fresh segment: the chain continues from the last sealed one
+            return (*self._sealed_tip(), size)
+        try:
+            entry = loads(last_line)
+            return int(entry["seq"]), entry["hmac"], size
+        except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError):
+            return (*self._last_valid_entry(), size)
+
+    def _truncate_torn_tail(self, size: int) -> int:
+        """Cut a partial last line left by a crash; returns the new size."""
+        with open(self.log_file, "r+b") as fh:
+            end = size
+            fh.seek(end - 1)
+            if fh.read(1) == b"\n":
+                return size
+            cut = 0
+            while end > 0:
+                start = max(0, end - TAIL_CHUNK)
+                fh.seek(start)
+                newline = fh.read(end - start).rfind(b"\n")
+                if newline != -1:
+                    cut = start + newline + 1
+                    break
+                end = start
+            fh.truncate(cut)
+            os.fsync(fh.fileno())
+        print(f"[WARN] Audit log: discarded {size - cut} bytes of a torn last entry")
+        return cut
+
+    def _last_valid_entry(self) -> tuple[int, str]:
+        """``(seq, hmac)`` of the last parseable entry, scanning the whole file."""
+        last = self._sealed_tip()
+        with open(self.log_file, "rb") as fh:
+            for line in fh:
+                try:
+                    entry = loads(line)
+                    last = int(entry["seq"]), entry["hmac"]
+                except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError):
+                    continue
+        return last
+
+    # ------------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, record: dict) -> Path:
+        return self.segments_dir / _segment_name(record["segment"])
+
+    def _rotation_due(self, size: int) -> bool:
+        if self.segment_bytes and size >= self.segment_bytes:
+            return True
+        return bool(
+            self.segment_seconds
+            and self._segment_opened is not None
+            and time.time() - self._segment_opened >= self.segment_seconds
+        )
+
+    def _rotate(self, last_seq: int, last_digest: str, size: int) -> None:
+        """Seal the active file as the next segment (call with ``_io_lock`` held)."""
+        self._fh.close()
+        self._fh = None
+        first = _parse_record(_first_line(self.log_file))
+        record = {
+            "type": "segment",
+            "segment": self._segment_no,
+            "first_seq": first.get("seq"),
+            "last_seq": last_seq,
+            "first_prev_digest": first.get("prev_digest"),
+            "last_digest": last_digest,
+            "entries": last_seq - first.get("seq", last_seq + 1) + 1,
+            "bytes": size,
+            "sha256": _file_sha256(self.log_file, size),
+            "sealed_utc": datetime.now(timezone.utc).isoformat(),
+        }
+        record["hmac"] = _entry_hmac(self._hmac_key, record)
+        line = (dumps_str(record) + "\n").encode("utf-8")
+
+        # Footer, rename, manifest – _finish_rotation() resumes after a crash
+        with open(self.log_file, "ab") as fh:
+            fh.write(line)
+            os.fsync(fh.fileno())
+        self.segments_dir.mkdir(exist_ok=True)
+        os.replace(self.log_file, self._segment_path(record))
+        _fsync_dir(self.segments_dir)
+        _fsync_dir(self.log_dir)
+        self._append_manifest(line)
+
+        # Checkpoints only ever describe the active file
+        self.checkpoint_file.unlink(missing_ok=True)
+        self._checkpoint_seq = last_seq
+        self._checkpoint_time = time.monotonic()
+        self._segment_no += 1
+        self._segment_opened = None
+
+    def _finish_rotation(self) -> None:
+        """Complete a rotation interrupted between footer, rename and manifest."""
+        number = len(self._read_manifest()[0]) + 1
+        footer = _parse_record(_last_line(self.log_file))
+        if footer.get("type") == "segment" and footer.get("segment") == number:
+            self.segments_dir.mkdir(exist_ok=True)
+            os.replace(self.log_file, self.segments_dir / _segment_name(number))
+        sealed = self.segments_dir / _segment_name(number)
+        footer_line = _last_line(sealed)
+        footer = _parse_record(footer_line)
+        if footer.get("type") == "segment" and footer.get("segment") == number:
+            self._append_manifest(footer_line + b"\n")
+            self.checkpoint_file.unlink(missing_ok=True)
+
+    def _append_manifest(self, line: bytes) -> None:
+        with open(self.manifest_file, "ab") as fh:
+            fh.write(line)
+            os.fsync(fh.fileno())
+        self._manifest_size = self._manifest_bytes()
+
+    def _manifest_bytes(self) -> int:
+        try:
+            return self.manifest_file.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _read_manifest(self) -> tuple[list[dict], dict[int, dict], list[str]]:
+        """Return ``(segments, verified records by segment, errors)``.
+
+        Records with a bad HMAC or out of sequence are reported and left out.
+        """
+        segments: list[dict] = []
+        verified: dict[int, dict] = {}
+        errors: list[str] = []
+        if not self.manifest_file.exists():
+            return segments, verified, errors
+        with open(self.manifest_file, "rb") as fh:
+            for lineno, line in enumerate(fh, 1):
+                if not line.strip():
+                    continue
+                record = _parse_record(line)
+                stored = record.pop("hmac", "")
+                if not record or not hmac.compare_digest(
+                    str(stored), _entry_hmac(self._hmac_key, record)
+                ):
+                    errors.append(f"Manifest line {lineno}: HMAC mismatch")
+                    continue
+                record["hmac"] = stored
+                if record.get("type") == "verified":
+                    verified[record["segment"]] = record
+                elif record.get("segment") == len(segments) + 1:
+                    segments.append(record)
+                else:
+                    errors.append(
+                        f"Manifest line {lineno}: expected segment {len(segments) + 1}"
+                    )
+        return segments, verified, errors
+
+    def _sealed_tip(self) -> tuple[int, str]:
+        """``(last_seq, last_digest)`` of the last sealed segment."""
+        segments = self._read_manifest()[0]
+        if not segments:
+            return 0, GENESIS_DIGEST
+        return segments[-1]["last_seq"], segments[-1]["last_digest"]
+
+    def _first_entry_time(self) -> Optional[float]:
+        stamp = _parse_record(_first_line(self.log_file)).get("timestamp_utc")
+        try:
+            return datetime.fromisoformat(stamp).timestamp() if stamp else None
+        except (TypeError, ValueError):
+            return None
+
+    def _segment_trusted(self, record: dict, verified: Optional[dict]) -> bool:
+        """A verified record for this exact segment, and the file is unchanged in size."""
+        if not verified or verified.get("sha256") != record["sha256"]:
+            return False
+        try:
+            return self._segment_path(record).stat().st_size == verified["size"]
+        except OSError:
+            return False
+
+    def _check_segment(self, record: dict, chunk_bytes: int, errors: list[str]) -> list:
+        """Check a segment's footer and digest; return its chunk ranges."""
+        path = self._segment_path(record)
+        if not path.exists():
+            errors.append(f"file {path.name} missing")
+            return []
+        footer = _parse_record(_last_line(path))
+        if footer != record:
+            errors.append("footer does not match the manifest")
+        if _file_sha256(path, record["bytes"]) != record["sha256"]:
+            errors.append("SHA-256 does not match the footer")
+        return _chunk_ranges(path, 0, record["bytes"], chunk_bytes)
+
+    def _mark_verified(self, record: dict) -> None:
+        """Record in the manifest that a segment verified (``_io_lock`` held)."""
+        entry = {
+            "type": "verified",
+            "segment": record["segment"],
+            "sha256": record["sha256"],
+            "size": self._segment_path(record).stat().st_size,
+            "verified_utc": datetime.now(timezone.utc).isoformat(),
+        }
+        entry["hmac"] = _entry_hmac(self._hmac_key, entry)
+        self._append_manifest((dumps_str(entry) + "\n").encode("utf-8"))
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _index_entries(self, entries: list[dict], segment: int, offset: int) -> None:
+        # The log is the record; a failed index update is caught up on restart
+        if self.index is None:
+            return
+        try:
+            self.index.add(entries, segment, offset)
+        except sqlite3.Error as exc:
+            print(f"[WARN] Audit index update failed: {exc}")
+
+    def _catch_up_index(self) -> None:
+        """Index what was written after the index's resume position."""
+        segment, offset = self.index.position()
+        if segment > self._segment_no or (
+            segment == self._segment_no and offset > self._current_size()
+        ):
+            # The index belongs to other files (e.g. restored log): rebuild
+            self.index.clear()
+            segment, offset = 1, 0
+        files = [
+            (record["segment"], self._segment_path(record))
+            for record in self._read_manifest()[0] if record["segment"] >= segment
+        ]
+        files.append((self._segment_no, self.log_file))
+        for number, path in files:
+            position = offset if number == segment else 0
+            if not path.exists():
+                continue
+            entries: list[dict] = []
+            with open(path, "rb") as fh:
+                fh.seek(position)
+                for raw in fh:
+                    position += len(raw)
+                    record = _parse_record(raw.strip())
+                    if isinstance(record.get("seq"), int) and "type" not in record:
+                        entries.append(record)
+                    if len(entries) >= 1000:
+                        self._index_entries(entries, number, position)
+                        entries = []
+            self._index_entries(entries, number, position)
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def _checkpoint_hmac(self, record: dict) -> str:
+        return _entry_hmac(self._hmac_key, record)
+
+    def _checkpoint_due(self, seq: int) -> bool:
+        if seq <= self._checkpoint_seq:
+            return False
+        if self.checkpoint_every and seq - self._checkpoint_seq >= self.checkpoint_every:
+            return True
+        return bool(
+            self.checkpoint_seconds
+            and time.monotonic() - self._checkpoint_time >= self.checkpoint_seconds
+        )
+
+    def _write_checkpoint(self, seq: int, digest: str, offset: int) -> None:
+        """Append a signed checkpoint (call with ``_io_lock`` held)."""
+        record = {
+            "type": "checkpoint",
+            "segment": self._segment_no,
+            "seq": seq,
+            "digest": digest,
+            "offset": offset,
+            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        }
+        record["hmac"] = self._checkpoint_hmac(record)
+        with open(self.checkpoint_file, "ab") as fh:
+            fh.write((dumps_str(record) + "\n").encode("utf-8"))
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._checkpoint_seq = seq
+        self._checkpoint_time = time.monotonic()
+
+    def _last_checkpoint_seq(self) -> int:
+        try:
+            return int(loads(_last_line(self.checkpoint_file))["seq"])
+        except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError):
+            return 0
+
+    def _trusted_checkpoint(self, errors: list[str]) -> Optional[tuple[int, str, int]]:
+        """``(seq, digest, offset)`` of the last checkpoint, if it holds.
+
+        The checkpoint must carry a valid HMAC and the log must still hold
+        the entry with its ``seq`` and ``hmac`` ending exactly at ``offset``.
+        """
+        line = _last_line(self.checkpoint_file)
+        if not line:
+            return None
+        try:
+            record = loads(line)
+            stored = record.pop("hmac")
+            seq, digest, offset = int(record["seq"]), record["digest"], int(record["offset"])
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError):
+            errors.append("Checkpoint: invalid record")
+            return None
+        if not hmac.compare_digest(str(stored), self._checkpoint_hmac(record)):
+            errors.append(f"Checkpoint seq={seq}: HMAC mismatch")
+            return None
+        if record.get("segment", 1) != self._segment_no:
+            return None  # left over from before the last rotation
+        entry = {}
         try:
-            return json.loads(last_line).get("hmac", "0" * 64)
-        except json.JSONDecodeError:
-            return "0" * 64
+            with open(self.log_file, "rb") as fh:
+                fh.seek(max(0, offset - 1))
+                ends_at_offset = fh.read(1) == b"\n"  # b"" if the file is shorter
+        except FileNotFoundError:
+            ends_at_offset = False
+        if ends_at_offset:
+            try:
+                entry = loads(_last_line(self.log_file, end=offset))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                pass
+        if not isinstance(entry, dict) or (entry.get("seq"), entry.get("hmac")) != (seq, digest):
+            errors.append(f"Checkpoint seq={seq}: log entry at offset {offset} does not match")
+            return None
+        return seq, digest, offset
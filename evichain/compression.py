@@ -0,0 +1,177 @@
+"""
+EviChain – HTTP Content-Encoding helpers
+
+Small, dependency-free helpers for negotiating and producing compressed
+response bodies:
+
+1. ``negotiate_encoding()`` picks the best encoding the client accepts
+   (``br`` > ``gzip``) from the ``Accept-Encoding`` header.
+2. ``compress_body()`` produces a gzip or brotli encoded body.
+3. ``compress_stream()`` encodes an iterable of chunks incrementally, for
+   streamed responses whose length is not known up front.
+4. ``CompressedBodyCache`` keeps recently compressed bodies keyed by
+   ``(body digest, encoding)`` so a popular representation is compressed
+   once and a changed body is never answered from the cache.
+
+Brotli is optional: it is used only when the ``brotli`` package is
+installed (``pip install brotli``); otherwise gzip is offered.
+"""
+
+from __future__ import annotations
+
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Iterable, Iterator
+
+try:
+    import brotli  # optional
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+
+# Preferred order when the client accepts several encodings equally.
+ENCODING_PREFERENCE: tuple[str, ...] = ("br", "gzip")
+
+# Media types worth compressing (JSON and text documents).
+COMPRESSIBLE_MIMETYPES = frozenset({
+    "application/json",
+    "application/javascript",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+})
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Return the encodings this process can produce, in preference order."""
+    if brotli is None:
+        return tuple(e for e in ENCODING_PREFERENCE if e != "br")
+    return ENCODING_PREFERENCE
+
+
+def parse_accept_encoding(header: str | None) -> dict[str, float]:
+    """Parse an ``Accept-Encoding`` header into ``{coding: q}``."""
+    accepted: dict[str, float] = {}
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        coding = token.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate_encoding(
+    header: str | None, offered: tuple[str, ...] | None = None
+) -> str | None:
+    """Return the best offered encoding accepted by the client, or ``None``.
+
+    ``None`` means the identity (uncompressed) representation.
+    """
+    accepted = parse_accept_encoding(header)
+    if not accepted:
+        return None
+    wildcard = accepted.get("*", 0.0)
+    best: str | None = None
+    best_q = 0.0
+    for coding in offered or available_encodings():
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_body(body: bytes, encoding: str, *, level: int | None = None) -> bytes:
+    """Compress ``body`` with ``encoding`` (``"gzip"`` or ``"br"``)."""
+    if encoding == "gzip":
+        # mtime=0 keeps the output deterministic for identical input
+        return gzip.compress(body, compresslevel=6 if level is None else level, mtime=0)
+    if encoding == "br":
+        if brotli is None:
+            raise RuntimeError("brotli is not installed.  Install it with:  pip install brotli")
+        return brotli.compress(body, quality=5 if level is None else level)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def compress_stream(
+    chunks: Iterable[bytes | str], encoding: str, *, level: int | None = None
+) -> Iterator[bytes]:
+    """Incrementally encode ``chunks``; yields compressed chunks as available."""
+    if encoding == "gzip":
+        # wbits=31 → zlib stream with a gzip header/trailer
+        compressor = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+        process, finish = compressor.compress, compressor.flush
+    elif encoding == "br":
+        if brotli is None:
+            raise RuntimeError("brotli is not installed.  Install it with:  pip install brotli")
+        compressor = brotli.Compressor(quality=5 if level is None else level)
+        process, finish = compressor.process, compressor.finish
+    else:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        out = process(chunk)
+        if out:
+            yield out
+    tail = finish()
+    if tail:
+        yield tail
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the ``encoding`` representation of a resource tagged ``etag``."""
+    return f"{etag}-{encoding}"
+
+
+class CompressedBodyCache:
+    """Thread-safe LRU of compressed bodies keyed by ``(key, encoding)``.
+
+    The key must identify the exact bytes compressed (e.g. a body digest).
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, encoding: str) -> bytes | None:
+        with self._lock:
+            body = self._items.get((key, encoding))
+            if body is not None:
+                self._items.move_to_end((key, encoding))
+            return body
+
+    def put(self, key: str, encoding: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop((key, encoding), None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[(key, encoding)] = body
+            self._bytes += len(body)
+            while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -17,6 +17,30 @@ Both paths record receipts as JSON in ``data/anchors/`` so that any
 auditor can independently verify the chain's integrity at the moment
 of anchoring.
 
+The anchored root is the Merkle Mountain Range root over the block
+hashes (``evichain.mmr``, receipts carry ``root_scheme: "mmr-sha256"``),
+which the chain keeps up to date as blocks are mined.  Appending blocks
+extends that root rather than replacing it: a receipt stays verifiable
+against the root of the first ``chain_length`` blocks, and
+``consistency_proof()`` shows in O(log n) hashes that the anchored root
+is a prefix of the current one.  Older receipts without ``root_scheme``
+hold a flat SHA-256 over the concatenated hashes and are checked
+against the same prefix of the chain.
+
+Every receipt is also listed, one JSON line each, in the append-only
+``manifest.jsonl`` (type, time, chain length, root and where the token
+or transaction is).  ``list_anchors()`` pages through it newest first
+without opening receipt files, and ``verify_all_anchors()`` checks every
+receipt in one pass over the chain, computing each anchored root once.
+A missing manifest is rebuilt from the receipt files.
+
+``anchor_batch()`` timestamps many roots – checkpoints of this chain or
+roots handed over by other chains (``source``) – with one TSA request:
+each root becomes a leaf of a Merkle tree (``evichain.mmr``) and only
+the tree's root is sent.  Every root still gets its own receipt, whose
+``batch`` field holds the inclusion proof tying it to the timestamped
+root.  Roots from other sources can only be checked against that proof.
+
 Security note:
     External anchoring mitigates threat T-03 (privileged admin
     rewriting the chain file) by creating an independent verification
@@ -29,6 +53,10 @@ Usage::
     anchor = ExternalAnchor(blockchain)
     receipt = anchor.anchor_rfc3161()       # free, no API key
     receipt = anchor.anchor_btc_testnet()   # requires funded testnet wallet
+    anchor.consistency_proof(receipt["chain_length"])
+    anchor.list_anchors(limit=20)["next_cursor"]
+    anchor.verify_all_anchors()["invalid"]
+    anchor.anchor_batch([{"source": "crm-sp", "chain_length": 120, "root_hash": "..."}])
 """
 
 from __future__ import annotations
@@ -36,14 +64,34 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from .mmr import ROOT_SCHEME, MerkleMountainRange, verify_inclusion
+from .outbound import create_session
+from .serialization import canonical_dumps, dumps, dumps_str, loads
 
 if TYPE_CHECKING:
     from blockchain_simulator import EviChainBlockchain
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+FLAT_ROOT_SCHEME = "flat-sha256"
+
+
+def batch_leaf(root: dict) -> bytes:
+    """Leaf data of a root in a batch tree: what the root claims to cover."""
+    return canonical_dumps({
+        "source": root["source"],
+        "chain_length": root["chain_length"],
+        "root_scheme": root["root_scheme"],
+        "root_hash": root["root_hash"],
+    }).encode()
+
 
 class ExternalAnchor:
     """Manages external anchoring of blockchain root hashes."""
@@ -58,75 +106,152 @@ class ExternalAnchor:
         *,
         anchors_dir: str | None = None,
         tsa_url: str | None = None,
+        tsa_timeout: float | None = None,
+        source: str | None = None,
     ) -> None:
         self.blockchain = blockchain
+        # Name of this chain in batch receipts shared with other sources
+        self.source = source or os.getenv("EVICHAIN_ANCHOR_SOURCE", "evichain")
         self.anchors_dir = Path(anchors_dir or self.ANCHORS_DIR)
         self.anchors_dir.mkdir(parents=True, exist_ok=True)
         self.tsa_url = tsa_url or os.getenv(
             "EVICHAIN_TSA_URL", self.DEFAULT_TSA_URL
         )
+        self.tsa_timeout = tsa_timeout or float(os.getenv("EVICHAIN_TSA_TIMEOUT", "30"))
+        # Keep-alive connections to the TSA, re-created after a fork
+        self._session = None
+        self._session_pid: Optional[int] = None
+
+        self.manifest_file = self.anchors_dir / "manifest.jsonl"
+        self._manifest_lock = threading.Lock()
+        self._manifest: list[dict] = []
+        self._manifest_offset = 0
+        if not self.manifest_file.exists():
+            self.rebuild_manifest()
 
     # ------------------------------------------------------------------
     # Public helpers
     # ------------------------------------------------------------------
 
-    def compute_chain_root_hash(self) -> str:
-        """Return the SHA-256 digest over all block hashes (Merkle-like root).
+    def compute_chain_root_hash(self, chain_length: Optional[int] = None) -> str:
+        """Return the MMR root over the first ``chain_length`` block hashes.
 
-        The root is computed by hashing the concatenation of every block
-        hash in order, so any single-block change invalidates the root.
+        Defaults to the whole chain.  Any change to one of those blocks
+        changes the root; blocks appended after them do not.
         """
-        concat = "".join(block.hash for block in self.blockchain.chain)
-        return hashlib.sha256(concat.encode()).hexdigest()
+        mmr = self.blockchain.mmr
+        return mmr.root_at(len(mmr) if chain_length is None else chain_length).hex()
+
+    def consistency_proof(self, first: int, second: Optional[int] = None) -> dict:
+        """Proof that the root at ``first`` blocks is a prefix of the root at ``second``.
+
+        ``second`` defaults to the current chain length.  Raises
+        ``ValueError`` when the sizes are out of range.
+        """
+        mmr = self.blockchain.mmr
+        second = len(mmr) if second is None else second
+        proof = mmr.consistency_proof(first, second)
+        return {
+            "root_scheme": ROOT_SCHEME,
+            "first_size": first,
+            "second_size": second,
+            "first_root": mmr.root_at(first).hex(),
+            "second_root": mmr.root_at(second).hex(),
+            "proof": [node.hex() for node in proof],
+        }
+
+    def _snapshot(self) -> tuple[int, str]:
+        """Current ``(chain_length, root_hash)``, taken from the same size."""
+        length = len(self.blockchain.mmr)
+        return length, self.compute_chain_root_hash(length)
 
     # ------------------------------------------------------------------
     # RFC 3161 Time-Stamp Protocol
     # ------------------------------------------------------------------
 
-    def anchor_rfc3161(self) -> dict:
-        """Request an RFC 3161 timestamp token for the current chain root.
+    def anchor_rfc3161(self, chain_length: Optional[int] = None) -> dict:
+        """Request an RFC 3161 timestamp token for the chain root.
 
-        Returns a receipt dict saved to ``anchors_dir``.
+        Anchors the first ``chain_length`` blocks (default: the whole
+        chain).  Returns a receipt dict saved to ``anchors_dir``.
         Requires the ``requests`` library (already a project dependency).
         """
-        import requests  # project dependency
-
-        root_hash = self.compute_chain_root_hash()
-        digest_bytes = bytes.fromhex(root_hash)
-
-        # Build a minimal TimeStampReq (DER) ---------------------------
-        ts_request = self._build_ts_request(digest_bytes)
-
-        resp = requests.post(
-            self.tsa_url,
-            data=ts_request,
-            headers={"Content-Type": "application/timestamp-query"},
-            timeout=30,
-        )
-        resp.raise_for_status()
+        if chain_length is None:
+            chain_length, root_hash = self._snapshot()
+        else:
+            root_hash = self.compute_chain_root_hash(chain_length)
+        resp = self._request_token(bytes.fromhex(root_hash))
 
         # Persist the token ----------------------------------------------
         ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-        token_path = self.anchors_dir / f"rfc3161_{ts}.tsr"
+        stem = self._unique_stem(f"rfc3161_{ts}_{chain_length}")
+        token_path = self.anchors_dir / f"{stem}.tsr"
         token_path.write_bytes(resp.content)
 
         receipt = {
             "type": "rfc3161",
             "timestamp_utc": ts,
-            "chain_length": len(self.blockchain.chain),
+            "chain_length": chain_length,
+            "root_scheme": ROOT_SCHEME,
             "root_hash": root_hash,
-            "tsa_url": self.tsa_url,
-            "token_file": str(token_path),
-            "token_size_bytes": len(resp.content),
-            "http_status": resp.status_code,
+            **self._token_fields(token_path, resp),
         }
 
-        receipt_path = self.anchors_dir / f"rfc3161_{ts}.json"
-        receipt_path.write_text(
-            json.dumps(receipt, indent=2, ensure_ascii=False), encoding="utf-8"
-        )
+        self._save_receipts([(receipt, self.anchors_dir / f"{stem}.json")])
         return receipt
 
+    def anchor_batch(self, roots: Sequence[dict]) -> list[dict]:
+        """Timestamp the Merkle root over ``roots`` with a single TSA request.
+
+        Each root is a dict with ``chain_length`` and ``root_hash``, plus
+        ``source`` (default: this chain) and ``root_scheme`` (default
+        ``mmr-sha256``).  Roots of this chain must match it.  Returns one
+        receipt per root, in order, each with its inclusion proof.
+        """
+        if not roots:
+            raise ValueError("No roots to anchor")
+        leaves = []
+        for root in roots:
+            root = {
+                "source": root.get("source") or self.source,
+                "chain_length": int(root["chain_length"]),
+                "root_scheme": root.get("root_scheme") or ROOT_SCHEME,
+                "root_hash": root["root_hash"],
+            }
+            if root["source"] == self.source and not self._local_root_matches(root):
+                raise ValueError(
+                    f"Root for {root['chain_length']} blocks does not match this chain"
+                )
+            leaves.append(root)
+
+        tree = MerkleMountainRange(batch_leaf(root) for root in leaves)
+        batch_root = tree.root()
+        resp = self._request_token(batch_root)
+
+        ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        stem = self._unique_stem(f"rfc3161_{ts}_batch")
+        token_path = self.anchors_dir / f"{stem}.tsr"
+        token_path.write_bytes(resp.content)
+
+        token = self._token_fields(token_path, resp)
+        receipts = []
+        for index, root in enumerate(leaves):
+            receipt = {
+                "type": "rfc3161",
+                "timestamp_utc": ts,
+                **root,
+                "batch": {
+                    "root": batch_root.hex(),
+                    "size": len(leaves),
+                    "index": index,
+                    "proof": [node.hex() for node in tree.inclusion_proof(index)],
+                },
+                **token,
+            }
+            receipts.append((receipt, self.anchors_dir / f"{stem}_{index}.json"))
+        self._save_receipts(receipts)
+        return [receipt for receipt, _ in receipts]
+
     # ------------------------------------------------------------------
     # Bitcoin Testnet OP_RETURN  (optional)
     # ------------------------------------------------------------------
@@ -148,7 +273,7 @@ class ExternalAnchor:
                 "Install it with:  pip install bitcoinlib"
             ) from exc
 
-        root_hash = self.compute_chain_root_hash()
+        chain_length, root_hash = self._snapshot()
         digest_bytes = bytes.fromhex(root_hash)
 
         wallet_name = os.getenv("EVICHAIN_BTC_WALLET", "evichain-testnet")
@@ -168,17 +293,15 @@ class ExternalAnchor:
         receipt = {
             "type": "btc_testnet_op_return",
             "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-            "chain_length": len(self.blockchain.chain),
+            "chain_length": chain_length,
+            "root_scheme": ROOT_SCHEME,
             "root_hash": root_hash,
             "txid": tx.txid if hasattr(tx, "txid") else str(tx),
             "network": "testnet",
         }
 
         ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-        receipt_path = self.anchors_dir / f"btc_testnet_{ts}.json"
-        receipt_path.write_text(
-            json.dumps(receipt, indent=2, ensure_ascii=False), encoding="utf-8"
-        )
+        self._save_receipts([(receipt, self.anchors_dir / f"{self._unique_stem(f'btc_testnet_{ts}')}.json")])
         return receipt
 
     # ------------------------------------------------------------------
@@ -188,35 +311,251 @@ class ExternalAnchor:
     def verify_anchor(self, receipt_path: str) -> dict:
         """Verify a previously saved anchor receipt against current chain.
 
-        Returns a dict with ``valid`` (bool) and ``details``.
+        The receipt is valid when the first ``chain_length`` blocks still
+        have the anchored root and, for a batch receipt, the root's
+        inclusion proof leads to the timestamped batch root.  Valid MMR
+        receipts also get the consistency proof from that root to the
+        current one, for an auditor to check with
+        ``evichain.mmr.verify_consistency()``.  Roots of other sources are
+        checked against their inclusion proof only.
         """
-        receipt = json.loads(
-            Path(receipt_path).read_text(encoding="utf-8")
-        )
-        current_root = self.compute_chain_root_hash()
-        chain_unchanged = current_root == receipt["root_hash"]
-
-        return {
+        receipt = loads(Path(receipt_path).read_bytes())
+        anchored_length = receipt["chain_length"]
+        length_now, current_root = self._snapshot()
+        included = self._batch_included(receipt)
+        result = {
             "receipt_type": receipt["type"],
+            "source": receipt.get("source", self.source),
+            "root_scheme": receipt.get("root_scheme", FLAT_ROOT_SCHEME),
             "receipt_root_hash": receipt["root_hash"],
             "current_root_hash": current_root,
-            "chain_unchanged": chain_unchanged,
-            "chain_length_at_anchor": receipt["chain_length"],
-            "chain_length_now": len(self.blockchain.chain),
-            "valid": chain_unchanged,
+            "chain_length_at_anchor": anchored_length,
+            "chain_length_now": length_now,
+            "included_in_batch": included,
+        }
+        if result["source"] != self.source:
+            return {**result, "chain_unchanged": None, "valid": bool(included)}
+        if anchored_length > length_now:
+            return {**result, "chain_unchanged": False, "valid": False}
+
+        if receipt.get("root_scheme") == ROOT_SCHEME:
+            chain_unchanged = self.compute_chain_root_hash(anchored_length) == receipt["root_hash"]
+            if chain_unchanged:
+                result["consistency_proof"] = self.consistency_proof(anchored_length, length_now)["proof"]
+        else:
+            chain_unchanged = self._flat_root(anchored_length) == receipt["root_hash"]
+
+        valid = chain_unchanged and included is not False
+        return {**result, "chain_unchanged": chain_unchanged, "valid": valid}
+
+    def verify_all_anchors(self) -> dict:
+        """Check every receipt in the manifest against the current chain.
+
+        Receipts are visited in chain-length order while one pass over the
+        block hashes feeds the flat-root digest, so every anchored root is
+        computed once however many receipts share it.  Returns
+        ``{"checked", "valid", "invalid": [seq, ...], "results": [...]}``.
+        """
+        entries = sorted(self._manifest_entries(), key=lambda e: e["chain_length"])
+        length_now = len(self.blockchain.mmr)
+        chain = self.blockchain.chain
+        roots: dict[tuple[str, int], str] = {}
+        flat = hashlib.sha256()
+        hashed = 0
+
+        results = []
+        for entry in entries:
+            length, scheme = entry["chain_length"], entry["root_scheme"]
+            key = (scheme, length)
+            source = entry.get("source", self.source)
+            local = source == self.source
+            if not local or length > length_now:
+                root = None
+            elif key in roots:
+                root = roots[key]
+            elif scheme == ROOT_SCHEME:
+                root = roots[key] = self.compute_chain_root_hash(length)
+            else:
+                for block in chain[hashed:length]:
+                    flat.update(block.hash.encode())
+                hashed = length
+                root = roots[key] = flat.hexdigest()
+            included = self._batch_included(entry)
+            if local:
+                valid = root == entry["root_hash"] and included is not False
+            else:
+                valid = included is True
+            token = entry.get("token")
+            results.append({
+                "seq": entry["seq"],
+                "type": entry["type"],
+                "source": source,
+                "chain_length": length,
+                "root_scheme": scheme,
+                "included_in_batch": included,
+                "valid": valid,
+                "token_found": (
+                    Path(token).is_file() if entry["type"] == "rfc3161" and token else None
+                ),
+            })
+
+        results.sort(key=lambda r: r["seq"])
+        invalid = [r["seq"] for r in results if not r["valid"]]
+        return {
+            "checked": len(results),
+            "valid": not invalid,
+            "invalid": invalid,
+            "chain_length_now": length_now,
+            "results": results,
         }
 
-    def list_anchors(self) -> list[dict]:
-        """Return metadata of all stored anchor receipts."""
-        anchors = []
-        for p in sorted(self.anchors_dir.glob("*.json")):
-            anchors.append(json.loads(p.read_text(encoding="utf-8")))
-        return anchors
+    def list_anchors(
+        self,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        before_seq: Optional[int] = None,
+    ) -> dict:
+        """Manifest entries, newest first, ``limit`` at a time.
+
+        Pass the returned ``next_cursor`` as ``before_seq`` for the next
+        page.  Returns ``{"anchors": [...], "next_cursor": seq or None}``.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        entries = self._manifest_entries()
+        end = len(entries) if before_seq is None else max(0, min(before_seq - 1, len(entries)))
+        page = entries[max(0, end - limit):end][::-1]
+        return {
+            "anchors": page,
+            "next_cursor": page[-1]["seq"] if page and page[-1]["seq"] > 1 else None,
+        }
+
+    def rebuild_manifest(self) -> int:
+        """Recreate ``manifest.jsonl`` from the receipt files, oldest first.
+
+        Returns the number of receipts listed.
+        """
+        paths = sorted(self.anchors_dir.glob("*.json"), key=lambda p: (p.stat().st_mtime, p.name))
+        lines = []
+        for path in paths:
+            try:
+                lines.append(dumps_str(self._manifest_record(loads(path.read_bytes()), path)) + "\n")
+            except (json.JSONDecodeError, KeyError, TypeError):
+                print(f"[WARN] Skipping unreadable anchor receipt {path.name}")
+        with self._manifest_lock:
+            tmp = self.manifest_file.with_suffix(".jsonl.tmp")
+            tmp.write_text("".join(lines), encoding="utf-8")
+            os.replace(tmp, self.manifest_file)
+            self._manifest = []
+            self._manifest_offset = 0
+        return len(lines)
 
     # ------------------------------------------------------------------
     # Internals
     # ------------------------------------------------------------------
 
+    @property
+    def session(self):
+        """Pooled ``requests.Session`` for the TSA (one per process)."""
+        if self._session is None or self._session_pid != os.getpid():
+            self._session = create_session(pool_size=2)
+            self._session_pid = os.getpid()
+        return self._session
+
+    def _unique_stem(self, stem: str) -> str:
+        """``stem``, suffixed if a receipt from the same second already has it."""
+        candidate, n = stem, 1
+        while any(self.anchors_dir.glob(f"{candidate}.*")):
+            n += 1
+            candidate = f"{stem}_{n}"
+        return candidate
+
+    def _request_token(self, digest: bytes):
+        """POST a TimeStampReq for ``digest`` to the TSA; return the response."""
+        resp = self.session.post(
+            self.tsa_url,
+            data=self._build_ts_request(digest),
+            headers={"Content-Type": "application/timestamp-query"},
+            timeout=self.tsa_timeout,
+        )
+        resp.raise_for_status()
+        return resp
+
+    def _token_fields(self, token_path: Path, resp) -> dict:
+        return {
+            "tsa_url": self.tsa_url,
+            "token_file": str(token_path),
+            "token_size_bytes": len(resp.content),
+            "http_status": resp.status_code,
+        }
+
+    def _local_root_matches(self, root: dict) -> bool:
+        if root["chain_length"] > len(self.blockchain.mmr):
+            return False
+        if root["root_scheme"] == ROOT_SCHEME:
+            return self.compute_chain_root_hash(root["chain_length"]) == root["root_hash"]
+        return self._flat_root(root["chain_length"]) == root["root_hash"]
+
+    @staticmethod
+    def _batch_included(receipt: dict) -> Optional[bool]:
+        """Whether a batch receipt's proof leads to its batch root (``None``: not batched)."""
+        batch = receipt.get("batch")
+        if not batch:
+            return None
+        return verify_inclusion(
+            batch["index"],
+            batch["size"],
+            batch_leaf(receipt),
+            bytes.fromhex(batch["root"]),
+            [bytes.fromhex(node) for node in batch["proof"]],
+        )
+
+    def _save_receipts(self, receipts: list[tuple[dict, Path]]) -> None:
+        """Write the receipt files, then list them in the manifest (one fsync)."""
+        lines = []
+        for receipt, path in receipts:
+            path.write_bytes(dumps(receipt, indent=True))
+            lines.append(dumps(self._manifest_record(receipt, path)) + b"\n")
+        with self._manifest_lock:
+            with open(self.manifest_file, "ab") as f:
+                f.write(b"".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _manifest_record(self, receipt: dict, path: Path) -> dict:
+        return {
+            "type": receipt["type"],
+            "timestamp_utc": receipt.get("timestamp_utc"),
+            "source": receipt.get("source", self.source),
+            "chain_length": receipt["chain_length"],
+            "root_scheme": receipt.get("root_scheme", FLAT_ROOT_SCHEME),
+            "root_hash": receipt["root_hash"],
+            "batch": receipt.get("batch"),
+            "token": receipt.get("token_file") or receipt.get("txid"),
+            "receipt_file": str(path),
+        }
+
+    def _manifest_entries(self) -> list[dict]:
+        """Manifest entries with their 1-based ``seq``, reading only new lines."""
+        with self._manifest_lock:
+            try:
+                with open(self.manifest_file, "rb") as f:
+                    f.seek(self._manifest_offset)
+                    data = f.read()
+            except FileNotFoundError:
+                data = b""
+            # A line still being appended by another process is read next time
+            complete = data[: data.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                if line.strip():
+                    self._manifest.append({**loads(line), "seq": len(self._manifest) + 1})
+            self._manifest_offset += len(complete)
+            return list(self._manifest)
+
+    def _flat_root(self, chain_length: int) -> str:
+        """Root of receipts made before ``root_scheme``: SHA-256 of the joined hashes."""
+        concat = "".join(block.hash for block in self.blockchain.chain[:chain_length])
+        return hashlib.sha256(concat.encode()).hexdigest()
+
     @staticmethod
     def _build_ts_request(digest: bytes) -> bytes:
         """Build a minimal DER-encoded RFC 3161 TimeStampReq.
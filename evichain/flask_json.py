@@ -0,0 +1,69 @@
+"""
+EviChain – Flask JSON provider
+
+Routes ``jsonify`` / ``request.get_json`` through
+``evichain.serialization`` so API responses use the fast backend
+(``orjson`` when installed).  Output stays equivalent to Flask's
+``DefaultJSONProvider``: keys sorted, compact outside debug mode, dates
+as HTTP dates via Flask's ``default`` hook.  Non-ASCII characters are
+emitted as UTF-8 instead of ``\\uXXXX`` escapes.  ``dumps()`` calls asking
+for a layout the fast encoder does not produce (other ``separators``, an
+``indent`` other than 2) are handed to the stdlib provider unchanged.
+
+Usage::
+
+    from evichain.flask_json import FastJSONProvider
+
+    app.json = FastJSONProvider(app)
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+from . import serialization
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """``DefaultJSONProvider`` backed by ``evichain.serialization``."""
+
+    ensure_ascii = False
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs.keys() - {"default", "sort_keys", "indent", "separators"} or not _fast_layout(kwargs):
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj, kwargs).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return serialization.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = self._encode(obj, {"indent": 2} if pretty else {})
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+    def _encode(self, obj: Any, kwargs: dict) -> bytes:
+        return serialization.dumps(
+            obj,
+            sort_keys=kwargs.get("sort_keys", self.sort_keys),
+            indent=bool(kwargs.get("indent")),
+            default=kwargs.get("default", self.default),
+        )
+
+
+def _fast_layout(kwargs: dict) -> bool:
+    """Whether ``serialization.dumps`` produces the layout ``kwargs`` ask for.
+
+    It writes compact ``(",", ":")`` separators, or ``(",", ": ")`` with a
+    two-space indent.
+    """
+    indent = kwargs.get("indent")
+    if indent not in (None, 2):
+        return False
+    separators = kwargs.get("separators")
+    return separators is None or tuple(separators) == ((",", ": ") if indent else (",", ":"))
@@ -0,0 +1,298 @@
+"""
+EviChain – Background Job Queue
+
+Runs slow pipelines (IA analysis, name detection, automatic
+investigations, mining, audit, registry lookups) outside the request that
+triggered them.  Each job has a ``kind``; ``register()`` maps kinds to
+handlers.
+
+* Bounded ``ThreadPoolExecutor`` pools execute jobs; once ``max_pending``
+  jobs are queued or running, ``submit()`` raises ``JobQueueFull`` so the
+  API can answer 503 instead of piling up work.  Kinds run on the
+  ``default`` pool (``max_workers``) unless registered on a named one
+  from ``pools``, so slow network lookups cannot hold every worker that
+  complaint sealing needs.
+* Every state change is written atomically to ``<jobs_dir>/<id>.json``
+  (write to a temp file + ``os.replace``), so job status survives a
+  restart and can be polled from any process sharing the directory.
+* ``recover()`` re-enqueues jobs that were queued or running when the
+  previous process stopped.  Handlers must therefore be idempotent; the
+  complaint handler uses the job id as the transaction ``origin_id`` and
+  skips jobs whose complaint is already on the chain.
+* The process running a job holds an exclusive ``flock`` on
+  ``<jobs_dir>/<id>.lock`` from ``submit()`` until the job finishes.  The
+  kernel drops it when that process dies, so every gunicorn worker can
+  call ``recover()`` at startup: it only takes over jobs whose lock it
+  can acquire, and never runs a job a live worker still owns.
+* A job that was started ``EVICHAIN_JOB_MAX_ATTEMPTS`` times (default 3)
+  without finishing – its worker died each time (OOM, a crash in a
+  lookup) – is marked ``failed`` by ``recover()`` instead of being run
+  again on every worker start.
+
+Usage::
+
+    from evichain.jobs import JobQueue
+
+    queue = JobQueue(handler=process_complaint, pools={"lookup": 4})
+    queue.register("investigation", run_investigation, pool="lookup")
+    queue.recover()
+    job = queue.submit({"descricao": "..."})
+    queue.get(job["id"])["status"]   # queued → running → done | failed
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+from .serialization import dumps, loads
+
+try:
+    import fcntl
+except ImportError:  # Windows: one server process (waitress), nothing to claim from
+    fcntl = None
+
+JOB_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when the queue already holds ``max_pending`` unfinished jobs."""
+
+
+class JobQueue:
+    """Bounded worker pool with durable, file-backed job state."""
+
+    def __init__(
+        self,
+        handler: Callable[[str, dict], dict],
+        *,
+        jobs_dir: str | Path | None = None,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+        retention_seconds: float = 7 * 24 * 3600,
+        pools: dict[str, int] | None = None,
+        max_attempts: int | None = None,
+    ) -> None:
+        self.handler = handler
+        self.handlers: dict[str, Callable[[str, dict], dict]] = {"complaint": handler}
+        self.kind_pools: dict[str, str] = {}
+        self.jobs_dir = Path(jobs_dir or os.getenv("EVICHAIN_JOBS_DIR", "data/jobs"))
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or int(os.getenv("EVICHAIN_JOB_WORKERS", "2"))
+        self.max_pending = max_pending or int(os.getenv("EVICHAIN_JOB_QUEUE_MAX", "100"))
+        self.retention_seconds = retention_seconds
+        self.max_attempts = max_attempts or int(os.getenv("EVICHAIN_JOB_MAX_ATTEMPTS", "3"))
+        # Worker count per pool name; kinds not registered on a pool use "default"
+        self.pool_workers = {"default": self.max_workers, **(pools or {})}
+
+        # Created on first use and re-created after a fork: worker threads
+        # do not survive fork(), so a pool inherited from a preloading
+        # master would accept work that never runs.
+        self._pools: dict[str, ThreadPoolExecutor] = {}
+        self._pool_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def register(
+        self, kind: str, handler: Callable[[str, dict], dict], *, pool: str = "default"
+    ) -> None:
+        """Route jobs of ``kind`` to ``handler``, run on the named worker ``pool``."""
+        if pool not in self.pool_workers:
+            raise ValueError(f"Unknown job pool: {pool}")
+        self.handlers[kind] = handler
+        self.kind_pools[kind] = pool
+
+    def submit(self, payload: dict, *, kind: str = "complaint") -> dict:
+        """Persist a new job and schedule it.  Returns the public job view."""
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise JobQueueFull(f"Job queue is full ({self.max_pending} pending)")
+            self._pending += 1
+
+        now = time.time()
+        job = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": STATUS_QUEUED,
+            "created_at": now,
+            "updated_at": now,
+            "attempts": 0,
+            "payload": payload,
+            "result": None,
+            "error": None,
+        }
+        claim = None
+        try:
+            # Locked before the job file exists, so no recover() can take it
+            claim = self._claim(job["id"])
+            self._save(job)
+            self._executor(kind).submit(self._run, job, claim)
+        except BaseException:
+            if claim is not None:
+                claim.close()
+            with self._lock:
+                self._pending -= 1
+            raise
+        return self.public_view(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return the public view of a job, or ``None`` if unknown."""
+        job = self._load(job_id)
+        return self.public_view(job) if job else None
+
+    def recover(self) -> int:
+        """Re-enqueue unfinished jobs no live process owns; prune old finished ones.
+
+        Jobs already started ``max_attempts`` times are marked failed
+        instead.  Returns the number of jobs re-enqueued.
+        """
+        recovered = 0
+        cutoff = time.time() - self.retention_seconds
+        for path in sorted(self.jobs_dir.glob("*.json")):
+            job = self._load(path.stem)
+            if job is None:
+                continue
+            if job["status"] in (STATUS_QUEUED, STATUS_RUNNING):
+                claim = self._claim(job["id"])
+                if claim is None:
+                    continue  # still running in another worker
+                # It may have finished between the read and the lock
+                job = self._load(path.stem)
+                if job is None or job["status"] not in (STATUS_QUEUED, STATUS_RUNNING):
+                    claim.close()
+                    continue
+                if job.get("attempts", 0) >= self.max_attempts:
+                    self._give_up(job)
+                    claim.close()
+                    continue
+                with self._lock:
+                    self._pending += 1
+                job["status"] = STATUS_QUEUED
+                self._save(job)
+                self._executor(job.get("kind", "complaint")).submit(self._run, job, claim)
+                recovered += 1
+            elif job.get("updated_at", 0) < cutoff:
+                path.unlink(missing_ok=True)
+                self._lock_path(job["id"]).unlink(missing_ok=True)
+        return recovered
+
+    def pending(self) -> int:
+        """Number of queued or running jobs in this process."""
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool_pid == os.getpid():
+            for pool in list(self._pools.values()):
+                pool.shutdown(wait=wait)
+
+    @staticmethod
+    def public_view(job: dict) -> dict:
+        """Job fields safe to return to clients (the payload is omitted)."""
+        return {k: v for k, v in job.items() if k != "payload"}
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _executor(self, kind: str) -> ThreadPoolExecutor:
+        name = self.kind_pools.get(kind, "default")
+        with self._lock:
+            if self._pool_pid != os.getpid():
+                self._pools = {}
+                self._pool_pid = os.getpid()
+            pool = self._pools.get(name)
+            if pool is None:
+                suffix = "" if name == "default" else f"-{name}"
+                pool = self._pools[name] = ThreadPoolExecutor(
+                    max_workers=self.pool_workers[name],
+                    thread_name_prefix=f"evichain-job{suffix}",
+                )
+            return pool
+
+    def _claim(self, job_id: str):
+        """Open and lock ``<id>.lock``; ``None`` if another process holds it."""
+        fh = open(self._lock_path(job_id), "ab")
+        if fcntl is None:
+            return fh
+        try:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return None
+        return fh
+
+    def _run(self, job: dict, claim) -> None:
+        try:
+            job["status"] = STATUS_RUNNING
+            job["attempts"] = job.get("attempts", 0) + 1
+            job["updated_at"] = time.time()
+            self._save(job)
+
+            try:
+                handler = self.handlers.get(job.get("kind", "complaint"))
+                if handler is None:
+                    raise LookupError(f"No handler registered for job kind: {job.get('kind')}")
+                job["result"] = handler(job["id"], job.get("payload") or {})
+                job["status"] = STATUS_DONE
+            except Exception as exc:  # handler errors are reported on the job
+                job["error"] = str(exc)
+                job["status"] = STATUS_FAILED
+
+            # The payload is only needed to (re)run the job.
+            job.pop("payload", None)
+            job["updated_at"] = time.time()
+            self._save(job)
+        finally:
+            claim.close()  # releases the flock
+            with self._lock:
+                self._pending -= 1
+
+    def _give_up(self, job: dict) -> None:
+        job["status"] = STATUS_FAILED
+        job["error"] = (
+            f"Worker stopped while running the job {job['attempts']} times; giving up"
+        )
+        job.pop("payload", None)
+        job["updated_at"] = time.time()
+        self._save(job)
+        print(f"[WARN] Job {job['id']} ({job.get('kind', 'complaint')}): {job['error']}")
+
+    def _path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _lock_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.lock"
+
+    def _save(self, job: dict) -> None:
+        path = self._path(job["id"])
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_bytes(dumps(job))
+        os.replace(tmp, path)
+
+    def _load(self, job_id: str) -> Optional[dict]:
+        if not JOB_ID_RE.match(job_id or ""):
+            return None
+        path = self._path(job_id)
+        try:
+            return loads(path.read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
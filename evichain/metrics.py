@@ -0,0 +1,288 @@
+"""
+EviChain – In-process Metrics
+
+A small, dependency-free metrics registry rendered in the Prometheus
+text exposition format (``/metrics``):
+
+1. ``Counter`` – monotonically increasing totals (requests by status).
+2. ``Gauge`` – a current value, either set explicitly or read from a
+   callback at scrape time (chain height).
+3. ``Histogram`` – fixed cumulative buckets; ``observe()`` is a bisect
+   plus three additions under a per-metric lock.
+
+Every label set gets its own series, so labels must have bounded
+cardinality: route *templates* (not raw paths), council codes, status
+codes – never names or ids.
+
+Each process keeps its own registry; with several gunicorn workers,
+scrape each worker or aggregate in the scraper.
+
+Usage::
+
+    from evichain.metrics import HTTP_REQUEST_SECONDS, REGISTRY
+
+    HTTP_REQUEST_SECONDS.observe(0.042, method="GET", route="/api/stats")
+    with MINING_SECONDS.time():
+        block.mine_block(difficulty)
+    body = REGISTRY.render()
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Sequence
+
+# Latency buckets in seconds: 1 ms … 60 s
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _samples(self) -> Iterator[tuple[str, list[tuple[str, str]], float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, pairs, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(pairs)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", list(zip(self.labelnames, key)), value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def set_function(self, fn: Optional[Callable[[], float]]) -> None:
+        """Read the (unlabelled) value from ``fn`` at scrape time."""
+        self._function = fn
+
+    def value(self, **labels) -> float:
+        if self._function is not None and not labels:
+            return float(self._function())
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        if self._function is not None:
+            try:
+                yield "", [], float(self._function())
+            except Exception:  # a failing callback must not break the scrape
+                pass
+            return
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", list(zip(self.labelnames, key)), value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (+Inf last), sum, count]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall-clock duration of the enclosed block, in seconds."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((k, (list(s[0]), s[1], s[2])) for k, s in self._series.items())
+        for key, (counts, total, count) in items:
+            pairs = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                yield "_bucket", pairs + [("le", _format_value(float(bound)))], cumulative
+            yield "_sum", pairs, total
+            yield "_count", pairs, count
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+def parse_text(text: str) -> dict[tuple[str, tuple[tuple[str, str], ...]], float]:
+    """Parse exposition text into ``{(sample_name, labels): value}``.
+
+    Enough for tests and the benchmark's scraper stand-in; not a full
+    implementation of the format (no timestamps, no escaped commas).
+    """
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        head, _, value = line.rpartition(" ")
+        name, _, rest = head.partition("{")
+        labels = []
+        if rest:
+            for part in rest.rstrip("}").split(","):
+                k, _, v = part.partition("=")
+                labels.append((k, v.strip('"')))
+        samples[(name, tuple(sorted(labels)))] = float(value.replace("+Inf", "inf"))
+    return samples
+
+
+# ---------------------------------------------------------------------------
+# EviChain metrics
+# ---------------------------------------------------------------------------
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "evichain_http_requests_total", "HTTP requests by route template and status.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "evichain_http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route"),
+)
+MINING_SECONDS = REGISTRY.histogram(
+    "evichain_mining_duration_seconds", "Proof-of-work time per mined block.",
+)
+MINING_NONCES = REGISTRY.histogram(
+    "evichain_mining_nonce", "Nonces tried per mined block.",
+    buckets=(10, 100, 1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 10_000_000),
+)
+OPENAI_SECONDS = REGISTRY.histogram(
+    "evichain_openai_request_duration_seconds", "OpenAI analysis call latency.",
+    ("outcome",),
+)
+REGISTRY_SCRAPE_SECONDS = REGISTRY.histogram(
+    "evichain_registry_scrape_duration_seconds", "Professional-registry lookup latency per council.",
+    ("council",),
+)
+AUDIT_APPEND_SECONDS = REGISTRY.histogram(
+    "evichain_audit_append_duration_seconds", "Audit log append (sign + write) time.",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+)
+CHAIN_HEIGHT = REGISTRY.gauge(
+    "evichain_chain_height", "Number of blocks in the served chain.",
+)
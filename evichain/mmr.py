@@ -0,0 +1,249 @@
+"""
+EviChain – Merkle Mountain Range over the Block Hashes
+
+An append-only accumulator of the chain's block hashes, kept up to date
+as blocks are mined, so an external anchor commits to a root that later
+blocks extend instead of replace:
+
+1. Leaves are ``SHA-256(0x00 || block_hash)`` and inner nodes
+   ``SHA-256(0x01 || left || right)`` (RFC 6962 domain separation), so a
+   leaf can never be passed off as a node.
+2. Every complete, aligned subtree is stored once, by height.  Appending
+   a leaf merges equal-height peaks – one node per carry, O(1) amortized.
+3. The root bags the peaks right to left, which makes it exactly the
+   RFC 6962 Merkle Tree Hash of the first ``n`` leaves.  ``root_at(m)``
+   gives the root any earlier chain length had, in O(log n).
+4. ``consistency_proof(m, n)`` returns the O(log n) hashes showing that
+   the tree of size ``m`` is a prefix of the tree of size ``n``;
+   ``verify_consistency()`` checks one with nothing but the two roots
+   (RFC 9162 §2.1.4.2).
+5. ``inclusion_proof(i)`` is the audit path of leaf ``i``;
+   ``verify_inclusion()`` recomputes the root from the leaf and that
+   path (RFC 9162 §2.1.3.2).  The same tree serves as the batch tree
+   when several roots share one timestamp.
+
+Usage::
+
+    from evichain.mmr import MerkleMountainRange, verify_consistency
+
+    mmr = MerkleMountainRange(block.hash.encode() for block in chain)
+    old_root = mmr.root()
+    mmr.append(new_block.hash.encode())
+    proof = mmr.consistency_proof(len(chain))
+    verify_consistency(len(chain), len(mmr), old_root, mmr.root(), proof)
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable, Optional, Sequence
+
+ROOT_SCHEME = "mmr-sha256"
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _split(size: int) -> int:
+    """Largest power of two strictly smaller than ``size`` (``size`` > 1)."""
+    return 1 << ((size - 1).bit_length() - 1)
+
+
+class MerkleMountainRange:
+    """Append-only Merkle accumulator with prefix roots and proofs."""
+
+    def __init__(self, leaves: Iterable[bytes] = ()) -> None:
+        # _levels[h][i] is the root of leaves [i * 2**h, (i + 1) * 2**h)
+        self._levels: list[list[bytes]] = [[]]
+        self.extend(leaves)
+
+    def __len__(self) -> int:
+        return len(self._levels[0])
+
+    # ------------------------------------------------------------------
+    # Appending
+    # ------------------------------------------------------------------
+
+    def append(self, data: bytes) -> None:
+        """Add the leaf for ``data`` and merge the peaks it completes."""
+        node = leaf_hash(data)
+        height = 0
+        while True:
+            level = self._levels[height]
+            level.append(node)
+            if len(level) % 2:
+                return
+            node = node_hash(level[-2], level[-1])
+            height += 1
+            if height == len(self._levels):
+                self._levels.append([])
+
+    def extend(self, leaves: Iterable[bytes]) -> None:
+        for data in leaves:
+            self.append(data)
+
+    # ------------------------------------------------------------------
+    # Roots
+    # ------------------------------------------------------------------
+
+    def root(self) -> bytes:
+        return self.root_at(len(self))
+
+    def root_at(self, size: int) -> bytes:
+        """Root of the tree over the first ``size`` leaves."""
+        self._check_size(size)
+        if size == 0:
+            return hashlib.sha256(b"").digest()
+        return self._subtree(0, size)
+
+    def peaks(self, size: Optional[int] = None) -> list[bytes]:
+        """Roots of the perfect subtrees covering the first ``size`` leaves."""
+        size = len(self) if size is None else size
+        self._check_size(size)
+        peaks, start = [], 0
+        for height in reversed(range(size.bit_length())):
+            if size >> height & 1:
+                peaks.append(self._levels[height][start >> height])
+                start += 1 << height
+        return peaks
+
+    # ------------------------------------------------------------------
+    # Proofs
+    # ------------------------------------------------------------------
+
+    def consistency_proof(self, first: int, second: Optional[int] = None) -> list[bytes]:
+        """Hashes proving the ``first``-leaf tree is a prefix of the ``second``.
+
+        ``second`` defaults to the current size.  Empty when the sizes are
+        equal; an empty tree is a prefix of anything and needs no proof.
+        """
+        second = len(self) if second is None else second
+        self._check_size(second)
+        if not 0 <= first <= second:
+            raise ValueError(f"first size {first} must be between 0 and {second}")
+        if first in (0, second):
+            return []
+        return self._subproof(first, 0, second, True)
+
+    def inclusion_proof(self, index: int, size: Optional[int] = None) -> list[bytes]:
+        """Audit path from leaf ``index`` to the root of the ``size``-leaf tree."""
+        size = len(self) if size is None else size
+        self._check_size(size)
+        if not 0 <= index < size:
+            raise ValueError(f"leaf {index} outside 0..{size - 1}")
+        return self._path(index, 0, size)
+
+    def _path(self, index: int, start: int, end: int) -> list[bytes]:
+        # RFC 6962 §2.1.1 PATH over leaves [start, end)
+        size = end - start
+        if size == 1:
+            return []
+        k = _split(size)
+        if index < k:
+            return self._path(index, start, start + k) + [self._subtree(start + k, end)]
+        return self._path(index - k, start + k, end) + [self._subtree(start, start + k)]
+
+    def _subproof(self, first: int, start: int, end: int, complete: bool) -> list[bytes]:
+        # RFC 6962 §2.1.2 SUBPROOF over leaves [start, end)
+        size = end - start
+        if first == size:
+            return [] if complete else [self._subtree(start, end)]
+        k = _split(size)
+        if first <= k:
+            return self._subproof(first, start, start + k, complete) + [self._subtree(start + k, end)]
+        return self._subproof(first - k, start + k, end, False) + [self._subtree(start, start + k)]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _subtree(self, start: int, end: int) -> bytes:
+        """Merkle Tree Hash of leaves [start, end); ``start`` is aligned."""
+        size = end - start
+        if size & (size - 1) == 0:
+            height = size.bit_length() - 1
+            return self._levels[height][start >> height]
+        k = _split(size)
+        return node_hash(self._subtree(start, start + k), self._subtree(start + k, end))
+
+    def _check_size(self, size: int) -> None:
+        if not 0 <= size <= len(self):
+            raise ValueError(f"size {size} outside 0..{len(self)}")
+
+
+def verify_consistency(
+    first: int,
+    second: int,
+    first_root: bytes,
+    second_root: bytes,
+    proof: Sequence[bytes],
+) -> bool:
+    """Check that ``proof`` links ``first_root`` to ``second_root``."""
+    if not 0 <= first <= second:
+        return False
+    if first == second:
+        return not proof and first_root == second_root
+    if first == 0:
+        return not proof
+    if not proof:
+        return False
+
+    path = list(proof)
+    if first & (first - 1) == 0:
+        path.insert(0, first_root)
+    fn, sn = first - 1, second - 1
+    while fn & 1:
+        fn >>= 1
+        sn >>= 1
+    fr = sr = path[0]
+    for node in path[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            fr = node_hash(node, fr)
+            sr = node_hash(node, sr)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            sr = node_hash(sr, node)
+        fn >>= 1
+        sn >>= 1
+    return fr == first_root and sr == second_root and sn == 0
+
+
+def verify_inclusion(
+    index: int,
+    size: int,
+    data: bytes,
+    root: bytes,
+    proof: Sequence[bytes],
+) -> bool:
+    """Check that ``data`` is leaf ``index`` of the ``size``-leaf tree with ``root``."""
+    if not 0 <= index < size:
+        return False
+    fn, sn = index, size - 1
+    node = leaf_hash(data)
+    for sibling in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            node = node_hash(sibling, node)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            node = node_hash(node, sibling)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and node == root
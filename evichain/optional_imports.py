@@ -0,0 +1,66 @@
+"""
+EviChain – Deferred Optional Imports
+
+The heavy third-party libraries (``openai`` ≈ 0.5 s, ``requests``,
+``bs4``, ``reportlab``) are only needed by some routes.  Importing them
+at module level made every worker – and every test run – pay for all of
+them at boot.  These accessors import a library on first use instead:
+
+1. ``available(name)`` – whether the library is installed, answered from
+   the import system's finders *without* importing it.
+2. ``optional_import(name)`` – the module, or ``None`` when missing.
+   The result is cached, so later calls cost one dict lookup.
+3. ``require(name)`` – the module, or ``ImportError`` with an install
+   hint.
+
+``HEAVY_MODULES`` lists what must stay out of ``import api_server``;
+``tests/test_services.py`` and ``benchmark.py --import-budget`` check it.
+
+Usage::
+
+    from evichain.optional_imports import available, require
+
+    OPENAI_DISPONIVEL = available("openai")
+    ...
+    client = require("openai").OpenAI(api_key=api_key)
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Optional
+
+HEAVY_MODULES = ("openai", "requests", "bs4", "lxml", "reportlab")
+
+# Nome do pacote no pip quando difere do módulo
+_PIP_NAMES = {"bs4": "beautifulsoup4", "openai": "openai>=1.0.0"}
+
+
+def available(name: str) -> bool:
+    """``True`` if ``name`` can be imported (the module is not loaded)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def optional_import(name: str) -> Optional[ModuleType]:
+    """Import ``name`` on first call; ``None`` if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def require(name: str) -> ModuleType:
+    """Import ``name`` on first call or raise ``ImportError`` with a hint."""
+    module = optional_import(name)
+    if module is None:
+        raise ImportError(
+            f"{name} is not installed.  Install it with:  pip install {_PIP_NAMES.get(name, name)}"
+        )
+    return module
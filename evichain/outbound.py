@@ -0,0 +1,132 @@
+"""
+EviChain – Outbound HTTP concurrency
+
+The investigation and registry lookups spend nearly all their time
+waiting on third-party sites (council portals, social networks, search
+APIs).  This module lets independent lookups wait *together* instead of
+one after another:
+
+1. ``fan_out()`` runs a mapping of independent calls on a shared,
+   bounded I/O thread pool (``EVICHAIN_OUTBOUND_WORKERS``, default 32)
+   and returns their results under the same keys.  A fan-out made from
+   inside that pool (e.g. the social and council lookups of a full
+   investigation) runs on a second pool of its own
+   (``EVICHAIN_OUTBOUND_NESTED_WORKERS``, default 16), so it never waits
+   for a slot held by its parent; one level further down, calls run
+   inline.
+2. ``create_session()`` builds a ``requests.Session`` whose connection
+   pool is large enough to be shared by the threads of both pools (the
+   default of 10 connections per host would make concurrent calls queue).
+
+Usage::
+
+    from evichain.outbound import create_session, fan_out
+
+    session = create_session(headers)
+    results = fan_out({
+        "facebook": lambda: buscar_facebook(nome),
+        "linkedin": lambda: buscar_linkedin(nome),
+    })
+"""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, Mapping, Optional, TypeVar
+
+from .tracing import tracer
+
+T = TypeVar("T")
+
+OUTBOUND_WORKERS = int(os.getenv("EVICHAIN_OUTBOUND_WORKERS", "32"))
+OUTBOUND_NESTED_WORKERS = int(os.getenv("EVICHAIN_OUTBOUND_NESTED_WORKERS", "16"))
+
+# One pool per nesting level: calls on level N only ever wait on level N + 1
+_executors: dict[int, ThreadPoolExecutor] = {}
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def _get_executor(depth: int = 0) -> ThreadPoolExecutor:
+    global _executor_pid
+    with _executor_lock:
+        # Pools inherited through fork() have no live threads: start new ones
+        if _executor_pid != os.getpid():
+            _executors.clear()
+            _executor_pid = os.getpid()
+        executor = _executors.get(depth)
+        if executor is None:
+            executor = _executors[depth] = ThreadPoolExecutor(
+                max_workers=OUTBOUND_NESTED_WORKERS if depth else OUTBOUND_WORKERS,
+                thread_name_prefix=f"evichain-io{depth or ''}",
+            )
+        return executor
+
+
+def _traced(stage: str, fn: Callable[[], T]) -> Callable[[], T]:
+    def run() -> T:
+        with tracer.span(stage):
+            return fn()
+    return run
+
+
+def _run_marked(depth: int, fn: Callable[[], T]) -> T:
+    _local.depth = depth
+    try:
+        return fn()
+    finally:
+        _local.depth = 0
+
+
+def fan_out(calls: Mapping[Hashable, Callable[[], T]], *, span: Optional[str] = None) -> dict:
+    """Run independent ``calls`` concurrently; return ``{key: result}``.
+
+    With ``span``, each call is traced as ``"<span>.<key>"`` (keys must
+    not carry personal data).  Results keep the order of ``calls``.  If a call raises, the first
+    exception (in ``calls`` order) is re-raised once all calls finished,
+    matching what a sequential loop would have surfaced.
+    """
+    if span is not None:
+        calls = {key: _traced(f"{span}.{key}", fn) for key, fn in calls.items()}
+
+    # 0 outside the pools, 1 on the shared pool, 2 on the nested one
+    depth = getattr(_local, "depth", 0)
+    if len(calls) <= 1 or depth > 1:
+        return {key: fn() for key, fn in calls.items()}
+
+    executor = _get_executor(depth)
+    # Each call runs in a copy of the caller's context (trace id, etc.)
+    futures = {
+        key: executor.submit(contextvars.copy_context().run, _run_marked, depth + 1, fn)
+        for key, fn in calls.items()
+    }
+    results = {}
+    error: Optional[BaseException] = None
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except Exception as exc:
+            if error is None:
+                error = exc
+    if error is not None:
+        raise error
+    return results
+
+
+def create_session(headers: Optional[dict] = None, *, pool_size: Optional[int] = None):
+    """``requests.Session`` sized for every thread of both fan-out pools."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    size = pool_size or OUTBOUND_WORKERS + OUTBOUND_NESTED_WORKERS
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
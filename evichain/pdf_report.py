@@ -0,0 +1,823 @@
+"""
+EviChain – Complaint PDF Reports
+
+Renders the complaint report (``/api/generate_pdf``) away from the API
+workers and avoids rendering the same report twice:
+
+1. ``render_complaint_pdf()`` is a pure function of the request payload
+   (reportlab platypus document → ``bytes``), so it can run in another
+   process.  Every date in the report comes from the payload and the
+   document is built with reportlab's ``invariant`` flag, so the same
+   payload always yields the same bytes and a cached copy is never stale.
+2. ``PdfRenderer`` runs it on a ``ProcessPoolExecutor``
+   (``EVICHAIN_PDF_WORKERS``, default 2; ``0`` renders in-process) and
+   caches the result on disk under ``<cache_dir>/<digest>.pdf``, where
+   the digest is a SHA-256 of the canonical JSON payload.  A repeated
+   request is a file lookup; concurrent requests for the same payload
+   share one render.
+3. ``render_zip()`` renders many payloads in parallel and packs them into
+   one (cached) zip archive.
+4. The cache is bounded: after each write, files older than
+   ``EVICHAIN_PDF_CACHE_MAX_AGE_HOURS`` (default 24 – the reports carry
+   complaint data, which should not linger on disk) are deleted, then the
+   oldest ones until the directory is under ``EVICHAIN_PDF_CACHE_MAX_MB``
+   (default 256).
+
+Responses are sent from the cached files, so Flask streams them from
+disk instead of holding the document in memory.  The pool uses the
+``spawn`` start method: forking a threaded server is not safe.  A worker
+that dies (OOM, a crash in reportlab) fails the renders it was running;
+the broken pool is then replaced, so later requests render again.
+
+Usage::
+
+    from evichain.pdf_report import PdfRenderer
+
+    renderer = PdfRenderer()
+    path = renderer.render(payload)           # Path to the cached PDF
+    archive = renderer.render_zip(payloads)   # Path to the cached zip
+"""
+
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from .serialization import canonical_dumps
+
+# Incrementar quando o layout do relatório mudar: invalida o cache em disco
+RENDERER_VERSION = 2
+
+PDF_WORKERS = int(os.getenv("EVICHAIN_PDF_WORKERS", "2"))
+PDF_TIMEOUT = float(os.getenv("EVICHAIN_PDF_TIMEOUT", "60"))
+PDF_CACHE_MAX_BYTES = int(float(os.getenv("EVICHAIN_PDF_CACHE_MAX_MB", "256")) * 1024 * 1024)
+PDF_CACHE_MAX_AGE = float(os.getenv("EVICHAIN_PDF_CACHE_MAX_AGE_HOURS", "24")) * 3600
+
+
+def payload_digest(payload: dict) -> str:
+    """Cache key of a report: SHA-256 of the canonical payload and renderer version."""
+    raw = f"{RENDERER_VERSION}|{canonical_dumps(payload, ensure_ascii=False)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def report_filename(payload: dict) -> str:
+    """Download name of a report, as sent in ``Content-Disposition``."""
+    return f"denuncia_{payload.get('complaint_id', 'N/A')}.pdf"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=path.suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class PdfRenderer:
+    """Process-pool PDF rendering with an on-disk, content-addressed cache."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        *,
+        max_workers: int | None = None,
+        render_fn: Callable[[dict], bytes] | None = None,
+        timeout: float | None = None,
+        max_bytes: int | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir or os.getenv("EVICHAIN_PDF_CACHE_DIR", "data/pdf_cache"))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = PDF_WORKERS if max_workers is None else max_workers
+        # Precisa ser uma função de módulo (picklable) para rodar no pool
+        self.render_fn = render_fn or render_complaint_pdf
+        self.timeout = timeout or PDF_TIMEOUT
+        self.max_bytes = PDF_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_age = PDF_CACHE_MAX_AGE if max_age is None else max_age
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        # digest -> render em andamento (requisições simultâneas compartilham)
+        self._inflight: dict[str, Future] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def render(self, payload: dict) -> Path:
+        """Path of the rendered report, rendering it on a cache miss."""
+        return self.render_many([payload])[0]
+
+    def render_many(self, payloads: list[dict]) -> list[Path]:
+        """Render ``payloads`` concurrently; paths are returned in input order."""
+        digests = [payload_digest(p) for p in payloads]
+        futures = {}
+        for digest, payload in zip(digests, payloads):
+            if digest not in futures and not self.cache_path(digest).exists():
+                futures[digest] = self._submit(digest, payload)
+        for future in futures.values():
+            future.result(timeout=self.timeout)
+        return [self.cache_path(d) for d in digests]
+
+    def render_zip(self, payloads: list[dict]) -> Path:
+        """One zip archive with the reports of ``payloads`` (cached by content)."""
+        digests = [payload_digest(p) for p in payloads]
+        archive = self.cache_dir / f"{hashlib.sha256('|'.join(digests).encode()).hexdigest()}.zip"
+        if archive.exists():
+            return archive
+        paths = self.render_many(payloads)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=".zip")
+        os.close(fd)
+        try:
+            # PDFs já são comprimidos: ZIP_STORED evita recomprimir
+            with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_STORED) as zf:
+                for name, path in zip(_unique_names(report_filename(p) for p in payloads), paths):
+                    zf.write(path, arcname=name)
+            os.replace(tmp, archive)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.prune(keep=archive)
+        return archive
+
+    def cache_path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.pdf"
+
+    def prune(self, keep: Optional[Path] = None) -> int:
+        """Delete expired reports, then the oldest until under ``max_bytes``.
+
+        ``keep`` (the file just written) is never deleted.  Returns the
+        number of files removed.
+        """
+        now = time.time()
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.suffix not in (".pdf", ".zip") or path.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # removido por outro worker
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if path == keep or (now - mtime <= self.max_age and total <= self.max_bytes):
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None and self._pool_pid == os.getpid():
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _submit(self, digest: str, payload: dict) -> Future:
+        """Future resolved with the cached path once ``payload`` is rendered."""
+        with self._lock:
+            future = self._inflight.get(digest)
+            if future is not None:
+                return future
+            future = self._inflight[digest] = Future()
+            pool = self._executor() if self.max_workers > 0 else None
+
+        if pool is None:
+            render: Future = Future()
+            try:
+                render.set_result(self.render_fn(payload))
+            except BaseException as exc:
+                render.set_exception(exc)
+            self._store(digest, render, future)
+        else:
+            try:
+                pool, render = self._pool_submit(pool, payload)
+            except BaseException as exc:
+                with self._lock:
+                    self._inflight.pop(digest, None)
+                future.set_exception(exc)
+                return future
+            render.add_done_callback(lambda done: self._store(digest, done, future, pool))
+        return future
+
+    def _pool_submit(
+        self, pool: ProcessPoolExecutor, payload: dict
+    ) -> tuple[ProcessPoolExecutor, Future]:
+        """Submit to ``pool``; a broken pool is replaced and the job retried once."""
+        try:
+            return pool, pool.submit(self.render_fn, payload)
+        except BrokenProcessPool:
+            with self._lock:
+                self._discard(pool)
+                pool = self._executor()
+            return pool, pool.submit(self.render_fn, payload)
+
+    def _store(
+        self, digest: str, render: Future, future: Future,
+        pool: Optional[ProcessPoolExecutor] = None,
+    ) -> None:
+        try:
+            _write_atomic(self.cache_path(digest), render.result())
+        except BaseException as exc:
+            if isinstance(exc, BrokenProcessPool) and pool is not None:
+                with self._lock:
+                    self._discard(pool)
+            future.set_exception(exc)
+        else:
+            self.prune(keep=self.cache_path(digest))
+            future.set_result(self.cache_path(digest))
+        finally:
+            with self._lock:
+                self._inflight.pop(digest, None)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Chamado com self._lock. Um pool herdado via fork() não tem processos vivos.
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            self._pool_pid = os.getpid()
+        return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        # Chamado com self._lock: o próximo _executor() cria um pool novo
+        if self._pool is pool:
+            self._pool = None
+            pool.shutdown(wait=False)
+
+
+def _unique_names(names: Iterable[str]) -> list[str]:
+    """Disambiguate repeated file names inside an archive (``x.pdf``, ``x-2.pdf``)."""
+    seen: dict[str, int] = {}
+    unique = []
+    for name in names:
+        count = seen[name] = seen.get(name, 0) + 1
+        if count > 1:
+            stem, dot, ext = name.rpartition(".")
+            name = f"{stem}-{count}{dot}{ext}"
+        unique.append(name)
+    return unique
+
+
+# ---------------------------------------------------------------------------
+# Rendering (runs in the worker processes)
+# ---------------------------------------------------------------------------
+
+def render_complaint_pdf(data: dict) -> bytes:
+    """Render the complaint report for ``data`` (the ``/api/generate_pdf`` payload).
+
+    Raises ``ImportError`` if reportlab is not installed.
+    """
+    # Extrair todos os dados da denúncia
+    complaint_id = data.get('complaint_id', 'N/A')
+    titulo = data.get('titulo', 'N/A')
+    nome_denunciado = data.get('nomeDenunciado', 'N/A')
+    assunto = data.get('assunto', 'N/A')
+    prioridade = data.get('prioridade', 'N/A')
+    finalidade = data.get('finalidade', 'N/A')
+    conselho = data.get('conselho', 'N/A')
+    categoria = data.get('categoria', 'N/A')
+    timestamp = data.get('timestamp')
+    codigosAnteriores = data.get('codigosAnteriores')
+    ouvidoriaAnonima = data.get('ouvidoriaAnonima', False)
+    anonymous = data.get('anonymous', False)
+    descricao = data.get('descricao', 'Não disponível')
+    ia_analysis = data.get('ia_analysis', {})
+    metadata = data.get('metadata', {})
+
+    from reportlab.lib.pagesizes import letter, A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch, cm
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
+    from io import BytesIO
+
+    # Criar documento PDF em memória com margens profissionais
+    buffer = BytesIO()
+    # invariant: sem data de criação nem ID aleatório nos metadados do PDF
+    doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1,
+                          rightMargin=2*cm, leftMargin=2*cm,
+                          topMargin=3*cm, bottomMargin=2*cm)
+
+    # Estilos profissionais para relatório
+    styles = getSampleStyleSheet()
+
+    # Estilo do cabeçalho principal
+    header_style = ParagraphStyle(
+        'ReportHeader',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=10,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold',
+        textColor=colors.HexColor('#1a365d')
+    )
+
+    # Estilo do subtítulo
+    subtitle_style = ParagraphStyle(
+        'ReportSubtitle',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=20,
+        alignment=TA_CENTER,
+        fontName='Helvetica',
+        textColor=colors.HexColor('#2d3748')
+    )
+
+    # Estilo para seções principais
+    section_style = ParagraphStyle(
+        'SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=12,
+        spaceBefore=20,
+        alignment=TA_LEFT,
+        fontName='Helvetica-Bold',
+        textColor=colors.HexColor('#2c5282'),
+        borderWidth=1,
+        borderColor=colors.HexColor('#e2e8f0'),
+        borderPadding=8,
+        backColor=colors.HexColor('#f7fafc')
+    )
+
+    # Estilo para subseções
+    subsection_style = ParagraphStyle(
+        'SubsectionHeader',
+        parent=styles['Heading3'],
+        fontSize=12,
+        spaceAfter=8,
+        spaceBefore=12,
+        alignment=TA_LEFT,
+        fontName='Helvetica-Bold',
+        textColor=colors.HexColor('#4a5568')
+    )
+
+    # Estilo para texto normal com melhor formatação
+    normal_style = ParagraphStyle(
+        'ReportNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=6,
+        alignment=TA_JUSTIFY,
+        fontName='Helvetica',
+        leading=14
+    )
+
+    # Estilo para dados importantes
+    important_style = ParagraphStyle(
+        'ImportantData',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=4,
+        alignment=TA_LEFT,
+        fontName='Helvetica',
+        textColor=colors.HexColor('#2d3748'),
+        leftIndent=20
+    )
+
+    # Conteúdo do relatório
+    story = []
+
+    # Formatar data primeiro. Só datas do payload: o PDF fica em cache
+    # e não pode carregar o horário em que foi renderizado.
+    data_documento = 'sem-data'
+    try:
+        if timestamp:
+            registrado_em = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            data_formatada = registrado_em.strftime('%d/%m/%Y %H:%M')
+            data_documento = registrado_em.strftime('%Y-%m-%d')
+        else:
+            data_formatada = 'N/A'
+    except:
+        data_formatada = timestamp or 'N/A'
+
+    # === CABEÇALHO FORMAL DO RELATÓRIO ===
+
+    # Logo/Título institucional
+    story.append(Paragraph("EVICHAIN", header_style))
+    story.append(Paragraph("Sistema Blockchain para Evidências Digitais", subtitle_style))
+
+    # Linha divisória
+    story.append(Spacer(1, 10))
+    divider_table = Table([['_' * 80]], colWidths=[15*cm])
+    divider_table.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#a0aec0'))
+    ]))
+    story.append(divider_table)
+    story.append(Spacer(1, 20))
+
+    # Título do relatório
+    story.append(Paragraph("RELATÓRIO DE ANÁLISE DE DENÚNCIA", header_style))
+    story.append(Spacer(1, 10))
+
+    # Informações do documento
+    doc_info_data = [
+        ['ID da Denúncia:', complaint_id],
+        ['Data do Registro:', data_formatada],
+        ['Documento:', f'EviChain_Relatorio_{complaint_id}_{data_documento}.pdf'],
+        ['Status:', 'CONFIDENCIAL - USO RESTRITO']
+    ]
+
+    doc_info_table = Table(doc_info_data, colWidths=[4*cm, 10*cm])
+    doc_info_table.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f7fafc')),
+        ('PADDING', (0, 0), (-1, -1), 6),
+    ]))
+    story.append(doc_info_table)
+    story.append(Spacer(1, 30))
+
+    # === SEÇÃO 1: INFORMAÇÕES BÁSICAS DA DENÚNCIA ===
+    story.append(Paragraph("1. INFORMAÇÕES BÁSICAS DA DENÚNCIA", section_style))
+
+    # Criar tabela para informações básicas
+    basic_info_data = [
+        ['Título:', titulo],
+        ['Nome do Profissional Denunciado:', nome_denunciado],
+        ['Assunto:', assunto],
+        ['Prioridade:', prioridade],
+        ['Finalidade:', finalidade],
+        ['Conselho:', conselho],
+        ['Categoria:', categoria],
+        ['Data de Registro:', data_formatada],
+        ['Status:', 'Registrada e Analisada']
+    ]
+
+    if codigosAnteriores:
+        basic_info_data.append(['Códigos Anteriores:', codigosAnteriores])
+
+    basic_info_table = Table(basic_info_data, colWidths=[4*cm, 11*cm])
+    basic_info_table.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8fafc')),
+        ('PADDING', (0, 0), (-1, -1), 8),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+    story.append(basic_info_table)
+    story.append(Spacer(1, 20))
+
+    # === SEÇÃO 2: CONFIGURAÇÕES DE PRIVACIDADE ===
+    story.append(Paragraph("2. CONFIGURAÇÕES DE PRIVACIDADE", section_style))
+
+    privacy_data = [
+        ['Ouvidoria Anônima:', 'Sim' if ouvidoriaAnonima else 'Não'],
+        ['Manter Anonimato:', 'Sim' if anonymous else 'Não']
+    ]
+
+    privacy_table = Table(privacy_data, colWidths=[4*cm, 11*cm])
+    privacy_table.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8fafc')),
+        ('PADDING', (0, 0), (-1, -1), 8),
+    ]))
+    story.append(privacy_table)
+    story.append(Spacer(1, 20))
+
+    # === SEÇÃO 3: DESCRIÇÃO DA DENÚNCIA ===
+    story.append(Paragraph("3. DESCRIÇÃO DA DENÚNCIA", section_style))
+    story.append(Paragraph(descricao, normal_style))
+    story.append(Spacer(1, 25))
+
+    # === SEÇÃO 4: ANÁLISE DA INTELIGÊNCIA ARTIFICIAL ===
+    if ia_analysis:
+        story.append(Paragraph("4. ANÁLISE DA INTELIGÊNCIA ARTIFICIAL", section_style))
+        story.append(Spacer(1, 10))
+
+        # Informações básicas da análise
+        analise_juridica = ia_analysis.get('analise_juridica', {})
+        classificacao_risco = ia_analysis.get('classificacao_risco', {})
+        analise_basica = ia_analysis.get('analise_basica', {})
+
+        # Criar tabela de análise principal
+        analise_data = []
+
+        if analise_juridica.get('gravidade'):
+            analise_data.append(['Gravidade:', analise_juridica['gravidade'].title()])
+
+        if analise_juridica.get('tipificacao'):
+            analise_data.append(['Tipificação:', analise_juridica['tipificacao']])
+
+        if classificacao_risco.get('nivel') and classificacao_risco.get('pontuacao'):
+            nivel = classificacao_risco['nivel']
+            pontuacao = classificacao_risco['pontuacao']
+            analise_data.append(['Nível de Risco:', f"{nivel} ({pontuacao}/100)"])
+
+        if classificacao_risco.get('acao_recomendada'):
+            analise_data.append(['Ação Recomendada:', classificacao_risco['acao_recomendada']])
+
+        if analise_data:
+            analise_table = Table(analise_data, colWidths=[4*cm, 11*cm])
+            analise_table.setStyle(TableStyle([
+                ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+                ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8fafc')),
+                ('PADDING', (0, 0), (-1, -1), 8),
+            ]))
+            story.append(analise_table)
+            story.append(Spacer(1, 15))
+
+        # Resumo da análise
+        if analise_basica.get('resumo'):
+            story.append(Paragraph("4.1 Resumo da Análise", subsection_style))
+            story.append(Paragraph(analise_basica['resumo'], normal_style))
+            story.append(Spacer(1, 12))
+
+        if analise_juridica.get('fundamentacao'):
+            story.append(Paragraph("4.2 Análise Detalhada", subsection_style))
+            story.append(Paragraph(analise_juridica['fundamentacao'], normal_style))
+            story.append(Spacer(1, 12))
+
+        # === SUBSEÇÃO: LEGISLAÇÃO RECOMENDADA ===
+        legislacao_especifica = analise_juridica.get('legislacao_especifica', {})
+        if legislacao_especifica:
+            story.append(Paragraph("4.3 Legislação Recomendada pela IA", subsection_style))
+
+            leg_data = []
+            if legislacao_especifica.get('legislacao_sugerida'):
+                leg_data.append(['Legislação Sugerida:', legislacao_especifica['legislacao_sugerida']])
+
+            if legislacao_especifica.get('conselho'):
+                leg_data.append(['Conselho:', legislacao_especifica['conselho']])
+
+            if legislacao_especifica.get('tipo'):
+                leg_data.append(['Tipo de Infração:', legislacao_especifica['tipo']])
+
+            if legislacao_especifica.get('descricao'):
+                leg_data.append(['Descrição:', legislacao_especifica['descricao']])
+
+            if legislacao_especifica.get('artigos'):
+                artigos = legislacao_especifica['artigos']
+                if isinstance(artigos, list):
+                    artigos = ' '.join(artigos)
+                leg_data.append(['Artigos:', artigos])
+
+            if legislacao_especifica.get('penalidades'):
+                penalidades = legislacao_especifica['penalidades']
+                if isinstance(penalidades, list):
+                    penalidades = ', '.join(penalidades)
+                leg_data.append(['Penalidades:', penalidades])
+
+            if leg_data:
+                leg_table = Table(leg_data, colWidths=[4*cm, 11*cm])
+                leg_table.setStyle(TableStyle([
+                    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+                    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+                    ('FONTSIZE', (0, 0), (-1, -1), 10),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+                    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#fff8dc')),
+                    ('PADDING', (0, 0), (-1, -1), 8),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ]))
+                story.append(leg_table)
+                story.append(Spacer(1, 12))
+
+        # === SUBSEÇÃO: PALAVRAS-CHAVE ===
+        palavras_chave = analise_basica.get('palavras_chave', [])
+        if palavras_chave:
+            story.append(Paragraph("4.4 Palavras-Chave Identificadas", subsection_style))
+            if isinstance(palavras_chave, list):
+                for palavra in palavras_chave:
+                    story.append(Paragraph(f"• {palavra}", important_style))
+            else:
+                story.append(Paragraph(palavras_chave, normal_style))
+            story.append(Spacer(1, 12))
+
+        # === SUBSEÇÃO: RECOMENDAÇÕES ===
+        recomendacoes = ia_analysis.get('recomendacoes', [])
+        if recomendacoes:
+            story.append(Paragraph("4.5 Recomendações", subsection_style))
+            if isinstance(recomendacoes, list):
+                for rec in recomendacoes:
+                    story.append(Paragraph(f"• {rec}", important_style))
+            else:
+                story.append(Paragraph(recomendacoes, normal_style))
+            story.append(Spacer(1, 12))
+
+        # Fatores de risco
+        fatores_risco = classificacao_risco.get('fatores_risco', [])
+        if fatores_risco and isinstance(fatores_risco, list):
+            story.append(Paragraph("4.6 Fatores de Risco", subsection_style))
+            for fator in fatores_risco:
+                story.append(Paragraph(f"• {fator}", important_style))
+            story.append(Spacer(1, 15))
+
+        story.append(Spacer(1, 20))
+
+    # === SEÇÃO 5: INVESTIGAÇÃO AUTOMÁTICA ===
+    investigacao = ia_analysis.get('investigacao_automatica', {}) if ia_analysis else {}
+    if investigacao:
+        story.append(Paragraph("5. INVESTIGAÇÃO AUTOMÁTICA REALIZADA", section_style))
+        story.append(Spacer(1, 10))
+
+        # Relatório de detecção formatado
+        if 'relatorio_deteccao' in investigacao:
+            story.append(Paragraph("5.1 Relatório de Detecção de Profissionais", subsection_style))
+
+            deteccao = investigacao.get('deteccao_nomes', {})
+
+            # Estatísticas gerais em tabela
+            stats_data = []
+            if deteccao.get('confiabilidade_deteccao') is not None:
+                stats_data.append(['Confiabilidade Geral:', f"{deteccao.get('confiabilidade_deteccao', 0)}%"])
+
+            if deteccao.get('contexto_profissional') is not None:
+                contexto = "SIM" if deteccao.get('contexto_profissional') else "NÃO"
+                stats_data.append(['Contexto Profissional Detectado:', contexto])
+
+            if deteccao.get('recomendacao_investigacao') is not None:
+                recomenda = "SIM" if deteccao.get('recomendacao_investigacao') else "NÃO"
+                stats_data.append(['Recomenda Investigação:', recomenda])
+
+            if stats_data:
+                stats_table = Table(stats_data, colWidths=[6*cm, 9*cm])
+                stats_table.setStyle(TableStyle([
+                    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+                    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+                    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+                    ('FONTSIZE', (0, 0), (-1, -1), 10),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+                    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f8ff')),
+                    ('PADDING', (0, 0), (-1, -1), 8),
+                ]))
+                story.append(stats_table)
+                story.append(Spacer(1, 15))
+
+        # Profissionais identificados de forma organizada
+        deteccao = investigacao.get('deteccao_nomes', {})
+        if deteccao.get('nomes_detectados'):
+            story.append(Paragraph("5.2 Profissionais Identificados", subsection_style))
+
+            # Criar tabela para profissionais detectados
+            prof_data = [['#', 'Nome Detectado', 'Confiabilidade', 'Contexto']]
+
+            for i, nome in enumerate(deteccao['nomes_detectados'], 1):
+                nome_profissional = nome.get('nome_detectado', f'Profissional {i}')
+                confiabilidade = f"{nome.get('confiabilidade', 0)}%"
+                contexto = nome.get('contexto_encontrado', 'N/A')
+
+                prof_data.append([str(i), nome_profissional, confiabilidade, contexto])
+
+            prof_table = Table(prof_data, colWidths=[1*cm, 5*cm, 2.5*cm, 6.5*cm])
+            prof_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a5568')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8f9fa')),
+                ('PADDING', (0, 0), (-1, -1), 6),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ]))
+            story.append(prof_table)
+            story.append(Spacer(1, 15))
+
+        # Resultados das investigações de forma organizada
+        investigacoes = investigacao.get('investigacoes_realizadas', [])
+        if investigacoes:
+            story.append(Paragraph("5.3 Resultados das Investigações Detalhadas", subsection_style))
+
+            for i, inv in enumerate(investigacoes, 1):
+                nome_investigado = inv.get('nome_investigado', f'Investigação {i}')
+                story.append(Paragraph(f"5.3.{i} Investigação: {nome_investigado}", subsection_style))
+
+                resultado = inv.get('resultado_investigacao', {})
+                registros = resultado.get('registros_oficiais', {})
+
+                inv_data = []
+
+                if registros.get('registro_encontrado'):
+                    inv_data.append(['Status:', 'REGISTRO ENCONTRADO ✓'])
+
+                    dados_prof = registros.get('dados_profissional', {})
+                    if dados_prof.get('nome_completo_oficial'):
+                        inv_data.append(['Nome Oficial:', dados_prof['nome_completo_oficial']])
+
+                    if dados_prof.get('registro_crm_completo') or dados_prof.get('registro_completo'):
+                        registro = dados_prof.get('registro_crm_completo') or dados_prof.get('registro_completo')
+                        inv_data.append(['Registro:', registro])
+
+                    if dados_prof.get('situacao_registro'):
+                        inv_data.append(['Situação:', dados_prof['situacao_registro']])
+
+                    if dados_prof.get('especialidades'):
+                        especialidades = ', '.join(dados_prof['especialidades'])
+                        inv_data.append(['Especialidades:', especialidades])
+
+                else:
+                    inv_data.append(['Status:', 'REGISTRO NÃO ENCONTRADO ✗'])
+                    if resultado.get('motivo_nao_encontrado'):
+                        inv_data.append(['Motivo:', resultado['motivo_nao_encontrado']])
+
+                if inv_data:
+                    inv_table = Table(inv_data, colWidths=[3*cm, 12*cm])
+                    inv_table.setStyle(TableStyle([
+                        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+                        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+                        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+                        ('FONTSIZE', (0, 0), (-1, -1), 9),
+                        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+                        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0fff0')),
+                        ('PADDING', (0, 0), (-1, -1), 6),
+                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                    ]))
+                    story.append(inv_table)
+                    story.append(Spacer(1, 12))
+
+            story.append(Spacer(1, 15))
+
+    # === RODAPÉ FORMAL DO RELATÓRIO ===
+    story.append(Spacer(1, 30))
+
+    # Assinatura digital
+    footer_data = [
+        ['', ''],
+        ['Documento gerado automaticamente pelo', ''],
+        ['Sistema EviChain v2.1', ''],
+        ['Blockchain para Evidências Digitais', ''],
+        ['', ''],
+        [f'Data/Hora do Registro: {data_formatada}', ''],
+        ['Este documento foi gerado automaticamente e não possui', ''],
+        ['assinatura digital. Consulte o sistema EviChain para verificação.', '']
+    ]
+
+    footer_table = Table(footer_data, colWidths=[15*cm, 0*cm])
+    footer_table.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#6b7280')),
+        ('FONTNAME', (0, 2), (0, 2), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 2), (0, 2), 10),
+        ('TEXTCOLOR', (0, 2), (0, 2), colors.HexColor('#1f2937')),
+    ]))
+    story.append(footer_table)
+
+    # Linha final
+    story.append(Spacer(1, 10))
+    final_line = Table([['_' * 80]], colWidths=[15*cm])
+    final_line.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#a0aec0'))
+    ]))
+    story.append(final_line)
+    story.append(Paragraph("_" * 80, styles['Normal']))
+    story.append(Paragraph("Documento gerado automaticamente pelo sistema EviChain", styles['Italic']))
+
+    # Construir PDF
+    doc.build(story)
+    pdf_content = buffer.getvalue()
+    buffer.close()
+
+    return pdf_content
@@ -0,0 +1,228 @@
+"""
+EviChain – Token-Bucket Rate Limiter
+
+Addresses STRIDE threat T-08 (Denial of Service) with O(1) state per
+client: each bucket is just ``(tokens, updated_at)``, refilled lazily on
+access.  Budgets are configurable per route, and the bucket state can
+live in one of two stores:
+
+1. ``MemoryBucketStore`` – in-process ``OrderedDict`` with LRU eviction,
+   so scanning traffic from many IPs cannot grow memory without bound.
+   Evicting an idle key is harmless: an idle bucket is full anyway.
+2. ``SQLiteBucketStore`` – a local SQLite file (WAL mode) shared by all
+   gunicorn workers on the host, so a limit holds across processes.  If
+   the file stays locked past the busy timeout, the request is let
+   through with a warning: the limiter fails open rather than turning
+   contention into server errors.
+
+Usage::
+
+    from evichain.rate_limit import Budget, MemoryBucketStore, RateLimiter
+
+    limiter = RateLimiter(MemoryBucketStore(), default=Budget(30, 60))
+    allowed, retry_after = limiter.hit("203.0.113.7", "/api/stats")
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class Budget:
+    """``requests`` per ``window`` seconds, with bursts up to ``requests``."""
+
+    requests: int
+    window: float
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.window
+
+    @property
+    def burst(self) -> float:
+        return float(self.requests)
+
+
+def _take(tokens: float, updated_at: float, now: float, budget: Budget) -> tuple[float, bool, float]:
+    """Refill a bucket and try to take one token.
+
+    Returns ``(tokens_left, allowed, retry_after_seconds)``.
+    """
+    tokens = min(budget.burst, tokens + (now - updated_at) * budget.rate)
+    if tokens >= 1.0:
+        return tokens - 1.0, True, 0.0
+    return tokens, False, (1.0 - tokens) / budget.rate
+
+
+class MemoryBucketStore:
+    """Per-process bucket store with LRU eviction."""
+
+    def __init__(self, max_keys: int = 10_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, budget: Budget, now: float) -> tuple[bool, float]:
+        with self._lock:
+            state = self._buckets.pop(key, None)
+            tokens, updated_at = state if state else (budget.burst, now)
+            tokens, allowed, retry_after = _take(tokens, updated_at, now, budget)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SQLiteBucketStore:
+    """Bucket store shared across worker processes through a SQLite file."""
+
+    PRUNE_EVERY = 1_000  # consume() calls between eviction passes
+
+    def __init__(self, path: str | Path, max_keys: int = 100_000, timeout: float = 5.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_keys = max_keys
+        self.timeout = timeout
+        self._local = threading.local()
+        self._calls = 0
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS buckets_updated ON buckets(updated_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # SQLite connections must not cross fork(): after --preload the
+        # forking thread's local survives in the worker, so key it by pid.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def consume(self, key: str, budget: Budget, now: float) -> tuple[bool, float]:
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as exc:  # locked past the busy timeout
+            print(f"[WARN] Rate limit store busy, request not limited: {exc}")
+            return True, 0.0
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated_at = row if row else (budget.burst, now)
+            tokens, allowed, retry_after = _take(tokens, updated_at, now, budget)
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except sqlite3.OperationalError as exc:
+            conn.execute("ROLLBACK")
+            print(f"[WARN] Rate limit store busy, request not limited: {exc}")
+            return True, 0.0
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._calls += 1
+        if self._calls % self.PRUNE_EVERY == 0:
+            try:
+                self._evict()
+            except sqlite3.OperationalError as exc:  # retried on the next pass
+                print(f"[WARN] Rate limit eviction skipped: {exc}")
+        return allowed, retry_after
+
+    def _evict(self) -> None:
+        """Drop the least recently used keys beyond ``max_keys``."""
+        conn = self._conn()
+        (count,) = conn.execute("SELECT COUNT(*) FROM buckets").fetchone()
+        excess = count - self.max_keys
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM buckets WHERE key IN "
+                "(SELECT key FROM buckets ORDER BY updated_at ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM buckets")
+
+    def __len__(self) -> int:
+        (count,) = self._conn().execute("SELECT COUNT(*) FROM buckets").fetchone()
+        return count
+
+
+class RateLimiter:
+    """Applies per-route token-bucket budgets to client keys.
+
+    ``routes`` maps a path to its budget; keys ending in ``/`` match as
+    prefixes, other keys match exactly.  The most specific match wins and
+    unmatched paths use ``default``.  Each route has its own bucket per
+    client, so a burst on one endpoint does not starve the others.
+    """
+
+    def __init__(
+        self,
+        store: MemoryBucketStore | SQLiteBucketStore,
+        *,
+        default: Budget,
+        routes: dict[str, Budget] | None = None,
+    ) -> None:
+        self.store = store
+        self.default = default
+        self.routes = dict(routes or {})
+        self._prefixes = sorted(
+            (p for p in self.routes if p.endswith("/")), key=len, reverse=True
+        )
+
+    def budget_for(self, path: str) -> tuple[str, Budget]:
+        """Return ``(scope, budget)`` for a request path."""
+        if path in self.routes and not path.endswith("/"):
+            return path, self.routes[path]
+        for prefix in self._prefixes:
+            if path.startswith(prefix):
+                return prefix, self.routes[prefix]
+        return "*", self.default
+
+    def hit(self, client: str, path: str, now: float | None = None) -> tuple[bool, float]:
+        """Record one request.  Returns ``(allowed, retry_after_seconds)``."""
+        scope, budget = self.budget_for(path)
+        return self.store.consume(f"{scope}|{client}", budget, time.time() if now is None else now)
+
+    def clear(self) -> None:
+        self.store.clear()
+
+
+def create_bucket_store() -> MemoryBucketStore | SQLiteBucketStore:
+    """Build the store selected by ``EVICHAIN_RATE_LIMIT_BACKEND``.
+
+    ``memory`` (default) keeps limits per process; ``sqlite`` shares them
+    across workers through ``EVICHAIN_RATE_LIMIT_DB``.
+    """
+    backend = os.getenv("EVICHAIN_RATE_LIMIT_BACKEND", "memory").strip().lower()
+    max_keys = int(os.getenv("EVICHAIN_RATE_LIMIT_MAX_KEYS", "10000"))
+    if backend == "sqlite":
+        return SQLiteBucketStore(
+            os.getenv("EVICHAIN_RATE_LIMIT_DB", "data/ratelimit.sqlite3"), max_keys=max_keys
+        )
+    return MemoryBucketStore(max_keys=max_keys)
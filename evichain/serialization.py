@@ -0,0 +1,136 @@
+"""
+EviChain – JSON Serialization Layer
+
+Every JSON encode/decode in the project goes through this module, which
+exposes two encoders with different contracts:
+
+1. ``canonical_dumps()`` – the byte-exact format that block hashes and
+   audit HMACs are computed over (``json.dumps(..., sort_keys=True)``).
+   It is always the standard library: changing it would change every
+   hash on disk, so it is *not* affected by the backend switch.
+2. ``dumps()`` / ``loads()`` – the fast path for API responses, the chain
+   file and other persisted state, where only JSON equivalence matters.
+   It uses ``orjson`` when installed and falls back to the stdlib.
+
+The fast backend is chosen with ``EVICHAIN_JSON_BACKEND`` (``auto``
+(default), ``orjson`` or ``stdlib``) or at runtime with ``set_backend()``.
+Either backend reads what the other wrote.
+
+Usage::
+
+    from evichain.serialization import canonical_dumps, dumps, loads
+
+    digest = hashlib.sha256(canonical_dumps(block).encode()).hexdigest()
+    body = dumps({"success": True}, sort_keys=True)   # bytes
+    data = loads(body)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, Optional
+
+try:
+    import orjson  # optional
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+BACKENDS = ("orjson", "stdlib")
+
+_backend = "stdlib"
+
+
+# ---------------------------------------------------------------------------
+# Canonical encoder (hashing / signing)
+# ---------------------------------------------------------------------------
+
+def canonical_dumps(obj: Any, *, ensure_ascii: bool = True) -> str:
+    """Deterministic encoding used for hashes and HMACs.
+
+    Blocks are hashed with the default ``ensure_ascii=True``; the audit
+    log signs its entries with ``ensure_ascii=False``.  Never route this
+    through a third-party encoder: whitespace, escaping and float
+    formatting are all part of the digest.
+    """
+    return json.dumps(obj, sort_keys=True, ensure_ascii=ensure_ascii)
+
+
+# ---------------------------------------------------------------------------
+# Fast encoder (responses / persistence)
+# ---------------------------------------------------------------------------
+
+def get_backend() -> str:
+    """Name of the backend used by ``dumps()`` / ``loads()``."""
+    return _backend
+
+
+def set_backend(name: str = "auto") -> str:
+    """Select the fast backend (``auto``, ``orjson`` or ``stdlib``).
+
+    Returns the backend actually in use.
+    """
+    global _backend
+    name = (name or "auto").strip().lower()
+    if name == "auto":
+        name = "orjson" if orjson is not None else "stdlib"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name} (expected one of {BACKENDS})")
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("orjson is not installed.  Install it with:  pip install orjson")
+    _backend = name
+    return _backend
+
+
+def dumps(
+    obj: Any,
+    *,
+    sort_keys: bool = False,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON bytes (non-ASCII is not escaped).
+
+    ``indent=True`` pretty-prints with two spaces.  ``default`` converts
+    objects the encoder does not know, as in ``json.dumps``.
+    """
+    if _backend == "orjson":
+        # Datetimes and dataclasses go through ``default`` like in the stdlib.
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits: let the stdlib handle the rare case
+            pass
+    return json.dumps(
+        obj,
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        default=default,
+    ).encode("utf-8")
+
+
+def dumps_str(obj: Any, **kwargs: Any) -> str:
+    """``dumps()`` decoded to ``str`` (for text-mode files)."""
+    return dumps(obj, **kwargs).decode("utf-8")
+
+
+def loads(data: bytes | bytearray | str) -> Any:
+    """Decode JSON.  Errors are raised as ``json.JSONDecodeError``."""
+    if _backend == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+set_backend(os.getenv("EVICHAIN_JSON_BACKEND", "auto"))
@@ -1,35 +1,121 @@
+"""
+EviChain – Service Container
+
+Holds the process-wide service singletons and builds each one the first
+time it is used:
+
+1. Heavy engines (IA, assistant, investigator, registry lookups) and the
+   modules behind them are only imported and constructed on first
+   access, so a worker that never runs an investigation never pays for it.
+2. Components are shared instead of duplicated: one registry consultant
+   (and its HTTP session) serves the investigator and the IA engine, and
+   one name detector serves the IA engine.
+3. Construction is guarded by a lock, so concurrent first requests on a
+   threaded worker still get exactly one instance.
+
+Under ``gunicorn --preload`` the master may call ``warm()`` (set
+``EVICHAIN_PRELOAD_SERVICES=1``) so the singletons are built once and
+shared copy-on-write by every forked worker; none of them holds threads
+or sockets until it is first used.
+
+Usage::
+
+    services = create_services(settings)
+    services.blockchain            # built eagerly
+    services.ia_engine             # built on first access
+    services.built()               # -> ("blockchain", "ia_engine", ...)
+"""
+
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+from typing import Any, Callable
 
 from blockchain_simulator import EviChainBlockchain
-from ia_engine_openai_padrao import IAEngineOpenAIPadrao
-from assistente_denuncia import AssistenteDenuncia
-from investigador_digital import InvestigadorDigital
-from consultor_registros import ConsultorRegistrosProfissionais
 
 from .settings import Settings
 
+# Ordem de construção usada por warm(): dependências primeiro
+LAZY_SERVICES = ("consultor_registros", "detector_nomes", "investigador", "ia_engine", "assistente")
+
 
-@dataclass
 class Services:
-    blockchain: EviChainBlockchain
-    ia_engine: IAEngineOpenAIPadrao
-    assistente: AssistenteDenuncia
-    investigador: InvestigadorDigital
-    consultor_registros: ConsultorRegistrosProfissionais
+    """Lazily built, shared service singletons for one process."""
+
+    def __init__(self, settings: Settings, *, blockchain: EviChainBlockchain | None = None) -> None:
+        self.settings = settings
+        # A chain é pequena e necessária em quase toda rota: carregada já
+        self.blockchain = blockchain or EviChainBlockchain(data_file=str(settings.data_file))
+        self._instances: dict[str, Any] = {}
+        # RLock: construir o ia_engine constrói (e reentra para) suas dependências
+        self._lock = threading.RLock()
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self._instances[name] = factory()
+        return instance
+
+    # ------------------------------------------------------------------
+    # Services
+    # ------------------------------------------------------------------
+
+    @property
+    def consultor_registros(self):
+        def build():
+            from consultor_registros import ConsultorRegistrosProfissionais
+            return ConsultorRegistrosProfissionais()
+        return self._get("consultor_registros", build)
+
+    @property
+    def detector_nomes(self):
+        def build():
+            from detector_nomes import DetectorNomes
+            return DetectorNomes()
+        return self._get("detector_nomes", build)
+
+    @property
+    def investigador(self):
+        def build():
+            from investigador_digital import InvestigadorDigital
+            return InvestigadorDigital(consultor_registros=self.consultor_registros)
+        return self._get("investigador", build)
+
+    @property
+    def ia_engine(self):
+        def build():
+            # IAEngineOpenAIPadrao já lida com fallback quando credenciais não existem.
+            from ia_engine_openai_padrao import IAEngineOpenAIPadrao
+            return IAEngineOpenAIPadrao(
+                detector_nomes=self.detector_nomes,
+                consultor_registros=self.consultor_registros,
+                investigador=self.investigador,
+            )
+        return self._get("ia_engine", build)
+
+    @property
+    def assistente(self):
+        def build():
+            from assistente_denuncia import AssistenteDenuncia
+            return AssistenteDenuncia()
+        return self._get("assistente", build)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def built(self) -> tuple[str, ...]:
+        """Names of the services constructed so far."""
+        return ("blockchain", *(n for n in LAZY_SERVICES if n in self._instances))
+
+    def warm(self) -> None:
+        """Build every service now (e.g. in the gunicorn master before forking)."""
+        for name in LAZY_SERVICES:
+            getattr(self, name)
 
 
 def create_services(settings: Settings) -> Services:
-    blockchain = EviChainBlockchain(data_file=str(settings.data_file))
-
-    # IAEngineOpenAIPadrao já lida com fallback quando credenciais não existem.
-    ia_engine = IAEngineOpenAIPadrao()
-
-    return Services(
-        blockchain=blockchain,
-        ia_engine=ia_engine,
-        assistente=AssistenteDenuncia(),
-        investigador=InvestigadorDigital(),
-        consultor_registros=ConsultorRegistrosProfissionais(),
-    )
+    return Services(settings)
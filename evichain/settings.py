@@ -33,6 +33,9 @@ class Settings:
     port: int
     debug: bool
     openai_api_key: str | None
+    debug_traces: bool = False
+    audit_query: bool = False
+    admin_token: str | None = None
 
 
 def load_settings(project_root: Path | None = None) -> Settings:
@@ -51,11 +54,18 @@ def load_settings(project_root: Path | None = None) -> Settings:
         port = 5000
 
     debug = os.getenv("FLASK_DEBUG", "").strip().lower() in {"1", "true", "yes", "y"}
+    # /api/debug/traces expõe rotas e trace ids: só com debug ou habilitado à parte
+    debug_traces = debug or os.getenv("EVICHAIN_DEBUG_TRACES", "").strip().lower() in {"1", "true", "yes", "y"}
+    # /api/security/audit-log/query devolve entradas completas (atores, ids de denúncia)
+    audit_query = debug or os.getenv("EVICHAIN_AUDIT_QUERY", "").strip().lower() in {"1", "true", "yes", "y"}
 
     data_file = root / os.getenv("EVICHAIN_DATA_FILE", "data/blockchain_data.json")
 
     openai_api_key = os.getenv("OPENAI_API_KEY")
 
+    # Rotas de escrita administrativas (ex.: resolver denúncia) exigem este token
+    admin_token = os.getenv("EVICHAIN_ADMIN_TOKEN", "").strip() or None
+
     return Settings(
         project_root=root,
         data_file=data_file,
@@ -63,4 +73,7 @@ def load_settings(project_root: Path | None = None) -> Settings:
         port=port,
         debug=debug,
         openai_api_key=openai_api_key,
+        debug_traces=debug_traces,
+        audit_query=audit_query,
+        admin_token=admin_token,
     )
@@ -0,0 +1,92 @@
+"""
+EviChain – Pre-serialized Static Responses
+
+Some API payloads (the STRIDE threat model, security posture and
+summary) are derived from constants in ``evichain.threat_model`` and
+only change on deploy.  Instead of rebuilding and ``jsonify``-ing them on
+every request, they are serialized once at startup into immutable bytes,
+pre-compressed (gzip, and brotli when available) and tagged with a
+content-hash ETag per representation.
+
+Serving such a payload only selects a ready-made body and sets headers.
+
+Usage::
+
+    from evichain.static_responses import build_security_responses
+
+    responses = build_security_responses()
+    body_encoding, body, etag = responses["posture"].select("gzip, br")
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+
+from .compression import available_encodings, compress_body, encoded_etag, negotiate_encoding
+from .serialization import dumps
+from .threat_model import get_security_posture, get_threat_catalogue, get_threat_summary
+
+
+@dataclass(frozen=True)
+class PrecomputedResponse:
+    """A JSON document serialized once, with pre-compressed variants."""
+
+    body: bytes
+    etag: str
+    variants: dict[str, tuple[bytes, str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_payload(cls, payload: dict, *, compress: bool = True) -> "PrecomputedResponse":
+        body = dumps(payload, sort_keys=True)
+        digest = hashlib.sha256(body).hexdigest()[:40]
+
+        variants: dict[str, tuple[bytes, str]] = {}
+        if compress:
+            for encoding in available_encodings():
+                # Max compression is fine here: it runs once per process.
+                level = 9 if encoding == "gzip" else 11
+                variants[encoding] = (
+                    compress_body(body, encoding, level=level),
+                    encoded_etag(digest, encoding),
+                )
+        return cls(body=body, etag=digest, variants=variants)
+
+    def select(self, accept_encoding: str | None) -> tuple[str | None, bytes, str]:
+        """Return ``(content_encoding, body, etag)`` for the client's header."""
+        encoding = negotiate_encoding(accept_encoding, tuple(self.variants))
+        if encoding is None:
+            return None, self.body, self.etag
+        body, etag = self.variants[encoding]
+        return encoding, body, etag
+
+
+def build_security_responses(*, compress: bool = True) -> dict[str, PrecomputedResponse]:
+    """Serialize the ``/api/security/*`` static payloads.
+
+    Keys: ``threat_model``, ``posture`` and ``summary``; the payload shapes
+    match the original ``jsonify`` responses.
+    """
+    summary = get_threat_summary()
+    posture = get_security_posture()
+    payloads = {
+        "threat_model": {
+            "success": True,
+            "threats": get_threat_catalogue(),
+            "summary": summary,
+        },
+        "posture": {
+            "success": True,
+            "posture": posture,
+        },
+        "summary": {
+            "success": True,
+            "summary": summary,
+            "guarantees_count": len(posture["guarantees"]),
+            "non_guarantees_count": len(posture["non_guarantees"]),
+        },
+    }
+    return {
+        name: PrecomputedResponse.from_payload(payload, compress=compress)
+        for name, payload in payloads.items()
+    }
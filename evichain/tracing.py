@@ -0,0 +1,183 @@
+"""
+EviChain – Per-stage Request Tracing
+
+Records a timed span for every stage of a request (IA analysis, name
+detection, each automatic investigation, mining, chain save, audit) in
+an in-memory ring buffer, so ``/api/debug/traces`` can show where the
+time goes and aggregate p50/p95/p99 per stage.
+
+* The buffer is a ``collections.deque(maxlen=N)``: ``append`` and the
+  snapshot copy are single C-level operations under the GIL, so writers
+  never take a lock and old spans fall off the end automatically.
+* The current trace id lives in a ``ContextVar``; nested spans (for
+  example ``chain.save`` inside ``mining``) inherit it without the id
+  being threaded through every call.
+* Spans carry only the stage name, timing, status and small numeric or
+  categorical attributes – never complaint text, names or registration
+  numbers (LGPD data minimisation).
+* A span is ``error`` when its block raises, or when the block sets a
+  ``status_code`` attribute of 500 or more (a request handler that turns
+  its exception into a 500 response).
+
+Usage::
+
+    from evichain.tracing import tracer
+
+    with tracer.span("ia_analysis", trace_id="REQ-1a2b3c"):
+        with tracer.span("ia.name_detection", names=3):
+            ...
+    tracer.stage_stats()["ia_analysis"]["p95_ms"]
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Iterator, Optional
+
+_current_trace: ContextVar[Optional[str]] = ContextVar("evichain_trace_id", default=None)
+
+
+@dataclass(frozen=True)
+class Span:
+    trace_id: Optional[str]
+    stage: str
+    started_at: float          # epoch seconds
+    duration_ms: float
+    status: str = "ok"         # ok | error
+    error: Optional[str] = None  # exception class name only
+    attrs: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    f, c = math.floor(k), math.ceil(k)
+    if f == c:
+        return sorted_values[int(k)]
+    return sorted_values[f] * (c - k) + sorted_values[c] * (k - f)
+
+
+class Tracer:
+    """Ring buffer of recent spans with per-stage latency aggregation."""
+
+    def __init__(self, capacity: int = 2048) -> None:
+        self.capacity = capacity
+        self._spans: deque[Span] = deque(maxlen=capacity)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def span(self, stage: str, *, trace_id: Optional[str] = None, **attrs) -> Iterator[dict]:
+        """Time the enclosed block as ``stage``.
+
+        Yields the attribute dict so the block can add attributes it only
+        learns while running (e.g. the mined nonce, or the response's
+        ``status_code``).
+        """
+        token = _current_trace.set(trace_id) if trace_id is not None else None
+        started_at = time.time()
+        t0 = time.perf_counter()
+        status, error = "ok", None
+        try:
+            yield attrs
+        except BaseException as exc:
+            status, error = "error", type(exc).__name__
+            raise
+        else:
+            if attrs.get("status_code", 0) >= 500:
+                status = "error"
+        finally:
+            self._spans.append(Span(
+                trace_id=_current_trace.get(),
+                stage=stage,
+                started_at=started_at,
+                duration_ms=(time.perf_counter() - t0) * 1000,
+                status=status,
+                error=error,
+                attrs=attrs,
+            ))
+            if token is not None:
+                _current_trace.reset(token)
+
+    def event(self, stage: str, *, trace_id: Optional[str] = None, **attrs) -> None:
+        """Record an instantaneous (zero-duration) marker."""
+        self._spans.append(Span(
+            trace_id=trace_id if trace_id is not None else _current_trace.get(),
+            stage=stage,
+            started_at=time.time(),
+            duration_ms=0.0,
+            attrs=attrs,
+        ))
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def spans(
+        self,
+        *,
+        trace_id: Optional[str] = None,
+        stage: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[Span]:
+        """Recent spans, oldest first, optionally filtered."""
+        snapshot = list(self._spans)
+        if trace_id is not None:
+            snapshot = [s for s in snapshot if s.trace_id == trace_id]
+        if stage is not None:
+            snapshot = [s for s in snapshot if s.stage == stage]
+        if limit is not None:
+            snapshot = snapshot[-limit:] if limit > 0 else []
+        return snapshot
+
+    def stage_stats(self) -> dict[str, dict]:
+        """``{stage: {count, errors, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}``.
+
+        Zero-duration events are counted but excluded from the latency
+        percentiles.
+        """
+        by_stage: dict[str, list[Span]] = {}
+        for s in list(self._spans):
+            by_stage.setdefault(s.stage, []).append(s)
+
+        stats = {}
+        for stage, spans in sorted(by_stage.items()):
+            durations = sorted(s.duration_ms for s in spans if s.duration_ms > 0)
+            stats[stage] = {
+                "count": len(spans),
+                "errors": sum(1 for s in spans if s.status == "error"),
+                "mean_ms": round(sum(durations) / len(durations), 3) if durations else 0.0,
+                "p50_ms": round(_percentile(durations, 50), 3),
+                "p95_ms": round(_percentile(durations, 95), 3),
+                "p99_ms": round(_percentile(durations, 99), 3),
+                "max_ms": round(durations[-1], 3) if durations else 0.0,
+            }
+        return stats
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace id of the enclosing span, if any."""
+    return _current_trace.get()
+
+
+# Process-wide tracer shared by the API and the engines it calls.
+tracer = Tracer(capacity=int(os.getenv("EVICHAIN_TRACE_BUFFER", "2048")))
@@ -81,18 +81,53 @@ class SyncService {
     }
 
     /**
-     * PULL — Baixa denúncias do servidor que não existem localmente.
-     * Retorna quantas denúncias foram importadas.
+     * Busca no servidor o que mudou desde a última ponta sincronizada.
+     * Sem ponta salva (ou se ela divergiu) o servidor devolve o conjunto
+     * completo, com ``full=true``.
      */
-    async pull() {
-        const serverUrl = this._getServerUrl();
-        const result = await this._request('GET', `${serverUrl}/api/sync/pull`);
+    async _fetchChanges(serverUrl) {
+        const tip = this.db.getSetting('sync_tip');
+        let url = `${serverUrl}/api/sync/pull`;
+        if (tip && tip.server === serverUrl) {
+            const params = new URLSearchParams({
+                since_height: String(tip.height),
+                since_hash: tip.hash
+            });
+            url += `?${params}`;
+        }
 
+        const result = await this._request('GET', url);
         if (result.status !== 200 || !result.data.success) {
             throw new Error(result.data.error || 'Erro ao buscar dados do servidor');
         }
+        return result.data;
+    }
+
+    /**
+     * IDs de denúncias que já existem no servidor, conhecidos pela última
+     * sincronização somados aos de ``changes``.
+     */
+    _knownServerIds(serverUrl, changes) {
+        const known = this.db.getSetting('sync_server_ids');
+        const ids = new Set(!changes.full && known && known.server === serverUrl ? known.ids : []);
+        (changes.complaints || []).forEach(c => ids.add(c.id));
+        return ids;
+    }
+
+    _saveKnownServerIds(serverUrl, ids) {
+        this.db.setSetting('sync_server_ids', { server: serverUrl, ids: [...ids] });
+    }
 
-        const serverComplaints = result.data.complaints || [];
+    /**
+     * PULL — Baixa denúncias do servidor que não existem localmente.
+     * Envia a ponta já conhecida (``since_height``/``since_hash``) para
+     * receber só os blocos novos. Retorna quantas denúncias foram importadas.
+     */
+    async pull() {
+        const serverUrl = this._getServerUrl();
+        const changes = await this._fetchChanges(serverUrl);
+
+        const serverComplaints = changes.complaints || [];
         let imported = 0;
         let updated = 0;
 
@@ -129,9 +164,19 @@ class SyncService {
             }
         }
 
+        this._saveKnownServerIds(serverUrl, this._knownServerIds(serverUrl, changes));
+        this.db.setSetting('sync_tip', {
+            server: serverUrl,
+            height: changes.tip_height,
+            hash: changes.tip_hash
+        });
+
         this.db.logAudit('sync_pull', 'sync', null, null, {
             server: serverUrl,
             server_total: serverComplaints.length,
+            full: !!changes.full,
+            diverged: !!changes.diverged,
+            tip_height: changes.tip_height,
             imported,
             updated
         });
@@ -146,13 +191,17 @@ class SyncService {
     async push() {
         const serverUrl = this._getServerUrl();
 
-        // Buscar IDs que já existem no servidor
-        const serverResult = await this._request('GET', `${serverUrl}/api/sync/pull`);
-        if (serverResult.status !== 200 || !serverResult.data.success) {
+        // IDs que já existem no servidor: os conhecidos mais os blocos novos.
+        // A ponta não avança aqui — as denúncias novas ainda não foram
+        // importadas e o próximo pull precisa recebê-las.
+        let changes;
+        try {
+            changes = await this._fetchChanges(serverUrl);
+        } catch (err) {
             throw new Error('Erro ao consultar servidor para sync');
         }
 
-        const serverIds = new Set((serverResult.data.complaints || []).map(c => c.id));
+        const serverIds = this._knownServerIds(serverUrl, changes);
         const localComplaints = this.db.listComplaints({});
         const toSync = localComplaints.filter(c => !serverIds.has(c.id));
 
@@ -181,6 +230,7 @@ class SyncService {
                 const result = await this._request('POST', `${serverUrl}/api/sync/push`, pushData);
 
                 if (result.status === 200 || result.status === 201) {
+                    serverIds.add(complaint.id);
                     pushed++;
                 } else {
                     errors.push({ id: complaint.id, error: result.data.error || 'Erro desconhecido' });
@@ -190,6 +240,8 @@ class SyncService {
             }
         }
 
+        this._saveKnownServerIds(serverUrl, serverIds);
+
         this.db.logAudit('sync_push', 'sync', null, null, {
             server: serverUrl,
             local_total: localComplaints.length,
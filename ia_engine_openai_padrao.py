@@ -5,18 +5,19 @@ from datetime import datetime
 from time import perf_counter
 from typing import Any, Dict, Optional
 
-# CORREÇÃO: Importar as classes corretamente
-try:
-    from openai import OpenAI
-    OPENAI_DISPONIVEL = True
-except ImportError:
-    OPENAI_DISPONIVEL = False
+from evichain.optional_imports import available, require
+
+# A biblioteca openai (~0.5 s de import) só é carregada quando há credenciais
+OPENAI_DISPONIVEL = available("openai")
+if not OPENAI_DISPONIVEL:
     print("[WARN] Biblioteca openai não instalada. Use: pip install openai>=1.0.0")
 
 from ia_analisador_texto import AnalisadorTexto
 from detector_nomes import DetectorNomes
 from consultor_registros import ConsultorRegistrosProfissionais
 from investigador_digital import InvestigadorDigital
+from evichain.metrics import OPENAI_SECONDS
+from evichain.tracing import tracer
 
 
 class IAEngineOpenAIPadrao:
@@ -77,19 +78,28 @@ class IAEngineOpenAIPadrao:
         return None
     """Motor de IA usando OpenAI para analise de denuncias com base de conhecimento legislativa"""
 
-    def __init__(self) -> None:
-        """Inicializa o motor de IA e o cliente OpenAI."""
+    def __init__(
+        self,
+        detector_nomes: Optional[DetectorNomes] = None,
+        consultor_registros: Optional[ConsultorRegistrosProfissionais] = None,
+        investigador: Optional[InvestigadorDigital] = None,
+    ) -> None:
+        """Inicializa o motor de IA e o cliente OpenAI.
+
+        Os componentes de investigação podem ser injetados (instâncias
+        compartilhadas do container de serviços); sem isso, são criados aqui.
+        """
         self.versao = "EviChain IA v2.1"
         self.client = None
         self.legislacao: Dict[str, Any] = {}
         self.analisador = AnalisadorTexto()
         
-        # Inicializar componentes de investigação automática
-        self.detector_nomes = DetectorNomes()
-        self.consultor_registros = ConsultorRegistrosProfissionais()
-        # Inicializar cache CONFEF com dados conhecidos
-        self.consultor_registros._inicializar_cache_confef()
-        self.investigador = InvestigadorDigital()
+        # Componentes de investigação automática (o consultor já carrega o cache CONFEF)
+        self.detector_nomes = detector_nomes or DetectorNomes()
+        self.consultor_registros = consultor_registros or (
+            investigador.consultor_registros if investigador else ConsultorRegistrosProfissionais()
+        )
+        self.investigador = investigador or InvestigadorDigital(consultor_registros=self.consultor_registros)
 
         # Carregar base de conhecimento legislativa
         self._carregar_legislacao()
@@ -126,7 +136,7 @@ class IAEngineOpenAIPadrao:
 
         try:
             # CORREÇÃO: Usar apenas parâmetros suportados
-            self.client = OpenAI(
+            self.client = require("openai").OpenAI(
                 api_key=api_key,
                 timeout=self._client_timeout,
                 max_retries=self._max_retries
@@ -211,23 +221,27 @@ class IAEngineOpenAIPadrao:
         analise_principal = None
         if self.client:
             try:
-                analise_principal = self._analisar_com_openai(descricao, conselho, categoria, trace_id)
+                with tracer.span("ia.openai"):
+                    analise_principal = self._analisar_com_openai(descricao, conselho, categoria, trace_id)
             except Exception as exc:
                 print(f"[WARN][{trace_id}] Falha OpenAI: {exc}. Usando fallback.")
 
         if not analise_principal:
-            analise_principal = self._analisar_local(descricao, conselho, categoria, trace_id)
+            with tracer.span("ia.local"):
+                analise_principal = self._analisar_local(descricao, conselho, categoria, trace_id)
 
         # 2. DETECÇÃO AUTOMÁTICA DE NOMES E PROFISSIONAIS
         print(f"[INFO][{trace_id}] Detectando nomes no texto da denúncia...")
-        deteccao_nomes = self.detector_nomes.detectar_nomes_e_registros(descricao, conselho)
+        with tracer.span("ia.name_detection") as span_attrs:
+            deteccao_nomes = self.detector_nomes.detectar_nomes_e_registros(descricao, conselho)
+            span_attrs["names"] = len(deteccao_nomes.get("nomes_detectados", []))
         
         # 3. INVESTIGAÇÃO AUTOMÁTICA DOS PROFISSIONAIS DETECTADOS
         investigacoes_automaticas = []
         if deteccao_nomes.get("recomendacao_investigacao", False):
             print(f"[INFO][{trace_id}] Investigação automática recomendada - executando...")
             
-            for nome_info in deteccao_nomes.get("nomes_detectados", []):
+            for posicao, nome_info in enumerate(deteccao_nomes.get("nomes_detectados", [])):
                 nome = nome_info["nome_detectado"]
                 print(f"[INFO][{trace_id}] Investigando automaticamente: {nome}")
                 
@@ -240,13 +254,14 @@ class IAEngineOpenAIPadrao:
                         conselho_investigacao = nome_info["registro_associado"]["conselho"]
                         registro_investigacao = nome_info["registro_associado"]["numero"]
                     
-                    # Realizar investigação completa
-                    investigacao_resultado = self.investigador.investigar_completo(
-                        nome=nome,
-                        registro_profissional=registro_investigacao,
-                        conselho=conselho_investigacao,
-                        informacoes_adicionais={"fonte": "deteccao_automatica", "trace_id": trace_id}
-                    )
+                    # Realizar investigação completa (o span guarda só a posição, não o nome)
+                    with tracer.span("ia.investigation", position=posicao):
+                        investigacao_resultado = self.investigador.investigar_completo(
+                            nome=nome,
+                            registro_profissional=registro_investigacao,
+                            conselho=conselho_investigacao,
+                            informacoes_adicionais={"fonte": "deteccao_automatica", "trace_id": trace_id}
+                        )
                     
                     investigacoes_automaticas.append({
                         "nome_investigado": nome,
@@ -327,17 +342,22 @@ Analise a denúncia e retorne APENAS um JSON no seguinte formato:
 
         start_time = perf_counter()
         
-        response = self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "Você é um especialista em análise de denúncias profissionais."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1000
-        )
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": "Você é um especialista em análise de denúncias profissionais."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=1000
+            )
+        except Exception:
+            OPENAI_SECONDS.observe(perf_counter() - start_time, outcome="error")
+            raise
         
         elapsed = perf_counter() - start_time
+        OPENAI_SECONDS.observe(elapsed, outcome="ok")
         resposta_texto = response.choices[0].message.content.strip()
         
         # Extrair JSON
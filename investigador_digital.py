@@ -5,7 +5,6 @@ Sistema de investigação digital para coleta de evidências em denúncias profi
 DESTINADO EXCLUSIVAMENTE PARA USO DE ÓRGÃOS PÚBLICOS COM COMPETÊNCIA INVESTIGATIVA
 """
 
-import requests
 import json
 import re
 import time
@@ -14,7 +13,9 @@ from datetime import datetime, timedelta
 import os
 from urllib.parse import quote
 import base64
+from functools import cached_property
 from consultor_registros import ConsultorRegistrosProfissionais
+from evichain.outbound import create_session, fan_out
 
 class InvestigadorDigital:
     """
@@ -22,7 +23,7 @@ class InvestigadorDigital:
     Coleta informações públicas e de redes sociais para investigação de denúncias
     """
     
-    def __init__(self):
+    def __init__(self, consultor_registros: Optional[ConsultorRegistrosProfissionais] = None):
         self.versao = "EviChain Investigador v1.0"
         self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         self.headers = {
@@ -33,11 +34,8 @@ class InvestigadorDigital:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         }
-        self.sessao = requests.Session()
-        self.sessao.headers.update(self.headers)
-        
-        # Inicializar consultor de registros profissionais
-        self.consultor_registros = ConsultorRegistrosProfissionais()
+        # Consultor de registros profissionais (compartilhado quando injetado)
+        self.consultor_registros = consultor_registros or ConsultorRegistrosProfissionais()
         
         # URLs de APIs e endpoints para investigação
         self.apis = {
@@ -57,6 +55,11 @@ class InvestigadorDigital:
         
         print(f"[INFO] {self.versao} inicializado")
         print("[WARN] Este sistema deve ser usado apenas por órgãos públicos com competência investigativa")
+
+    @cached_property
+    def sessao(self):
+        """Sessão HTTP compartilhada pelas buscas paralelas; criada na primeira busca."""
+        return create_session(self.headers)
     
     def investigar_completo(self, nome: str, registro_profissional: str = None, 
                           conselho: str = None, informacoes_adicionais: Dict = None) -> Dict[str, Any]:
@@ -92,19 +95,16 @@ class InvestigadorDigital:
         }
         
         try:
-            # 1. Verificar registros oficiais nos conselhos
-            print("[INFO] Verificando registros oficiais...")
-            resultado_investigacao["registros_oficiais"] = self._verificar_registros_oficiais(
-                nome, registro_profissional, conselho
-            )
-            
-            # 2. Buscar em redes sociais
-            print("[INFO] Investigando redes sociais...")
-            resultado_investigacao["redes_sociais"] = self._investigar_redes_sociais(nome)
-            
-            # 3. Busca geral na internet
-            print("[INFO] Realizando busca geral...")
-            resultado_investigacao["busca_geral"] = self._busca_geral_internet(nome, registro_profissional)
+            # 1-3. Registros oficiais, redes sociais e busca geral são independentes
+            # e quase só esperam por rede: consultados em paralelo.
+            print("[INFO] Verificando registros oficiais, redes sociais e busca geral...")
+            resultado_investigacao.update(fan_out({
+                "registros_oficiais": lambda: self._verificar_registros_oficiais(
+                    nome, registro_profissional, conselho
+                ),
+                "redes_sociais": lambda: self._investigar_redes_sociais(nome),
+                "busca_geral": lambda: self._busca_geral_internet(nome, registro_profissional),
+            }, span="investigation"))
             
             # 4. Verificar histórico de sanções
             print("[INFO] Verificando histórico de sanções...")
@@ -195,15 +195,16 @@ class InvestigadorDigital:
     
     def _investigar_redes_sociais(self, nome: str) -> Dict[str, Any]:
         """Investiga presença em redes sociais"""
-        redes_sociais = {
-            "facebook": self._buscar_facebook(nome),
-            "instagram": self._buscar_instagram(nome),
-            "linkedin": self._buscar_linkedin(nome),
-            "twitter": self._buscar_twitter(nome),
-            "youtube": self._buscar_youtube(nome),
-            "tiktok": self._buscar_tiktok(nome),
-            "outras_redes": self._buscar_outras_redes(nome)
-        }
+        # Cada plataforma é consultada em paralelo
+        redes_sociais = fan_out({
+            "facebook": lambda: self._buscar_facebook(nome),
+            "instagram": lambda: self._buscar_instagram(nome),
+            "linkedin": lambda: self._buscar_linkedin(nome),
+            "twitter": lambda: self._buscar_twitter(nome),
+            "youtube": lambda: self._buscar_youtube(nome),
+            "tiktok": lambda: self._buscar_tiktok(nome),
+            "outras_redes": lambda: self._buscar_outras_redes(nome)
+        }, span="social")
         
         return redes_sociais
     
@@ -262,13 +263,14 @@ class InvestigadorDigital:
         try:
             # Busca por username comum baseado no nome
             nome_limpo = re.sub(r'[^a-zA-Z0-9]', '', nome.lower())
-            possiveis_usernames = [
+            # nome_limpo já não tem espaços: dict.fromkeys evita sondar o mesmo perfil duas vezes
+            possiveis_usernames = list(dict.fromkeys([
                 nome_limpo,
                 nome_limpo.replace(' ', ''),
                 f"dr{nome_limpo}",
                 f"dra{nome_limpo}",
                 f"{nome_limpo}oficial"
-            ]
+            ]))
             
             for username in possiveis_usernames:
                 url_perfil = f"https://www.instagram.com/{username}/"
@@ -54,7 +54,7 @@ After=network.target
 User=${APP_USER}
 WorkingDirectory=${REMOTE_DIR}
 EnvironmentFile=${REMOTE_DIR}/.env
-ExecStart=${REMOTE_DIR}/.venv/bin/gunicorn wsgi:app --bind 127.0.0.1:${APP_PORT} --workers 2 --timeout 120
+ExecStart=${REMOTE_DIR}/.venv/bin/gunicorn wsgi:app --bind 127.0.0.1:${APP_PORT} --workers 2 --worker-class gthread --threads 8 --timeout 120
 Restart=always
 
 [Install]
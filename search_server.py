@@ -10,8 +10,10 @@ from pathlib import Path
 
 from blockchain_simulator import EviChainBlockchain
 from evichain import load_settings
+from evichain.flask_json import FastJSONProvider
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)
 
 # Inicializar blockchain
@@ -0,0 +1,170 @@
+"""
+EviChain – Incremental Aggregates Tests
+
+The counters kept by ``evichain.aggregates`` must always equal a full
+recount of the chain, survive a reload, and be rebuilt when the saved
+copy no longer matches the chain.
+
+Run with:  pytest tests/test_aggregates.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import api_server  # noqa: E402
+from api_server import app, _rate_limit_store, evichain  # noqa: E402
+from blockchain_simulator import EviChainBlockchain  # noqa: E402
+from evichain.aggregates import ChainAggregates  # noqa: E402
+
+
+@pytest.fixture()
+def client():
+    app.config["TESTING"] = True
+    _rate_limit_store.clear()
+    with app.test_client() as c:
+        yield c
+
+
+@pytest.fixture()
+def chain(tmp_path):
+    bc = EviChainBlockchain(data_file=str(tmp_path / "chain.json"))
+    bc.difficulty = 1
+    return bc
+
+
+def _add(bc, conselho, categoria, nivel=None):
+    analysis = {"classificacao_risco": {"nivel": nivel}} if nivel else {}
+    complaint_id = bc.add_evidence_transaction(
+        {"titulo": "t", "descricao": "d", "conselho": conselho, "categoria": categoria,
+         "ia_analysis": analysis}
+    )
+    bc.mine_pending_transactions()
+    return complaint_id
+
+
+def _recount(bc) -> dict:
+    councils, categories = {}, {}
+    for c in bc.get_all_complaints():
+        councils[c["conselho"] or "N/A"] = councils.get(c["conselho"] or "N/A", 0) + 1
+        categories[c["categoria"] or "N/A"] = categories.get(c["categoria"] or "N/A", 0) + 1
+    return {"total": len(bc.get_all_complaints()), "councils": councils, "categories": categories}
+
+
+# ──────────────────────────────────────────────
+# Incremental updates
+# ──────────────────────────────────────────────
+
+class TestIncremental:
+    def test_matches_full_recount(self, chain):
+        _add(chain, "CRM", "Negligência", "ALTO")
+        _add(chain, "CRM", "Ética", "BAIXO")
+        _add(chain, None, "Ética")
+
+        stats = chain.aggregates.stats()
+        expected = _recount(chain)
+        assert stats["total_complaints"] == expected["total"] == 3
+        assert stats["councils"] == expected["councils"] == {"CRM": 2, "N/A": 1}
+        assert stats["categories"] == expected["categories"]
+        assert stats["risk_levels"] == {"ALTO": 1, "BAIXO": 1, "N/A": 1}
+        assert chain.aggregates.to_dict() == ChainAggregates.build(chain.chain).to_dict()
+
+    def test_resolution_time_from_status_updates(self, chain):
+        first = _add(chain, "CRM", "Ética")
+        _add(chain, "OAB", "Ética")
+        update = chain.add_status_update(first)
+        # Resolvida exatamente 36h após o registro
+        tx = chain.chain[1].data["transactions"][0]
+        update["timestamp"] = tx["timestamp"] + 36 * 3600
+        chain.mine_pending_transactions()
+
+        analytics = chain.aggregates.analytics()
+        assert analytics["resolvedComplaints"] == 1
+        assert analytics["pendingComplaints"] == 1
+        assert analytics["averageResolutionTime"] == "36h"
+        assert sum(day["resolved"] for day in chain.aggregates.timeseries()) == 1
+        # A atualização de status não aparece como denúncia
+        assert len(chain.get_all_complaints()) == 2
+
+    def test_status_update_for_unknown_complaint_rejected(self, chain):
+        with pytest.raises(KeyError):
+            chain.add_status_update("EVC-0000-000000")
+
+    def test_resolve_endpoint_records_resolution(self, client, chain, monkeypatch):
+        monkeypatch.setattr(api_server, "evichain", chain)
+        monkeypatch.setattr(api_server, "audit_log", None)
+        monkeypatch.setitem(app.config, "EVICHAIN_ADMIN_TOKEN", "s3cret")
+        first = _add(chain, "CRM", "Ética")
+        auth = {"Authorization": "Bearer s3cret"}
+
+        assert client.post(f"/api/complaints/{first}/resolve").status_code == 401
+        r = client.post(f"/api/complaints/{first}/resolve", headers=auth)
+        assert r.status_code == 200
+        assert r.get_json()["block_index"] == chain.last_block.index
+        assert client.get("/api/analytics").get_json()["resolvedComplaints"] == 1
+
+        assert client.post(f"/api/complaints/{first}/resolve", headers=auth).status_code == 409
+        assert client.post("/api/complaints/EVC-0000-000000/resolve", headers=auth).status_code == 404
+
+    def test_resolve_endpoint_hidden_without_token(self, client, monkeypatch):
+        monkeypatch.setitem(app.config, "EVICHAIN_ADMIN_TOKEN", None)
+        assert client.post("/api/complaints/EVC-1/resolve").status_code == 404
+
+
+# ──────────────────────────────────────────────
+# Persistence with the chain file
+# ──────────────────────────────────────────────
+
+class TestPersistence:
+    def test_saved_aggregates_reused_on_load(self, chain):
+        _add(chain, "CRM", "Ética")
+        with open(chain.data_file, encoding="utf-8") as f:
+            saved = json.load(f)["aggregates"]
+        assert saved["height"] == chain.last_block.index
+        assert saved["tip_hash"] == chain.last_block.hash
+
+        reloaded = EviChainBlockchain(data_file=chain.data_file)
+        assert reloaded.aggregates.to_dict() == chain.aggregates.to_dict()
+
+    def test_stale_aggregates_are_rebuilt(self, chain):
+        _add(chain, "CRM", "Ética")
+        with open(chain.data_file, encoding="utf-8") as f:
+            document = json.load(f)
+        document["aggregates"]["tip_hash"] = "0" * 64
+        document["aggregates"]["total_complaints"] = 999
+        with open(chain.data_file, "w", encoding="utf-8") as f:
+            json.dump(document, f)
+
+        reloaded = EviChainBlockchain(data_file=chain.data_file)
+        assert reloaded.aggregates.stats()["total_complaints"] == 1
+
+    def test_older_aggregates_catch_up(self, chain):
+        _add(chain, "CRM", "Ética")
+        older = chain.aggregates.to_dict()
+        _add(chain, "OAB", "Ética")
+
+        resumed = ChainAggregates.from_dict(older).resume(chain.chain)
+        assert resumed.to_dict() == chain.aggregates.to_dict()
+
+
+# ──────────────────────────────────────────────
+# Endpoints
+# ──────────────────────────────────────────────
+
+class TestEndpoints:
+    def test_stats_and_analytics_use_aggregates(self, client):
+        expected = _recount(evichain)
+        stats = client.get("/api/stats").get_json()
+        assert stats["total_complaints"] == expected["total"]
+        assert stats["councils"] == expected["councils"]
+
+        analytics = client.get("/api/analytics?days=7").get_json()
+        assert analytics["totalComplaints"] == expected["total"]
+        assert len(analytics["timeseries"]) <= 7
@@ -0,0 +1,199 @@
+"""
+EviChain – API Performance Behaviour Tests
+
+Covers the HTTP-level optimisations of the API server:
+    * conditional GET (ETag / If-None-Match) on chain read endpoints
+    * pre-serialized, pre-compressed static security payloads
+    * gzip/brotli response compression middleware
+
+Run with:  pytest tests/test_api_performance.py -v
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sys
+import time
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from api_server import app, _rate_limit_store  # noqa: E402
+
+
+@pytest.fixture()
+def client():
+    app.config["TESTING"] = True
+    _rate_limit_store.clear()
+    with app.test_client() as c:
+        yield c
+
+
+# ──────────────────────────────────────────────
+# Conditional GET keyed on chain tip
+# ──────────────────────────────────────────────
+
+class TestChainETags:
+    READ_ENDPOINTS = [
+        "/api/complaints",
+        "/api/stats",
+        "/api/blockchain-info",
+        "/api/analytics",
+        "/api/search?query=teste",
+    ]
+
+    def test_revalidation_returns_304(self, client):
+        for path in self.READ_ENDPOINTS:
+            first = client.get(path)
+            assert first.status_code == 200, path
+            etag = first.headers.get("ETag")
+            assert etag and not etag.startswith("W/"), path
+            assert "no-cache" in first.headers.get("Cache-Control", "")
+
+            again = client.get(path, headers={"If-None-Match": etag})
+            assert again.status_code == 304, path
+            assert again.get_data() == b""
+            assert again.headers.get("ETag") == etag
+
+    def test_etag_depends_on_query(self, client):
+        a = client.get("/api/search?query=alpha").headers["ETag"]
+        b = client.get("/api/search?query=beta").headers["ETag"]
+        assert a != b
+
+    def test_escaped_separators_do_not_collide(self, client):
+        split = client.get("/api/search?query=a&limit=5").headers["ETag"]
+        joined = client.get("/api/search?query=a%26limit%3D5").headers["ETag"]
+        assert split != joined
+        assert client.get("/api/search?limit=5&query=a").headers["ETag"] == split
+
+    def test_new_block_changes_etag(self, client):
+        etag = client.get("/api/stats").headers["ETag"]
+        client.post("/api/sync/push-batch", json=[{"titulo": "etag", "descricao": "etag"}])
+        r = client.get("/api/stats", headers={"If-None-Match": etag})
+        assert r.status_code == 200
+        assert r.headers["ETag"] != etag
+
+    def test_errors_are_not_tagged(self, client):
+        r = client.get("/api/search")
+        assert r.status_code == 400
+        assert "ETag" not in r.headers
+
+
+# ──────────────────────────────────────────────
+# Pre-serialized security endpoints
+# ──────────────────────────────────────────────
+
+class TestPrecomputedSecurityResponses:
+    PATHS = [
+        "/api/security/threat-model",
+        "/api/security/posture",
+        "/api/security/summary",
+    ]
+
+    def test_gzip_variant_matches_identity(self, client):
+        for path in self.PATHS:
+            plain = client.get(path)
+            zipped = client.get(path, headers={"Accept-Encoding": "gzip"})
+            assert zipped.headers.get("Content-Encoding") == "gzip", path
+            assert json.loads(gzip.decompress(zipped.get_data())) == plain.get_json()
+            assert zipped.headers["ETag"] != plain.headers["ETag"]
+            assert "Accept-Encoding" in zipped.headers.get("Vary", "")
+
+    def test_conditional_get_per_variant(self, client):
+        plain = client.get("/api/security/posture")
+        r = client.get("/api/security/posture", headers={"If-None-Match": plain.headers["ETag"]})
+        assert r.status_code == 304
+
+    def test_body_is_built_once(self, client):
+        from api_server import STATIC_RESPONSES
+
+        body = STATIC_RESPONSES["summary"].body
+        client.get("/api/security/summary")
+        assert STATIC_RESPONSES["summary"].body is body
+
+
+# ──────────────────────────────────────────────
+# Response compression
+# ──────────────────────────────────────────────
+
+class TestResponseCompression:
+    def test_large_json_is_gzipped(self, client):
+        from api_server import COMPRESSION_MIN_BYTES
+
+        plain = client.get("/api/sync/pull")
+        assert len(plain.get_data()) >= COMPRESSION_MIN_BYTES
+        assert "Content-Encoding" not in plain.headers
+
+        zipped = client.get("/api/sync/pull", headers={"Accept-Encoding": "gzip"})
+        assert zipped.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in zipped.headers.get("Vary", "")
+        assert len(zipped.get_data()) < len(plain.get_data())
+        body = json.loads(gzip.decompress(zipped.get_data()))
+        assert body["tip_hash"] == plain.get_json()["tip_hash"]
+
+    def test_encoded_etag_revalidates(self, client):
+        zipped = client.get("/api/complaints", headers={"Accept-Encoding": "gzip"})
+        etag = zipped.headers["ETag"]
+        assert etag.endswith('-gzip"')
+        r = client.get("/api/complaints", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert r.status_code == 304
+        assert r.headers["ETag"] == etag
+
+    def test_same_etag_new_body_is_recompressed(self, client):
+        # /api/sync/pull keeps its ETag until the next block, but server_time moves
+        first = client.get("/api/sync/pull", headers={"Accept-Encoding": "gzip"})
+        time.sleep(0.01)
+        second = client.get("/api/sync/pull", headers={"Accept-Encoding": "gzip"})
+        assert first.headers["ETag"] == second.headers["ETag"]
+        assert (json.loads(gzip.decompress(second.get_data()))["server_time"]
+                != json.loads(gzip.decompress(first.get_data()))["server_time"])
+
+    def test_files_keep_identity_encoding(self, client):
+        r = client.get("/landing.js", headers={"Accept-Encoding": "gzip"})
+        assert r.status_code == 200
+        assert "Content-Encoding" not in r.headers
+        again = client.get("/landing.js", headers={"If-None-Match": r.headers["ETag"],
+                                                   "Accept-Encoding": "gzip"})
+        assert again.status_code == 304
+        r.close()
+
+    def test_small_bodies_left_alone(self, client):
+        r = client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in r.headers
+
+    def test_identity_refused_encodings(self, client):
+        r = client.get("/api/complaints", headers={"Accept-Encoding": "gzip;q=0"})
+        assert "Content-Encoding" not in r.headers
+
+
+class TestCompressionHelpers:
+    def test_negotiation(self):
+        from evichain.compression import negotiate_encoding
+
+        assert negotiate_encoding("gzip, deflate") == "gzip"
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("") is None
+        assert negotiate_encoding("*", ("gzip",)) == "gzip"
+
+    def test_stream_round_trip(self):
+        from evichain.compression import compress_stream
+
+        chunks = [b'{"a": ', "[1, 2, 3]", b"}"] * 50
+        out = b"".join(compress_stream(iter(chunks), "gzip"))
+        assert gzip.decompress(out) == b"".join(
+            c.encode() if isinstance(c, str) else c for c in chunks
+        )
+
+    def test_body_cache_is_bounded(self):
+        from evichain.compression import CompressedBodyCache
+
+        cache = CompressedBodyCache(max_entries=2)
+        for i in range(5):
+            cache.put(f"e{i}", "gzip", b"x")
+        assert len(cache) == 2
+        assert cache.get("e4", "gzip") == b"x"
+        assert cache.get("e0", "gzip") is None
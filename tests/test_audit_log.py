@@ -0,0 +1,492 @@
+"""
+EviChain – Audit Log Tests
+
+Covers ``evichain.audit_log``: appends continue the sequence and the
+HMAC chain from the tail of an existing file without re-reading it,
+stay chained under concurrent writers, and reach the disk according to
+the configured durability mode.
+
+Run with:  pytest tests/test_audit_log.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from evichain import audit_log as audit_module  # noqa: E402
+from evichain.audit_index import parse_timestamp  # noqa: E402
+from evichain.audit_log import GENESIS_DIGEST, AuditLog  # noqa: E402
+
+KEY = b"k" * 32
+
+
+@pytest.fixture()
+def log(tmp_path):
+    log = AuditLog(log_dir=tmp_path, hmac_key=KEY, durability="fsync")
+    yield log
+    log.close()
+
+
+@pytest.fixture(params=["fsync", "interval", "batch"])
+def any_log(request, tmp_path):
+    log = AuditLog(log_dir=tmp_path, hmac_key=KEY, durability=request.param,
+                   flush_interval=0.01)
+    yield log
+    log.close()
+
+
+def _lines(log) -> int:
+    return sum(1 for line in open(log.log_file, "rb") if line.strip())
+
+
+# ──────────────────────────────────────────────
+# Tail recovery
+# ──────────────────────────────────────────────
+
+class TestTailRecovery:
+    def test_empty_log_starts_at_genesis(self, log):
+        assert (log._seq, log._prev_digest) == (0, GENESIS_DIGEST)
+        assert log.log_event("TEST", actor="t")["seq"] == 1
+
+    def test_reopen_continues_sequence_and_chain(self, any_log, tmp_path):
+        for _ in range(3):
+            last = any_log.log_event("TEST", actor="t", detail={"texto": "ação"})
+        any_log.close()
+
+        reopened = AuditLog(log_dir=tmp_path, hmac_key=KEY)
+        assert reopened._seq == 3
+        assert reopened._prev_digest == last["hmac"]
+        entry = reopened.log_event("TEST", actor="t")
+        reopened.flush()  # interval mode chains the entry when it is written
+        assert entry["seq"] == 4
+        assert reopened.verify_integrity()["valid"] is True
+
+    def test_recovery_reads_only_the_tail(self, log, monkeypatch):
+        big = "x" * (audit_module.TAIL_CHUNK * 3)
+        for _ in range(20):
+            log.log_event("TEST", actor="t", detail={"blob": big})
+        last = log.log_event("TEST", actor="t")
+
+        monkeypatch.setattr(AuditLog, "_last_valid_entry", lambda self: pytest.fail("full scan"))
+        size = log.log_file.stat().st_size
+        assert log._recover_tail() == (21, last["hmac"], size)
+
+    def test_entry_longer_than_chunk(self, log, monkeypatch):
+        monkeypatch.setattr(audit_module, "TAIL_CHUNK", 16)
+        entry = log.log_event("TEST", actor="t", detail={"blob": "y" * 500})
+        assert log._recover_tail()[:2] == (1, entry["hmac"])
+
+    def test_torn_last_line_is_cut_off(self, log, tmp_path):
+        log.log_event("TEST", actor="t")
+        second = log.log_event("TEST", actor="t")
+        size = log.log_file.stat().st_size
+        with open(log.log_file, "a", encoding="utf-8") as fh:
+            fh.write('{"seq": 3, "trunc')
+        log.close()
+
+        reopened = AuditLog(log_dir=tmp_path, hmac_key=KEY, durability="fsync")
+        assert (reopened._seq, reopened._prev_digest) == (2, second["hmac"])
+        assert reopened.log_file.stat().st_size == size
+        assert reopened.log_event("TEST", actor="t")["seq"] == 3
+        assert reopened.verify_integrity(full=True)["errors"] == []
+        reopened.close()
+
+    def test_invalid_last_line_links_to_last_valid_entry(self, log):
+        entry = log.log_event("TEST", actor="t")
+        with open(log.log_file, "a", encoding="utf-8") as fh:
+            fh.write("not json\n")
+        assert log._recover_tail()[:2] == (1, entry["hmac"])
+
+
+# ──────────────────────────────────────────────
+# Concurrent writers and durability modes
+# ──────────────────────────────────────────────
+
+class TestConcurrentAppends:
+    def test_threads_share_one_chain(self, any_log):
+        log = any_log
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            for _ in range(25):
+                log.log_event("TEST", actor="t")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        result = log.verify_integrity(full=True)
+        assert (result["valid"], result["entries"], result["errors"]) == (True, 200, [])
+        assert log._seq == 200
+
+    def test_second_writer_is_picked_up(self, log, tmp_path):
+        other = AuditLog(log_dir=tmp_path, hmac_key=KEY, durability="fsync")
+        log.log_event("A", actor="t")
+        other.log_event("B", actor="t")
+        assert log.log_event("A", actor="t")["seq"] == 3
+        assert log.verify_integrity()["valid"] is True
+
+    @pytest.mark.parametrize("mode", ["fsync", "interval", "batch"])
+    def test_writers_share_one_file(self, tmp_path, mode):
+        # Separate instances only share the flock, like separate processes
+        logs = [AuditLog(log_dir=tmp_path, hmac_key=KEY, durability=mode,
+                         flush_interval=0.005, index=False)
+                for _ in range(4)]
+        barrier = threading.Barrier(len(logs))
+
+        def worker(log):
+            barrier.wait()
+            for _ in range(25):
+                log.log_event("TEST", actor="t")
+
+        threads = [threading.Thread(target=worker, args=(log,)) for log in logs]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for log in logs:
+            log.close()
+        result = logs[0].verify_integrity(full=True)
+        assert (result["valid"], result["entries"], result["errors"]) == (True, 100, [])
+
+    @pytest.mark.parametrize("mode", ["fsync", "batch"])
+    def test_rotation_by_another_writer_is_followed(self, tmp_path, mode):
+        first, second = (AuditLog(log_dir=tmp_path, hmac_key=KEY, durability=mode,
+                                  segment_bytes=2000, index=False) for _ in range(2))
+        for i in range(30):
+            (first if i % 2 else second).log_event("TEST", actor="t", detail={"i": i})
+        result = first.verify_integrity(full=True)
+        assert (result["valid"], result["entries"]) == (True, 30)
+        assert result["segments"]["sealed"] > 1
+        first.close()
+        second.close()
+
+    def test_durable_modes_write_before_returning(self, tmp_path):
+        for mode in ("fsync", "batch"):
+            log = AuditLog(log_dir=tmp_path / mode, hmac_key=KEY, durability=mode)
+            log.log_event("TEST", actor="t")
+            assert _lines(log) == 1
+            log.close()
+
+    def test_interval_mode_flushes_in_background(self, tmp_path):
+        log = AuditLog(log_dir=tmp_path, hmac_key=KEY, durability="interval",
+                       flush_interval=60)
+        log.log_event("TEST", actor="t")
+        assert not log.log_file.exists() or _lines(log) == 0
+        log.flush()
+        assert _lines(log) == 1
+
+        log.flush_interval = 0.01
+        log.close()
+        log.log_event("TEST", actor="t")  # writer restarts after close()
+        deadline = time.monotonic() + 5
+        while _lines(log) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _lines(log) == 2
+        log.close()
+
+    def test_unknown_mode_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="durability"):
+            AuditLog(log_dir=tmp_path, hmac_key=KEY, durability="never")
+
+
+# ──────────────────────────────────────────────
+# Signed checkpoints
+# ──────────────────────────────────────────────
+
+def _checkpoints(log) -> list[dict]:
+    if not log.checkpoint_file.exists():
+        return []
+    return [json.loads(line) for line in open(log.checkpoint_file, encoding="utf-8")]
+
+
+def _rewrite_line(log, lineno: int, old: str, new: str) -> None:
+    lines = log.log_file.read_text(encoding="utf-8").splitlines(keepends=True)
+    lines[lineno - 1] = lines[lineno - 1].replace(old, new)
+    log.log_file.write_text("".join(lines), encoding="utf-8")
+
+
+@pytest.fixture()
+def checkpointed(tmp_path):
+    log = AuditLog(log_dir=tmp_path, hmac_key=KEY, durability="fsync",
+                   checkpoint_every=5, checkpoint_seconds=0)
+    for i in range(12):
+        log.log_event("TEST", actor="t", detail={"i": f"{i:02d}"})
+    yield log
+    log.close()
+
+
+class TestCheckpoints:
+    def test_written_every_n_entries(self, checkpointed):
+        cps = _checkpoints(checkpointed)
+        assert [cp["seq"] for cp in cps] == [5, 10]
+        with open(checkpointed.log_file, "rb") as fh:
+            lines = fh.readlines()
+        assert cps[-1]["offset"] == sum(len(line) for line in lines[:10])
+        assert cps[-1]["digest"] == json.loads(lines[9])["hmac"]
+
+    def test_verification_starts_at_checkpoint(self, checkpointed):
+        result = checkpointed.verify_integrity()
+        assert (result["valid"], result["entries"], result["verified_from"]) == (True, 12, 10)
+        # A successful run checkpoints the tip, so the next one reads nothing
+        assert _checkpoints(checkpointed)[-1]["seq"] == 12
+        assert checkpointed.verify_integrity()["verified_from"] == 12
+
+    def test_full_verification_rechecks_old_entries(self, checkpointed):
+        _rewrite_line(checkpointed, 2, '"i":"01"', '"i":"99"')
+        assert checkpointed.verify_integrity()["valid"] is True
+        result = checkpointed.verify_integrity(full=True)
+        assert result["verified_from"] == 0
+        assert result["errors"] == ["Line 2: HMAC mismatch"]
+
+    def test_tampering_after_checkpoint_detected(self, checkpointed):
+        _rewrite_line(checkpointed, 11, '"i":"10"', '"i":"99"')
+        assert checkpointed.verify_integrity()["errors"] == ["Line 11: HMAC mismatch"]
+
+    def test_forged_checkpoint_falls_back_to_full(self, checkpointed):
+        cps = _checkpoints(checkpointed)
+        cps[-1]["seq"] = 12
+        checkpointed.checkpoint_file.write_text(
+            "".join(json.dumps(cp) + "\n" for cp in cps), encoding="utf-8"
+        )
+        result = checkpointed.verify_integrity()
+        assert result["errors"] == ["Checkpoint seq=12: HMAC mismatch"]
+        assert (result["entries"], result["verified_from"]) == (12, 0)
+
+    def test_shifted_entries_invalidate_checkpoint(self, checkpointed):
+        _rewrite_line(checkpointed, 3, '"i":"02"', '"i":"002"')
+        errors = checkpointed.verify_integrity()["errors"]
+        assert errors[0].startswith("Checkpoint seq=10: log entry at offset")
+        assert "Line 3: HMAC mismatch" in errors
+
+    def test_deleted_or_truncated_log_is_invalid(self, checkpointed):
+        size = checkpointed.log_file.stat().st_size
+        with open(checkpointed.log_file, "r+b") as fh:
+            fh.truncate(size // 3)
+        errors = checkpointed.verify_integrity()["errors"]
+        assert errors[0].startswith("Checkpoint seq=10: log entry at offset")
+
+        checkpointed.log_file.unlink()
+        result = checkpointed.verify_integrity()
+        assert result["valid"] is False
+        assert result["errors"][0].startswith("Checkpoint seq=10: log entry at offset")
+
+
+# ──────────────────────────────────────────────
+# Parallel verification
+# ──────────────────────────────────────────────
+
+@pytest.fixture()
+def damaged(tmp_path):
+    """A log with an HMAC mismatch, a bad line, a deleted entry and blank lines."""
+    log = AuditLog(log_dir=tmp_path, hmac_key=KEY, durability="fsync", checkpoint_every=0)
+    for i in range(40):
+        log.log_event("TEST", actor="t", detail={"i": f"{i:02d}"})
+    lines = log.log_file.read_text(encoding="utf-8").splitlines(keepends=True)
+    lines[4] = lines[4].replace('"i":"04"', '"i":"99"')
+    lines[12] = "{not json\n"
+    del lines[20]
+    lines.insert(30, "\n")
+    lines[-1] = lines[-1].rstrip("\n")
+    log.log_file.write_text("".join(lines), encoding="utf-8")
+    yield log
+    log.close()
+
+
+class TestParallelVerification:
+    def test_chunked_matches_single_pass(self, damaged):
+        single = damaged.verify_integrity(full=True, workers=1, chunk_bytes=0)
+        assert single["errors"][:2] == ["Line 5: HMAC mismatch", "Line 13: invalid JSON"]
+        assert any(e.startswith("Line 21: chain break") for e in single["errors"])
+        # One chunk per line: every link is checked across a seam
+        assert damaged.verify_integrity(full=True, workers=1, chunk_bytes=1) == single
+
+    def test_process_pool_matches_single_pass(self, damaged):
+        single = damaged.verify_integrity(full=True, workers=1, chunk_bytes=0)
+        parallel = damaged.verify_integrity(full=True, workers=2, chunk_bytes=1500)
+        assert parallel == single
+
+    def test_pool_is_reused_across_runs(self, damaged):
+        first = damaged.verify_integrity(full=True, workers=2, chunk_bytes=1500)
+        pool = audit_module._verify_pool
+        assert damaged.verify_integrity(full=True, workers=2, chunk_bytes=1500) == first
+        assert audit_module._verify_pool is pool
+
+    def test_parallel_run_of_valid_log_checkpoints_tip(self, tmp_path):
+        log = AuditLog(log_dir=tmp_path, hmac_key=KEY, durability="fsync", checkpoint_every=0)
+        for i in range(30):
+            log.log_event("TEST", actor="t", detail={"i": i})
+        result = log.verify_integrity(full=True, workers=2, chunk_bytes=1000)
+        assert (result["valid"], result["entries"]) == (True, 30)
+        assert _checkpoints(log)[-1]["seq"] == 30
+        log.close()
+
+
+# ──────────────────────────────────────────────
+# Segment rotation
+# ──────────────────────────────────────────────
+
+def _segmented(tmp_path, n=30, **kwargs):
+    options = {"durability": "fsync", "checkpoint_every": 0, "segment_bytes": 2000, **kwargs}
+    log = AuditLog(log_dir=tmp_path, hmac_key=KEY, **options)
+    for i in range(n):
+        log.log_event("TEST", actor="t", detail={"i": f"{i:02d}"})
+    return log
+
+
+def _manifest(log) -> list[dict]:
+    return [json.loads(line) for line in open(log.manifest_file, encoding="utf-8")]
+
+
+class TestSegments:
+    def test_rotation_by_size_keeps_one_chain(self, tmp_path):
+        log = _segmented(tmp_path)
+        sealed = [r for r in _manifest(log) if r["type"] == "segment"]
+        assert len(sealed) >= 2
+        assert log.log_file.stat().st_size < 2000
+        assert sealed[0]["first_seq"] == 1
+        for before, after in zip(sealed, sealed[1:]):
+            assert after["first_seq"] == before["last_seq"] + 1
+            assert after["first_prev_digest"] == before["last_digest"]
+
+        result = log.verify_integrity(full=True)
+        assert (result["valid"], result["entries"], result["errors"]) == (True, 30, [])
+        log.close()
+
+        reopened = AuditLog(log_dir=tmp_path, hmac_key=KEY, segment_bytes=2000)
+        entry = reopened.log_event("TEST", actor="t")
+        reopened.flush()
+        assert entry["seq"] == 31
+        assert reopened.verify_integrity(full=True)["valid"] is True
+        reopened.close()
+
+    def test_verified_segments_are_skipped(self, tmp_path):
+        log = _segmented(tmp_path)
+        first = log.verify_integrity()
+        assert first["segments"]["skipped"] == 0
+        again = log.verify_integrity()
+        assert again["segments"]["skipped"] == again["segments"]["sealed"] > 0
+        assert again["verified_from"] > 0
+        assert log.verify_integrity(full=True)["segments"]["skipped"] == 0
+        log.close()
+
+    def test_tampered_sealed_segment_found_by_full_check(self, tmp_path):
+        log = _segmented(tmp_path)
+        log.verify_integrity()
+        path = log.segments_dir / "audit-000001.jsonl"
+        path.write_bytes(path.read_bytes().replace(b'"i":"01"', b'"i":"99"'))
+
+        assert log.verify_integrity()["valid"] is True  # same size: skipped
+        errors = log.verify_integrity(full=True)["errors"]
+        assert errors == [
+            "Segment 1: SHA-256 does not match the footer",
+            "Segment 1: Line 2: HMAC mismatch",
+        ]
+        log.close()
+
+    def test_missing_segment_reported(self, tmp_path):
+        log = _segmented(tmp_path)
+        (log.segments_dir / "audit-000002.jsonl").unlink()
+        assert "Segment 2: file audit-000002.jsonl missing" in log.verify_integrity()["errors"]
+        log.close()
+
+    def test_interrupted_rotation_completed_on_start(self, tmp_path):
+        log = _segmented(tmp_path)
+        log.close()
+        # Crash after the footer was written, before rename and manifest
+        lines = log.manifest_file.read_bytes().splitlines(keepends=True)
+        last = json.loads(lines[-1])
+        log.manifest_file.write_bytes(b"".join(lines[:-1]))
+        active = log.log_file.read_bytes()
+        os.replace(log.segments_dir / f"audit-{last['segment']:06d}.jsonl", log.log_file)
+
+        reopened = AuditLog(log_dir=tmp_path, hmac_key=KEY, segment_bytes=2000)
+        assert _manifest(reopened)[-1] == last
+        assert not reopened.log_file.exists()
+        reopened.log_file.write_bytes(active)  # entries written after the rotation
+        assert reopened.verify_integrity(full=True)["valid"] is True
+        reopened.close()
+
+    def test_rotation_by_age(self, tmp_path):
+        log = _segmented(tmp_path, n=3, segment_bytes=0, segment_seconds=1e-9)
+        assert [r["segment"] for r in _manifest(log)] == [1, 2, 3]
+        assert log.verify_integrity(full=True)["entries"] == 3
+        log.close()
+
+
+# ──────────────────────────────────────────────
+# Query index
+# ──────────────────────────────────────────────
+
+def _investigation(log):
+    log.log_complaint_submitted("EVC-1", actor="trace-1")
+    log.log_block_mined(1, "a" * 64, complaint_ids=["EVC-1"])
+    log.log_complaint_submitted("EVC-2", actor="trace-2")
+    log.log_complaint_submitted("EVC-3", actor="trace-3")
+    log.log_block_mined(2, "b" * 64, complaint_ids=["EVC-2", "EVC-3"])
+    log.log_security_event("probe")
+
+
+class TestIndex:
+    def test_query_by_complaint_block_and_event(self, log):
+        _investigation(log)
+        trail = log.query(complaint_id="EVC-2")["entries"]
+        assert [(e["seq"], e["event"]) for e in trail] == [(5, "BLOCK_MINED"), (3, "COMPLAINT_SUBMITTED")]
+        assert trail[0]["hmac"]  # entries come back as logged
+        assert [e["seq"] for e in log.query(block_index=1)["entries"]] == [2]
+        assert [e["seq"] for e in log.query(event="SECURITY_EVENT")["entries"]] == [6]
+        assert [e["seq"] for e in log.query(actor="trace-3")["entries"]] == [4]
+
+    def test_pagination_and_time_range(self, log):
+        _investigation(log)
+        first = log.query(limit=4)
+        assert [e["seq"] for e in first["entries"]] == [6, 5, 4, 3]
+        rest = log.query(limit=4, before_seq=first["next_cursor"])
+        assert [e["seq"] for e in rest["entries"]] == [2, 1]
+        assert rest["next_cursor"] is None
+
+        stamp = parse_timestamp(first["entries"][-1]["timestamp_utc"])
+        assert {e["seq"] for e in log.query(since=stamp)["entries"]} >= {3, 4, 5, 6}
+        assert log.query(until=stamp - 3600)["entries"] == []
+
+    def test_buffered_entries_are_visible(self, tmp_path):
+        log = AuditLog(log_dir=tmp_path, hmac_key=KEY, durability="interval", flush_interval=60)
+        log.log_complaint_submitted("EVC-9")
+        assert len(log.query(complaint_id="EVC-9")["entries"]) == 1
+        log.close()
+
+    def test_catches_up_after_restart(self, tmp_path):
+        log = _segmented(tmp_path, n=10)
+        log.close()
+        unindexed = AuditLog(log_dir=tmp_path, hmac_key=KEY, durability="fsync",
+                             segment_bytes=2000, index=False)
+        for i in range(25):
+            unindexed.log_complaint_submitted(f"EVC-{i}")
+        unindexed.close()
+
+        reopened = AuditLog(log_dir=tmp_path, hmac_key=KEY, segment_bytes=2000)
+        assert len(reopened.index) == 35
+        assert [e["seq"] for e in reopened.query(complaint_id="EVC-0")["entries"]] == [11]
+        reopened.close()
+
+    def test_rebuilt_when_deleted(self, log, tmp_path):
+        _investigation(log)
+        log.close()
+        for path in tmp_path.glob("audit.index.sqlite3*"):
+            path.unlink()
+        reopened = AuditLog(log_dir=tmp_path, hmac_key=KEY)
+        assert len(reopened.index) == 6
+        reopened.close()
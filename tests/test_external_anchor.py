@@ -0,0 +1,494 @@
+"""
+EviChain – External Anchoring Tests
+
+Covers ``evichain.mmr`` (roots equal the RFC 6962 tree hash, consistency
+proofs link any earlier root to a later one), ``ExternalAnchor`` (receipts
+stay valid as blocks are appended and fail once an anchored block
+changes; the manifest pages and bulk-verifies them; batches share one
+timestamp through inclusion proofs) and ``AnchorScheduler`` (triggers,
+durable queue, backoff, batching).
+Anchors are sent to a stand-in TSA served on localhost.
+
+Run with:  pytest tests/test_external_anchor.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import api_server  # noqa: E402
+from api_server import app, _rate_limit_store  # noqa: E402
+from blockchain_simulator import EviChainBlockchain  # noqa: E402
+from evichain.anchor_scheduler import STATUS_FAILED, STATUS_QUEUED, AnchorScheduler  # noqa: E402
+from evichain.external_anchor import ExternalAnchor  # noqa: E402
+from evichain.serialization import dumps, loads  # noqa: E402
+from evichain.mmr import (  # noqa: E402
+    MerkleMountainRange, leaf_hash, node_hash, verify_consistency, verify_inclusion,
+)
+
+
+def tree_hash(leaves: list[bytes]) -> bytes:
+    """RFC 6962 Merkle Tree Hash, computed recursively from scratch."""
+    if len(leaves) == 1:
+        return leaf_hash(leaves[0])
+    k = 1 << ((len(leaves) - 1).bit_length() - 1)
+    return node_hash(tree_hash(leaves[:k]), tree_hash(leaves[k:]))
+
+
+class StandInTSA(ThreadingHTTPServer):
+    """Local RFC 3161 endpoint: records requests, answers ``status``."""
+
+    token = b"0\x03\x02\x01\x00"  # stand-in TimeStampResp
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInTSAHandler)
+        self.status = 200
+        self.requests: list[bytes] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/tsr"
+
+
+class StandInTSAHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.server.requests.append(self.rfile.read(int(self.headers["Content-Length"])))
+        body = self.server.token if self.server.status == 200 else b"unavailable"
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/timestamp-reply")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def tsa():
+    server = StandInTSA()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def chain(tmp_path):
+    bc = EviChainBlockchain(data_file=str(tmp_path / "chain.json"))
+    bc.difficulty = 1
+    return bc
+
+
+@pytest.fixture()
+def anchor(chain, tmp_path, tsa):
+    return ExternalAnchor(chain, anchors_dir=str(tmp_path / "anchors"), tsa_url=tsa.url)
+
+
+@pytest.fixture()
+def scheduler(anchor):
+    anchored = []
+    sched = AnchorScheduler(anchor, every_blocks=3, every_minutes=10, retry_seconds=30,
+                            max_attempts=3, on_anchored=anchored.append)
+    sched.anchored = anchored
+    yield sched
+    sched.stop()
+
+
+@pytest.fixture()
+def client():
+    app.config["TESTING"] = True
+    _rate_limit_store.clear()
+    with app.test_client() as c:
+        yield c
+
+
+def _mine(bc, count=1):
+    for _ in range(count):
+        bc.add_evidence_transaction({"titulo": "t", "descricao": "d"})
+        bc.mine_pending_transactions()
+
+
+# ──────────────────────────────────────────────
+# Merkle Mountain Range
+# ──────────────────────────────────────────────
+
+class TestMMR:
+    LEAVES = [str(i).encode() for i in range(40)]
+
+    def test_roots_match_tree_hash_at_every_size(self):
+        mmr = MerkleMountainRange(self.LEAVES)
+        for size in range(1, len(self.LEAVES) + 1):
+            assert mmr.root_at(size) == tree_hash(self.LEAVES[:size])
+        assert len(mmr.peaks()) == bin(len(self.LEAVES)).count("1")
+
+    def test_consistency_proofs_verify(self):
+        mmr = MerkleMountainRange(self.LEAVES)
+        for second in range(1, len(self.LEAVES) + 1):
+            for first in range(second + 1):
+                proof = mmr.consistency_proof(first, second)
+                assert len(proof) <= 2 * second.bit_length()
+                assert verify_consistency(first, second, mmr.root_at(first), mmr.root_at(second), proof)
+
+    def test_proof_rejects_rewritten_history(self):
+        mmr = MerkleMountainRange(self.LEAVES)
+        forged = MerkleMountainRange([b"x"] + self.LEAVES[1:])
+        proof = mmr.consistency_proof(7, 40)
+        assert not verify_consistency(7, 40, mmr.root_at(7), forged.root(), proof)
+        assert not verify_consistency(7, 40, forged.root_at(7), mmr.root(), proof)
+        assert not verify_consistency(7, 40, mmr.root_at(7), mmr.root(), proof[:-1])
+
+    def test_inclusion_proofs_verify(self):
+        mmr = MerkleMountainRange(self.LEAVES)
+        for size in range(1, len(self.LEAVES) + 1):
+            for index in range(size):
+                proof = mmr.inclusion_proof(index, size)
+                root = mmr.root_at(size)
+                assert verify_inclusion(index, size, self.LEAVES[index], root, proof)
+                assert not verify_inclusion(index, size, b"forged", root, proof)
+        assert not verify_inclusion(3, 40, self.LEAVES[4], mmr.root(), mmr.inclusion_proof(3))
+
+    def test_out_of_range_sizes(self):
+        mmr = MerkleMountainRange(self.LEAVES[:3])
+        with pytest.raises(ValueError):
+            mmr.root_at(4)
+        with pytest.raises(ValueError):
+            mmr.consistency_proof(3, 2)
+
+
+# ──────────────────────────────────────────────
+# Chain integration and receipts
+# ──────────────────────────────────────────────
+
+class TestAnchors:
+    def test_chain_keeps_mmr_in_step(self, chain):
+        _mine(chain, 3)
+        leaves = [block.hash.encode() for block in chain.chain]
+        assert chain.mmr.root() == tree_hash(leaves)
+        reloaded = EviChainBlockchain(data_file=chain.data_file)
+        assert reloaded.mmr.root() == chain.mmr.root()
+
+    def test_receipt_survives_appends(self, chain, anchor, tsa):
+        _mine(chain, 2)
+        receipt = anchor.anchor_rfc3161()
+        assert receipt["root_scheme"] == "mmr-sha256"
+        assert receipt["chain_length"] == 3
+        assert len(tsa.requests) == 1
+        assert tsa.requests[0].endswith(bytes.fromhex(receipt["root_hash"]) + b"\x01\x01\xff")
+        _mine(chain, 3)
+
+        [receipt_file] = anchor.anchors_dir.glob("*.json")
+        result = anchor.verify_anchor(str(receipt_file))
+        assert result["valid"] is True
+        assert result["chain_length_now"] == 6
+        assert verify_consistency(
+            3, 6, bytes.fromhex(receipt["root_hash"]), bytes.fromhex(result["current_root_hash"]),
+            [bytes.fromhex(node) for node in result["consistency_proof"]],
+        )
+
+    def test_tampered_anchored_block_invalidates_receipt(self, chain, anchor):
+        _mine(chain, 2)
+        anchor.anchor_rfc3161()
+        chain.chain[1].hash = "0" * 64
+        chain._rebuild_indexes()
+
+        [receipt_file] = anchor.anchors_dir.glob("*.json")
+        result = anchor.verify_anchor(str(receipt_file))
+        assert result["valid"] is False
+        assert "consistency_proof" not in result
+
+    def test_legacy_flat_receipt_checked_against_prefix(self, chain, anchor):
+        _mine(chain, 1)
+        flat_root = anchor._flat_root(2)
+        path = anchor.anchors_dir / "rfc3161_legacy.json"
+        path.write_text(
+            '{"type": "rfc3161", "chain_length": 2, "root_hash": "%s"}' % flat_root,
+            encoding="utf-8",
+        )
+        _mine(chain, 1)
+        result = anchor.verify_anchor(str(path))
+        assert result["root_scheme"] == "flat-sha256"
+        assert result["valid"] is True
+
+
+# ──────────────────────────────────────────────
+# Manifest, listing and bulk verification
+# ──────────────────────────────────────────────
+
+class TestManifest:
+    def test_listing_pages_newest_first(self, chain, anchor):
+        for _ in range(3):
+            _mine(chain, 1)
+            anchor.anchor_rfc3161()
+
+        page = anchor.list_anchors(limit=2)
+        assert [a["seq"] for a in page["anchors"]] == [3, 2]
+        assert [a["chain_length"] for a in page["anchors"]] == [4, 3]
+        assert page["anchors"][0]["token"].endswith("_4.tsr")
+        rest = anchor.list_anchors(limit=2, before_seq=page["next_cursor"])
+        assert [a["seq"] for a in rest["anchors"]] == [1]
+        assert rest["next_cursor"] is None
+
+    def test_missing_manifest_rebuilt_from_receipts(self, chain, anchor):
+        anchor.anchor_rfc3161()
+        _mine(chain, 1)
+        anchor.anchor_rfc3161()
+        anchor.manifest_file.unlink()
+
+        reopened = ExternalAnchor(chain, anchors_dir=str(anchor.anchors_dir), tsa_url=anchor.tsa_url)
+        assert [a["chain_length"] for a in reopened.list_anchors()["anchors"]] == [2, 1]
+
+    def test_verify_all_computes_each_root_once(self, chain, anchor, monkeypatch):
+        _mine(chain, 1)
+        anchor.anchor_rfc3161()
+        anchor.anchor_rfc3161()  # same length again
+        (anchor.anchors_dir / "rfc3161_legacy.json").write_text(
+            '{"type": "rfc3161", "chain_length": 2, "root_hash": "%s"}' % anchor._flat_root(2),
+            encoding="utf-8",
+        )
+        anchor.rebuild_manifest()
+        _mine(chain, 2)
+        anchor.anchor_rfc3161()
+
+        calls = []
+        original = anchor.compute_chain_root_hash
+        monkeypatch.setattr(anchor, "compute_chain_root_hash",
+                            lambda length=None: calls.append(length) or original(length))
+        report = anchor.verify_all_anchors()
+        assert report["valid"] is True
+        assert report["checked"] == 4
+        assert sorted(calls) == [2, 4]
+        assert all(r["token_found"] for r in report["results"] if r["root_scheme"] == "mmr-sha256")
+
+        chain.chain[3].hash = "0" * 64
+        chain._rebuild_indexes()
+        report = anchor.verify_all_anchors()
+        assert report["valid"] is False
+        assert [r["chain_length"] for r in report["results"] if not r["valid"]] == [4]
+
+
+# ──────────────────────────────────────────────
+# Background scheduler
+# ──────────────────────────────────────────────
+
+class TestScheduler:
+    def test_block_and_interval_triggers(self, chain, scheduler):
+        now = time.time()
+        assert scheduler.check_triggers(now) is None  # first run sets the baseline
+        _mine(chain, 2)
+        assert scheduler.check_triggers(now) is None
+        _mine(chain, 1)
+        request = scheduler.check_triggers(now)
+        assert request["reason"] == "blocks"
+        assert request["chain_length"] == 4
+
+        _mine(chain, 1)
+        assert scheduler.check_triggers(now + 60) is None
+        assert scheduler.check_triggers(now + 601)["reason"] == "interval"
+        assert scheduler.check_triggers(now + 1200) is None  # nothing new since
+
+    def test_enqueue_coalesces_and_survives_restart(self, chain, anchor, scheduler, tsa):
+        first = scheduler.enqueue()
+        assert scheduler.enqueue()["id"] == first["id"]
+        assert tsa.requests == []
+
+        restarted = AnchorScheduler(anchor, on_anchored=scheduler.anchored.append)
+        assert [r["id"] for r in restarted.status()["requests"]] == [first["id"]]
+        assert restarted.run_pending() == 1
+        assert restarted.status()["requests"] == []
+        assert scheduler.anchored[0]["root_hash"] == first["root_hash"]
+        assert anchor.verify_anchor(str(next(anchor.anchors_dir.glob("*.json"))))["valid"]
+
+    def test_failed_attempts_back_off_then_give_up(self, scheduler, tsa):
+        tsa.status = 503
+        scheduler.enqueue()
+        now = time.time()
+        assert scheduler.run_pending(now) == 0
+        [request] = scheduler.status()["requests"]
+        assert request["attempts"] == 1
+        assert "503" in request["last_error"]
+        assert request["next_attempt_at"] >= now + 30
+
+        assert scheduler.run_pending(now + 10) == 0  # not due yet
+        assert len(tsa.requests) == 1
+        scheduler.run_pending(now + 31)
+        assert scheduler.status()["requests"][0]["next_attempt_at"] >= now + 60  # doubled
+        scheduler.run_pending(now + 200)
+        [request] = scheduler.status()["requests"]
+        assert request["status"] == STATUS_FAILED
+        assert len(tsa.requests) == 3
+        assert scheduler.anchored == []
+
+    def test_one_worker_drains_a_shared_queue(self, chain, anchor, scheduler, tmp_path, tsa):
+        # A second gunicorn worker: its own copy of the chain, same anchors dir
+        other_chain = EviChainBlockchain(data_file=str(tmp_path / "other.json"))
+        other = AnchorScheduler(ExternalAnchor(other_chain, anchors_dir=str(anchor.anchors_dir),
+                                               tsa_url=tsa.url))
+        try:
+            _mine(chain, 2)
+            first = scheduler.enqueue()
+            assert other.run_pending() == 0  # leader now; block 3 not visible to it
+            [request] = other.status()["requests"]
+            assert request["status"] == STATUS_QUEUED
+            assert request["attempts"] == 0
+            assert tsa.requests == []
+
+            assert scheduler.run_pending(time.time() + 60) == 0  # not the leader
+            assert tsa.requests == []
+            other.stop()  # the leader exits and releases the lock
+            assert scheduler.run_pending(time.time() + 60) == 1
+            assert len(tsa.requests) == 1
+            assert scheduler.anchored[0]["root_hash"] == first["root_hash"]
+        finally:
+            other.stop()
+
+    def test_concurrent_state_writes(self, scheduler):
+        errors = []
+
+        def writer(n):
+            try:
+                for i in range(50):
+                    scheduler._save_state({"writer": n, "i": i})
+            except OSError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert not list(scheduler.queue_dir.glob(".tmp-*"))
+
+    def test_background_thread_anchors(self, scheduler, tsa):
+        scheduler.start()
+        scheduler.enqueue()
+        deadline = time.time() + 5
+        while not scheduler.anchored and time.time() < deadline:
+            time.sleep(0.02)
+        assert len(scheduler.anchored) == 1
+        assert len(tsa.requests) == 1
+
+
+# ──────────────────────────────────────────────
+# Batched anchoring
+# ──────────────────────────────────────────────
+
+FOREIGN_ROOT = "ab" * 32
+
+
+class TestBatches:
+    def test_pending_roots_share_one_timestamp(self, chain, anchor, scheduler, tsa):
+        _mine(chain, 1)
+        scheduler.enqueue()
+        _mine(chain, 1)
+        scheduler.enqueue()
+        scheduler.enqueue_root("crm-sp", 10, FOREIGN_ROOT)
+
+        assert scheduler.run_pending() == 3
+        assert len(tsa.requests) == 1
+        receipts = scheduler.anchored
+        assert [(r["source"], r["chain_length"]) for r in receipts] == [
+            ("evichain", 2), ("evichain", 3), ("crm-sp", 10)]
+        batch_root = receipts[0]["batch"]["root"]
+        assert {r["batch"]["root"] for r in receipts} == {batch_root}
+        assert {r["token_file"] for r in receipts} == {receipts[0]["token_file"]}
+        assert bytes.fromhex(batch_root) in tsa.requests[0]
+
+        for path in sorted(anchor.anchors_dir.glob("*.json")):
+            result = anchor.verify_anchor(str(path))
+            assert result["valid"] is True
+            assert result["included_in_batch"] is True
+        report = anchor.verify_all_anchors()
+        assert (report["checked"], report["valid"]) == (3, True)
+        assert scheduler.status()["requests"] == []
+
+    def test_altered_root_fails_inclusion(self, anchor, scheduler):
+        scheduler.enqueue()
+        scheduler.enqueue_root("crm-sp", 10, FOREIGN_ROOT)
+        scheduler.run_pending()
+
+        path = next(p for p in anchor.anchors_dir.glob("*.json")
+                    if loads(p.read_bytes())["source"] == "crm-sp")
+        receipt = loads(path.read_bytes())
+        path.write_bytes(dumps({**receipt, "root_hash": "cd" * 32}))
+        result = anchor.verify_anchor(str(path))
+        assert result["included_in_batch"] is False
+        assert result["valid"] is False
+
+    def test_stale_local_root_dropped_from_batch(self, chain, scheduler, tsa):
+        _mine(chain, 1)
+        scheduler.enqueue()
+        chain.chain[1].hash = "0" * 64
+        chain._rebuild_indexes()
+        scheduler.enqueue_root("crm-sp", 10, FOREIGN_ROOT)
+
+        assert scheduler.run_pending() == 1
+        [request] = scheduler.status()["requests"]
+        assert request["status"] == STATUS_FAILED
+        assert "changed" in request["last_error"]
+        assert [r["source"] for r in scheduler.anchored] == ["crm-sp"]
+
+    def test_enqueue_root_validation(self, scheduler):
+        with pytest.raises(ValueError):
+            scheduler.enqueue_root("evichain", 1, FOREIGN_ROOT)
+        with pytest.raises(ValueError):
+            scheduler.enqueue_root("crm-sp", 1, "not-hex")
+        first = scheduler.enqueue_root("crm-sp", 1, FOREIGN_ROOT)
+        assert scheduler.enqueue_root("crm-sp", 1, FOREIGN_ROOT)["id"] == first["id"]
+
+
+# ──────────────────────────────────────────────
+# Endpoints
+# ──────────────────────────────────────────────
+
+class TestEndpoints:
+    def test_consistency_endpoint(self, client):
+        length = len(api_server.evichain.chain)
+        r = client.get(f"/api/security/anchors/consistency?first=1&second={length}")
+        assert r.status_code == 200
+        body = r.get_json()
+        assert body["second_size"] == length
+        assert verify_consistency(
+            1, length, bytes.fromhex(body["first_root"]), bytes.fromhex(body["second_root"]),
+            [bytes.fromhex(node) for node in body["proof"]],
+        )
+
+    def test_consistency_endpoint_rejects_bad_sizes(self, client):
+        assert client.get("/api/security/anchors/consistency").status_code == 400
+        length = len(api_server.evichain.chain)
+        r = client.get(f"/api/security/anchors/consistency?first={length + 1}")
+        assert r.status_code == 400
+
+    def test_anchor_endpoint_enqueues(self, client, tmp_path, tsa, monkeypatch):
+        anchor = ExternalAnchor(api_server.evichain, anchors_dir=str(tmp_path), tsa_url=tsa.url)
+        sched = AnchorScheduler(anchor, every_blocks=0, every_minutes=0)
+        monkeypatch.setattr(api_server, "anchor_scheduler", sched)
+        try:
+            r = client.post("/api/security/anchor")
+            assert r.status_code == 202
+            body = r.get_json()
+            assert body["request"]["chain_length"] == len(api_server.evichain.mmr)
+            assert r.headers["Location"] == "/api/security/anchor/queue"
+            queue = client.get("/api/security/anchor/queue").get_json()
+            assert [q["id"] for q in queue["requests"]] in ([], [body["request"]["id"]])
+        finally:
+            sched.stop()
+
+    def test_anchor_listing_and_verify_endpoints(self, client):
+        assert client.get("/api/security/anchors?limit=x").status_code == 400
+        listing = client.get("/api/security/anchors?limit=5").get_json()
+        assert listing["success"] is True
+        assert len(listing["anchors"]) <= 5
+        report = client.get("/api/security/anchors/verify").get_json()
+        assert report["checked"] == len(report["results"])
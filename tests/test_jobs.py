@@ -0,0 +1,216 @@
+"""
+EviChain – Background Job Queue Tests
+
+Covers asynchronous complaint submission (202 Accepted + polling) and
+the durable job state kept by ``evichain.jobs.JobQueue``.
+
+Run with:  pytest tests/test_jobs.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from api_server import app, _rate_limit_store  # noqa: E402
+from evichain.jobs import STATUS_RUNNING, JobQueue, JobQueueFull  # noqa: E402
+
+
+@pytest.fixture()
+def client():
+    app.config["TESTING"] = True
+    _rate_limit_store.clear()
+    with app.test_client() as c:
+        yield c
+
+
+def _wait_for(queue: JobQueue, job_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+class TestJobQueue:
+    def test_job_runs_and_drops_payload(self, tmp_path):
+        queue = JobQueue(lambda job_id, payload: {"echo": payload["x"]}, jobs_dir=tmp_path)
+        job = queue.submit({"x": 42})
+        assert "payload" not in job
+
+        done = _wait_for(queue, job["id"])
+        assert done["status"] == "done"
+        assert done["result"] == {"echo": 42}
+        assert "payload" not in (tmp_path / f"{job['id']}.json").read_text(encoding="utf-8")
+        queue.shutdown()
+
+    def test_handler_error_marks_failed(self, tmp_path):
+        def boom(job_id, payload):
+            raise ValueError("boom")
+
+        queue = JobQueue(boom, jobs_dir=tmp_path)
+        job = _wait_for(queue, queue.submit({})["id"])
+        assert job["status"] == "failed"
+        assert job["error"] == "boom"
+        queue.shutdown()
+
+    def test_queue_is_bounded(self, tmp_path):
+        release = threading.Event()
+        queue = JobQueue(lambda job_id, payload: release.wait(5), jobs_dir=tmp_path,
+                         max_workers=1, max_pending=2)
+        queue.submit({})
+        queue.submit({})
+        with pytest.raises(JobQueueFull):
+            queue.submit({})
+        release.set()
+        queue.shutdown()
+
+    def test_unfinished_jobs_recovered_after_restart(self, tmp_path):
+        # Left queued by a process that died: nobody holds its lock
+        stale = JobQueue(lambda job_id, payload: {}, jobs_dir=tmp_path)
+        job = {"id": "ab" * 16, "kind": "complaint", "status": STATUS_RUNNING,
+               "created_at": 0, "updated_at": 0, "attempts": 1, "payload": {"n": 2},
+               "result": None, "error": None}
+        stale._save(job)
+
+        second = JobQueue(lambda job_id, payload: {"n": payload["n"]}, jobs_dir=tmp_path)
+        assert second.recover() == 1
+        assert _wait_for(second, job["id"])["result"] == {"n": 2}
+        assert second.recover() == 0
+        second.shutdown()
+
+    def test_job_that_keeps_killing_its_worker_is_failed(self, tmp_path):
+        stale = JobQueue(lambda job_id, payload: {}, jobs_dir=tmp_path)
+        job = {"id": "cd" * 16, "kind": "complaint", "status": STATUS_RUNNING,
+               "created_at": 0, "updated_at": 0, "attempts": 2, "payload": {"n": 2},
+               "result": None, "error": None}
+        stale._save(job)
+
+        runs = []
+        second = JobQueue(lambda job_id, payload: runs.append(job_id), jobs_dir=tmp_path,
+                          max_attempts=2)
+        assert second.recover() == 0
+        failed = second.get(job["id"])
+        assert failed["status"] == "failed" and "2 times" in failed["error"]
+        assert "payload" not in second._load(job["id"])
+        assert runs == [] and second.pending() == 0
+        second.shutdown()
+
+    def test_jobs_of_a_live_worker_are_not_recovered(self, tmp_path):
+        release = threading.Event()
+        runs = []
+        first = JobQueue(lambda job_id, payload: runs.append(job_id) or release.wait(5),
+                         jobs_dir=tmp_path, max_workers=1)
+        first.submit({"n": 1})
+        first.submit({"n": 2})
+
+        # Another gunicorn worker starting up sees both jobs unfinished
+        second = JobQueue(lambda job_id, payload: runs.append(job_id), jobs_dir=tmp_path)
+        assert second.recover() == 0
+        release.set()
+        first.shutdown()
+        assert second.recover() == 0
+        assert len(runs) == 2 and len(set(runs)) == 2
+        second.shutdown()
+
+    def test_failed_save_releases_the_slot(self, tmp_path, monkeypatch):
+        queue = JobQueue(lambda job_id, payload: {}, jobs_dir=tmp_path, max_pending=1)
+
+        def disk_full(job):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(queue, "_save", disk_full)
+        with pytest.raises(OSError):
+            queue.submit({})
+        assert queue.pending() == 0
+        queue.shutdown()
+
+    def test_jobs_routed_by_kind(self, tmp_path):
+        queue = JobQueue(lambda job_id, payload: {"kind": "complaint"}, jobs_dir=tmp_path)
+        queue.register("lookup", lambda job_id, payload: {"kind": "lookup"})
+        assert _wait_for(queue, queue.submit({}, kind="lookup")["id"])["result"] == {"kind": "lookup"}
+        assert _wait_for(queue, queue.submit({})["id"])["result"] == {"kind": "complaint"}
+        with pytest.raises(ValueError):
+            queue.submit({}, kind="unknown")
+        queue.shutdown()
+
+    def test_lookups_do_not_hold_complaint_workers(self, tmp_path):
+        release = threading.Event()
+        queue = JobQueue(lambda job_id, payload: {"sealed": True}, jobs_dir=tmp_path,
+                         max_workers=1, pools={"lookup": 2})
+        queue.register("investigation", lambda job_id, payload: release.wait(5), pool="lookup")
+        slow = [queue.submit({}, kind="investigation") for _ in range(2)]
+
+        complaint = queue.submit({})
+        assert _wait_for(queue, complaint["id"], timeout=2)["result"] == {"sealed": True}
+        assert all(queue.get(job["id"])["status"] in ("queued", "running") for job in slow)
+        release.set()
+        queue.shutdown()
+        with pytest.raises(ValueError):
+            queue.register("social", lambda job_id, payload: {}, pool="unknown")
+
+    def test_rejects_malformed_ids(self, tmp_path):
+        queue = JobQueue(lambda job_id, payload: {}, jobs_dir=tmp_path)
+        assert queue.get("../../etc/passwd") is None
+        queue.shutdown()
+
+
+class TestAsyncSubmission:
+    PAYLOAD = {
+        "titulo": "Async test",
+        "descricao": "Teste de envio assíncrono",
+        "nomeDenunciado": "Test Name",
+        "assunto": "teste",
+        "finalidade": "teste",
+    }
+
+    def test_async_submit_returns_202_and_completes(self, client):
+        r = client.post("/api/submit-complaint?async=1", json=self.PAYLOAD)
+        assert r.status_code == 202
+        data = r.get_json()
+        assert r.headers["Location"] == data["status_url"]
+
+        deadline = time.monotonic() + 60
+        job = None
+        while time.monotonic() < deadline:
+            _rate_limit_store.clear()  # polling must not trip the rate limiter
+            job = client.get(data["status_url"]).get_json()["job"]
+            if job["status"] in ("done", "failed"):
+                break
+            time.sleep(0.25)
+        assert job["status"] == "done"
+        assert job["result"]["block_index"] is not None
+
+    def test_validation_stays_synchronous(self, client):
+        r = client.post("/api/submit-complaint", json={"titulo": "x"},
+                        headers={"Prefer": "respond-async"})
+        assert r.status_code == 400
+
+    def test_async_registry_lookup(self, client, monkeypatch):
+        import api_server
+
+        monkeypatch.setattr(api_server, "_registry_lookup",
+                            lambda params: {"encontrado": False, "nome": params["nome"]})
+        r = client.post("/api/registros/consultar", json={"nome": "Fulano"},
+                        headers={"Prefer": "respond-async"})
+        assert r.status_code == 202
+        job = _wait_for(api_server.job_queue, r.get_json()["job_id"])
+        assert job["kind"] == "registry"
+        assert job["result"] == {"encontrado": False, "nome": "Fulano"}
+
+    def test_lookup_validation_stays_synchronous(self, client):
+        for path in ("/api/registros/consultar", "/api/investigacao/iniciar",
+                     "/api/investigacao/buscar-redes-sociais"):
+            assert client.post(path + "?async=1", json={"nome": ""}).status_code == 400
+
+    def test_unknown_job_404(self, client):
+        assert client.get("/api/jobs/" + "0" * 32).status_code == 404
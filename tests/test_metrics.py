@@ -0,0 +1,118 @@
+"""
+EviChain – Metrics Registry Tests
+
+Covers ``evichain.metrics`` (counters, gauges, histograms, exposition
+format) and the ``/metrics`` endpoint.
+
+Run with:  pytest tests/test_metrics.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import api_server  # noqa: E402
+from api_server import app, _rate_limit_store  # noqa: E402
+from evichain.metrics import Registry, parse_text  # noqa: E402
+
+
+@pytest.fixture()
+def client():
+    app.config["TESTING"] = True
+    _rate_limit_store.clear()
+    with app.test_client() as c:
+        yield c
+
+
+def _scrape(client) -> dict:
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    return parse_text(r.get_data(as_text=True))
+
+
+# ──────────────────────────────────────────────
+# Registry
+# ──────────────────────────────────────────────
+
+class TestRegistry:
+    def test_histogram_buckets_are_cumulative(self):
+        reg = Registry()
+        h = reg.histogram("t_seconds", "test", ("route",), buckets=(0.1, 1.0))
+        for v in (0.05, 0.1, 0.5, 3.0):
+            h.observe(v, route="/a")
+        samples = parse_text(reg.render())
+        bucket = lambda le: samples[("t_seconds_bucket", (("le", le), ("route", "/a")))]
+        assert bucket("0.1") == 2      # le is inclusive
+        assert bucket("1") == 3
+        assert bucket("+Inf") == 4
+        assert samples[("t_seconds_count", (("route", "/a"),))] == 4
+        assert samples[("t_seconds_sum", (("route", "/a"),))] == pytest.approx(3.65)
+
+    def test_render_has_help_and_type(self):
+        reg = Registry()
+        reg.counter("c_total", "A counter.", ("status",)).inc(status="200")
+        text = reg.render()
+        assert "# HELP c_total A counter." in text
+        assert "# TYPE c_total counter" in text
+        assert 'c_total{status="200"} 1' in text
+
+    def test_label_values_escaped(self):
+        reg = Registry()
+        reg.counter("c_total", "x", ("route",)).inc(route='a"b\\c')
+        assert 'route="a\\"b\\\\c"' in reg.render()
+
+    def test_wrong_labels_rejected(self):
+        reg = Registry()
+        c = reg.counter("c_total", "x", ("status",))
+        with pytest.raises(ValueError):
+            c.inc(route="/x")
+        with pytest.raises(ValueError):
+            reg.counter("c_total", "dup")
+
+    def test_gauge_function_read_at_scrape(self):
+        reg = Registry()
+        value = {"n": 1}
+        reg.gauge("g", "x").set_function(lambda: value["n"])
+        value["n"] = 5
+        assert parse_text(reg.render())[("g", ())] == 5
+
+
+# ──────────────────────────────────────────────
+# /metrics endpoint
+# ──────────────────────────────────────────────
+
+class TestMetricsEndpoint:
+    def test_route_latency_uses_rule_template(self, client):
+        client.get("/api/jobs/" + "0" * 32)
+        samples = _scrape(client)
+        key = ("evichain_http_requests_total",
+               (("method", "GET"), ("route", "/api/jobs/<job_id>"), ("status", "404")))
+        assert samples[key] >= 1
+        assert ("evichain_http_request_duration_seconds_count",
+                (("method", "GET"), ("route", "/api/jobs/<job_id>"))) in samples
+
+    def test_chain_height_gauge(self, client):
+        assert _scrape(client)[("evichain_chain_height", ())] == len(api_server.evichain.chain)
+
+    def test_submit_records_mining_and_audit(self, client):
+        before = _scrape(client)
+        r = client.post("/api/submit-complaint", json={
+            "titulo": "Metrics test",
+            "descricao": "Teste de métricas",
+            "nomeDenunciado": "Test Name",
+            "assunto": "teste",
+            "finalidade": "teste",
+        })
+        assert r.status_code == 200
+        after = _scrape(client)
+        for name in ("evichain_mining_duration_seconds_count",
+                     "evichain_mining_nonce_count",
+                     "evichain_audit_append_duration_seconds_count"):
+            assert after[(name, ())] > before.get((name, ()), 0), name
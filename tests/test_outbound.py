@@ -0,0 +1,78 @@
+"""
+EviChain – Outbound HTTP Concurrency Tests
+
+Covers ``evichain.outbound``: independent lookups run concurrently on the
+shared I/O pool, nested fan-outs run concurrently on a pool of their own,
+and errors surface as they would in a sequential loop.
+
+Run with:  pytest tests/test_outbound.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from evichain.outbound import create_session, fan_out  # noqa: E402
+
+
+class TestFanOut:
+    def test_calls_wait_concurrently(self):
+        start = time.perf_counter()
+        results = fan_out({i: (lambda i=i: (time.sleep(0.2), i)[1]) for i in range(5)})
+        assert results == {i: i for i in range(5)}
+        assert list(results) == list(range(5))
+        assert time.perf_counter() - start < 0.8
+
+    def test_nested_fan_outs_run_concurrently(self):
+        def inner():
+            return fan_out({k: (lambda: (time.sleep(0.2), threading.current_thread().name)[1])
+                            for k in "abc"})
+
+        start = time.perf_counter()
+        results = fan_out({"x": inner, "y": inner})
+        assert time.perf_counter() - start < 0.5
+        names = {name for result in results.values() for name in result.values()}
+        assert all(name.startswith("evichain-io1") for name in names)
+
+    def test_third_level_runs_inline(self):
+        def level(n):
+            if n == 4:
+                return threading.current_thread().name
+            return fan_out({"a": lambda: level(n + 1), "b": lambda: level(n + 1)})
+
+        for second in level(1).values():
+            for third in second.values():
+                # Both leaves ran on the nested-pool thread of their parent
+                assert len(set(third.values())) == 1
+                assert third["a"].startswith("evichain-io1")
+
+    def test_first_error_reraised_after_all_finish(self):
+        finished = []
+
+        def slow_ok():
+            time.sleep(0.1)
+            finished.append("ok")
+            return 1
+
+        def fail(msg):
+            raise ValueError(msg)
+
+        with pytest.raises(ValueError, match="first"):
+            fan_out({"a": lambda: fail("first"), "b": slow_ok, "c": lambda: fail("second")})
+        assert finished == ["ok"]
+
+
+class TestSession:
+    def test_connection_pool_sized_for_pool(self):
+        session = create_session({"User-Agent": "test"}, pool_size=17)
+        adapter = session.get_adapter("https://example.org")
+        assert adapter._pool_maxsize == 17
+        assert session.headers["User-Agent"] == "test"
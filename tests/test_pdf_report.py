@@ -0,0 +1,201 @@
+"""
+EviChain – PDF Report Rendering Tests
+
+Covers ``evichain.pdf_report``: reports are rendered once per distinct
+payload (on-disk cache keyed by content hash), can run on the process
+pool, and batches come back as one zip.  A stub renderer stands in for
+reportlab, which is an optional dependency.
+
+Run with:  pytest tests/test_pdf_report.py -v
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import api_server  # noqa: E402
+from api_server import app, _rate_limit_store  # noqa: E402
+from evichain.pdf_report import PdfRenderer, payload_digest, render_complaint_pdf  # noqa: E402
+
+CALLS = []
+
+
+def stub_render(payload: dict) -> bytes:
+    """Module-level (picklable) stand-in for the reportlab renderer."""
+    CALLS.append(payload.get("complaint_id"))
+    return b"%PDF-1.4 stub " + str(payload.get("complaint_id")).encode()
+
+
+def failing_render(payload: dict) -> bytes:
+    raise ValueError("layout error")
+
+
+def crashing_render(payload: dict) -> bytes:
+    """Kills the worker process for one payload, like an OOM kill."""
+    if payload.get("complaint_id") == "EVC-CRASH":
+        os._exit(1)
+    return stub_render(payload)
+
+
+@pytest.fixture()
+def renderer(tmp_path):
+    CALLS.clear()
+    return PdfRenderer(tmp_path / "pdf", max_workers=0, render_fn=stub_render)
+
+
+@pytest.fixture()
+def client(renderer, monkeypatch):
+    monkeypatch.setattr(api_server, "pdf_renderer", renderer)
+    app.config["TESTING"] = True
+    _rate_limit_store.clear()
+    with app.test_client() as c:
+        yield c
+
+
+COMPLAINT = {"complaint_id": "EVC-2025-1", "titulo": "Teste", "descricao": "Descrição"}
+
+
+# ──────────────────────────────────────────────
+# Content-addressed cache
+# ──────────────────────────────────────────────
+
+class TestCache:
+    def test_same_payload_rendered_once(self, renderer):
+        first = renderer.render(dict(COMPLAINT))
+        again = renderer.render({**COMPLAINT})
+        assert first == again
+        assert first.read_bytes().startswith(b"%PDF")
+        assert CALLS == ["EVC-2025-1"]
+
+    def test_digest_ignores_key_order_but_not_content(self):
+        reordered = dict(reversed(list(COMPLAINT.items())))
+        assert payload_digest(reordered) == payload_digest(COMPLAINT)
+        assert payload_digest({**COMPLAINT, "titulo": "Outro"}) != payload_digest(COMPLAINT)
+
+    def test_failed_render_is_not_cached(self, tmp_path):
+        renderer = PdfRenderer(tmp_path, max_workers=0, render_fn=failing_render)
+        with pytest.raises(ValueError):
+            renderer.render(COMPLAINT)
+        assert not renderer.cache_path(payload_digest(COMPLAINT)).exists()
+        assert renderer._inflight == {}
+
+    def test_process_pool_render(self, tmp_path):
+        CALLS.clear()
+        renderer = PdfRenderer(tmp_path, max_workers=1, render_fn=stub_render)
+        try:
+            paths = renderer.render_many([COMPLAINT, {**COMPLAINT, "complaint_id": "EVC-2"}])
+        finally:
+            renderer.shutdown()
+        assert [p.read_bytes() for p in paths] == [b"%PDF-1.4 stub EVC-2025-1", b"%PDF-1.4 stub EVC-2"]
+        assert CALLS == []  # rendered in the worker process, not here
+
+    def test_dead_worker_does_not_break_later_renders(self, tmp_path):
+        renderer = PdfRenderer(tmp_path, max_workers=1, render_fn=crashing_render, timeout=30)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                renderer.render({**COMPLAINT, "complaint_id": "EVC-CRASH"})
+            assert renderer._inflight == {}
+            assert renderer.render(COMPLAINT).read_bytes() == b"%PDF-1.4 stub EVC-2025-1"
+        finally:
+            renderer.shutdown()
+
+    def test_submit_to_broken_pool_is_retried(self, tmp_path):
+        renderer = PdfRenderer(tmp_path, max_workers=1, render_fn=stub_render)
+        try:
+            with renderer._lock:
+                broken = renderer._executor()
+            with pytest.raises(BrokenProcessPool):
+                broken.submit(os._exit, 1).result(timeout=30)
+            assert renderer.render(COMPLAINT).exists()
+            assert renderer._pool is not broken
+            assert renderer._inflight == {}
+        finally:
+            renderer.shutdown()
+
+    def test_batch_zip_has_unique_names(self, renderer):
+        archive = renderer.render_zip([COMPLAINT, {**COMPLAINT, "titulo": "Outro"}])
+        with zipfile.ZipFile(archive) as zf:
+            assert zf.namelist() == ["denuncia_EVC-2025-1.pdf", "denuncia_EVC-2025-1-2.pdf"]
+        assert renderer.render_zip([COMPLAINT, {**COMPLAINT, "titulo": "Outro"}]) == archive
+        assert len(CALLS) == 2
+
+    def test_reportlab_renders_pdf(self):
+        pytest.importorskip("reportlab")
+        assert render_complaint_pdf(COMPLAINT).startswith(b"%PDF")
+
+    def test_report_bytes_depend_only_on_payload(self):
+        pytest.importorskip("reportlab")
+        payload = {**COMPLAINT, "timestamp": "2025-03-01T10:00:00"}
+        first = render_complaint_pdf(payload)
+        time.sleep(1.1)  # the clock must not leak into the cached document
+        assert render_complaint_pdf(payload) == first
+
+
+class TestCacheBounds:
+    def test_expired_reports_pruned_on_write(self, tmp_path):
+        renderer = PdfRenderer(tmp_path, max_workers=0, render_fn=stub_render, max_age=3600)
+        old = renderer.render({**COMPLAINT, "complaint_id": "old"})
+        os.utime(old, (time.time() - 7200, time.time() - 7200))
+        fresh = renderer.render(COMPLAINT)
+        assert fresh.exists()
+        assert not old.exists()
+
+    def test_oldest_reports_evicted_over_size(self, tmp_path):
+        renderer = PdfRenderer(tmp_path, max_workers=0, render_fn=stub_render, max_bytes=40)
+        paths = []
+        for n in range(4):
+            paths.append(renderer.render({**COMPLAINT, "complaint_id": f"c{n}"}))
+            os.utime(paths[-1], (time.time() - 100 + n, time.time() - 100 + n))
+        assert [p.exists() for p in paths] == [False, False, True, True]
+        assert renderer.render_zip([COMPLAINT]).exists()  # newest write is kept
+
+
+# ──────────────────────────────────────────────
+# Endpoints
+# ──────────────────────────────────────────────
+
+class TestEndpoints:
+    def test_generate_pdf_streams_cached_file(self, client):
+        r = client.post("/api/generate_pdf", json=COMPLAINT)
+        assert r.status_code == 200
+        assert r.mimetype == "application/pdf"
+        assert "denuncia_EVC-2025-1.pdf" in r.headers["Content-Disposition"]
+        assert r.get_data() == b"%PDF-1.4 stub EVC-2025-1"
+
+        again = client.post("/api/generate_pdf", json=COMPLAINT)
+        assert again.get_data() == r.get_data()
+        assert again.headers["ETag"] == r.headers["ETag"]
+        assert CALLS == ["EVC-2025-1"]
+
+    def test_batch_returns_zip(self, client):
+        r = client.post("/api/generate_pdf/batch",
+                        json={"complaints": [COMPLAINT, {**COMPLAINT, "complaint_id": "EVC-2"}]})
+        assert r.status_code == 200
+        assert r.mimetype == "application/zip"
+        with zipfile.ZipFile(io.BytesIO(r.get_data())) as zf:
+            assert sorted(zf.namelist()) == ["denuncia_EVC-2.pdf", "denuncia_EVC-2025-1.pdf"]
+
+    def test_batch_validation(self, client):
+        assert client.post("/api/generate_pdf/batch", json=[]).status_code == 400
+        assert client.post("/api/generate_pdf/batch", json=["x"]).status_code == 400
+        too_many = [{"complaint_id": str(i)} for i in range(api_server.PDF_BATCH_MAX + 1)]
+        assert client.post("/api/generate_pdf/batch", json=too_many).status_code == 400
+
+    def test_missing_reportlab_reported(self, client, renderer, monkeypatch):
+        def no_reportlab(payload):
+            raise ImportError("reportlab")
+
+        monkeypatch.setattr(renderer, "render_fn", no_reportlab)
+        r = client.post("/api/generate_pdf", json={"complaint_id": "EVC-3"})
+        assert r.status_code == 500
+        assert "reportlab" in r.get_json()["error"]
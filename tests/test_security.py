@@ -15,6 +15,7 @@ from __future__ import annotations
 
 import json
 import os
+import sqlite3
 import sys
 import time
 
@@ -23,7 +24,12 @@ import pytest
 # Allow imports from project root
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+import api_server  # noqa: E402
 from api_server import app, _rate_limit_store  # noqa: E402
+from evichain.audit_log import AuditLog  # noqa: E402
+from evichain.rate_limit import (  # noqa: E402
+    Budget, MemoryBucketStore, RateLimiter, SQLiteBucketStore,
+)
 
 
 @pytest.fixture()
@@ -144,6 +150,64 @@ class TestRateLimiting:
         # (may not trigger in test env if rate limiter uses real IP)
         assert 200 in statuses  # service is up
 
+    def test_limited_response_has_retry_after(self, client):
+        r = None
+        for _ in range(40):
+            r = client.get("/api/health")
+            if r.status_code == 429:
+                break
+        assert r.status_code == 429
+        assert int(r.headers["Retry-After"]) >= 1
+
+    def test_token_bucket_refills(self):
+        limiter = RateLimiter(MemoryBucketStore(), default=Budget(2, 2))
+        assert limiter.hit("ip", "/x", now=100.0)[0]
+        assert limiter.hit("ip", "/x", now=100.0)[0]
+        allowed, retry_after = limiter.hit("ip", "/x", now=100.0)
+        assert not allowed and retry_after == pytest.approx(1.0)
+        assert limiter.hit("ip", "/x", now=101.0)[0]
+
+    def test_route_budgets_are_separate(self):
+        limiter = RateLimiter(
+            MemoryBucketStore(),
+            default=Budget(1, 60),
+            routes={"/api/sync/": Budget(5, 60), "/api/submit": Budget(1, 60)},
+        )
+        assert limiter.budget_for("/api/sync/pull")[0] == "/api/sync/"
+        assert limiter.budget_for("/api/submit-x")[0] == "*"
+        assert limiter.hit("ip", "/api/stats", now=0)[0]
+        assert not limiter.hit("ip", "/api/stats", now=0)[0]
+        assert limiter.hit("ip", "/api/sync/pull", now=0)[0]
+
+    def test_memory_store_is_bounded(self):
+        store = MemoryBucketStore(max_keys=100)
+        limiter = RateLimiter(store, default=Budget(30, 60))
+        for i in range(1000):
+            limiter.hit(f"10.0.{i // 256}.{i % 256}", "/api/health", now=0)
+        assert len(store) == 100
+
+    def test_sqlite_store_shared_between_instances(self, tmp_path):
+        db = tmp_path / "rl.sqlite3"
+        a = RateLimiter(SQLiteBucketStore(db), default=Budget(2, 60))
+        b = RateLimiter(SQLiteBucketStore(db), default=Budget(2, 60))
+        assert a.hit("ip", "/x", now=0)[0]
+        assert b.hit("ip", "/x", now=0)[0]
+        assert not a.hit("ip", "/x", now=0)[0]
+
+    def test_sqlite_store_fails_open_when_locked(self, tmp_path, capsys):
+        db = tmp_path / "rl.sqlite3"
+        limiter = RateLimiter(SQLiteBucketStore(db, timeout=0.05), default=Budget(1, 60))
+        holder = sqlite3.connect(db, isolation_level=None)
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            assert limiter.hit("ip", "/x", now=0) == (True, 0.0)
+            assert "Rate limit store busy" in capsys.readouterr().out
+        finally:
+            holder.execute("ROLLBACK")
+            holder.close()
+        assert limiter.hit("ip", "/x", now=0)[0]
+        assert not limiter.hit("ip", "/x", now=0)[0]
+
 
 # ──────────────────────────────────────────────
 # A09 – Error Handling (no stack trace leak)
@@ -205,6 +269,35 @@ class TestAuditLog:
         data = r.get_json()
         assert data["audit_log"]["valid"] is True
 
+    def test_audit_log_full_verification(self, client):
+        r = client.get("/api/security/audit-log/verify?full=true")
+        assert r.status_code == 200
+        assert r.get_json()["audit_log"]["verified_from"] == 0
+
+    @pytest.fixture()
+    def query_log(self, tmp_path, monkeypatch):
+        log = AuditLog(log_dir=tmp_path, hmac_key=b"k" * 32)
+        monkeypatch.setattr(api_server, "audit_log", log)
+        monkeypatch.setitem(app.config, "EVICHAIN_AUDIT_QUERY", True)
+        yield log
+        log.close()
+
+    def test_audit_log_query_endpoint(self, client, query_log):
+        query_log.log_block_mined(7, "c" * 64, complaint_ids=["EVC-QUERY-TEST"])
+        r = client.get("/api/security/audit-log/query?complaint_id=EVC-QUERY-TEST&limit=1")
+        assert r.status_code == 200
+        data = r.get_json()
+        assert data["entries"][0]["detail"]["complaint_ids"] == ["EVC-QUERY-TEST"]
+        assert "next_cursor" in data
+
+    def test_audit_log_query_hidden_by_default(self, client, monkeypatch):
+        monkeypatch.setitem(app.config, "EVICHAIN_AUDIT_QUERY", False)
+        assert client.get("/api/security/audit-log/query").status_code == 404
+
+    def test_audit_log_query_rejects_bad_params(self, client, query_log):
+        assert client.get("/api/security/audit-log/query?limit=x").status_code == 400
+        assert client.get("/api/security/audit-log/query?since=yesterday").status_code == 400
+
 
 # ──────────────────────────────────────────────
 # OpenAI API Key handling
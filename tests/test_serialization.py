@@ -0,0 +1,148 @@
+"""
+EviChain – JSON Serialization Layer Tests
+
+The fast backend may be swapped freely; block hashes and audit HMACs
+must not change when it is.
+
+Run with:  pytest tests/test_serialization.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from api_server import app, _rate_limit_store  # noqa: E402
+from blockchain_simulator import Block, EviChainBlockchain  # noqa: E402
+from evichain import serialization  # noqa: E402
+from evichain.audit_log import AuditLog  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+CHAIN_FILE = os.path.join(ROOT, "data", "blockchain_data.json")
+
+BACKENDS = ["stdlib"] + (["orjson"] if serialization.orjson is not None else [])
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = serialization.get_backend()
+    serialization.set_backend(request.param)
+    yield request.param
+    serialization.set_backend(previous)
+
+
+@pytest.fixture()
+def client():
+    app.config["TESTING"] = True
+    _rate_limit_store.clear()
+    with app.test_client() as c:
+        yield c
+
+
+SAMPLE = {
+    "titulo": "Denúncia — teste",
+    "valores": [1, 2.5, 1e-7, 123456789012345678],
+    "aninhado": {"b": None, "a": True},
+}
+
+
+# ──────────────────────────────────────────────
+# Canonical encoder (hash format)
+# ──────────────────────────────────────────────
+
+class TestCanonicalEncoding:
+    def test_matches_stdlib_sorted_dumps(self, backend):
+        assert serialization.canonical_dumps(SAMPLE) == json.dumps(SAMPLE, sort_keys=True)
+        assert serialization.canonical_dumps(SAMPLE, ensure_ascii=False) == json.dumps(
+            SAMPLE, sort_keys=True, ensure_ascii=False
+        )
+
+    def test_stored_block_hashes_unchanged(self, backend):
+        """Recompute every hash in the committed chain file with the new code."""
+        with open(CHAIN_FILE, encoding="utf-8") as f:
+            stored = json.load(f)["blocks"]
+        for raw in stored:
+            block = Block(raw["index"], raw["timestamp"], serialization.loads(raw["data"]),
+                          raw["previous_hash"])
+            block.nonce = raw["nonce"]
+            assert block.calculate_hash() == raw["hash"]
+
+    def test_mining_template_matches_calculate_hash(self):
+        block = Block(3, 1_700_000_000.25, {"transactions": [SAMPLE]}, "ab" * 32)
+        block.mine_block(2)
+        assert block.hash == block.calculate_hash()
+        assert block.hash.startswith("00")
+
+    def test_chain_roundtrip_keeps_hashes(self, backend, tmp_path):
+        bc = EviChainBlockchain(data_file=str(tmp_path / "chain.json"))
+        bc.difficulty = 1
+        bc.add_evidence_transaction(dict(SAMPLE))
+        bc.mine_pending_transactions()
+
+        reloaded = EviChainBlockchain(data_file=str(tmp_path / "chain.json"))
+        assert [b.hash for b in reloaded.chain] == [b.hash for b in bc.chain]
+        assert reloaded.is_chain_valid()
+
+    def test_audit_log_verifies_across_backends(self, tmp_path):
+        previous = serialization.get_backend()
+        log = AuditLog(log_dir=tmp_path, hmac_key=b"k" * 32)
+        try:
+            for name in BACKENDS:
+                serialization.set_backend(name)
+                log.log_event("TEST", detail=dict(SAMPLE))
+            for name in BACKENDS:
+                serialization.set_backend(name)
+                assert log.verify_integrity()["valid"]
+        finally:
+            serialization.set_backend(previous)
+
+
+# ──────────────────────────────────────────────
+# Fast encoder and Flask provider
+# ──────────────────────────────────────────────
+
+class TestFastEncoding:
+    def test_roundtrip_equivalent(self, backend):
+        encoded = serialization.dumps(SAMPLE, sort_keys=True)
+        assert isinstance(encoded, bytes)
+        assert serialization.loads(encoded) == SAMPLE
+        assert json.loads(serialization.dumps(SAMPLE, indent=True)) == SAMPLE
+
+    def test_default_hook_handles_datetimes(self, backend):
+        when = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        encoded = serialization.dumps({"at": when}, default=lambda o: o.isoformat())
+        assert serialization.loads(encoded) == {"at": when.isoformat()}
+
+    def test_invalid_json_raises_decode_error(self, backend):
+        with pytest.raises(json.JSONDecodeError):
+            serialization.loads(b"{not json")
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            serialization.set_backend("simplejson")
+
+    def test_provider_dumps_honours_layout(self, backend):
+        payload = {"b": [1, 2], "a": "ç"}
+        with app.app_context():
+            assert app.json.dumps(payload, separators=(", ", ": ")) == json.dumps(
+                payload, separators=(", ", ": "), sort_keys=True, ensure_ascii=False, default=app.json.default)
+            assert app.json.dumps(payload, indent=4) == json.dumps(
+                payload, indent=4, sort_keys=True, ensure_ascii=False, default=app.json.default)
+            assert app.json.dumps(payload, separators=(",", ":")) == '{"a":"ç","b":[1,2]}'
+
+    def test_jsonify_matches_default_provider(self, client, backend):
+        from flask.json.provider import DefaultJSONProvider
+
+        payload = {"z": 1, "a": [SAMPLE], "when": datetime(2025, 1, 2, tzinfo=timezone.utc)}
+        with app.app_context():
+            fast = app.json.response(payload).get_data()
+            default = DefaultJSONProvider(app).response(payload).get_data()
+        assert json.loads(fast) == json.loads(default)
+        assert fast.endswith(b"\n")
@@ -0,0 +1,149 @@
+"""
+EviChain – Service Container Tests
+
+Covers ``evichain.services``: services are built on first use, exactly
+once even under concurrent first access, and share their components;
+heavy optional libraries stay out of ``import api_server``.
+
+Run with:  pytest tests/test_services.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from evichain.optional_imports import HEAVY_MODULES, available, require  # noqa: E402
+from evichain.services import LAZY_SERVICES, Services  # noqa: E402
+from evichain.settings import Settings  # noqa: E402
+from evichain.rate_limit import SQLiteBucketStore  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+@pytest.fixture()
+def services(tmp_path):
+    settings = Settings(
+        project_root=tmp_path,
+        data_file=tmp_path / "chain.json",
+        host="127.0.0.1",
+        port=5000,
+        debug=False,
+        openai_api_key=None,
+    )
+    return Services(settings)
+
+
+# ──────────────────────────────────────────────
+# Lazy construction
+# ──────────────────────────────────────────────
+
+class TestLazyServices:
+    def test_only_blockchain_built_up_front(self, services):
+        assert services.built() == ("blockchain",)
+        services.consultor_registros
+        assert services.built() == ("blockchain", "consultor_registros")
+
+    def test_components_are_shared(self, services):
+        engine = services.ia_engine
+        assert engine.investigador is services.investigador
+        assert engine.consultor_registros is services.consultor_registros
+        assert engine.detector_nomes is services.detector_nomes
+        assert services.investigador.consultor_registros is services.consultor_registros
+
+    def test_concurrent_first_access_builds_once(self, services):
+        barrier = threading.Barrier(8)
+        seen = []
+
+        def worker():
+            barrier.wait()
+            seen.append(services.ia_engine)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len({id(engine) for engine in seen}) == 1
+
+    def test_warm_builds_everything(self, services):
+        services.warm()
+        assert services.built() == ("blockchain", *LAZY_SERVICES)
+
+
+# ──────────────────────────────────────────────
+# Cold start
+# ──────────────────────────────────────────────
+
+class TestColdStart:
+    def test_api_server_import_skips_heavy_modules(self):
+        code = (
+            "import sys, api_server; "
+            f"print('loaded:', [m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60,
+        )
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.strip().splitlines()[-1] == "loaded: []"
+
+    def test_building_services_stays_offline(self):
+        code = (
+            "import sys; from evichain.services import Services; "
+            "from evichain.settings import load_settings; "
+            "Services(load_settings()).warm(); "
+            "print('loaded:', [m for m in ('requests', 'bs4', 'openai') if m in sys.modules])"
+        )
+        env = {**os.environ, "OPENAI_API_KEY": ""}
+        proc = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+            timeout=60, env=env,
+        )
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.strip().splitlines()[-1] == "loaded: []"
+
+    def test_require_missing_module_has_install_hint(self):
+        assert not available("evichain_no_such_module")
+        with pytest.raises(ImportError, match="pip install"):
+            require("evichain_no_such_module")
+
+
+# ──────────────────────────────────────────────
+# Fork safety (gunicorn --preload)
+# ──────────────────────────────────────────────
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+class TestForkSafety:
+    def _in_child(self, fn) -> int:
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the child
+            try:
+                fn()
+                os._exit(0)
+            except BaseException:
+                os._exit(1)
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status)
+
+    def test_outbound_pool_recreated_after_fork(self):
+        from evichain.outbound import fan_out
+
+        assert fan_out({"a": lambda: 1, "b": lambda: 2}) == {"a": 1, "b": 2}
+        assert self._in_child(lambda: fan_out({"a": lambda: 1, "b": lambda: 2})) == 0
+
+    def test_sqlite_connection_not_shared_with_child(self, tmp_path):
+        store = SQLiteBucketStore(Path(tmp_path) / "buckets.db")
+        parent_conn = store._conn()
+
+        def child():
+            assert store._conn() is not parent_conn
+
+        assert self._in_child(child) == 0
@@ -0,0 +1,140 @@
+"""
+EviChain – Desktop Sync Test Suite
+
+Covers the incremental sync protocol used by the desktop client:
+delta pulls keyed on block height / tip hash and divergence detection.
+
+Run with:  pytest tests/test_sync.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from api_server import app, _rate_limit_store  # noqa: E402
+from blockchain_simulator import EviChainBlockchain  # noqa: E402
+
+
+@pytest.fixture()
+def client():
+    app.config["TESTING"] = True
+    _rate_limit_store.clear()
+    with app.test_client() as c:
+        yield c
+
+
+@pytest.fixture()
+def chain(tmp_path):
+    bc = EviChainBlockchain(data_file=str(tmp_path / "chain.json"))
+    bc.difficulty = 1
+    return bc
+
+
+def _add_complaint(bc: EviChainBlockchain, titulo: str):
+    complaint_id = bc.add_evidence_transaction({"titulo": titulo, "descricao": titulo})
+    block = bc.mine_pending_transactions()
+    return complaint_id, block
+
+
+class TestDeltaSync:
+    def test_complaints_since_height(self, chain):
+        _add_complaint(chain, "first")
+        tip = chain.last_block.index
+        _add_complaint(chain, "second")
+
+        complaints = chain.get_complaints_since(tip)
+        assert [c["titulo"] for c in complaints] == ["second"]
+        assert chain.get_complaints_since(chain.last_block.index) == []
+
+    def test_resolve_tip_by_hash(self, chain):
+        _, block = _add_complaint(chain, "first")
+        assert chain.resolve_sync_tip(since_hash=block.hash) == block.index
+        assert chain.resolve_sync_tip(block.index, block.hash) == block.index
+
+    def test_divergence_detected(self, chain):
+        _, block = _add_complaint(chain, "first")
+        assert chain.resolve_sync_tip(since_hash="f" * 64) is None
+        assert chain.resolve_sync_tip(since_height=block.index + 5) is None
+        assert chain.resolve_sync_tip(0, block.hash) is None
+
+    def test_indexes_survive_reload(self, chain):
+        _, block = _add_complaint(chain, "first")
+        reloaded = EviChainBlockchain(data_file=chain.data_file)
+        assert reloaded.get_block_height(block.hash) == block.index
+
+
+class TestSyncPullEndpoint:
+    def test_full_pull_reports_tip(self, client):
+        r = client.get("/api/sync/pull")
+        data = r.get_json()
+        assert r.status_code == 200
+        assert data["full"] is True
+        assert data["diverged"] is False
+        assert len(data["tip_hash"]) == 64
+
+    def test_pull_at_tip_is_empty(self, client):
+        tip = client.get("/api/sync/pull").get_json()
+        r = client.get(
+            f"/api/sync/pull?since_height={tip['tip_height']}&since_hash={tip['tip_hash']}"
+        )
+        data = r.get_json()
+        assert data["full"] is False
+        assert data["complaints"] == []
+        assert data["blocks"] == []
+
+    def test_unknown_hash_diverges(self, client):
+        r = client.get("/api/sync/pull?since_hash=" + "0" * 64)
+        data = r.get_json()
+        assert data["diverged"] is True
+        assert data["full"] is True
+
+    def test_invalid_height_rejected(self, client):
+        r = client.get("/api/sync/pull?since_height=abc")
+        assert r.status_code == 400
+
+
+class TestComplaintIndex:
+    def test_origin_id_indexed_and_persisted(self, chain):
+        chain.add_evidence_transaction({"titulo": "desk", "origin_id": "DESK-1"})
+        block = chain.mine_pending_transactions()
+        found = chain.find_complaint("DESK-1")
+        assert found is not None and found[0] == block.index
+
+        reloaded = EviChainBlockchain(data_file=chain.data_file)
+        assert reloaded.find_complaint("DESK-1") == found
+
+    def test_ids_unique_within_block(self, chain):
+        ids = [chain.add_evidence_transaction({"titulo": str(i)}) for i in range(5)]
+        assert len(set(ids)) == 5
+
+
+class TestSyncPushBatchEndpoint:
+    def test_batch_seals_one_block_with_per_item_status(self, client):
+        items = [
+            {"id": "DESK-BATCH-A", "titulo": "A", "descricao": "a"},
+            {"id": "DESK-BATCH-B", "titulo": "B", "descricao": "b"},
+            {"id": "DESK-BATCH-A", "titulo": "A again"},
+            "not-an-object",
+        ]
+        r = client.post("/api/sync/push-batch", json={"complaints": items})
+        data = r.get_json()
+        statuses = [res["status"] for res in data["results"]]
+        assert statuses[2:] == ["duplicate", "invalid"]
+
+        if r.status_code == 201:
+            created = [res for res in data["results"] if res["status"] == "created"]
+            assert {res["block_index"] for res in created} == {data["block_index"]}
+
+        again = client.post("/api/sync/push-batch", json=items[:2]).get_json()
+        assert [res["status"] for res in again["results"]] == ["already_exists"] * 2
+        assert again["block_index"] is None
+
+    def test_batch_requires_list(self, client):
+        r = client.post("/api/sync/push-batch", json={"complaints": "nope"})
+        assert r.status_code == 400
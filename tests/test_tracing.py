@@ -0,0 +1,152 @@
+"""
+EviChain – Request Tracing Tests
+
+Covers ``evichain.tracing`` (spans, ring buffer, per-stage percentiles)
+and the ``/api/debug/traces`` endpoint.
+
+Run with:  pytest tests/test_tracing.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import pytest
+
+# Allow imports from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import api_server  # noqa: E402
+from api_server import app, _rate_limit_store  # noqa: E402
+from evichain.tracing import Span, Tracer, current_trace_id, tracer  # noqa: E402
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    app.config["TESTING"] = True
+    monkeypatch.setitem(app.config, "EVICHAIN_DEBUG_TRACES", True)
+    _rate_limit_store.clear()
+    with app.test_client() as c:
+        yield c
+
+
+# ──────────────────────────────────────────────
+# Tracer
+# ──────────────────────────────────────────────
+
+class TestTracer:
+    def test_span_records_duration_and_attrs(self):
+        t = Tracer()
+        with t.span("stage", trace_id="T1", size=3) as attrs:
+            time.sleep(0.01)
+            attrs["nonce"] = 7
+        (span,) = t.spans()
+        assert span.trace_id == "T1"
+        assert span.duration_ms >= 10
+        assert span.attrs == {"size": 3, "nonce": 7}
+        assert span.status == "ok"
+
+    def test_nested_spans_inherit_trace_id(self):
+        t = Tracer()
+        with t.span("outer", trace_id="T2"):
+            assert current_trace_id() == "T2"
+            with t.span("inner"):
+                pass
+        assert current_trace_id() is None
+        assert [s.trace_id for s in t.spans()] == ["T2", "T2"]
+
+    def test_error_recorded_without_message(self):
+        t = Tracer()
+        with pytest.raises(ValueError):
+            with t.span("boom"):
+                raise ValueError("Fulano de Tal, CPF 123")
+        (span,) = t.spans()
+        assert span.status == "error"
+        assert span.error == "ValueError"
+        assert "Fulano" not in str(span.to_dict())
+
+    def test_server_error_status_marks_span(self):
+        t = Tracer()
+        for code in (200, 400, 500):
+            with t.span("request") as attrs:
+                attrs["status_code"] = code
+        assert [s.status for s in t.spans()] == ["ok", "ok", "error"]
+
+    def test_ring_buffer_is_bounded(self):
+        t = Tracer(capacity=5)
+        for i in range(20):
+            t.event("e", i=i)
+        assert len(t) == 5
+        assert [s.attrs["i"] for s in t.spans()] == [15, 16, 17, 18, 19]
+
+    def test_stage_percentiles(self):
+        t = Tracer()
+        for ms in range(1, 101):
+            t._spans.append(Span(trace_id=None, stage="s", started_at=0.0, duration_ms=float(ms)))
+        stats = t.stage_stats()["s"]
+        assert stats["count"] == 100
+        assert stats["p50_ms"] == pytest.approx(50.5)
+        assert stats["p95_ms"] == pytest.approx(95.05)
+        assert stats["p99_ms"] == pytest.approx(99.01)
+        assert stats["max_ms"] == 100.0
+
+
+# ──────────────────────────────────────────────
+# /api/debug/traces
+# ──────────────────────────────────────────────
+
+class TestDebugTracesEndpoint:
+    PAYLOAD = {
+        "titulo": "Trace test",
+        "descricao": "Texto sigiloso da denúncia para teste de rastreamento",
+        "nomeDenunciado": "Profissional Rastreado",
+        "assunto": "teste",
+        "finalidade": "teste",
+    }
+
+    def test_submit_pipeline_stages_are_traced(self, client):
+        tracer.clear()
+        assert client.post("/api/submit-complaint", json=self.PAYLOAD).status_code == 200
+
+        r = client.get("/api/debug/traces?limit=500")
+        assert r.status_code == 200
+        assert r.headers["Cache-Control"] == "no-store"
+        data = r.get_json()
+        for stage in ("submit_complaint", "ia_analysis", "ia.name_detection",
+                      "blockchain_add", "mining", "chain.pow", "chain.save", "audit"):
+            assert stage in data["stages"], stage
+            assert {"p50_ms", "p95_ms", "p99_ms"} <= set(data["stages"][stage])
+
+        trace_ids = {s["trace_id"] for s in data["spans"] if s["stage"] == "chain.save"}
+        (trace_id,) = trace_ids
+        assert trace_id.startswith("REQ-")
+
+        raw = r.get_data(as_text=True)
+        assert "sigiloso" not in raw
+        assert "Rastreado" not in raw
+
+    def test_filters(self, client):
+        tracer.clear()
+        with tracer.span("only-this", trace_id="T-filter"):
+            pass
+        tracer.event("other")
+        spans = client.get("/api/debug/traces?trace_id=T-filter").get_json()["spans"]
+        assert [s["stage"] for s in spans] == ["only-this"]
+        assert client.get("/api/debug/traces?limit=x").status_code == 400
+
+    def test_hidden_unless_enabled(self, client, monkeypatch):
+        monkeypatch.setitem(app.config, "EVICHAIN_DEBUG_TRACES", False)
+        assert client.get("/api/debug/traces").status_code == 404
+
+    def test_failed_submission_span_is_error(self, client, monkeypatch):
+        def broken(transaction_data, trace_id):
+            raise RuntimeError("mineração falhou")
+
+        monkeypatch.setattr(api_server, "_process_complaint", broken)
+        tracer.clear()
+        assert client.post("/api/submit-complaint", json=self.PAYLOAD).status_code == 500
+        (span,) = tracer.spans(stage="submit_complaint")
+        assert span.status == "error"
+        assert span.attrs["status_code"] == 500